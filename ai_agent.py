@@ -1,29 +1,50 @@
 """
 Agente de IA para análise de dados do dashboard usando OpenAI GPT
-Usa requests diretamente para evitar problemas de proxy no Streamlit Cloud
+
+As chamadas ao modelo passam por um backend plugável (ver ai_backends): a API da OpenAI
+por padrão, um endpoint compatível local ou respostas gravadas (replay).
 """
 
 import logging
-from typing import Dict, Any
-import requests
-from openai import OpenAI
+from typing import Dict, Any, Optional, Tuple
+
+from ai_backends import OpenAIBackend
+from ai_cache import AIAnalysisCache, analysis_cache_key
+from ai_prompt import DEFAULT_PROMPT_TOKEN_BUDGET, build_analysis_data_text
 
 logger = logging.getLogger(__name__)
 
 
 class AIAgent:
-    def __init__(self, api_key: str, model: str = "gpt-4o-mini"):
+    # Incrementar ao mudar prompts/parâmetros: invalida as análises guardadas no cache
+    PROMPT_VERSION = "2"
+
+    def __init__(self, api_key: Optional[str], model: str = "gpt-4o-mini", cache: Optional[AIAnalysisCache] = None,
+                 prompt_token_budget: int = DEFAULT_PROMPT_TOKEN_BUDGET, backend: Any = None):
         """
         Inicializa o agente de IA
 
         Args:
             api_key: Chave da API OpenAI
             model: Modelo a usar (gpt-4o-mini é mais barato, gpt-4o é mais potente)
+            cache: Cache persistente de análises (opcional; compartilhado entre sessões)
+            prompt_token_budget: Orçamento estimado de tokens para o bloco de dados do prompt
+            backend: Backend de LLM (ai_backends); padrão é a API da OpenAI com ``api_key``
         """
         self.api_key = api_key
         self.model = model
-        self.api_url = "https://api.openai.com/v1/chat/completions"
-        self.client = OpenAI(api_key=api_key)
+        self.cache = cache
+        self.prompt_token_budget = prompt_token_budget
+        self.backend = backend if backend is not None else OpenAIBackend(api_key)
+
+    @property
+    def client(self):
+        """Cliente OpenAI do backend HTTP (criado no primeiro uso e compartilhado no processo)."""
+        return self.backend.client
+
+    @client.setter
+    def client(self, value):
+        self.backend.client = value
 
     @staticmethod
     def is_available() -> bool:
@@ -129,93 +150,77 @@ Formato da resposta:
                                    creative_data: Any = None,
                                    source_data: Any = None,
                                    events_data: Any = None) -> str:
-        """Formata os dados do dashboard para análise"""
-
-        data_text = f"""
-## DADOS DO META ADS (Facebook/Instagram)
-- Investimento: $ {meta_data.get('investimento', 0):,.2f}
-- Impressões: {meta_data.get('impressoes', 0):,}
-- Alcance: {meta_data.get('alcance', 0):,}
-- Frequência: {meta_data.get('frequencia', 0):.2f}
-- Cliques no Link: {meta_data.get('cliques_link', 0):,}
-- Cliques na Loja (Meta): {meta_data.get('store_clicks_meta', 0):,}
-- CTR (Taxa de Cliques): {meta_data.get('ctr_link', 0):.2f}%
-- CPC (Custo por Clique): $ {meta_data.get('cpc_link', 0):.2f}
-- CPM (Custo por Mil): $ {meta_data.get('cpm', 0):.2f}
-
-Variações vs período anterior:
-- CTR: {meta_data.get('delta_ctr', 0):+.2f}pp
-- CPC: {meta_data.get('delta_cpc', 0):+.1f}%
-- Cliques: {meta_data.get('delta_cliques', 0):+.1f}%
-
-## DADOS DO GA4 (Landing Page)
-- Sessões: {ga4_data.get('sessoes', 0):,}
-- Usuários: {ga4_data.get('usuarios', 0):,}
-- Pageviews: {ga4_data.get('pageviews', 0):,}
-- Taxa de Engajamento: {ga4_data.get('taxa_engajamento', 0):.1f}%
-- Tempo Médio: {ga4_data.get('tempo_medio', 'N/A')}
-"""
-
-        # Adicionar dados de criativos se disponível
-        if creative_data is not None and len(creative_data) > 0:
-            data_text += "\n## PERFORMANCE DOS CRIATIVOS\n"
-            for _, row in creative_data.head(5).iterrows():
-                data_text += f"- {row.get('Criativo', 'N/A')}: Taxa de cliques {row.get('Taxa de cliques', 0):.2f}%, Custo por clique $ {row.get('Custo por clique', 0):.2f}\n"
-
-        # Adicionar dados de origem/mídia se disponível
-        if source_data is not None and len(source_data) > 0:
-            data_text += "\n## ORIGENS DE TRÁFEGO (TOP 3)\n"
-            for _, row in source_data.head(3).iterrows():
-                data_text += f"- {row.get('Origem / Midia', 'N/A')}: {row.get('Sessoes', 0)} sessões, {row.get('Engajamento', 'N/A')} engajamento\n"
-
-        # Adicionar dados de eventos se disponível
-        if events_data is not None and len(events_data) > 0:
-            data_text += "\n## EVENTOS GA4 (TOP 5)\n"
-            for _, row in events_data.head(5).iterrows():
-                data_text += f"- {row.get('Nome do Evento', 'N/A')}: {row.get('Contagem de Eventos', 'N/A')}\n"
-
-        return data_text
+        """Formata os dados do dashboard para análise (compacto, dentro do orçamento de tokens)"""
+        return build_analysis_data_text(
+            meta_data, ga4_data,
+            creative_data=creative_data,
+            source_data=source_data,
+            events_data=events_data,
+            token_budget=self.prompt_token_budget,
+        )
+
+    def _cached_analysis(self, cache_key: str) -> Optional[str]:
+        if self.cache is None:
+            return None
+        try:
+            return self.cache.get(cache_key)
+        except Exception as e:
+            logger.warning(f"Cache de análises indisponível: {e}")
+            return None
 
-    def analyze(self, meta_data: Dict, ga4_data: Dict,
-                creative_data: Any = None,
-                source_data: Any = None,
-                events_data: Any = None,
-                period: str = "7d",
-                cycle: str = "Ciclo 2") -> str:
+    def _store_analysis(self, cache_key: str, analysis: str, cycle: str, period: str) -> None:
+        if self.cache is None:
+            return
+        try:
+            self.cache.put(cache_key, analysis, cycle=cycle, model=self.model,
+                           prompt_version=self.PROMPT_VERSION, period=period)
+        except Exception as e:
+            logger.warning(f"Não foi possível gravar a análise no cache: {e}")
+
+    def latest_analysis(self, meta_data: Dict, ga4_data: Dict,
+                        creative_data: Any = None,
+                        source_data: Any = None,
+                        events_data: Any = None,
+                        period: str = "7d",
+                        cycle: str = "Ciclo 2") -> Optional[Tuple[str, bool]]:
         """
-        Analisa os dados do dashboard e retorna insights
-
-        Args:
-            meta_data: Dados do Meta Ads
-            ga4_data: Dados do GA4
-            creative_data: DataFrame com performance dos criativos
-            source_data: DataFrame com origens de tráfego
-            events_data: DataFrame com eventos do GA4
-            period: Período selecionado
-            cycle: Ciclo atual (Ciclo 1 ou Ciclo 2)
+        Análise já guardada para o período/ciclo, sem chamar a API
 
         Returns:
-            String com análise e recomendações
+            Tupla (análise, dados_mudaram) ou None se não há análise guardada;
+            dados_mudaram indica que a análise foi gerada com números diferentes dos atuais
         """
+        if self.cache is None:
+            return None
+        data_text = self._format_data_for_analysis(meta_data, ga4_data, creative_data, source_data, events_data)
+        current = self._cached_analysis(analysis_cache_key(data_text, cycle, self.model, self.PROMPT_VERSION, period))
+        if current is not None:
+            return current, False
         try:
-            # Formatar dados
-            data_text = self._format_data_for_analysis(
-                meta_data, ga4_data, creative_data, source_data, events_data
-            )
+            latest = self.cache.get_latest(period, cycle, self.model, self.PROMPT_VERSION)
+        except Exception as e:
+            logger.warning(f"Cache de análises indisponível: {e}")
+            return None
+        return (latest[1], True) if latest else None
 
-            # Mapear período para texto
-            period_text = {
-                "today": "hoje",
-                "yesterday": "ontem",
-                "7d": "últimos 7 dias",
-                "14d": "últimos 14 dias",
-                "30d": "últimos 30 dias",
-                "custom": "período personalizado"
-            }.get(period, period)
+    @staticmethod
+    def _period_text(period: str) -> str:
+        """Mapeia o período do dashboard para texto"""
+        return {
+            "today": "hoje",
+            "yesterday": "ontem",
+            "7d": "últimos 7 dias",
+            "14d": "últimos 14 dias",
+            "30d": "últimos 30 dias",
+            "custom": "período personalizado"
+        }.get(period, period)
+
+    def _build_user_prompt(self, data_text: str, period: str = "7d", cycle: str = "Ciclo 2") -> str:
+        """Constrói o prompt do usuário baseado no ciclo (usado por analyze e analyze_stream)"""
+        period_text = self._period_text(period)
 
-            # Construir prompt do usuário baseado no ciclo
-            if cycle == "Ciclo 2":
-                user_prompt = f"""Analise os dados de campanha do período: {period_text}
+        if cycle == "Ciclo 2":
+            return f"""Analise os dados de campanha do período: {period_text}
 
 {data_text}
 
@@ -231,8 +236,8 @@ Por favor, forneça uma análise POSITIVA e OBJETIVA:
 
 LEMBRE-SE: Foco no positivo! O gestor vai decidir se precisa ajustar algo baseado nos números.
 """
-            else:
-                user_prompt = f"""Analise os dados de campanha do período: {period_text}
+
+        return f"""Analise os dados de campanha do período: {period_text}
 
 {data_text}
 
@@ -247,48 +252,83 @@ Por favor, forneça:
 6. 💡 **Próximos Passos** (máximo 3 ações prioritárias)
 """
 
-            # Chamar API diretamente com requests
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json"
-            }
-
-            payload = {
-                "model": self.model,
-                "messages": [
-                    {"role": "system", "content": self._build_system_prompt(cycle)},
-                    {"role": "user", "content": user_prompt}
-                ],
-                "temperature": 0.7,
-                "max_tokens": 1200
-            }
-
-            response = requests.post(
-                self.api_url,
-                headers=headers,
-                json=payload,
-                timeout=60
+    def _build_messages(self, data_text: str, period: str, cycle: str) -> list:
+        return [
+            {"role": "system", "content": self._build_system_prompt(cycle)},
+            {"role": "user", "content": self._build_user_prompt(data_text, period, cycle)}
+        ]
+
+    def analyze(self, meta_data: Dict, ga4_data: Dict,
+                creative_data: Any = None,
+                source_data: Any = None,
+                events_data: Any = None,
+                period: str = "7d",
+                cycle: str = "Ciclo 2") -> str:
+        """
+        Analisa os dados do dashboard e retorna insights
+
+        Args:
+            meta_data: Dados do Meta Ads
+            ga4_data: Dados do GA4
+            creative_data: DataFrame com performance dos criativos
+            source_data: DataFrame com origens de tráfego
+            events_data: DataFrame com eventos do GA4
+            period: Período selecionado
+            cycle: Ciclo atual (Ciclo 1 ou Ciclo 2)
+
+        Returns:
+            String com análise e recomendações
+        """
+        try:
+            # Formatar dados
+            data_text = self._format_data_for_analysis(
+                meta_data, ga4_data, creative_data, source_data, events_data
             )
 
-            if response.status_code != 200:
-                error_msg = response.json().get('error', {}).get('message', response.text)
-                return f"❌ Erro da API OpenAI: {error_msg}"
+            # Mesmos números + ciclo + modelo + prompt => reaproveita a análise já gerada
+            cache_key = analysis_cache_key(data_text, cycle, self.model, self.PROMPT_VERSION, period)
+            cached = self._cached_analysis(cache_key)
+            if cached is not None:
+                return cached
 
-            result = response.json()
-            return result['choices'][0]['message']['content']
+            analysis = self.backend.complete(
+                model=self.model,
+                messages=self._build_messages(data_text, period, cycle),
+                temperature=0.7,
+                max_tokens=1200
+            )
+            self._store_analysis(cache_key, analysis, cycle, period)
+            return analysis
 
         except Exception as e:
+            api_error = self._api_error_message(e)
+            if api_error:
+                return f"❌ Erro da API OpenAI: {api_error}"
             logger.error(f"Erro na análise de IA: {e}")
             return f"❌ Erro ao gerar análise: {str(e)}"
 
+    @staticmethod
+    def _api_error_message(error: Exception) -> Optional[str]:
+        """Mensagem de erro da API (openai.APIStatusError) ou None para outros erros"""
+        if getattr(error, "status_code", None) is None:
+            return None
+        body = getattr(error, "body", None)
+        if isinstance(body, dict) and body.get("message"):
+            return body["message"]
+        return getattr(error, "message", None) or str(error)
+
     def analyze_stream(self, meta_data: Dict, ga4_data: Dict,
                        creative_data: Any = None,
                        source_data: Any = None,
                        events_data: Any = None,
-                       period: str = "7d"):
+                       period: str = "7d",
+                       cycle: str = "Ciclo 2"):
         """
         Versão streaming da análise (para resposta em tempo real)
 
+        Usa os mesmos prompts por ciclo e o mesmo cache do analyze: análise já guardada
+        sai de uma vez; uma nova é gravada quando o stream termina sem erro.
+
         Yields:
             Chunks de texto conforme são gerados
         """
@@ -297,42 +337,24 @@ Por favor, forneça:
                 meta_data, ga4_data, creative_data, source_data, events_data
             )
 
-            period_text = {
-                "today": "hoje",
-                "yesterday": "ontem",
-                "7d": "últimos 7 dias",
-                "14d": "últimos 14 dias",
-                "30d": "últimos 30 dias",
-                "custom": "período personalizado"
-            }.get(period, period)
-
-            user_prompt = f"""Analise os dados de campanha do período: {period_text}
-
-{data_text}
-
-Por favor, forneça:
-1. 🎯 **Resumo da Performance** (2-3 frases)
-2. ✅ **O que está funcionando bem**
-3. ⚠️ **Pontos de atenção**
-4. 🏆 **Criativo Vencedor** - Identifique qual criativo está performando melhor e explique POR QUE ele funciona (qual gancho, emoção ou promessa está ressoando com o público)
-5. 🏠 **Otimização da Landing Page** - Baseado nos dados do GA4 (engajamento, tempo na página) e no criativo vencedor, sugira mudanças ESPECÍFICAS para a landing page que mantenham consistência com o anúncio vencedor e aumentem o engajamento
-6. 💡 **Próximos Passos** (máximo 3 ações prioritárias)
-"""
+            cache_key = analysis_cache_key(data_text, cycle, self.model, self.PROMPT_VERSION, period)
+            cached = self._cached_analysis(cache_key)
+            if cached is not None:
+                yield cached
+                return
 
-            stream = self.client.chat.completions.create(
+            chunks = []
+            for piece in self.backend.stream(
                 model=self.model,
-                messages=[
-                    {"role": "system", "content": self._build_system_prompt()},
-                    {"role": "user", "content": user_prompt}
-                ],
+                messages=self._build_messages(data_text, period, cycle),
                 temperature=0.7,
-                max_tokens=1200,
-                stream=True
-            )
+                max_tokens=1200
+            ):
+                chunks.append(piece)
+                yield piece
 
-            for chunk in stream:
-                if chunk.choices[0].delta.content:
-                    yield chunk.choices[0].delta.content
+            if chunks:
+                self._store_analysis(cache_key, "".join(chunks), cycle, period)
 
         except Exception as e:
             logger.error(f"Erro na análise de IA (stream): {e}")
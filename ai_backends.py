@@ -0,0 +1,186 @@
+"""
+Backends de LLM do AIAgent
+
+- OpenAIBackend: API de chat da OpenAI (ou qualquer endpoint compatível via ``base_url``,
+  como o servidor local de ai_stub_server.py)
+- ReplayBackend: respostas gravadas em JSON, para testes offline e de carga sem rede
+
+Todos expõem ``complete`` (texto inteiro) e ``stream`` (pedaços de texto conforme chegam).
+O SDK da OpenAI só é importado no primeiro uso. Todos os clientes do processo usam o
+mesmo httpx.Client (pool de conexões keep-alive) passado explicitamente ao SDK, o que
+também evita a configuração de proxy automática que quebrava no Streamlit Cloud.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+from typing import Any, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+HTTP_TIMEOUT_SECONDS = 60.0
+HTTP_CONNECT_TIMEOUT_SECONDS = 10.0
+DEFAULT_REPLAY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "ai_replay.json")
+# O SDK exige uma chave; endpoints locais compatíveis a ignoram
+LOCAL_ENDPOINT_API_KEY = "local"
+
+_http_client = None
+_openai_clients: Dict[str, Any] = {}
+_clients_lock = threading.Lock()
+
+
+def get_openai_client(api_key: str, base_url: Optional[str] = None):
+    """
+    Cliente OpenAI do processo para a chave/endpoint, sobre o transporte HTTP compartilhado
+
+    Args:
+        api_key: Chave da API OpenAI
+        base_url: Endpoint compatível (None usa a API da OpenAI)
+
+    Returns:
+        Instância de openai.OpenAI (reaproveitada entre agentes e sessões)
+    """
+    global _http_client
+    client_key = hashlib.sha256(f"{base_url or ''}\0{api_key}".encode("utf-8")).hexdigest()
+    with _clients_lock:
+        client = _openai_clients.get(client_key)
+        if client is None:
+            import httpx
+            from openai import OpenAI
+
+            if _http_client is None:
+                _http_client = httpx.Client(
+                    timeout=httpx.Timeout(HTTP_TIMEOUT_SECONDS, connect=HTTP_CONNECT_TIMEOUT_SECONDS),
+                    limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+                )
+            client = OpenAI(api_key=api_key, base_url=base_url, http_client=_http_client, max_retries=2)
+            _openai_clients[client_key] = client
+        return client
+
+
+class OpenAIBackend:
+    """Chat completions via SDK da OpenAI (cliente do processo, criado no primeiro uso)."""
+
+    def __init__(self, api_key: Optional[str], base_url: Optional[str] = None):
+        self.api_key = api_key or (LOCAL_ENDPOINT_API_KEY if base_url else None)
+        self.base_url = base_url
+        self._client = None
+
+    @property
+    def client(self):
+        if self._client is None:
+            self._client = get_openai_client(self.api_key, self.base_url)
+        return self._client
+
+    @client.setter
+    def client(self, value):
+        self._client = value
+
+    def complete(self, model: str, messages: List[Dict[str, str]], temperature: float, max_tokens: int) -> str:
+        response = self.client.chat.completions.create(
+            model=model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens
+        )
+        return response.choices[0].message.content
+
+    def stream(self, model: str, messages: List[Dict[str, str]], temperature: float, max_tokens: int) -> Iterator[str]:
+        stream = self.client.chat.completions.create(
+            model=model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            stream=True
+        )
+        for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+
+class ReplayMissError(LookupError):
+    """Pedido sem resposta gravada (e sem backend para gravar)."""
+
+
+def replay_request_key(model: str, messages: List[Dict[str, str]]) -> str:
+    """Hash do modelo + mensagens (o mesmo prompt encontra a mesma resposta gravada)."""
+    payload = json.dumps({"model": model, "messages": messages}, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ReplayBackend:
+    """
+    Respostas gravadas em um arquivo JSON, indexadas pelo hash do pedido
+
+    Com ``record_from``, pedidos ainda não gravados vão ao backend real e a resposta é
+    salva no arquivo (modo gravação). Sem ele, um pedido desconhecido devolve
+    ``default_response`` ou levanta ReplayMissError.
+    """
+
+    def __init__(self, path: str = DEFAULT_REPLAY_PATH, record_from: Any = None,
+                 default_response: Optional[str] = None):
+        self.path = path
+        self.record_from = record_from
+        self.default_response = default_response
+        self._lock = threading.Lock()
+        self._responses: Dict[str, Dict[str, str]] = {}
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self._responses = json.load(f).get("responses", {})
+
+    def __len__(self) -> int:
+        return len(self._responses)
+
+    def _save(self) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": 1, "responses": self._responses}, f, ensure_ascii=False, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+    def complete(self, model: str, messages: List[Dict[str, str]], temperature: float, max_tokens: int) -> str:
+        key = replay_request_key(model, messages)
+        with self._lock:
+            recorded = self._responses.get(key)
+        if recorded is not None:
+            return recorded["response"]
+
+        if self.record_from is not None:
+            response = self.record_from.complete(model, messages, temperature, max_tokens)
+            with self._lock:
+                self._responses[key] = {"model": model, "response": response}
+                self._save()
+            logger.info("Replay: resposta gravada (%s)", key[:12])
+            return response
+
+        if self.default_response is not None:
+            return self.default_response
+        raise ReplayMissError(f"Sem resposta gravada para o pedido {key[:12]} ({self.path})")
+
+    def stream(self, model: str, messages: List[Dict[str, str]], temperature: float, max_tokens: int) -> Iterator[str]:
+        # Mesma resposta do complete, entregue palavra a palavra como num stream real
+        yield from re.findall(r"\s*\S+\s*", self.complete(model, messages, temperature, max_tokens))
+
+
+def build_backend(kind: str = "openai", api_key: Optional[str] = None, base_url: Optional[str] = None,
+                  replay_path: str = DEFAULT_REPLAY_PATH):
+    """
+    Cria o backend configurado
+
+    Args:
+        kind: "openai" (HTTP) ou "replay" (respostas gravadas)
+        api_key: Chave da API OpenAI
+        base_url: Endpoint compatível com a OpenAI (ex.: servidor local de ai_stub_server.py)
+        replay_path: Arquivo de respostas gravadas do modo replay
+
+    Returns:
+        OpenAIBackend ou ReplayBackend
+    """
+    if kind == "replay":
+        return ReplayBackend(replay_path)
+    return OpenAIBackend(api_key, base_url=base_url)
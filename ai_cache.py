@@ -0,0 +1,139 @@
+"""Cache persistente (SQLite) das análises de IA, endereçado pelo conteúdo do prompt."""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from typing import Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_AI_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "ai_analyses.sqlite3")
+
+
+def analysis_cache_key(data_text: str, cycle: str, model: str, prompt_version: str, period: str = "") -> str:
+    """Hash dos dados formatados + ciclo + período + modelo + versão do prompt (mesmos números => mesma chave)."""
+    digest = hashlib.sha256()
+    for part in (prompt_version, model, cycle, period, data_text):
+        digest.update(str(part).encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class AIAnalysisCache:
+    """Guarda análises por chave de conteúdo, com expiração (TTL) e descarte dos menos usados (LRU).
+
+    Também lembra a última análise gravada por período × ciclo × modelo × versão do prompt
+    (``ai_latest``), para mostrá-la na hora mesmo quando os dados mudaram desde então.
+    """
+
+    DEFAULT_TTL_SECONDS = 24 * 3600
+    DEFAULT_MAX_ENTRIES = 500
+
+    def __init__(self, path: str = DEFAULT_AI_CACHE_PATH, ttl_seconds: int = DEFAULT_TTL_SECONDS,
+                 max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS ai_analyses (
+                    cache_key TEXT PRIMARY KEY,
+                    cycle TEXT NOT NULL,
+                    model TEXT NOT NULL,
+                    prompt_version TEXT NOT NULL,
+                    analysis TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_used_at REAL NOT NULL
+                )
+                """
+            )
+            latest_columns = {row[1] for row in conn.execute("PRAGMA table_info(ai_latest)")}
+            if latest_columns and "prompt_version" not in latest_columns:
+                # Esquema antigo (sem versão do prompt): os ponteiros são só um atalho, recria vazio
+                conn.execute("DROP TABLE ai_latest")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS ai_latest (
+                    period TEXT NOT NULL,
+                    cycle TEXT NOT NULL,
+                    model TEXT NOT NULL,
+                    prompt_version TEXT NOT NULL,
+                    cache_key TEXT NOT NULL,
+                    updated_at REAL NOT NULL,
+                    PRIMARY KEY (period, cycle, model, prompt_version)
+                )
+                """
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=10)
+
+    def get(self, cache_key: str) -> Optional[str]:
+        """Retorna a análise guardada (e marca o uso) ou None se ausente/expirada."""
+        now = time.time()
+        with self._lock, closing(self._connect()) as conn, conn:
+            row = conn.execute(
+                "SELECT analysis, created_at FROM ai_analyses WHERE cache_key = ?", (cache_key,)
+            ).fetchone()
+            if row is None:
+                return None
+            analysis, created_at = row
+            if now - created_at > self.ttl_seconds:
+                conn.execute("DELETE FROM ai_analyses WHERE cache_key = ?", (cache_key,))
+                return None
+            conn.execute("UPDATE ai_analyses SET last_used_at = ? WHERE cache_key = ?", (now, cache_key))
+            return analysis
+
+    def get_latest(self, period: str, cycle: str, model: str, prompt_version: str) -> Optional[Tuple[str, str]]:
+        """Retorna (chave, análise) da última análise gravada para o período/ciclo com esta versão do prompt, ou None."""
+        now = time.time()
+        with self._lock, closing(self._connect()) as conn:
+            return conn.execute(
+                "SELECT a.cache_key, a.analysis FROM ai_latest l "
+                "JOIN ai_analyses a ON a.cache_key = l.cache_key "
+                "WHERE l.period = ? AND l.cycle = ? AND l.model = ? AND l.prompt_version = ? AND a.created_at >= ?",
+                (period, cycle, model, prompt_version, now - self.ttl_seconds),
+            ).fetchone()
+
+    def put(self, cache_key: str, analysis: str, cycle: str, model: str, prompt_version: str,
+            period: Optional[str] = None) -> None:
+        """Grava a análise e descarta entradas expiradas e as menos usadas além de ``max_entries``.
+
+        Com ``period``, a análise também passa a ser a última do período/ciclo (ver ``get_latest``).
+        """
+        now = time.time()
+        with self._lock, closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO ai_analyses "
+                "(cache_key, cycle, model, prompt_version, analysis, created_at, last_used_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (cache_key, cycle, model, prompt_version, analysis, now, now),
+            )
+            if period is not None:
+                conn.execute(
+                    "INSERT OR REPLACE INTO ai_latest (period, cycle, model, prompt_version, cache_key, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (period, cycle, model, prompt_version, cache_key, now),
+                )
+            conn.execute("DELETE FROM ai_analyses WHERE created_at < ?", (now - self.ttl_seconds,))
+            conn.execute(
+                "DELETE FROM ai_analyses WHERE cache_key NOT IN "
+                "(SELECT cache_key FROM ai_analyses ORDER BY last_used_at DESC LIMIT ?)",
+                (self.max_entries,),
+            )
+        logger.debug("AI cache: análise gravada (%s, %s)", cycle, model)
+
+    def __len__(self) -> int:
+        with self._lock, closing(self._connect()) as conn:
+            return conn.execute("SELECT COUNT(*) FROM ai_analyses").fetchone()[0]
@@ -0,0 +1,115 @@
+"""Pré-geração das análises de IA em segundo plano (períodos pré-definidos × ciclos).
+
+Depois de uma atualização explícita dos dados ("Atualizar dados" / "Limpar cache"), cada
+combinação é analisada e gravada no cache de análises; o botão do painel passa a mostrar o
+resultado na hora. Combinações cujos números não mudaram saem do cache sem chamar a API.
+
+Custo: cada execução pode gerar até len(PRECOMPUTE_PERIODS) × len(PRECOMPUTE_CAMPAIGNS)
+análises pagas (12 com os valores abaixo). Os períodos "last_Xd" incluem o dia de hoje, então
+os números quase sempre mudam entre duas atualizações e o cache raramente poupa a chamada;
+por isso a pré-geração não roda sozinha a cada rerun.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# "Hoje" fica de fora: os números mudam a cada poucos minutos e a análise envelheceria logo
+PRECOMPUTE_PERIODS = ("yesterday", "last_7d", "last_14d", "last_30d")
+PRECOMPUTE_CAMPAIGNS = ("Ciclo 2", "Ciclo 1", "Todas")
+
+
+def cycle_for_campaign(campanha: str) -> str:
+    """Ciclo usado nos prompts para a campanha do filtro ("Todas" => "Todos os Ciclos")."""
+    return campanha if campanha in ("Ciclo 1", "Ciclo 2") else "Todos os Ciclos"
+
+
+def precompute_analyses(agent, load_inputs: Callable[[str, str], Dict[str, Any]],
+                        periods: Iterable[str] = PRECOMPUTE_PERIODS,
+                        campaigns: Iterable[str] = PRECOMPUTE_CAMPAIGNS) -> Dict[Tuple[str, str], str]:
+    """
+    Gera (ou confirma no cache) a análise de cada período × campanha
+
+    Args:
+        agent: AIAgent com cache configurado
+        load_inputs: (período, campanha) -> kwargs de dados do analyze
+            (meta_data, ga4_data, creative_data, source_data, events_data)
+        periods: Períodos pré-definidos a cobrir
+        campaigns: Campanhas do filtro a cobrir
+
+    Returns:
+        Dicionário {(período, ciclo): "cache" | "gerada" | "erro"}
+    """
+    results = {}
+    for period in periods:
+        for campanha in campaigns:
+            cycle = cycle_for_campaign(campanha)
+            try:
+                inputs = load_inputs(period, campanha)
+                latest = agent.latest_analysis(**inputs, period=period, cycle=cycle)
+                if latest is not None and not latest[1]:
+                    results[(period, cycle)] = "cache"
+                    continue
+                analysis = agent.analyze(**inputs, period=period, cycle=cycle)
+                results[(period, cycle)] = "erro" if analysis.startswith("❌") else "gerada"
+            except Exception as e:
+                logger.warning(f"Pré-geração de análise falhou ({period}, {cycle}): {e}")
+                results[(period, cycle)] = "erro"
+    logger.info("Pré-geração de análises de IA: %s", results)
+    return results
+
+
+class PrecomputeScheduler:
+    """Uma execução por vez no processo, espaçadas por ``min_interval_seconds`` (atualizações seguidas não repetem a pré-geração)."""
+
+    def __init__(self, min_interval_seconds: float = 300):
+        self.min_interval_seconds = min_interval_seconds
+        self._lock = threading.Lock()
+        self._running = False
+        self._last_started: Optional[float] = None
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    def trigger(self, submit: Callable[[Callable[[], Any]], Any], job: Callable[[], Any],
+                force: bool = False) -> bool:
+        """
+        Agenda ``job`` se não houver execução em andamento e o intervalo já passou
+
+        Args:
+            submit: Agenda uma função sem argumentos (ex.: pool de threads do app)
+            job: Trabalho de pré-geração
+            force: Ignora o intervalo (ex.: após "Atualizar dados")
+
+        Returns:
+            True se o trabalho foi agendado
+        """
+        now = time.monotonic()
+        with self._lock:
+            if self._running:
+                return False
+            if not force and self._last_started is not None and now - self._last_started < self.min_interval_seconds:
+                return False
+            self._running = True
+            self._last_started = now
+
+        def run():
+            try:
+                return job()
+            finally:
+                with self._lock:
+                    self._running = False
+
+        try:
+            submit(run)
+        except Exception:
+            with self._lock:
+                self._running = False
+            raise
+        return True
@@ -0,0 +1,149 @@
+"""Dados do dashboard para o prompt da IA: formato compacto e limitado por orçamento de tokens.
+
+As tabelas (criativos, origens, eventos) viram linhas "a|b|c" com cabeçalho único,
+ordenadas por relevância; se o texto passar do orçamento, as tabelas perdem linhas
+do fim (a maior primeiro) até caber. Assim o custo e a latência não crescem com a conta.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from html_tables import format_column
+
+CHARS_PER_TOKEN = 4
+DEFAULT_PROMPT_TOKEN_BUDGET = 1200
+# Teto de linhas por tabela antes do corte por orçamento (limita o trabalho com contas grandes)
+MAX_TABLE_ROWS = 25
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimativa local de tokens (~4 caracteres por token), sem tokenizer."""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def _is_frame(data: Any) -> bool:
+    return isinstance(data, pd.DataFrame) and not data.empty
+
+
+def rank_creatives(creative_data: pd.DataFrame) -> pd.DataFrame:
+    """Criativos por valor gasto e, no empate, por taxa de cliques (maiores primeiro)."""
+    sort_columns = [col for col in ("Valor gasto", "Taxa de cliques") if col in creative_data.columns]
+    if not sort_columns:
+        return creative_data
+    keys = creative_data[sort_columns].apply(pd.to_numeric, errors="coerce").fillna(0)
+    order = keys.sort_values(sort_columns, ascending=False, kind="mergesort").index
+    return creative_data.loc[order]
+
+
+def rank_sources(source_data: pd.DataFrame) -> pd.DataFrame:
+    if "Sessoes" not in source_data.columns:
+        return source_data
+    sessions = pd.to_numeric(source_data["Sessoes"], errors="coerce").fillna(0)
+    return source_data.loc[sessions.sort_values(ascending=False, kind="mergesort").index]
+
+
+def compact_rows(df: pd.DataFrame, columns: Sequence[Tuple[str, str, Optional[str]]]) -> Tuple[str, List[str]]:
+    """
+    Serializa o DataFrame em cabeçalho + linhas separadas por "|"
+
+    Args:
+        df: Dados (já ordenados e recortados)
+        columns: (coluna no DataFrame, rótulo no cabeçalho, formato str.format ou None)
+
+    Returns:
+        Tupla (cabeçalho, lista de linhas)
+    """
+    present = [(col, label, fmt) for col, label, fmt in columns if col in df.columns]
+    header = "|".join(label for _, label, _ in present)
+    if df.empty or not present:
+        return header, []
+    cells = [
+        format_column(df[col], fmt).str.replace("|", "/", regex=False).str.strip()
+        for col, _, fmt in present
+    ]
+    rows = cells[0]
+    for column in cells[1:]:
+        rows = rows + "|" + column
+    return header, rows.tolist()
+
+
+def _summary_block(meta_data: Dict, ga4_data: Dict) -> str:
+    return (
+        "## META ADS\n"
+        f"Investimento $ {meta_data.get('investimento', 0):,.2f}; Impressões {meta_data.get('impressoes', 0):,}; "
+        f"Alcance {meta_data.get('alcance', 0):,}; Frequência {meta_data.get('frequencia', 0):.2f}; "
+        f"Cliques no link {meta_data.get('cliques_link', 0):,}; Cliques na loja {meta_data.get('store_clicks_meta', 0):,}; "
+        f"CTR {meta_data.get('ctr_link', 0):.2f}%; CPC $ {meta_data.get('cpc_link', 0):.2f}; CPM $ {meta_data.get('cpm', 0):.2f}\n"
+        f"Variação vs período anterior: CTR {meta_data.get('delta_ctr', 0):+.2f}pp; "
+        f"CPC {meta_data.get('delta_cpc', 0):+.1f}%; Cliques {meta_data.get('delta_cliques', 0):+.1f}%\n"
+        "## GA4 (LANDING PAGE)\n"
+        f"Sessões {ga4_data.get('sessoes', 0):,}; Usuários {ga4_data.get('usuarios', 0):,}; "
+        f"Pageviews {ga4_data.get('pageviews', 0):,}; Engajamento {ga4_data.get('taxa_engajamento', 0):.1f}%; "
+        f"Tempo médio {ga4_data.get('tempo_medio', 'N/A')}\n"
+    )
+
+
+def _table_text(title: str, header: str, rows: List[str], total: int, limit: int) -> str:
+    if limit <= 0:
+        return ""
+    omitted = total - limit
+    note = f"(+{omitted} linhas omitidas)\n" if omitted > 0 else ""
+    return f"## {title}\n{header}\n" + "\n".join(rows[:limit]) + "\n" + note
+
+
+def build_analysis_data_text(meta_data: Dict, ga4_data: Dict,
+                             creative_data: Any = None,
+                             source_data: Any = None,
+                             events_data: Any = None,
+                             token_budget: int = DEFAULT_PROMPT_TOKEN_BUDGET) -> str:
+    """
+    Monta o bloco de dados do prompt dentro do orçamento de tokens
+
+    Args:
+        meta_data: Métricas agregadas do Meta Ads
+        ga4_data: Métricas agregadas do GA4
+        creative_data: DataFrame de criativos (ranqueado por gasto e CTR)
+        source_data: DataFrame de origem/mídia (ranqueado por sessões)
+        events_data: DataFrame de eventos do GA4 (na ordem recebida)
+        token_budget: Máximo estimado de tokens do bloco
+
+    Returns:
+        Texto compacto; o resumo do Meta/GA4 é sempre mantido, as tabelas são cortadas se preciso
+    """
+    tables = []
+    if _is_frame(creative_data):
+        tables.append(("CRIATIVOS (por gasto e CTR)", len(creative_data), *compact_rows(rank_creatives(creative_data).head(MAX_TABLE_ROWS), [
+            ("Criativo", "Criativo", None),
+            ("Valor gasto", "Gasto $", "{:.2f}"),
+            ("Cliques", "Cliques", "{:.0f}"),
+            ("Taxa de cliques", "CTR %", "{:.2f}"),
+            ("Custo por clique", "CPC $", "{:.2f}"),
+        ])))
+    if _is_frame(source_data):
+        tables.append(("ORIGENS DE TRÁFEGO (por sessões)", len(source_data), *compact_rows(rank_sources(source_data).head(MAX_TABLE_ROWS), [
+            ("Origem / Midia", "Origem/Mídia", None),
+            ("Sessoes", "Sessões", None),
+            ("Engajamento", "Engajamento", None),
+        ])))
+    if _is_frame(events_data):
+        tables.append(("EVENTOS GA4", len(events_data), *compact_rows(events_data.head(MAX_TABLE_ROWS), [
+            ("Nome do Evento", "Evento", None),
+            ("Contagem de Eventos", "Contagem", None),
+        ])))
+
+    summary = _summary_block(meta_data, ga4_data)
+    limits = [len(rows) for _, _, _, rows in tables]
+    while True:
+        text = summary + "".join(
+            _table_text(title, header, rows, total, limit)
+            for (title, total, header, rows), limit in zip(tables, limits)
+        )
+        if estimate_tokens(text) <= token_budget or not any(limits):
+            return text
+        # Corta do fim da tabela mais longa (no empate, a de menor prioridade: eventos > origens > criativos)
+        longest = max(range(len(limits)), key=lambda i: (limits[i], i))
+        limits[longest] -= 1
@@ -0,0 +1,196 @@
+"""
+Servidor local compatível com a API de chat da OpenAI (testes offline e de carga)
+
+Responde POST /v1/chat/completions (JSON, ou SSE com ``stream: true``) e GET /v1/models,
+com latência até o primeiro token e intervalo entre pedaços configuráveis. Guarda
+contadores de pedidos e de concorrência para medir o caminho da análise com vários usuários.
+
+Uso:
+    python ai_stub_server.py --port 8765 --latency 1.5 --token-delay 0.03
+    AI_BASE_URL=http://127.0.0.1:8765/v1 streamlit run app_lia_premium.py
+"""
+
+import argparse
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+
+DEFAULT_RESPONSE_TEXT = (
+    "## 📊 Resumo\n"
+    "Os números do período estão estáveis: o investimento segue o planejado e o CTR "
+    "se mantém dentro da faixa esperada para a fase atual.\n\n"
+    "## ✅ Destaques\n"
+    "- Os criativos com maior gasto também concentram os melhores CTRs.\n"
+    "- O tráfego pago continua sendo a principal origem das sessões.\n\n"
+    "## 🎯 Recomendações\n"
+    "1. Redistribuir verba para os dois criativos mais eficientes.\n"
+    "2. Acompanhar o custo por clique nos próximos dias.\n"
+)
+
+
+class StubLLMServer:
+    """Endpoint de chat local que imita a OpenAI (rodando em uma thread própria)."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency_seconds: float = 0.0,
+                 token_delay_seconds: float = 0.0, response_text: str = DEFAULT_RESPONSE_TEXT):
+        """
+        Args:
+            host: Interface de escuta
+            port: Porta (0 escolhe uma livre)
+            latency_seconds: Espera antes do primeiro token (ou da resposta inteira)
+            token_delay_seconds: Espera entre pedaços no modo streaming
+            response_text: Texto devolvido em todas as respostas
+        """
+        self.latency_seconds = latency_seconds
+        self.token_delay_seconds = token_delay_seconds
+        self.response_text = response_text
+        self.request_count = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        self._thread = None
+        self._httpd = ThreadingHTTPServer((host, port), _StubHandler)
+        self._httpd.daemon_threads = True
+        self._httpd.stub = self
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> "StubLLMServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="ai-stub-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def __enter__(self) -> "StubLLMServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def _request_started(self) -> None:
+        with self._lock:
+            self.request_count += 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+    def _request_finished(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+
+    def chunks(self) -> List[str]:
+        """Resposta em pedaços de uma palavra (com o espaço seguinte), como tokens de um stream."""
+        return re.findall(r"\s*\S+\s*", self.response_text)
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):  # noqa: A002 (assinatura da classe base)
+        pass
+
+    def _send_json(self, status: int, payload: Dict) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _write_event(self, payload) -> None:
+        data = payload if isinstance(payload, str) else json.dumps(payload, ensure_ascii=False)
+        event = f"data: {data}\n\n".encode("utf-8")
+        self.wfile.write(f"{len(event):X}\r\n".encode("ascii") + event + b"\r\n")
+        self.wfile.flush()
+
+    def do_GET(self):
+        if self.path.rstrip("/") == "/v1/models":
+            self._send_json(200, {"object": "list", "data": [{"id": "stub", "object": "model", "owned_by": "local"}]})
+        else:
+            self._send_json(404, {"error": {"message": f"Rota desconhecida: {self.path}", "type": "not_found"}})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            request = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            self._send_json(400, {"error": {"message": "JSON inválido", "type": "invalid_request_error"}})
+            return
+        if self.path.rstrip("/") != "/v1/chat/completions":
+            self._send_json(404, {"error": {"message": f"Rota desconhecida: {self.path}", "type": "not_found"}})
+            return
+
+        stub = self.server.stub
+        stub._request_started()
+        try:
+            time.sleep(stub.latency_seconds)
+            base = {"id": f"chatcmpl-stub-{stub.request_count}", "created": int(time.time()),
+                    "model": request.get("model", "stub")}
+            if request.get("stream"):
+                self._stream_completion(stub, base)
+            else:
+                prompt_chars = sum(len(str(m.get("content", ""))) for m in request.get("messages", []))
+                completion_tokens = len(stub.chunks())
+                self._send_json(200, {
+                    **base,
+                    "object": "chat.completion",
+                    "choices": [{"index": 0, "message": {"role": "assistant", "content": stub.response_text},
+                                 "finish_reason": "stop"}],
+                    "usage": {"prompt_tokens": prompt_chars // 4, "completion_tokens": completion_tokens,
+                              "total_tokens": prompt_chars // 4 + completion_tokens},
+                })
+        finally:
+            stub._request_finished()
+
+    def _stream_completion(self, stub: StubLLMServer, base: Dict) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        def chunk(delta, finish_reason=None):
+            return {**base, "object": "chat.completion.chunk",
+                    "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}]}
+
+        self._write_event(chunk({"role": "assistant", "content": ""}))
+        for i, piece in enumerate(stub.chunks()):
+            if i and stub.token_delay_seconds:
+                time.sleep(stub.token_delay_seconds)
+            self._write_event(chunk({"content": piece}))
+        self._write_event(chunk({}, finish_reason="stop"))
+        self._write_event("[DONE]")
+        self.wfile.write(b"0\r\n\r\n")
+        self.wfile.flush()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Servidor local compatível com a API de chat da OpenAI")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=1.0, help="segundos até o primeiro token")
+    parser.add_argument("--token-delay", type=float, default=0.03, help="segundos entre pedaços do stream")
+    args = parser.parse_args()
+
+    server = StubLLMServer(args.host, args.port, latency_seconds=args.latency, token_delay_seconds=args.token_delay)
+    print(f"Stub LLM em {server.base_url} (latência {args.latency}s, {args.token_delay}s/token)")
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
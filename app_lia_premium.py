@@ -1,28 +1,48 @@
+import time
+
+import startup_profile
+
+_app_imports_started = time.perf_counter()
+
 import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 import pandas as pd
-import plotly.graph_objects as go
 from datetime import datetime, timedelta
-import base64
+import hashlib
 import html
-import os
+import importlib.util
+import json
 import logging
-import textwrap
-from dashboard_kpis import build_meta_kpi_cards_payload
-from build_info import get_build_stamp
-from landing_events_service import build_landing_events_card_data
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dashboard_kpis import build_ga4_kpi_cards_payload, build_kpi_card, build_kpi_cards_html, build_meta_kpi_cards_payload
+from charts import (
+    build_trend_frames,
+    clicks_ctr_dual_axis_figure,
+    clicks_per_day_figure,
+    cpc_per_day_figure,
+    ctr_per_day_figure,
+    daily_clicks_figure,
+    funnel_figure,
+    weekly_clicks_figure,
+)
+from html_tables import DEFAULT_PAGE_SIZE, paginate_frame, render_html_table
+from assets import logo_src, static_serving_enabled, theme_style_html
+from build_info import get_build_stamp_nowait
+from theme import LIA
 
-# Importar integrações
+# Importar integrações (SDKs do GA4/Meta só carregam quando o DataProvider constrói os clientes)
 from config import Config
-from ga_integration import GA4Integration
-from meta_integration import MetaAdsIntegration
+from data_provider import DataProvider
+from ai_agent import AIAgent
+from ai_backends import build_backend
+from ai_cache import AIAnalysisCache
+from ai_precompute import PrecomputeScheduler, cycle_for_campaign, precompute_analyses
+
+# O SDK da OpenAI só é importado quando o agente cria o cliente; aqui só checamos se a dependência existe
+AI_AGENT_AVAILABLE = importlib.util.find_spec("openai") is not None
 
-# Importar AIAgent para análise de IA (opcional - não quebra se não disponível)
-try:
-    from ai_agent import AIAgent
-except Exception as e:
-    print(f"AIAgent não disponível: {e}")
-    AIAgent = None
-from meta_funnel import ACTIVATE_APP_ACTION_TYPES, INSTALL_ACTION_TYPES, STORE_CLICK_ACTION_TYPES, collect_action_type_diagnostics, collect_all_action_types, sum_actions_by_types
+startup_profile.record("imports do app", time.perf_counter() - _app_imports_started)
 
 # =============================================================================
 # CONFIGURACAO DE LOGGING
@@ -52,729 +72,94 @@ st.set_page_config(
     initial_sidebar_state="collapsed",
 )
 
-# =============================================================================
-# PALETA OFICIAL LIA - MINT / VIOLET
-# =============================================================================
-LIA = {
-    # Cores principais LIA
-    "primary": "#5CC9B6",           # Mint / Aqua Green
-    "primary_dark": "#5CC9B6",      # Mantém consistência com a marca
-    "primary_light": "#F7F9FC",     # Ice Gray para fundos suaves
-    "secondary": "#7A5CFF",         # Soft Violet
-    "accent": "#7A5CFF",            # Reforço secundário
-
-    # Base de fundo
-    "gradient_start": "#F7F9FC",
-    "gradient_mid": "#F7F9FC",
-    "gradient_end": "#FFFFFF",
-
-    # Backgrounds
-    "bg_dark": "#FFFFFF",           # Usado para textos sobre gradientes
-    "bg_card": "#FFFFFF",           # Superfície de cartões
-    "bg_card_solid": "#FFFFFF",
-    "bg_glass": "rgba(92, 201, 182, 0.06)",
-    "bg_hover": "rgba(92, 201, 182, 0.1)",
-
-    # Texto
-    "text_light": "#1A2B49",        # Navy para títulos
-    "text_primary": "#1A2B49",
-    "text_secondary": "rgba(26, 43, 73, 0.7)",
-    "text_muted": "rgba(26, 43, 73, 0.55)",
-    "text_dark": "#1A2B49",
-
-    # Status colors (alinhados à marca)
-    "success": "#5CC9B6",
-    "success_light": "rgba(92, 201, 182, 0.2)",
-    "error": "#7A5CFF",
-    "error_light": "rgba(122, 92, 255, 0.2)",
-    "warning": "#7A5CFF",
-    "warning_light": "rgba(122, 92, 255, 0.18)",
-
-    # Bordas e sombras
-    "border": "rgba(26, 43, 73, 0.12)",
-    "border_light": "rgba(26, 43, 73, 0.08)",
-    "shadow": "rgba(26, 43, 73, 0.12)",
-    "glow": "rgba(92, 201, 182, 0.18)",
-}
-
 # =============================================================================
 # CARREGAR LOGO DA CORUJA
 # =============================================================================
-def get_logo_base64():
-    try:
-        logo_path = os.path.join(os.path.dirname(__file__), "logo_lia.png")
-        if os.path.exists(logo_path):
-            with open(logo_path, "rb") as f:
-                return base64.b64encode(f.read()).decode()
-    except Exception as e:
-        logger.error(f"Erro ao carregar logo: {e}")
-    return None
-
-logo_base64 = get_logo_base64()
+# Servido uma vez por referência (static/) ou como um único data URI em cache
+logo_url = logo_src(static_serving_enabled())
 
 # =============================================================================
-# DATA PROVIDER COM TRATAMENTO DE ERROS
+# DATA PROVIDER (UM POR PROCESSO)
 # =============================================================================
-class DataProvider:
-    def __init__(self, mode="auto"):
-        self.mode = mode
-        self.error_state = False
-        self.error_message = ""
-        self.meta_client = None
-        self.ga4_client = None
-        self.ga4_app_client = None
-        self._init_clients()
-
-    def _init_clients(self):
-        """Inicializa clientes das APIs se credenciais estiverem disponíveis"""
-        try:
-            # Inicializar Meta Ads
-            if Config.validate_meta_credentials():
-                self.meta_client = MetaAdsIntegration(
-                    access_token=Config.get_meta_access_token(),
-                    ad_account_id=Config.get_meta_ad_account_id(),
-                    app_id=Config.get_meta_app_id(),
-                )
-                logger.info("Meta Ads client initialized")
-        except Exception as e:
-            logger.error(f"Erro ao inicializar Meta client: {e}")
-            self.meta_client = None
+@st.cache_resource(show_spinner=False)
+def get_data_provider() -> DataProvider:
+    """Provider compartilhado entre sessões: clientes, canais gRPC e caches de capacidade vivem no processo.
 
-        try:
-            # Inicializar GA4
-            if Config.validate_ga4_credentials():
-                creds = Config.get_ga4_credentials()
-                self.ga4_client = GA4Integration(
-                    credentials_json=creds,
-                    property_id=Config.get_ga4_property_id()
-                )
-                ga4_app_property_id = Config.get_ga4_app_property_id()
-                if ga4_app_property_id:
-                    self.ga4_app_client = GA4Integration(
-                        credentials_json=creds,
-                        property_id=ga4_app_property_id,
-                    )
-                logger.info("GA4 client initialized")
-        except Exception as e:
-            logger.error(f"Erro ao inicializar GA4 client: {e}")
-            self.ga4_client = None
+    Estado de erro continua por sessão (st.session_state da sessão que chamou).
+    """
+    return DataProvider(mode="auto", session_state=lambda: st.session_state)
 
-    def _safe_execute(self, func, default=None):
-        """Executa funcao com tratamento de erro"""
-        try:
-            return func()
-        except Exception as e:
-            logger.error(f"DataProvider error: {e}")
-            self.error_state = True
-            self.error_message = str(e)
-            return default
-
-    def _period_to_api_format(self, period):
-        """Converte período do dashboard para formato da API"""
-        mapping = {
-            "today": "today",
-            "yesterday": "yesterday",
-            "last_7d": "last_7d",
-            "last_14d": "last_14d",
-            "last_30d": "last_30d",
-            "custom": "custom"
-        }
-        return mapping.get(period, "last_7d")
 
-    def _enrich_with_sdk_events(self, result: dict, api_period: str, custom_start, custom_end):
-        """Busca eventos SDK e enriquece o resultado com dados do SDK."""
-        if not self.meta_client:
-            return
+data_provider = get_data_provider()
 
-        if not self.meta_client.app_id:
-            result["_all_sdk_events"] = {}
-            result["_sdk_source"] = "no_app_id"
-            result["_sdk_event_types"] = []
-            result["_sdk_errors"] = ["META_APP_ID não configurado — eventos SDK não podem ser consultados"]
-            result["_sdk_debug"] = {}
-            return
 
-        try:
-            sdk_data = self.meta_client.get_all_sdk_events(
-                date_range=api_period,
-                custom_start=custom_start,
-                custom_end=custom_end,
-            )
-            result["_all_sdk_events"] = sdk_data["events"]
-            result["_sdk_source"] = sdk_data["source"]
-            result["_sdk_event_types"] = list(sdk_data["events"].keys())
-            result["_sdk_errors"] = sdk_data["errors"]
-            result["_sdk_debug"] = sdk_data.get("_debug", {})
-
-            # Se não encontrou install events nas actions do Ads Insights,
-            # usar dados do SDK endpoint (que inclui eventos não-atribuídos)
-            if result.get("instalacoes_sdk", 0) == 0:
-                sdk_installs = sdk_data["install_count"]
-                if sdk_installs == 0 and sdk_data["activate_count"] > 0:
-                    logger.warning(
-                        "Using SDK activate_app (%d) as proxy for installs",
-                        sdk_data["activate_count"],
-                    )
-                    sdk_installs = sdk_data["activate_count"]
-
-                if sdk_installs > 0:
-                    result["instalacoes_sdk"] = sdk_installs
-
-            endpoint_unsupported = bool(result.get("_sdk_debug", {}).get("endpoint_unsupported"))
-            if result.get("instalacoes_sdk", 0) == 0 and endpoint_unsupported:
-                if self.ga4_app_client:
-                    ga4_installs = self.ga4_app_client.get_event_count(
-                        event_name="first_open",
-                        date_range=api_period,
-                        custom_start=custom_start,
-                        custom_end=custom_end,
-                    )
-                    if ga4_installs > 0:
-                        result["instalacoes_sdk"] = ga4_installs
-                        result["_sdk_source"] = "ga4_first_open"
-                        result["_sdk_debug"]["ga4_fallback"] = {
-                            "event": "first_open",
-                            "value": ga4_installs,
-                            "used": True,
-                        }
-                else:
-                    msg = "Instalações indisponíveis: Meta endpoint unsupported e GA4_APP_PROPERTY_ID ausente."
-                    result["_sdk_errors"].append(msg)
-                    result["_sdk_debug"]["ga4_fallback"] = {"used": False, "reason": "missing_ga4_app_property_id"}
-
-        except Exception as e:
-            logger.error("Failed to fetch SDK events: %s", e)
-            result["_sdk_source"] = result.get("_sdk_source", "error")
-            result["_sdk_errors"] = [str(e)]
-            result["_sdk_debug"] = {}
-
-    def get_meta_metrics(self, period="7d", level="campaign", filters=None, campaign_filter=None, custom_start=None, custom_end=None):
-        # Tentar dados reais primeiro
-        if self.meta_client and self.mode != "mock":
-            try:
-                api_period = self._period_to_api_format(period)
-
-                # Primeiro busca COM filtro de campanha
-                insights = self.meta_client.get_ad_insights(date_range=api_period, campaign_name_filter=campaign_filter, custom_start=custom_start, custom_end=custom_end)
-
-                if not insights.empty:
-                    result = self._process_meta_insights(insights)
-
-                    # Buscar métricas agregadas para Alcance e Frequência corretos
-                    aggregated = self.meta_client.get_aggregated_insights(
-                        date_range=api_period,
-                        campaign_name_filter=campaign_filter,
-                        custom_start=custom_start,
-                        custom_end=custom_end
-                    )
-                    if aggregated:
-                        result["alcance"] = aggregated.get("reach", result["alcance"])
-                        result["frequencia"] = aggregated.get("frequency", result["frequencia"])
-                        result["_debug"] = {"aggregated_insights": aggregated.get("_debug", {})}
-
-                    # Sempre buscar eventos SDK (são totais, não por campanha)
-                    self._enrich_with_sdk_events(result, api_period, custom_start, custom_end)
-
-                    result["_data_source"] = "real"
-                    result["_filter_applied"] = campaign_filter
-                    return result
-
-                # Se não encontrou com filtro, tenta SEM filtro para ver se há dados
-                if campaign_filter:
-                    logger.info(f"Meta: No data found for filter '{campaign_filter}', trying without filter")
-                    insights_no_filter = self.meta_client.get_ad_insights(date_range=api_period, campaign_name_filter=None, custom_start=custom_start, custom_end=custom_end)
-
-                    if not insights_no_filter.empty:
-                        # Há dados mas não com o filtro especificado
-                        result = self._process_meta_insights(insights_no_filter)
-
-                        # Buscar métricas agregadas para Alcance e Frequência corretos
-                        aggregated = self.meta_client.get_aggregated_insights(
-                            date_range=api_period,
-                            campaign_name_filter=None,
-                            custom_start=custom_start,
-                            custom_end=custom_end
-                        )
-                        if aggregated:
-                            result["alcance"] = aggregated.get("reach", result["alcance"])
-                            result["frequencia"] = aggregated.get("frequency", result["frequencia"])
-                            result["_debug"] = {"aggregated_insights": aggregated.get("_debug", {})}
-
-                        # Sempre buscar eventos SDK (são totais, não por campanha)
-                        self._enrich_with_sdk_events(result, api_period, custom_start, custom_end)
-
-                        result["_data_source"] = "real_no_filter"
-                        result["_filter_applied"] = None
-                        result["_requested_filter"] = campaign_filter
-                        # Log das campanhas disponíveis para debug
-                        if 'campaign_name' in insights_no_filter.columns:
-                            available = insights_no_filter['campaign_name'].unique().tolist()
-                            logger.info(f"Meta: Available campaigns: {available}")
-                            result["_available_campaigns"] = available
-                        return result
-
-            except Exception as e:
-                logger.error(f"Erro ao obter dados reais do Meta: {e}")
-
-        # Fallback para mock
-        result = self._safe_execute(
-            lambda: self._get_mock_meta_metrics(period, level),
-            default=self._empty_meta_metrics()
-        )
-        result["_data_source"] = "mock"
-        return result
-
-    def _process_meta_insights(self, df):
-        """Processa insights do Meta para formato do dashboard"""
-        import math
-
-        def safe_sum(col):
-            """Soma segura que trata NaN"""
-            if col not in df.columns:
-                return 0
-            val = df[col].sum()
-            return 0 if (pd.isna(val) or math.isnan(val)) else val
-
-        def safe_int(val):
-            """Conversão segura para int"""
-            if pd.isna(val) or (isinstance(val, float) and math.isnan(val)):
-                return 0
-            return int(val)
-
-        def safe_div(numerator, denominator):
-            """Divisão segura que retorna 0 se divisor for 0"""
-            if denominator == 0:
-                return 0
-            return numerator / denominator
-
-
-        try:
-            # Agregar métricas básicas
-            total_spend = safe_sum('spend')
-            total_impressions = safe_int(safe_sum('impressions'))
-            total_clicks = safe_int(safe_sum('clicks'))
-
-            # Calcular métricas derivadas corretamente a partir dos totais
-            # CTR = (clicks / impressions) * 100
-            ctr = safe_div(total_clicks, total_impressions) * 100
-            # CPC = spend / clicks
-            cpc = safe_div(total_spend, total_clicks)
-            # CPM = (spend / impressions) * 1000
-            cpm = safe_div(total_spend, total_impressions) * 1000
-
-            # Nota: Alcance e Frequência serão sobrescritos pelo get_aggregated_insights
-            # pois não podem ser somados (são métricas de usuários únicos)
-            actions_series = df["actions"] if "actions" in df.columns else pd.Series(dtype=object)
-            found_action_types = collect_all_action_types(actions_series)
-            diagnostics = collect_action_type_diagnostics(actions_series)
-            store_clicks, has_store_clicks = sum_actions_by_types(actions_series, STORE_CLICK_ACTION_TYPES)
-            if not has_store_clicks:
-                # Fallback: try outbound_click specifically
-                store_clicks, has_outbound = sum_actions_by_types(actions_series, {"outbound_click"})
-                if not has_outbound:
-                    # Fallback: try link_click
-                    store_clicks, has_link_clicks = sum_actions_by_types(actions_series, {"link_click"})
-                    if has_link_clicks:
-                        logger.warning(
-                            "Meta funnel: store click actions not found, "
-                            "using 'link_click' as fallback"
-                        )
-                    else:
-                        logger.warning(
-                            "Meta funnel: no store click actions found. "
-                            "Using total clicks as fallback."
-                        )
-                        store_clicks = total_clicks
-
-            # SDK install events: check all known install action types
-            instalacoes_sdk, tem_eventos_instalacao = sum_actions_by_types(actions_series, INSTALL_ACTION_TYPES)
-            if not tem_eventos_instalacao:
-                # Try activate_app as secondary signal for installs
-                activate_count, has_activate = sum_actions_by_types(actions_series, ACTIVATE_APP_ACTION_TYPES)
-                if has_activate:
-                    logger.warning(
-                        "Meta funnel: no install events found, but found activate_app events (%d). "
-                        "Using activate_app as proxy for installs.",
-                        activate_count,
-                    )
-                    instalacoes_sdk = activate_count
-                    tem_eventos_instalacao = True
-                else:
-                    logger.warning(
-                        "Meta funnel: no SDK install events found. "
-                        "Action types in response: %s",
-                        list(diagnostics.get("all_action_types", {}).keys()),
-                    )
-
-            return {
-                "investimento": total_spend,
-                "impressoes": total_impressions,
-                "alcance": safe_int(safe_sum('reach')),  # Pode ser sobrescrito por aggregated
-                "frequencia": 0,  # Será sobrescrito por aggregated; reach não é aditivo
-                "cliques_link": total_clicks,
-                "store_clicks_meta": store_clicks,
-                "instalacoes_sdk": instalacoes_sdk,
-                "instalacoes_total": 0,
-                "ctr_link": round(ctr, 2),
-                "cpc_link": round(cpc, 2),
-                "cpm": round(cpm, 2),
-                "delta_investimento": 0,
-                "delta_impressoes": 0,
-                "delta_alcance": 0,
-                "delta_frequencia": 0,
-                "delta_cliques": 0,
-                "delta_ctr": 0,
-                "delta_cpc": 0,
-                "delta_cpm": 0,
-                "_action_types_found": found_action_types,
-                "_sdk_diagnostics": diagnostics,
-            }
-        except Exception as e:
-            logger.error(f"Erro ao processar insights Meta: {e}")
-            return self._empty_meta_metrics()
-
-    def get_ga4_metrics(self, period="7d", filters=None, custom_start=None, custom_end=None, campaign_filter=None):
-        # Tentar dados reais primeiro
-        if self.ga4_client and self.mode != "mock":
-            try:
-                api_period = self._period_to_api_format(period)
-                metrics = self.ga4_client.get_aggregated_metrics(date_range=api_period, custom_start=custom_start, custom_end=custom_end, campaign_filter=campaign_filter)
-
-                if metrics:
-                    sessions = metrics.get('sessoes', 0)
-                    users = metrics.get('usuarios', 0)
-                    pageviews = metrics.get('pageviews', 0)
-
-                    # Log para diagnóstico
-                    logger.info(f"GA4 metrics retrieved - sessions: {sessions}, users: {users}, pageviews: {pageviews}, filter: {campaign_filter}")
-
-                    # Verificar se há dados significativos (não apenas sessions)
-                    has_meaningful_data = sessions > 0 or users > 0 or pageviews > 0
-
-                    if has_meaningful_data:
-                        # Adicionar deltas (por enquanto zerados)
-                        metrics['delta_sessoes'] = 0
-                        metrics['delta_usuarios'] = 0
-                        metrics['delta_pageviews'] = 0
-                        metrics['delta_engajamento'] = 0
-                        metrics['_campaign_filter'] = campaign_filter
-
-                        # Indicar se dados são completos ou parciais
-                        if sessions > 0:
-                            metrics['_data_source'] = 'real'
-                        else:
-                            # Dados parciais: há pageviews/users mas não sessions
-                            metrics['_data_source'] = 'partial'
-                            logger.warning(f"GA4 partial data: sessions=0 but users={users}, pageviews={pageviews}")
-                        return metrics
-
-                # GA4 conectado mas sem dados para este filtro
-                return {**self._empty_metrics(), "_data_source": "no_data", "_campaign_filter": campaign_filter}
-
-            except Exception as e:
-                logger.error(f"Erro ao obter dados reais do GA4: {e}")
-
-        # Fallback para mock
-        metrics = self._get_mock_ga4_metrics()
-        metrics["_data_source"] = "mock"
-        return metrics
-
-    def get_source_medium(self, period="7d", custom_start=None, custom_end=None, campaign_filter=None):
-        if self.ga4_client and self.mode != "mock":
-            try:
-                api_period = self._period_to_api_format(period)
-                df = self.ga4_client.get_sessions_data(date_range=api_period, custom_start=custom_start, custom_end=custom_end)
-                if not df.empty:
-                    # Agrupar por source_medium
-                    summary = df.groupby('source_medium').agg({
-                        'sessions': 'sum',
-                        'users': 'sum',
-                        'engagement_rate': 'mean',
-                        'pageviews': 'sum'
-                    }).reset_index()
-                    summary = summary.sort_values('sessions', ascending=False)
-                    summary.columns = ["Origem / Midia", "Sessoes", "Usuarios", "Engajamento", "Pageviews"]
-                    # Formatar engajamento
-                    summary["Engajamento"] = summary["Engajamento"].apply(lambda x: f"{x*100:.1f}%")
-                    return summary
-            except Exception as e:
-                logger.error(f"Erro ao obter source/medium real: {e}")
-
-        return self._get_mock_source_medium()
-
-    def get_events_data(self, period="7d", custom_start=None, custom_end=None, campaign_filter=None):
-        if self.ga4_client and self.mode != "mock":
-            try:
-                api_period = self._period_to_api_format(period)
-                df = self.ga4_client.get_events_data(date_range=api_period, custom_start=custom_start, custom_end=custom_end, campaign_filter=campaign_filter)
-                if not df.empty:
-                    # Renomear colunas para o dashboard
-                    df = df.rename(columns={
-                        'event_name': 'Nome do Evento',
-                        'event_count': 'Contagem de Eventos',
-                        'total_users': 'Total de Usuarios',
-                        'events_per_user': 'Eventos por Usuario'
-                    })
-                    # Formatar colunas com percentuais
-                    df['Contagem de Eventos'] = df.apply(lambda x: f"{x['Contagem de Eventos']:,} ({x['event_count_pct']:.2f}%)".replace(',', '.'), axis=1)
-                    df['Total de Usuarios'] = df.apply(lambda x: f"{x['Total de Usuarios']:,} ({x['users_pct']:.2f}%)".replace(',', '.'), axis=1)
-                    df['Eventos por Usuario'] = df['Eventos por Usuario'].apply(lambda x: f"{x:.2f}".replace('.', ','))
-
-                    return df[['Nome do Evento', 'Contagem de Eventos', 'Total de Usuarios', 'Eventos por Usuario']]
-            except Exception as e:
-                logger.error(f"Erro ao obter eventos reais: {e}")
-
-        return self._get_mock_events_data()
-
-    def get_landing_events_card_data(self, period="7d", custom_start=None, custom_end=None):
-        """Retorna dados do card de Eventos da Landing (GA4) com fallback seguro."""
-        events_mode = Config.get_events_mode()
-        api_period = self._period_to_api_format(period)
-        landing_host_filter = Config.get_landing_host_filter()
-        return build_landing_events_card_data(
-            self.ga4_client,
-            events_mode=events_mode,
-            period_api=api_period,
-            custom_start=custom_start,
-            custom_end=custom_end,
-            landing_host_filter=landing_host_filter,
-        )
-
-    def get_creative_data(self, period="7d", custom_start=None, custom_end=None, campaign_filter=None):
-        if self.meta_client and self.mode != "mock":
-            try:
-                api_period = self._period_to_api_format(period)
-
-                # Primeiro tenta com filtro de campanha
-                df = self.meta_client.get_creative_insights(date_range=api_period, campaign_name_filter=campaign_filter, custom_start=custom_start, custom_end=custom_end)
-
-                # Se não encontrou com filtro, tenta sem filtro
-                if df.empty and campaign_filter:
-                    logger.info(f"Creative: No data with filter '{campaign_filter}', trying without filter")
-                    df = self.meta_client.get_creative_insights(date_range=api_period, campaign_name_filter=None, custom_start=custom_start, custom_end=custom_end)
-
-                if not df.empty:
-                    # Renomear e selecionar colunas
-                    df = df.rename(columns={
-                        'ad_name': 'Criativo',
-                        'spend': 'Valor gasto',
-                        'impressions': 'Exibições',
-                        'clicks': 'Cliques',
-                        'ctr': 'Taxa de cliques',
-                        'cpc': 'Custo por clique',
-                        'cpm': 'Custo por mil'
-                    })
-                    # Adicionar coluna de formato (Meta API não retorna diretamente de forma simples, vamos inferir ou deixar fixo)
-                    df['Formato'] = df['Criativo'].apply(lambda x: "Video" if "video" in str(x).lower() else "Imagem")
-                    return df[['Criativo', 'Formato', 'Valor gasto', 'Exibições', 'Cliques', 'Taxa de cliques', 'Custo por clique', 'Custo por mil']]
-            except Exception as e:
-                logger.error(f"Erro ao obter criativos reais: {e}")
-
-        # Retorna DataFrame vazio em vez de mock data para não mostrar dados falsos
-        return pd.DataFrame()
-
-    def get_daily_trends(self, period="7d", custom_start=None, custom_end=None, campaign_filter=None):
-        """Retorna dados de tendência diária (cliques, CTR, CPC)"""
-        if self.meta_client and self.mode != "mock":
-            try:
-                api_period = self._period_to_api_format(period)
-
-                # Primeiro tenta com filtro de campanha
-                df = self.meta_client.get_ad_insights(
-                    date_range=api_period,
-                    campaign_name_filter=campaign_filter,
-                    custom_start=custom_start,
-                    custom_end=custom_end
-                )
-
-                # Se não encontrou com filtro, tenta sem filtro
-                if df.empty and campaign_filter:
-                    logger.info(f"Trends: No data with filter '{campaign_filter}', trying without filter")
-                    df = self.meta_client.get_ad_insights(
-                        date_range=api_period,
-                        campaign_name_filter=None,
-                        custom_start=custom_start,
-                        custom_end=custom_end
-                    )
-
-                if not df.empty and 'date_start' in df.columns:
-                    # Agrupar por data para obter totais diários
-                    df['Data'] = pd.to_datetime(df['date_start']).dt.strftime('%d/%m')
-                    df['_sort_key'] = pd.to_datetime(df['date_start'])
-
-                    # Agregar corretamente: CTR e CPC são métricas derivadas
-                    # CTR = clicks / impressions * 100
-                    # CPC = spend / clicks
-                    daily = df.groupby(['Data', '_sort_key'], sort=False).agg({
-                        'clicks': 'sum',
-                        'impressions': 'sum',
-                        'spend': 'sum'
-                    }).reset_index()
-
-                    # Calcular métricas derivadas corretamente
-                    daily['Cliques'] = daily['clicks']
-                    daily['CTR'] = (daily['clicks'] / daily['impressions'] * 100).fillna(0)
-                    daily['CPC'] = (daily['spend'] / daily['clicks']).fillna(0)
-
-                    # Ordenar por data cronologicamente
-                    daily = daily.sort_values('_sort_key').drop(columns=['_sort_key', 'clicks', 'impressions', 'spend'])
-                    return daily
-            except Exception as e:
-                logger.error(f"Erro ao obter tendências reais: {e}")
-
-        # Retorna DataFrame vazio se não há dados reais
-        return pd.DataFrame()
-
-    def _empty_meta_metrics(self):
-        return {
-            "investimento": 0, "impressoes": 0, "alcance": 0, "frequencia": 0,
-            "cliques_link": 0, "store_clicks_meta": 0, "instalacoes_sdk": 0, "instalacoes_total": 0,
-            "ctr_link": 0, "cpc_link": 0, "cpm": 0,
-            "delta_investimento": 0, "delta_impressoes": 0, "delta_alcance": 0,
-            "delta_frequencia": 0, "delta_cliques": 0, "delta_ctr": 0,
-            "delta_cpc": 0, "delta_cpm": 0,
-            "_data_source": "empty", "_filter_applied": None,
-            "_requested_filter": None, "_available_campaigns": [],
-            "_action_types_found": {},
-            "_sdk_source": "none", "_sdk_errors": [], "_sdk_debug": {},
-            "_debug": {},
-        }
-
-    def _empty_metrics(self):
-        return {
-            'sessoes': 0, 'usuarios': 0, 'pageviews': 0,
-            'taxa_engajamento': 0, 'tempo_medio': "0m 0s",
-            'delta_sessoes': 0, 'delta_usuarios': 0, 'delta_pageviews': 0, 'delta_engajamento': 0
-        }
-
-    def _get_mock_meta_metrics(self, period, level):
-        return {
-            "investimento": 1250.50, "impressoes": 85400, "alcance": 42100, "frequencia": 2.03,
-            "cliques_link": 2450, "store_clicks_meta": 1820, "instalacoes_sdk": 320, "instalacoes_total": 0,
-            "ctr_link": 2.87, "cpc_link": 0.51, "cpm": 14.64,
-            "delta_investimento": 12.5, "delta_impressoes": -5.2, "delta_alcance": 3.1,
-            "delta_frequencia": 0.5, "delta_cliques": 15.8, "delta_ctr": 0.45,
-            "delta_cpc": -8.2, "delta_cpm": 2.3,
-            "_sdk_source": "none", "_sdk_errors": [], "_sdk_debug": {},
-            "_debug": {},
-        }
+@st.cache_resource(show_spinner=False)
+def get_ai_analysis_cache():
+    """Cache de análises de IA do processo (SQLite: sobrevive a reloads e restarts); None se desativado."""
+    path = Config.get_ai_cache_path()
+    if not path:
+        return None
+    try:
+        return AIAnalysisCache(path)
+    except Exception as e:
+        logger.warning(f"Cache de análises de IA desativado ({path}): {e}")
+        return None
 
-    def _get_mock_ga4_metrics(self):
-        return {
-            "sessoes": 3240, "usuarios": 2850, "pageviews": 6120,
-            "taxa_engajamento": 68.5, "tempo_medio": "1m 42s",
-            "delta_sessoes": 15.2, "delta_usuarios": 12.4,
-            "delta_pageviews": 18.9, "delta_engajamento": 3.2,
-        }
 
-    def _get_mock_creative_data(self):
-        return pd.DataFrame({
-            "Criativo": [
-                "Video_LIA_Problema_WhatsApp_v2", "Static_Beneficios_App_v1",
-                "Carousel_Features_3slides", "Video_Depoimento_Usuario",
-                "Static_Promo_Download_v3"
-            ],
-            "Formato": ["Video 15s", "Imagem", "Carrossel", "Video 30s", "Imagem"],
-            "Valor gasto": [285.00, 195.00, 165.00, 125.00, 80.00],
-            "Exibições": [42000, 31000, 26000, 18000, 8000],
-            "Cliques": [1280, 890, 620, 320, 90],
-            "Taxa de cliques": [3.05, 2.87, 2.38, 1.78, 1.12],
-            "Custo por clique": [0.22, 0.22, 0.27, 0.39, 0.89],
-            "Custo por mil": [6.79, 6.29, 6.35, 6.94, 10.00],
-        })
-
-    def _get_mock_daily_trends(self, period, custom_start=None, custom_end=None):
-        import random
-        random.seed(42)
-
-        # Calcular dias baseado no período ou datas personalizadas
-        if period == "custom" and custom_start and custom_end:
-            start_date = datetime.strptime(custom_start, "%Y-%m-%d")
-            end_date = datetime.strptime(custom_end, "%Y-%m-%d")
-            days = (end_date - start_date).days + 1
-            dates = [(start_date + timedelta(days=i)).strftime("%d/%m") for i in range(days)]
-        else:
-            # Mapeamento correto dos períodos do dashboard
-            days = {"today": 1, "yesterday": 1, "last_7d": 7, "last_14d": 14, "last_30d": 30}.get(period, 7)
-            dates = [(datetime.now() - timedelta(days=i)).strftime("%d/%m") for i in range(days-1, -1, -1)]
-
-        # Gerar dados mock para o número correto de dias
-        base_cliques = [380, 420, 395, 450, 480, 510, 565, 520, 490, 530, 560, 580, 540, 500]
-        base_ctr = [2.3, 2.4, 2.35, 2.5, 2.55, 2.6, 2.75, 2.65, 2.58, 2.7, 2.8, 2.85, 2.72, 2.62]
-        base_cpc = [0.30, 0.28, 0.29, 0.27, 0.26, 0.25, 0.24, 0.25, 0.26, 0.24, 0.23, 0.22, 0.24, 0.25]
-
-        # Estender dados se necessário
-        while len(base_cliques) < days:
-            base_cliques.extend([random.randint(380, 600) for _ in range(7)])
-            base_ctr.extend([round(random.uniform(2.2, 2.9), 2) for _ in range(7)])
-            base_cpc.extend([round(random.uniform(0.22, 0.32), 2) for _ in range(7)])
-
-        return pd.DataFrame({
-            "Data": dates,
-            "Cliques": base_cliques[:days],
-            "CTR": base_ctr[:days],
-            "CPC": base_cpc[:days],
-        })
-
-    def _get_mock_source_medium(self):
-        return pd.DataFrame({
-            "Origem / Midia": ["facebook / paid", "instagram / paid", "google / cpc", "(direct) / (none)", "google / organic"],
-            "Sessoes": [1450, 890, 285, 145, 80],
-            "Usuarios": [1200, 750, 240, 95, 55],
-            "Engajamento": ["72.3%", "68.9%", "58.2%", "45.1%", "62.8%"],
-            "Tempo Medio": ["1m 58s", "1m 42s", "1m 15s", "0m 48s", "2m 05s"],
-        })
-
-    def _get_mock_events_data(self):
-        """Retorna dados mock de eventos do GA4"""
-        return pd.DataFrame({
-            "Nome do Evento": [
-                "page_view", "session_start", "first_visit", "scroll",
-                "user_engagement", "scroll_50", "primary_cta_click"
-            ],
-            "Contagem de Eventos": [
-                "2.050 (33,19%)", "1.992 (32,25%)", "1.958 (31,70%)", "78 (1,26%)",
-                "78 (1,26%)", "17 (0,28%)", "3 (0,05%)"
-            ],
-            "Total de Usuarios": [
-                "1.968 (100%)", "1.968 (100%)", "1.958 (99,49%)", "68 (3,46%)",
-                "38 (1,93%)", "14 (0,71%)", "3 (0,15%)"
-            ],
-            "Eventos por Usuario": ["1,04", "1,01", "1,00", "1,15", "2,05", "1,21", "1,00"]
-        })
-
-    def get_cycle_status(self, period, meta_data, creative_data):
-        try:
-            insights = []
-            delta_ctr = meta_data.get("delta_ctr", 0)
-            delta_cpc = meta_data.get("delta_cpc", 0)
-
-            if abs(delta_ctr) < 0.5:
-                insights.append("CTR estavel")
-            elif delta_ctr > 0:
-                insights.append("CTR em alta")
-            else:
-                insights.append("CTR em queda")
+@st.cache_resource(show_spinner=False)
+def _ai_precompute_scheduler() -> PrecomputeScheduler:
+    """Pré-geração de análises do processo: uma execução por vez, no máximo a cada 30 min mesmo com atualizações seguidas."""
+    return PrecomputeScheduler(min_interval_seconds=1800)
 
-            if delta_cpc < 0:
-                insights.append("CPC controlado")
-            else:
-                insights.append("CPC em observacao")
 
-            if len(creative_data) > 0:
-                insights.append("Criativo lider identificado")
+@st.cache_resource(show_spinner=False)
+def get_ai_backend():
+    """Backend de LLM do processo (OpenAI, endpoint compatível ou replay, conforme AI_BACKEND/AI_BASE_URL)."""
+    return build_backend(
+        Config.get_ai_backend(),
+        api_key=Config.get_openai_api_key(),
+        base_url=Config.get_ai_base_url(),
+        replay_path=Config.get_ai_replay_path(),
+    )
 
-            is_learning = period in ["today", "yesterday"]
-            phase = "Fase de Aprendizado (ate 48h)" if is_learning else "Otimizacao ativa"
 
-            return {"insights": insights, "phase": phase, "is_learning": is_learning}
-        except Exception as e:
-            logger.error(f"Erro em get_cycle_status: {e}")
-            return {"insights": ["Coletando dados..."], "phase": "Processando", "is_learning": True}
+def _new_ai_agent() -> AIAgent:
+    """Agente de IA com o backend, o cache e o orçamento de prompt configurados."""
+    return AIAgent(
+        api_key=Config.get_openai_api_key(),
+        cache=get_ai_analysis_cache(),
+        prompt_token_budget=Config.snapshot().ai_prompt_token_budget,
+        backend=get_ai_backend(),
+    )
 
 
-# Inicializar provider
-data_provider = DataProvider(mode="auto")
+def _ai_analysis_inputs(meta_data, ga4_data, creative_data, source_medium_data, ga4_events_data):
+    """Recorte dos dados enviado à IA (o botão e a pré-geração precisam do mesmo para bater no cache)."""
+    return {
+        "meta_data": {
+            "investimento": meta_data.get("investimento", 0),
+            "impressoes": meta_data.get("impressoes", 0),
+            "alcance": meta_data.get("alcance", 0),
+            "frequencia": meta_data.get("frequencia", 0),
+            "cliques_link": meta_data.get("cliques_link", 0),
+            "ctr_link": meta_data.get("ctr_link", 0),
+            "cpc_link": meta_data.get("cpc_link", 0),
+            "cpm": meta_data.get("cpm", 0),
+            "delta_ctr": meta_data.get("delta_ctr", 0),
+            "delta_cpc": meta_data.get("delta_cpc", 0),
+            "delta_cliques": meta_data.get("delta_cliques", 0),
+        },
+        "ga4_data": {
+            "sessoes": ga4_data.get("sessoes", 0),
+            "usuarios": ga4_data.get("usuarios", 0),
+            "pageviews": ga4_data.get("pageviews", 0),
+            "taxa_engajamento": ga4_data.get("taxa_engajamento", 0),
+            "tempo_medio": ga4_data.get("tempo_medio", "N/A"),
+        },
+        "creative_data": creative_data,
+        "source_data": source_medium_data,
+        "events_data": ga4_events_data,
+    }
 
 
 # =============================================================================
@@ -789,7 +174,7 @@ def _normalize_breakdowns_for_cache(breakdowns):
 def _fetch_meta_cached(period, campaign_filter, custom_start, custom_end, level, breakdowns, app_id):
     return data_provider.get_meta_metrics(
         period=period, campaign_filter=campaign_filter, level=level,
-        custom_start=custom_start, custom_end=custom_end,
+        custom_start=custom_start, custom_end=custom_end, include_sdk=False,
     )
 
 
@@ -816,11 +201,112 @@ def _fetch_trends_cached(period, campaign_filter, custom_start, custom_end):
         custom_start=custom_start, custom_end=custom_end,
     )
 
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _fetch_source_medium_cached(period, custom_start, custom_end, campaign_filter):
+    return data_provider.get_source_medium(
+        period=period, custom_start=custom_start,
+        custom_end=custom_end, campaign_filter=campaign_filter,
+    )
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _fetch_events_cached(period, custom_start, custom_end, campaign_filter):
+    return data_provider.get_events_data(
+        period=period, custom_start=custom_start,
+        custom_end=custom_end, campaign_filter=campaign_filter,
+    )
+
+
+# Eventos SDK são totais da conta (não dependem do filtro de campanha) e mudam devagar:
+# etapa própria, com TTL maior, buscada só quando algo na tela usa o resultado
+@st.cache_data(ttl=1800, show_spinner=False)
+def _fetch_meta_sdk_cached(period, custom_start, custom_end, app_id, install_fallback):
+    return data_provider.get_sdk_enrichment(
+        period=period, custom_start=custom_start,
+        custom_end=custom_end, install_fallback=install_fallback,
+    )
+
+
+def _payload_fingerprint(data):
+    """Hash do conteúdo do payload: muda sempre que os números mudam, mesmo com a mesma chave de dataset."""
+    return hashlib.sha1(json.dumps(data, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+# HTML dos cards KPI por versão do dataset: a chave é a mesma dos fetchers acima,
+# os dados entram como argumento "_" (não participam do hash do st.cache_data)
+@st.cache_data(ttl=300, show_spinner=False)
+def _meta_kpi_cards_html_cached(dataset_key, data_version, show_install_kpis, _meta_data):
+    return build_kpi_cards_html(build_meta_kpi_cards_payload({**_meta_data, "show_install_kpis": show_install_kpis}))
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _ga4_kpi_cards_html_cached(dataset_key, data_version, _ga4_data):
+    return build_kpi_cards_html(build_ga4_kpi_cards_payload(_ga4_data))
+
+# =============================================================================
+# CARREGAMENTO PROGRESSIVO (fontes em paralelo, seções com skeleton)
+# =============================================================================
+@st.cache_resource(show_spinner=False)
+def _data_loader_pool() -> ThreadPoolExecutor:
+    """Pool do processo para buscar as fontes em paralelo (compartilhado entre sessões)."""
+    return ThreadPoolExecutor(max_workers=8, thread_name_prefix="lia-data")
+
+
+def submit_with_session(fn, *args):
+    """Agenda ``fn(*args)`` no pool levando o contexto da sessão atual (st.cache_data, st.session_state)."""
+    ctx = get_script_run_ctx()
+
+    def run():
+        thread = threading.current_thread()
+        add_script_run_ctx(thread, ctx)
+        try:
+            return fn(*args)
+        finally:
+            add_script_run_ctx(thread, None)
+
+    return _data_loader_pool().submit(run)
+
+
+_progressive_sections = []
+
+
+def progressive_section(deps, render, height=120, label="Carregando...", refresh=()):
+    """
+    Reserva o lugar da seção na página com um skeleton; ela é renderizada quando ``deps`` ficam prontos
+
+    Args:
+        deps: Nomes das fontes necessárias (chaves de _data_futures, "meta_full" = Meta + SDK)
+        render: Função que recebe o dict de dados carregados e desenha a seção
+        height: Altura mínima do skeleton (px), para a página não "pular" ao preencher
+        label: Texto exibido no skeleton
+        refresh: Fontes que, chegando depois da primeira renderização, redesenham a seção
+    """
+    slot = st.empty()
+    slot.markdown(f'<div class="lia-skeleton" style="min-height:{height}px;">{html.escape(label)}</div>', unsafe_allow_html=True)
+    _progressive_sections.append({"slot": slot, "deps": tuple(deps), "refresh": tuple(refresh), "render": render, "rendered": False})
+
+
+def render_ready_sections(loaded_data):
+    """Desenha (em ordem de página) as seções cujas fontes já chegaram."""
+    for section in _progressive_sections:
+        if not all(name in loaded_data for name in section["deps"]):
+            continue
+        refresh_ready = all(name in loaded_data for name in section["refresh"])
+        if section["rendered"] and not (section["refresh"] and refresh_ready):
+            continue
+        with section["slot"].container():
+            section["render"](loaded_data)
+        section["rendered"] = True
+        if refresh_ready:
+            section["refresh"] = ()
+
+
 # =============================================================================
 # COMPONENTE: CARD DE ERRO AMIGAVEL
 # =============================================================================
 def render_error_card(title="Estamos ajustando os dados", message="Algumas metricas estao temporariamente indisponiveis. Nossa equipe ja esta verificando."):
-    owl_img = f'<img src="data:image/png;base64,{logo_base64}" style="width:48px;height:48px;margin-bottom:12px;filter:drop-shadow(0 0 10px rgba(92,201,182,0.18));">' if logo_base64 else ''
+    owl_img = f'<img src="{logo_url}" style="width:48px;height:48px;margin-bottom:12px;filter:drop-shadow(0 0 10px rgba(92,201,182,0.18));">' if logo_url else ''
     st.markdown(f'''
     <div style="background:{LIA["bg_card"]};backdrop-filter:blur(18px);-webkit-backdrop-filter:blur(18px);border-radius:20px;padding:32px;text-align:center;border:1px solid {LIA["border"]};margin:16px 0;box-shadow:0 12px 24px rgba(92,201,182,0.12), 0 0 16px rgba(122,92,255,0.14);">
         {owl_img}
@@ -832,831 +318,29 @@ def render_error_card(title="Estamos ajustando os dados", message="Algumas metri
     </div>
     ''', unsafe_allow_html=True)
 
+# =============================================================================
+# COMPONENTE: TABELA HTML PAGINADA
+# =============================================================================
+def render_paginated_table(df, key, page_size=DEFAULT_PAGE_SIZE, **table_options):
+    """Renderiza a tabela (HTML em cache por conteúdo) com seletor de página para frames grandes."""
+    table_slot = st.empty()
+    page = 1
+    if len(df) > page_size:
+        page_count = -(-len(df) // page_size)
+        page = st.number_input(f"Página (de {page_count})", min_value=1, max_value=page_count, value=1, step=1, key=key)
+    page_df, _ = paginate_frame(df, page, page_size)
+    table_slot.markdown(render_html_table(page_df, **table_options), unsafe_allow_html=True)
+
 # =============================================================================
 # CSS - LIA MINT / VIOLET (ACESSIVEL E ELEVADO)
 # =============================================================================
-st.markdown(f"""
-<style>
-@import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700;800&display=swap');
-
-*, *::before, *::after {{ box-sizing: border-box; }}
-
-/* Fundo: Ice Gray com glow suave */
-html, body, [data-testid="stAppViewContainer"], .stApp {{
-    background: linear-gradient(
-        180deg,
-        rgba(255, 210, 180, 0.3) 0%,
-        rgba(255, 245, 240, 0.4) 25%,
-        #FFFFFF 60%
-    ) !important;
-    min-height: 100vh;
-    font-family: 'Inter', -apple-system, sans-serif !important;
-}}
-
-/* Ajuste para melhor transição do gradiente */
-[data-testid="stAppViewContainer"]::before {{
-    content: '';
-    position: fixed;
-    top: 0;
-    left: 0;
-    right: 0;
-    bottom: 0;
-    background: radial-gradient(ellipse at 20% 0%, rgba(92, 201, 182, 0.12) 0%, transparent 55%),
-                radial-gradient(ellipse at 85% 100%, rgba(122, 92, 255, 0.1) 0%, transparent 45%);
-    pointer-events: none;
-    z-index: 0;
-}}
-
-[data-testid="stSidebar"], section[data-testid="stSidebar"],
-button[kind="header"], [data-testid="collapsedControl"] {{
-    display: none !important;
-}}
-
-.main .block-container {{
-    padding: 20px !important;
-    max-width: 1200px !important;
-    margin: 0 auto;
-    position: relative;
-    z-index: 1;
-}}
-
-/* ========== CARTOES GLASSMORPHISM ESCUROS ========== */
-.glass-card {{
-    background: linear-gradient(
-        120deg,
-        rgba(255, 210, 180, 0.35) 0%,
-        rgba(255, 170, 120, 0.35) 35%,
-        rgba(255, 150, 110, 0.28) 70%,
-        rgba(255, 245, 240, 0.4) 100%
-    );
-    backdrop-filter: blur(16px);
-    -webkit-backdrop-filter: blur(16px);
-    border: 1px solid {LIA["border"]};
-    border-radius: 20px;
-    box-shadow: 0 12px 24px rgba(92, 201, 182, 0.12),
-                0 0 16px rgba(92, 201, 182, 0.18);
-    padding: 24px;
-}}
-
-.content-layer {{
-    display: flex;
-    flex-direction: column;
-    gap: 18px;
-    margin-top: 16px;
-}}
-
-.empty-state {{
-    display: none !important;
-}}
-
-/* ========== HEADER (glass escuro com glow) ========== */
-.lia-header {{
-    background: linear-gradient(
-        120deg,
-        rgba(255, 210, 180, 0.35) 0%,
-        rgba(255, 170, 120, 0.35) 35%,
-        rgba(255, 150, 110, 0.28) 70%,
-        rgba(255, 245, 240, 0.4) 100%
-    );
-    backdrop-filter: blur(18px);
-    -webkit-backdrop-filter: blur(18px);
-    border-radius: 20px;
-    padding: 20px 28px;
-    min-height: 84px;
-    display: flex;
-    align-items: center;
-    justify-content: space-between;
-    border: 1px solid {LIA["border"]};
-    box-shadow: 0 12px 24px rgba(92, 201, 182, 0.12),
-                0 0 16px rgba(122, 92, 255, 0.14);
-    margin-bottom: 0;
-    overflow: visible;
-    position: relative;
-    z-index: 2;
-}}
-
-.lia-header-left {{
-    display: flex;
-    align-items: center;
-    gap: 14px;
-}}
-
-.lia-logo {{
-    width: 50px;
-    height: 50px;
-    border-radius: 20px;
-    background: linear-gradient(135deg, {LIA["primary"]} 0%, {LIA["secondary"]} 100%);
-    backdrop-filter: blur(12px);
-    display: flex;
-    align-items: center;
-    justify-content: center;
-    box-shadow: 0 8px 16px rgba(92, 201, 182, 0.18),
-                0 0 12px rgba(122, 92, 255, 0.14);
-    position: relative;
-    z-index: 3;
-}}
-
-.lia-logo img {{
-    width: 32px;
-    height: 32px;
-    filter: none;
-    mix-blend-mode: normal;
-}}
-
-.lia-title-group {{
-    display: flex;
-    flex-direction: column;
-}}
-
-.lia-main-title {{
-    font-size: 20px;
-    font-weight: 800;
-    color: {LIA["text_light"]};
-    letter-spacing: -0.5px;
-    margin: 0;
-    line-height: 1.2;
-    text-shadow: none;
-}}
-
-.lia-subtitle {{
-    font-size: 12px;
-    color: {LIA["text_secondary"]};
-    font-weight: 500;
-    margin: 0;
-}}
-
-/* ========== STATUS CARD ========== */
-.status-card {{
-    background: {LIA["bg_card"]};
-    border-radius: 20px;
-    padding: 12px 20px;
-    display: flex;
-    align-items: center;
-    gap: 12px;
-    border: 1px solid {LIA["border"]};
-    box-shadow: 0 10px 20px rgba(92, 201, 182, 0.12),
-                0 0 12px rgba(92, 201, 182, 0.18);
-}}
-
-.status-owl {{
-    width: 28px;
-    height: 28px;
-    filter: drop-shadow(0 0 8px rgba(92, 201, 182, 0.18));
-}}
-
-.status-text {{
-    font-size: 13px;
-    color: {LIA["text_primary"]};
-    font-weight: 500;
-}}
-
-/* ========== KPI GRID & CARDS ========== */
-.section-title {{
-    font-size: 15px;
-    font-weight: 700;
-    color: {LIA["text_light"]};
-    margin-bottom: 18px;
-    display: flex;
-    align-items: center;
-    gap: 8px;
-    text-transform: uppercase;
-    letter-spacing: 0.5px;
-}}
-
-.section-icon {{
-    width: 24px;
-    height: 24px;
-    background: linear-gradient(135deg, {LIA["primary"]} 0%, {LIA["secondary"]} 100%);
-    color: {LIA["bg_dark"]};
-    border-radius: 16px;
-    display: flex;
-    align-items: center;
-    justify-content: center;
-    font-size: 12px;
-    font-weight: 800;
-    box-shadow: 0 6px 12px rgba(92, 201, 182, 0.18),
-                0 0 10px rgba(122, 92, 255, 0.14);
-}}
-
-.kpi-grid {{
-    display: grid;
-    grid-template-columns: repeat(auto-fit, minmax(130px, 1fr));
-    gap: 12px;
-}}
-
-.kpi-card {{
-    position: relative;
-    perspective: 1000px;
-    height: 150px;
-    display: block;
-}}
-
-.kpi-card input {{
-    position: absolute;
-    opacity: 0;
-    pointer-events: none;
-}}
-
-.kpi-inner {{
-    position: relative;
-    width: 100%;
-    height: 100%;
-}}
-
-.kpi-front,
-.kpi-back {{
-    position: absolute;
-    inset: 0;
-    backface-visibility: hidden;
-    background: {LIA["bg_card"]};
-    border-radius: 20px;
-    padding: 16px;
-    border: 1px solid {LIA["border"]};
-    transition: transform 0.6s ease, background 0.2s ease, box-shadow 0.2s ease;
-    cursor: pointer;
-    box-shadow: 0 10px 20px rgba(92, 201, 182, 0.12),
-                0 0 12px rgba(92, 201, 182, 0.18);
-}}
-
-.kpi-front {{
-    transform: rotateY(0deg);
-}}
-
-.kpi-back {{
-    transform: rotateY(180deg);
-}}
-
-.kpi-card input:checked ~ .kpi-inner .kpi-back {{
-    transform: rotateY(0deg);
-}}
-
-.kpi-card input:checked ~ .kpi-inner .kpi-front {{
-    transform: rotateY(-180deg);
-}}
-
-.kpi-card:hover .kpi-front,
-.kpi-card:hover .kpi-back {{
-    background: {LIA["bg_card"]};
-    border-color: {LIA["primary"]};
-    box-shadow: 0 12px 24px rgba(92, 201, 182, 0.14),
-                0 0 14px rgba(92, 201, 182, 0.18);
-}}
-
-.kpi-top {{
-    display: flex;
-    align-items: center;
-    justify-content: space-between;
-    gap: 8px;
-    margin-bottom: 10px;
-}}
-
-.kpi-icon {{
-    font-size: 16px;
-    filter: drop-shadow(0 0 6px rgba(92, 201, 182, 0.18));
-}}
-
-.kpi-label {{
-    font-size: 11px;
-    font-weight: 600;
-    color: {LIA["text_secondary"]};
-    text-transform: uppercase;
-    letter-spacing: 0.3px;
-    margin: 0;
-}}
-
-.kpi-value {{
-    font-size: 20px;
-    font-weight: 800;
-    color: {LIA["text_light"]};
-    margin-bottom: 6px;
-    text-shadow: none;
-}}
-
-.kpi-delta {{
-    font-size: 11px;
-    font-weight: 700;
-    display: flex;
-    align-items: center;
-    gap: 2px;
-}}
-
-.kpi-back p {{
-    margin: 12px 0 0 0;
-    font-size: 12px;
-    color: {LIA["text_secondary"]};
-}}
-
-.delta-up {{ color: {LIA["success"]}; text-shadow: 0 0 10px rgba(92, 201, 182, 0.18); }}
-.delta-down {{ color: {LIA["error"]}; text-shadow: 0 0 10px rgba(122, 92, 255, 0.14); }}
-.delta-neutral {{ color: {LIA["text_muted"]}; }}
-
-/* ========== BADGES ========== */
-.badge-row {{
-    display: flex;
-    gap: 8px;
-    margin-bottom: 16px;
-}}
-
-.badge {{
-    padding: 6px 12px;
-    border-radius: 18px;
-    font-size: 11px;
-    font-weight: 700;
-    display: flex;
-    align-items: center;
-    gap: 6px;
-}}
-
-.badge-orange, .badge-cyan {{
-    background: rgba(92, 201, 182, 0.12);
-    color: {LIA["primary"]};
-    border: 1px solid rgba(92, 201, 182, 0.3);
-    box-shadow: 0 0 6px rgba(92, 201, 182, 0.14);
-}}
-
-.badge-green {{
-    background: rgba(92, 201, 182, 0.12);
-    color: {LIA["success"]};
-    border: 1px solid rgba(92, 201, 182, 0.3);
-    box-shadow: 0 0 6px rgba(92, 201, 182, 0.14);
-}}
-
-/* ========== TABELA COM HEADER GLASS ESCURO ========== */
-.table-container {{
-    background: {LIA["bg_card"]};
-    backdrop-filter: blur(16px);
-    -webkit-backdrop-filter: blur(16px);
-    border-radius: 20px;
-    overflow: hidden;
-    border: 1px solid {LIA["border"]};
-    box-shadow: 0 12px 24px rgba(92, 201, 182, 0.12),
-                0 0 16px rgba(92, 201, 182, 0.18);
-    margin-bottom: 12px;
-}}
-
-.table-header {{
-    background: rgba(92, 201, 182, 0.12);
-    padding: 14px 18px;
-    border-bottom: 1px solid {LIA["border"]};
-}}
-
-.table-header-title {{
-    font-size: 14px;
-    font-weight: 600;
-    color: {LIA["text_light"]};
-}}
-
-.stDataFrame {{
-    background: transparent !important;
-}}
-
-[data-testid="stDataFrame"] > div {{
-    background: transparent !important;
-}}
-
-.lia-html-table {{
-    width: 100%;
-    border-collapse: collapse;
-    font-size: 14px;
-    text-align: left;
-}}
-
-.lia-html-table :is(th, td) {{
-    padding: 12px 16px;
-    white-space: nowrap;
-    vertical-align: middle;
-}}
-
-.lia-html-table thead th {{
-    background: rgba(92, 201, 182, 0.12);
-    border-bottom: 1px solid {LIA["border"]};
-    color: {LIA["text_light"]};
-    font-weight: 600;
-    text-transform: capitalize;
-    letter-spacing: 0.02em;
-}}
-
-.lia-html-table tbody td {{
-    border-bottom: 1px solid rgba(26, 43, 73, 0.08);
-    color: {LIA["text_primary"]};
-    opacity: 0.88;
-    transition: opacity 0.3s ease, background 0.3s ease;
-}}
-
-.lia-html-table tbody tr:nth-child(odd) {{
-    background: rgba(247, 249, 252, 0.9);
-}}
-
-.lia-html-table tbody tr:hover td {{
-    opacity: 1;
-}}
-
-.lia-html-table tbody tr:last-child td {{
-    border-bottom: 0;
-}}
-
-.lia-html-table tbody td:nth-child(n + 2) {{
-    text-align: right;
-    font-variant-numeric: tabular-nums;
-}}
-
-.event-tooltip-wrapper {{
-    position: relative;
-    display: inline-flex;
-    align-items: center;
-    gap: 6px;
-}}
-
-.event-btn {{
-    background: transparent;
-    border: none;
-    padding: 0;
-    font-size: 14px;
-    font-weight: 600;
-    color: {LIA["text_light"]};
-    cursor: default;
-    display: inline-flex;
-    align-items: center;
-    gap: 6px;
-}}
-
-.tooltip-icon {{
-    width: 16px;
-    height: 16px;
-    border-radius: 50%;
-    background: linear-gradient(135deg, {LIA["primary"]} 0%, {LIA["secondary"]} 100%);
-    color: {LIA["bg_dark"]};
-    display: inline-flex;
-    align-items: center;
-    justify-content: center;
-    font-size: 11px;
-    font-weight: 700;
-    box-shadow: 0 0 8px rgba(92, 201, 182, 0.18);
-}}
-
-.tooltip-popup {{
-    position: absolute;
-    left: 0;
-    bottom: calc(100% + 8px);
-    background: {LIA["bg_card"]};
-    color: {LIA["text_light"]};
-    padding: 8px 10px;
-    border-radius: 16px;
-    font-size: 12px;
-    line-height: 1.4;
-    min-width: 160px;
-    max-width: 240px;
-    opacity: 0;
-    pointer-events: none;
-    transform: translateY(4px);
-    transition: opacity 0.2s ease, transform 0.2s ease;
-    z-index: 10;
-    border: 1px solid {LIA["border"]};
-    box-shadow: 0 10px 20px rgba(92, 201, 182, 0.12),
-                0 0 14px rgba(122, 92, 255, 0.14);
-}}
-
-.event-tooltip-wrapper:hover .tooltip-popup,
-.event-tooltip-wrapper:focus-within .tooltip-popup {{
-    opacity: 1;
-    pointer-events: auto;
-    transform: translateY(0);
-}}
-
-/* ========== CARD DE ESCOPO ========== */
-.scope-card {{
-    background: {LIA["bg_card"]};
-    backdrop-filter: blur(16px);
-    -webkit-backdrop-filter: blur(16px);
-    border-radius: 20px;
-    padding: 16px 20px;
-    display: flex;
-    align-items: center;
-    gap: 12px;
-    border: 1px solid {LIA["border"]};
-    box-shadow: 0 12px 24px rgba(92, 201, 182, 0.12),
-                0 0 14px rgba(92, 201, 182, 0.18);
-    margin-bottom: 12px;
-}}
-
-.scope-text {{
-    font-size: 13px;
-    color: {LIA["text_primary"]};
-}}
-
-/* ========== GRAFICOS EM CARDS ========== */
-.chart-card {{
-    background: {LIA["bg_card"]};
-    backdrop-filter: blur(16px);
-    -webkit-backdrop-filter: blur(16px);
-    border-radius: 20px;
-    padding: 18px;
-    border: 1px solid {LIA["border"]};
-    box-shadow: 0 12px 24px rgba(92, 201, 182, 0.12),
-                0 0 16px rgba(92, 201, 182, 0.18);
-    margin-bottom: 12px;
-}}
-
-.trend-toggle [data-baseweb="tab-list"] {{
-    gap: 8px;
-    background: rgba(92, 201, 182, 0.1);
-    border-radius: 18px;
-    padding: 4px;
-}}
-
-.trend-toggle [data-baseweb="tab"] {{
-    background: transparent;
-    border-radius: 18px;
-    padding: 6px 14px;
-    color: {LIA["text_secondary"]};
-    font-size: 13px;
-    font-weight: 600;
-}}
-
-.trend-toggle [aria-selected="true"] {{
-    background: linear-gradient(135deg, {LIA["primary"]} 0%, {LIA["secondary"]} 100%);
-    color: {LIA["bg_dark"]};
-    box-shadow: 0 8px 16px rgba(92, 201, 182, 0.14),
-                0 0 12px rgba(122, 92, 255, 0.14);
-}}
-
-.js-plotly-plot .plotly .modebar {{ display: none !important; }}
-
-/* ========== FILTROS ========== */
-.filter-card {{
-    background: {LIA["bg_card"]};
-    backdrop-filter: blur(16px);
-    -webkit-backdrop-filter: blur(16px);
-    border: 1px solid {LIA["border"]};
-    border-radius: 20px;
-    box-shadow: 0 8px 16px rgba(92, 201, 182, 0.1);
-    padding: 18px 18px 10px 18px;
-}}
-
-.stSelectbox > div > div {{
-    background: #FFFFFF !important;
-    border: 1px solid {LIA["border"]} !important;
-    border-radius: 18px !important;
-    box-shadow: none;
-    color: {LIA["text_light"]} !important;
-}}
-
-.stSelectbox > div > div:hover {{
-    border-color: {LIA["primary"]} !important;
-    box-shadow: none;
-}}
-
-.stSelectbox label {{
-    color: {LIA["text_secondary"]} !important;
-    font-size: 12px !important;
-}}
-
-.stSelectbox [data-baseweb="select"] span {{
-    color: {LIA["text_light"]} !important;
-}}
-
-/* ========== AGENTE DE IA ========== */
-.ai-agent-card {{
-    background: linear-gradient(135deg, rgba(92, 201, 182, 0.12) 0%, rgba(122, 92, 255, 0.12) 100%);
-    backdrop-filter: blur(16px);
-    -webkit-backdrop-filter: blur(16px);
-    border: 1px solid {LIA["primary"]};
-    border-radius: 20px;
-    padding: 24px;
-    margin-bottom: 16px;
-    box-shadow: 0 12px 24px rgba(92, 201, 182, 0.12),
-                0 0 14px rgba(122, 92, 255, 0.14);
-}}
-
-.ai-agent-header {{
-    display: flex;
-    align-items: center;
-    gap: 12px;
-    margin-bottom: 16px;
-}}
-
-.ai-agent-icon {{
-    width: 40px;
-    height: 40px;
-    background: linear-gradient(135deg, {LIA["primary"]} 0%, {LIA["secondary"]} 100%);
-    border-radius: 20px;
-    display: flex;
-    align-items: center;
-    justify-content: center;
-    font-size: 20px;
-    box-shadow: 0 8px 16px rgba(92, 201, 182, 0.18),
-                0 0 12px rgba(122, 92, 255, 0.14);
-}}
-
-.ai-agent-title {{
-    font-size: 16px;
-    font-weight: 700;
-    color: {LIA["text_light"]};
-    text-shadow: none;
-}}
-
-.ai-agent-subtitle {{
-    font-size: 12px;
-    color: {LIA["text_secondary"]};
-}}
-
-.ai-agent-content {{
-    background: #FFFFFF;
-    border-radius: 20px;
-    padding: 16px;
-    font-size: 14px;
-    line-height: 1.6;
-    color: {LIA["text_primary"]};
-    border: 1px solid {LIA["border"]};
-}}
-
-.ai-agent-content h1, .ai-agent-content h2, .ai-agent-content h3 {{
-    font-size: 14px;
-    font-weight: 700;
-    margin: 12px 0 8px 0;
-    color: {LIA["text_light"]};
-}}
-
-.ai-agent-content p {{
-    margin: 8px 0;
-}}
-
-.ai-agent-content ul, .ai-agent-content ol {{
-    margin: 8px 0;
-    padding-left: 20px;
-    color: {LIA["text_primary"]};
-}}
-
-/* ========== FOOTER ========== */
-.footer {{
-    text-align: center;
-    padding: 8px 0 0 0;
-    color: {LIA["text_secondary"]};
-    font-size: 12px;
-    border-top: none;
-    margin-top: 8px;
-}}
-
-/* ========== STREAMLIT GLOBAL OVERRIDES ========== */
-.stButton > button {{
-    background: linear-gradient(135deg, {LIA["primary"]} 0%, {LIA["secondary"]} 100%) !important;
-    color: #FFFFFF !important;
-    border: none !important;
-    border-radius: 999px !important;
-    padding: 10px 20px !important;
-    font-weight: 600 !important;
-    box-shadow: 0 8px 16px rgba(92, 201, 182, 0.18),
-                0 0 12px rgba(122, 92, 255, 0.14) !important;
-    transition: all 0.3s ease !important;
-}}
-
-.stButton > button:hover {{
-    transform: translateY(-2px) !important;
-    box-shadow: 0 10px 20px rgba(92, 201, 182, 0.18),
-                0 0 14px rgba(122, 92, 255, 0.14) !important;
-}}
-
-.stButton > button[kind="secondary"],
-.stButton > button[kind="secondary"]:hover {{
-    background: #FFFFFF !important;
-    color: {LIA["text_light"]} !important;
-    border: 1px solid rgba(92, 201, 182, 0.18) !important;
-    box-shadow: none !important;
-    transform: none !important;
-}}
-
-.stButton > button[kind="tertiary"],
-.stButton > button[kind="tertiary"]:hover {{
-    background: transparent !important;
-    color: {LIA["text_light"]} !important;
-    border: none !important;
-    box-shadow: none !important;
-    text-decoration: underline;
-    text-decoration-color: rgba(92, 201, 182, 0.6);
-}}
-
-.ai-analysis-button .stButton > button {{
-    position: relative;
-    overflow: hidden;
-    justify-content: center;
-    gap: 10px;
-    height: 56px;
-    font-size: 16px !important;
-    letter-spacing: 0.2px;
-    background: {LIA["text_light"]} !important;
-    color: #FFFFFF !important;
-    border-radius: 999px !important;
-    border: none !important;
-    box-shadow: 0 10px 18px rgba(26, 43, 73, 0.18);
-}}
-
-.ai-analysis-button .stButton > button::after {{
-    content: "";
-    position: absolute;
-    left: 8%;
-    right: 8%;
-    bottom: 8px;
-    height: 3px;
-    border-radius: 999px;
-    background: linear-gradient(90deg, {LIA["primary"]}, {LIA["secondary"]});
-    opacity: 0;
-    transition: opacity 0.25s ease;
-}}
-
-.ai-analysis-button .stButton > button:hover::after {{
-    opacity: 1;
-}}
-
-/* Date input styling */
-.stDateInput > div > div {{
-    background: #FFFFFF !important;
-    border: 1px solid {LIA["border"]} !important;
-    border-radius: 18px !important;
-    color: {LIA["text_light"]} !important;
-    box-shadow: none !important;
-}}
-
-.stDateInput label {{
-    color: {LIA["text_secondary"]} !important;
-}}
-
-/* Metric styling */
-[data-testid="stMetricValue"] {{
-    color: {LIA["text_light"]} !important;
-}}
-
-[data-testid="stMetricDelta"] {{
-    color: {LIA["success"]} !important;
-}}
-
-/* Text elements */
-.stMarkdown p, .stMarkdown li {{
-    color: {LIA["text_primary"]};
-}}
-
-/* Alerts */
-.stAlert {{
-    background: #FFFFFF !important;
-    border: 1px solid rgba(92, 201, 182, 0.18) !important;
-    border-radius: 20px !important;
-    box-shadow: 0 10px 20px rgba(92, 201, 182, 0.12),
-                0 0 12px rgba(122, 92, 255, 0.14) !important;
-}}
-
-.stAlert [data-testid="stAlertContent"] {{
-    color: {LIA["text_light"]} !important;
-}}
-
-/* Expander styling */
-.streamlit-expanderHeader {{
-    background: #FFFFFF !important;
-    border: 1px solid {LIA["border"]} !important;
-    border-radius: 18px !important;
-    color: {LIA["text_light"]} !important;
-}}
-
-/* Scrollbar styling */
-::-webkit-scrollbar {{
-    width: 8px;
-    height: 8px;
-}}
-
-::-webkit-scrollbar-track {{
-    background: rgba(26, 43, 73, 0.08);
-    border-radius: 16px;
-}}
-
-::-webkit-scrollbar-thumb {{
-    background: {LIA["primary"]};
-    border-radius: 16px;
-}}
-
-::-webkit-scrollbar-thumb:hover {{
-    background: {LIA["primary_dark"]};
-}}
-
-/* Link styling */
-a {{
-    color: {LIA["primary"]} !important;
-    text-decoration: none;
-}}
-
-a:hover {{
-    text-decoration: underline;
-    text-shadow: 0 0 10px rgba(92, 201, 182, 0.18);
-}}
-
-/* Loading spinner */
-.stSpinner > div {{
-    border-top-color: {LIA["primary"]} !important;
-}}
-</style>
-""", unsafe_allow_html=True)
+# Tema montado (e minificado) uma vez por processo
+st.markdown(theme_style_html(), unsafe_allow_html=True)
 
 # =============================================================================
 # BARRA SUPERIOR (HEADER)
 # =============================================================================
-logo_img = f'<img src="data:image/png;base64,{logo_base64}">' if logo_base64 else '🦉'
+logo_img = f'<img src="{logo_url}">' if logo_url else '🦉'
 
 st.markdown(f'''
 <div class="lia-header">
@@ -1746,75 +430,91 @@ else:
     </div>
     ''', unsafe_allow_html=True)
 
-build_stamp = get_build_stamp()
+build_stamp = get_build_stamp_nowait()
 st.markdown(f"<div style='text-align:right;color:{LIA['text_muted']};font-size:12px;margin-bottom:8px;'>Build: {html.escape(build_stamp)}</div>", unsafe_allow_html=True)
 
 # -----------------------------------------------------------------------------
-# CARREGAR DADOS (com tratamento de erro)
-# -----------------------------------------------------------------------------
-cycle_status = {"insights": ["Processando..."], "phase": "Carregando", "is_learning": True}
-try:
-    with st.spinner("Sincronizando dados..."):
-        _cache_app_id = data_provider.meta_client.app_id if data_provider.meta_client else "no_app_id"
-        _cache_breakdowns = _normalize_breakdowns_for_cache(())
-        meta_data = _fetch_meta_cached(selected_period, meta_campaign_filter, custom_start_str, custom_end_str, "campaign", _cache_breakdowns, _cache_app_id)
-        ga4_data = _fetch_ga4_cached(selected_period, custom_start_str, custom_end_str, ga4_campaign_filter)
-        creative_data = _fetch_creative_cached(selected_period, meta_campaign_filter, custom_start_str, custom_end_str)
-        trends_data = _fetch_trends_cached(selected_period, meta_campaign_filter, custom_start_str, custom_end_str)
-        cycle_status = data_provider.get_cycle_status(selected_period, meta_data, creative_data)
-        events_mode = Config.get_events_mode()
-        landing_events_card_data = data_provider.get_landing_events_card_data(selected_period, custom_start_str, custom_end_str)
-except Exception as e:
-    logger.error(f"Erro ao carregar dados do módulo Premium: {e}")
-    meta_data = {
-        **data_provider._empty_meta_metrics(),
-        "_data_source": "error",
-        "_requested_filter": meta_campaign_filter,
-    }
-    ga4_data = {
-        "sessoes": 0, "usuarios": 0, "pageviews": 0,
-        "taxa_engajamento": 0, "tempo_medio": "0m 0s",
-        "delta_sessoes": 0, "delta_usuarios": 0, "delta_pageviews": 0,
-        "delta_engajamento": 0, "_data_source": "error"
-    }
-    creative_data = {}
-    trends_data = []
-    events_mode = Config.get_events_mode()
-    landing_events_card_data = {"status": "error", "title": "Eventos (em desenvolvimento)", "message": "Integração GA4/Meta em configuração. Este bloco será ativado quando GA4_PROPERTY_ID e credenciais estiverem válidos.", "checklist": ["Adicionar a service account como Viewer na propriedade GA4", "Setar GA4_PROPERTY_ID", "Validar eventos da landing page"], "error": "Falha no carregamento de dados."}
-
-# -----------------------------------------------------------------------------
-# REFRESH BUTTON + LAST UPDATED TIMESTAMP
+# REFRESH BUTTON
 # -----------------------------------------------------------------------------
 _refresh_cols = st.columns([5, 1, 1])
 with _refresh_cols[1]:
     if st.button("Atualizar dados", key="btn_refresh_data"):
         st.cache_data.clear()
+        DataProvider.clear_api_caches()
+        st.session_state["ai_precompute_force"] = True
         st.rerun()
 with _refresh_cols[2]:
     if st.button("Limpar cache", key="btn_clear_cache"):
         st.cache_data.clear()
+        DataProvider.clear_api_caches()
+        Config.invalidate()  # env/secrets alterados valem já, sem esperar o TTL do snapshot
+        st.session_state["ai_precompute_force"] = True
         st.rerun()
 
-_fetch_ts = meta_data.get("_fetch_timestamp")
-if _fetch_ts:
-    st.caption(f"Dados atualizados em: {_fetch_ts[:19].replace('T', ' ')} (SP)")
-else:
-    st.caption(f"Dados carregados em: {_now_sp()} (SP)")
+# -----------------------------------------------------------------------------
+# CARREGAR DADOS EM PARALELO (renderização progressiva)
+# -----------------------------------------------------------------------------
+# As fontes são buscadas no pool do processo; cada seção abaixo entra como skeleton
+# e é preenchida no fim do script, assim que as fontes de que depende ficam prontas.
+_cache_app_id = data_provider.meta_client.app_id if data_provider.meta_client else "no_app_id"
+_cache_breakdowns = _normalize_breakdowns_for_cache(())
+meta_dataset_key = (selected_period, meta_campaign_filter, custom_start_str, custom_end_str, "campaign", _cache_breakdowns, _cache_app_id)
+ga4_dataset_key = (selected_period, custom_start_str, custom_end_str, ga4_campaign_filter)
+# Configuração resolvida e congelada (sem consultar env/secrets nem parsear credenciais a cada rerun)
+app_config = Config.snapshot()
+events_mode = app_config.events_mode
+show_install_kpis = app_config.install_campaigns_configured
+# SDK aparece nos KPIs de instalação e no painel admin; o funil pede a etapa à parte
+# quando o Meta base não basta para escolher o modo (ver _funnel_mode_needs_sdk)
+sdk_enrichment_displayed = show_install_kpis or bool(st.session_state.get("show_integration_settings"))
+
+_data_futures = {
+    submit_with_session(_fetch_meta_cached, *meta_dataset_key): "meta",
+    submit_with_session(_fetch_ga4_cached, *ga4_dataset_key): "ga4",
+    submit_with_session(_fetch_creative_cached, selected_period, meta_campaign_filter, custom_start_str, custom_end_str): "creative",
+    submit_with_session(_fetch_trends_cached, selected_period, meta_campaign_filter, custom_start_str, custom_end_str): "trends",
+    submit_with_session(_fetch_source_medium_cached, selected_period, custom_start_str, custom_end_str, ga4_campaign_filter): "source_medium",
+    submit_with_session(_fetch_events_cached, selected_period, custom_start_str, custom_end_str, ga4_campaign_filter): "events",
+}
+
+
+def _data_fallback(name):
+    """Valor usado quando uma fonte falha (a seção renderiza o estado vazio/erro)."""
+    if name == "meta":
+        return {**data_provider._empty_meta_metrics(), "_data_source": "error", "_requested_filter": meta_campaign_filter}
+    if name == "ga4":
+        return {
+            "sessoes": 0, "usuarios": 0, "pageviews": 0,
+            "taxa_engajamento": 0, "tempo_medio": "0m 0s",
+            "delta_sessoes": 0, "delta_usuarios": 0, "delta_pageviews": 0,
+            "delta_engajamento": 0, "_data_source": "error"
+        }
+    if name in ("source_medium", "events"):
+        return pd.DataFrame()
+    if name == "trends":
+        return []
+    return {}
+
+
+def render_data_timestamp(meta_data):
+    _fetch_ts = meta_data.get("_fetch_timestamp")
+    if _fetch_ts:
+        st.caption(f"Dados atualizados em: {_fetch_ts[:19].replace('T', ' ')} (SP)")
+    else:
+        st.caption(f"Dados carregados em: {_now_sp()} (SP)")
+
+
+progressive_section(("meta",), lambda d: render_data_timestamp(d["meta"]), height=24, label="")
 
 
 # -----------------------------------------------------------------------------
 # SDK EVENTS — dados para uso interno (sem poluir a tela)
 # -----------------------------------------------------------------------------
-_diag = meta_data.get("_sdk_diagnostics", {})
-_data_source = meta_data.get("_data_source", "unknown")
-_sdk_installs = meta_data.get("instalacoes_sdk", 0)
-_all_sdk_events = meta_data.get("_all_sdk_events", {})
-_sdk_source = meta_data.get("_sdk_source", "none")
-_sdk_errors = meta_data.get("_sdk_errors", [])
-_sdk_debug = meta_data.get("_sdk_debug", {})
-
-# Painel de diagnóstico SDK (apenas modo admin — colapsado por padrão)
-if st.session_state.get("show_integration_settings") and _data_source in ("real", "real_no_filter"):
+def render_sdk_admin_panel(meta_data):
+    # Painel de diagnóstico SDK (apenas modo admin — colapsado por padrão)
+    if meta_data.get("_data_source", "unknown") not in ("real", "real_no_filter"):
+        return
+    _sdk_errors = meta_data.get("_sdk_errors", [])
     with st.expander("🔧 Instalações Meta (admin)", expanded=False):
         st.info("Aguardando integração com campanha de instalações Meta.")
         if _sdk_errors:
@@ -1822,134 +522,158 @@ if st.session_state.get("show_integration_settings") and _data_source in ("real"
             for err in _sdk_errors:
                 st.caption(f"• {err}")
 
-# -----------------------------------------------------------------------------
-# STATUS DO CICLO (COM CORUJA)
-# -----------------------------------------------------------------------------
-try:
-    owl_img = f'<img src="data:image/png;base64,{logo_base64}" class="status-owl">' if logo_base64 else ''
-except Exception as e:
-    logger.error(f"Erro ao gerar imagem da coruja: {e}")
-    owl_img = ''
-insights_text = ". ".join(cycle_status["insights"]) + "."
-campaign_objective_map = {
-    "Ciclo 2": "Conversão na landing page",
-    "Ciclo 1": "Reconhecimento de marca",
-    "Todas": "Múltiplos objetivos",
-}
-campaign_objective = campaign_objective_map.get(campanha, "Conversão na landing page")
-status_line = f"{insights_text} Objetivo da campanha: {campaign_objective}. {cycle_status['phase']}."
 
-st.markdown(f'''
-<div class="status-card">
-    {owl_img}
-    <div class="status-text">{status_line}</div>
-</div>
-''', unsafe_allow_html=True)
+if st.session_state.get("show_integration_settings"):
+    progressive_section(("meta_full",), lambda d: render_sdk_admin_panel(d["meta_full"]), height=48, label="Carregando eventos SDK...")
 
-if st.session_state.show_integration_settings:
-    # Indicador discreto de fonte de dados (apenas em modo admin)
-    data_source = meta_data.get("_data_source", "unknown")
-    if data_source == "real":
-        st.caption(f"✅ Meta Ads conectado | Filtro: {meta_data.get('_filter_applied', 'Nenhum')}")
-    elif data_source == "real_no_filter":
-        st.caption(f"⚠️ Meta Ads: Sem dados para '{meta_data.get('_requested_filter')}'. Mostrando total da conta.")
-    else:
-        st.caption("💡 Dados de demonstração. Configure as credenciais no Streamlit Secrets.")
 
-# =============================================================================
-# SEÇÃO DE ANÁLISE COM IA (PRIMEIRA DOBRA)
-# =============================================================================
-st.markdown('<div class="section-title"><div class="section-icon">🤖</div> Análise com IA</div>', unsafe_allow_html=True)
+# -----------------------------------------------------------------------------
+# STATUS DO CICLO (COM CORUJA)
+# -----------------------------------------------------------------------------
+def render_cycle_status(meta_data, creative_data):
+    cycle_status = data_provider.get_cycle_status(selected_period, meta_data, creative_data)
+    try:
+        owl_img = f'<img src="{logo_url}" class="status-owl">' if logo_url else ''
+    except Exception as e:
+        logger.error(f"Erro ao gerar imagem da coruja: {e}")
+        owl_img = ''
+    insights_text = ". ".join(cycle_status["insights"]) + "."
+    campaign_objective_map = {
+        "Ciclo 2": "Conversão na landing page",
+        "Ciclo 1": "Reconhecimento de marca",
+        "Todas": "Múltiplos objetivos",
+    }
+    campaign_objective = campaign_objective_map.get(campanha, "Conversão na landing page")
+    status_line = f"{insights_text} Objetivo da campanha: {campaign_objective}. {cycle_status['phase']}."
 
-# Verificar se a API key e AIAgent estão disponíveis
-if AIAgent is None:
     st.markdown(f'''
-    <div class="glass-card" style="padding: 20px; text-align: center;">
-        <p style="color: {LIA["text_muted"]}; margin: 0;">
-            ⚠️ IA Agent desativado (dependência OpenAI indisponível).
-        </p>
+    <div class="status-card">
+        {owl_img}
+        <div class="status-text">{status_line}</div>
     </div>
     ''', unsafe_allow_html=True)
-elif Config.validate_openai_credentials():
-    # Determinar o ciclo baseado na campanha selecionada
-    cycle = campanha if campanha in ["Ciclo 1", "Ciclo 2"] else "Todos os Ciclos"
-
-    # Botão para gerar análise
-    st.markdown('<div class="ai-analysis-button">', unsafe_allow_html=True)
-    if st.button("🔮 Gerar Análise com IA", key="btn_ai_analysis", use_container_width=True):
-        with st.spinner("Analisando dados com IA..."):
-            try:
-                # Inicializar o agente de IA
-                ai_agent = AIAgent(api_key=Config.get_openai_api_key())
-
-                # Preparar dados para análise
-                analysis_meta_data = {
-                    "investimento": meta_data.get("investimento", 0),
-                    "impressoes": meta_data.get("impressoes", 0),
-                    "alcance": meta_data.get("alcance", 0),
-                    "frequencia": meta_data.get("frequencia", 0),
-                    "cliques_link": meta_data.get("cliques_link", 0),
-                    "ctr_link": meta_data.get("ctr_link", 0),
-                    "cpc_link": meta_data.get("cpc_link", 0),
-                    "cpm": meta_data.get("cpm", 0),
-                    "delta_ctr": meta_data.get("delta_ctr", 0),
-                    "delta_cpc": meta_data.get("delta_cpc", 0),
-                    "delta_cliques": meta_data.get("delta_cliques", 0),
-                }
-
-                analysis_ga4_data = {
-                    "sessoes": ga4_data.get("sessoes", 0),
-                    "usuarios": ga4_data.get("usuarios", 0),
-                    "pageviews": ga4_data.get("pageviews", 0),
-                    "taxa_engajamento": ga4_data.get("taxa_engajamento", 0),
-                    "tempo_medio": ga4_data.get("tempo_medio", "N/A"),
-                }
-
-                # Gerar análise
-                analysis = ai_agent.analyze(
-                    meta_data=analysis_meta_data,
-                    ga4_data=analysis_ga4_data,
-                    creative_data=creative_data,
-                    source_data=data_provider.get_source_medium(period=selected_period, custom_start=custom_start_str, custom_end=custom_end_str, campaign_filter=ga4_campaign_filter),
-                    events_data=data_provider.get_events_data(period=selected_period, custom_start=custom_start_str, custom_end=custom_end_str, campaign_filter=ga4_campaign_filter),
-                    period=selected_period,
-                    cycle=cycle
-                )
 
-                # Salvar análise no session state
-                st.session_state['ai_analysis'] = analysis
-                st.session_state['ai_analysis_cycle'] = cycle
+    if st.session_state.show_integration_settings:
+        # Indicador discreto de fonte de dados (apenas em modo admin)
+        data_source = meta_data.get("_data_source", "unknown")
+        if data_source == "real":
+            st.caption(f"✅ Meta Ads conectado | Filtro: {meta_data.get('_filter_applied', 'Nenhum')}")
+        elif data_source == "real_no_filter":
+            st.caption(f"⚠️ Meta Ads: Sem dados para '{meta_data.get('_requested_filter')}'. Mostrando total da conta.")
+        else:
+            st.caption("💡 Dados de demonstração. Configure as credenciais no Streamlit Secrets.")
+
+        with st.expander("⏱️ Perfil de inicialização (admin)", expanded=False):
+            st.caption(f"Processo ativo há {startup_profile.uptime_seconds():.0f}s · tempos do cold start (primeira medição)")
+            st.dataframe(
+                pd.DataFrame(startup_profile.snapshot(), columns=["Fase", "ms"]),
+                hide_index=True,
+                use_container_width=True,
+            )
 
-            except Exception as e:
-                logger.error(f"Erro ao gerar análise de IA: {e}")
-                st.error(f"Erro ao gerar análise: {str(e)}")
-    st.markdown('</div>', unsafe_allow_html=True)
 
-    # Exibir análise salva se existir
-    if 'ai_analysis' in st.session_state:
-        analysis_cycle = st.session_state.get('ai_analysis_cycle', 'Ciclo 2')
+progressive_section(("meta", "creative"), lambda d: render_cycle_status(d["meta"], d["creative"]), height=72, label="Sincronizando dados...")
+
+# =============================================================================
+# SEÇÃO DE ANÁLISE COM IA (PRIMEIRA DOBRA)
+# =============================================================================
+@st.fragment
+def render_ai_section(meta_data, ga4_data, creative_data, source_medium_data, ga4_events_data, selected_period, campanha):
+    """Painel de IA: o botão reexecuta só este trecho."""
+    st.markdown('<div class="section-title"><div class="section-icon">🤖</div> Análise com IA</div>', unsafe_allow_html=True)
+
+    # Verificar se a API key e AIAgent estão disponíveis
+    if not AI_AGENT_AVAILABLE:
         st.markdown(f'''
-        <div class="ai-agent-card">
-            <div class="ai-agent-header">
-                <div class="ai-agent-icon">🦉</div>
-                <div>
-                    <div class="ai-agent-title">LIA - Análise Inteligente</div>
-                    <div class="ai-agent-subtitle">Análise do {analysis_cycle} • Powered by GPT-4</div>
+        <div class="glass-card" style="padding: 20px; text-align: center;">
+            <p style="color: {LIA["text_muted"]}; margin: 0;">
+                ⚠️ IA Agent desativado (dependência OpenAI indisponível).
+            </p>
+        </div>
+        ''', unsafe_allow_html=True)
+    elif Config.snapshot().ai_backend_ready:
+        # Determinar o ciclo baseado na campanha selecionada
+        cycle = cycle_for_campaign(campanha)
+        regenerate = st.session_state.pop("ai_regenerate_requested", False)
+
+        # Botão para gerar análise
+        st.markdown('<div class="ai-analysis-button">', unsafe_allow_html=True)
+        generate = st.button("🔮 Gerar Análise com IA", key="btn_ai_analysis", use_container_width=True)
+        if generate or regenerate:
+            # Texto parcial aparece aqui conforme os tokens chegam; ao terminar vira o card abaixo
+            stream_slot = st.empty()
+            with st.spinner("Analisando dados com IA..."):
+                try:
+                    ai_agent = _new_ai_agent()
+                    analysis_inputs = _ai_analysis_inputs(meta_data, ga4_data, creative_data, source_medium_data, ga4_events_data)
+
+                    # Análise já guardada (pré-gerada ou pedida antes) para este período/ciclo aparece na hora;
+                    # se os números mudaram desde então, o card oferece "Regenerar"
+                    latest = None
+                    if generate and selected_period != "custom":
+                        latest = ai_agent.latest_analysis(**analysis_inputs, period=selected_period, cycle=cycle)
+
+                    if latest is not None:
+                        analysis, data_changed = latest
+                    else:
+                        # Gerar análise em streaming (markdown parcial a cada token)
+                        with stream_slot.container():
+                            analysis = st.write_stream(ai_agent.analyze_stream(
+                                **analysis_inputs,
+                                period=selected_period,
+                                cycle=cycle
+                            ))
+                        stream_slot.empty()
+                        data_changed = False
+
+                    # Salvar análise no session state
+                    st.session_state['ai_analysis'] = analysis
+                    st.session_state['ai_analysis_cycle'] = cycle
+                    st.session_state['ai_analysis_stale'] = data_changed
+
+                except Exception as e:
+                    logger.error(f"Erro ao gerar análise de IA: {e}")
+                    st.error(f"Erro ao gerar análise: {str(e)}")
+        st.markdown('</div>', unsafe_allow_html=True)
+
+        # Exibir análise salva se existir
+        if 'ai_analysis' in st.session_state:
+            analysis_cycle = st.session_state.get('ai_analysis_cycle', 'Ciclo 2')
+            st.markdown(f'''
+            <div class="ai-agent-card">
+                <div class="ai-agent-header">
+                    <div class="ai-agent-icon">🦉</div>
+                    <div>
+                        <div class="ai-agent-title">LIA - Análise Inteligente</div>
+                        <div class="ai-agent-subtitle">Análise do {analysis_cycle} • Powered by GPT-4</div>
+                    </div>
+                </div>
+                <div class="ai-agent-content">
+                    {st.session_state['ai_analysis']}
                 </div>
             </div>
-            <div class="ai-agent-content">
-                {st.session_state['ai_analysis']}
-            </div>
+            ''', unsafe_allow_html=True)
+            if st.session_state.get('ai_analysis_stale'):
+                st.caption("Os dados mudaram desde esta análise.")
+                st.button(
+                    "🔄 Regenerar com os dados atuais", key="btn_ai_regenerate", use_container_width=True,
+                    on_click=lambda: st.session_state.update(ai_regenerate_requested=True),
+                )
+    else:
+        st.markdown(f'''
+        <div class="glass-card" style="padding: 20px; text-align: center;">
+            <p style="color: {LIA["text_muted"]}; margin: 0;">
+                🔒 Configure a chave da API OpenAI no Streamlit Secrets para habilitar a análise com IA.
+            </p>
         </div>
         ''', unsafe_allow_html=True)
-else:
-    st.markdown(f'''
-    <div class="glass-card" style="padding: 20px; text-align: center;">
-        <p style="color: {LIA["text_muted"]}; margin: 0;">
-            🔒 Configure a chave da API OpenAI no Streamlit Secrets para habilitar a análise com IA.
-        </p>
-    </div>
-    ''', unsafe_allow_html=True)
+
+
+progressive_section(
+    ("meta", "ga4", "creative", "source_medium", "events"),
+    lambda d: render_ai_section(d["meta"], d["ga4"], d["creative"], d["source_medium"], d["events"], selected_period, campanha),
+    height=96,
+)
 
 # =============================================================================
 # CAMADA DE CONTEUDO CENTRAL
@@ -1958,133 +682,82 @@ else:
 # -----------------------------------------------------------------------------
 # META ADS (KPIs)
 # -----------------------------------------------------------------------------
-def build_kpi_card(icon, label, value, delta, suffix="%", invert=False, precision=1):
-    delta_class = "delta-neutral"
-    delta_text = "stable"
-
-    if delta is not None and delta != 0:
-        is_positive = delta > 0
-        # Se invert=True, positivo é ruim (ex: CPC subindo)
-        is_good = not is_positive if invert else is_positive
-        delta_class = "delta-up" if is_good else "delta-down"
-        icon_delta = "↑" if is_positive else "↓"
-        delta_text = f"{icon_delta} {abs(delta):.{precision}f}{suffix}"
-
-    card_id = "kpi-" + "".join(
-        char.lower() if char.isalnum() else "-" for char in str(label)
-    ).strip("-")
-
-    return textwrap.dedent(f"""
-    <label class="kpi-card" id="{card_id}">
-        <input type="checkbox" />
-        <div class="kpi-inner">
-            <div class="kpi-front">
-                <div class="kpi-top">
-                    <div style="display:flex;align-items:center;gap:8px;">
-                        <div class="kpi-icon">{icon}</div>
-                        <div class="kpi-label">{label}</div>
-                    </div>
-                    <span style="font-size:16px;color:{LIA["text_muted"]};">⋯</span>
-                </div>
-                <div class="kpi-value">{value}</div>
-                <div class="kpi-delta {delta_class}">{delta_text}</div>
-            </div>
-            <div class="kpi-back">
-                <div class="kpi-top">
-                    <div class="kpi-label">{label}</div>
-                    <span style="font-size:14px;color:{LIA["text_muted"]};">✕</span>
-                </div>
-                <h3 style="margin:0;font-size:18px;color:{LIA["text_dark"]};">{value}</h3>
-                <p>Variação: <span class="{delta_class}">{delta_text}</span></p>
-            </div>
-        </div>
-    </label>
-    """).strip()
-
-meta_cards_data = {**meta_data, "show_install_kpis": Config.get_install_campaigns_configured()}
-kpi_cards = build_meta_kpi_cards_payload(meta_cards_data)
-
-kpi_cards_html = "\n".join(
-    build_kpi_card(
-        card["icon"],
-        card["label"],
-        card["value"],
-        card["delta"],
-        suffix=card.get("suffix", "%"),
-        invert=card.get("invert", False),
-        precision=card.get("precision", 1),
-    )
-    for card in kpi_cards
-)
-
-kpi_section = textwrap.dedent(f"""
-<div class="glass-card">
+@st.fragment
+def render_meta_kpi_section(kpi_cards_html):
+    st.markdown(f"""<div class="glass-card">
   <div class="section-title"><div class="section-icon">$</div> Resultados dos anúncios (Meta Ads)</div>
   <div class="kpi-grid">
 {kpi_cards_html}
   </div>
-</div>
-""")
+</div>""", unsafe_allow_html=True)
 
-st.markdown(kpi_section, unsafe_allow_html=True)
+
+def _render_meta_kpis(meta_data):
+    render_meta_kpi_section(_meta_kpi_cards_html_cached(
+        meta_dataset_key,
+        _payload_fingerprint(meta_data),
+        show_install_kpis,
+        meta_data,
+    ))
+
+
+# O grid sai com os dados base do Meta; os KPIs de instalação são atualizados quando o SDK chega
+progressive_section(
+    ("meta",),
+    lambda d: _render_meta_kpis(d.get("meta_full", d["meta"])),
+    refresh=("meta_full",) if show_install_kpis else (),
+    height=260,
+    label="Carregando resultados dos anúncios...",
+)
 
 # -----------------------------------------------------------------------------
 # PERFORMANCE POR CRIATIVO
 # -----------------------------------------------------------------------------
-st.markdown('<div class="glass-card">', unsafe_allow_html=True)
-st.markdown('<div class="section-title"><div class="section-icon">*</div> Desempenho por anúncio</div>', unsafe_allow_html=True)
+@st.fragment
+def render_creatives_section(creative_data):
+    st.markdown('<div class="glass-card">', unsafe_allow_html=True)
+    st.markdown('<div class="section-title"><div class="section-icon">*</div> Desempenho por anúncio</div>', unsafe_allow_html=True)
 
-if len(creative_data) > 0:
-    try:
-        best_ctr_idx = creative_data["Taxa de cliques"].idxmax()
-        best_ctr_name = str(creative_data.loc[best_ctr_idx, "Criativo"])[:22]
+    if len(creative_data) > 0:
+        try:
+            best_ctr_idx = creative_data["Taxa de cliques"].idxmax()
+            best_ctr_name = str(creative_data.loc[best_ctr_idx, "Criativo"])[:22]
 
-        st.markdown(f'''
-        <div class="badge-row">
-            <div class="badge badge-orange">Criativo campeão: {best_ctr_name}... ({creative_data.loc[best_ctr_idx, "Taxa de cliques"]:.2f}% taxa de cliques)</div>
+            st.markdown(f'''
+            <div class="badge-row">
+                <div class="badge badge-orange">Criativo campeão: {best_ctr_name}... ({creative_data.loc[best_ctr_idx, "Taxa de cliques"]:.2f}% taxa de cliques)</div>
+            </div>
+            ''', unsafe_allow_html=True)
+
+            st.markdown('<div class="table-container">', unsafe_allow_html=True)
+            st.markdown('<div class="table-header"><span class="table-header-title">Desempenho de cada anúncio</span></div>', unsafe_allow_html=True)
+
+            # Mostrar todos os criativos, ordenados por CTR (campeão primeiro)
+            creative_display = creative_data.sort_values('Taxa de cliques', ascending=False)
+            creative_formats = {
+                "Valor gasto": "$ {:,.2f}",
+                "Exibições": "{:,.0f}",
+                "Cliques": "{:,.0f}",
+                "Taxa de cliques": "{:.2f}%",
+                "Custo por clique": "$ {:,.2f}",
+                "Custo por mil": "$ {:,.2f}",
+            }
+            render_paginated_table(creative_display, key="page_creatives", formats=creative_formats)
+            st.markdown('</div>', unsafe_allow_html=True)
+        except Exception as e:
+            logger.error(f"Erro ao renderizar tabela de criativos: {e}")
+            render_error_card("Dados de criativos indisponiveis", "Estamos processando as informacoes de criativos.")
+    else:
+            st.markdown(f'''
+        <div class="empty-state" style="background:{LIA["bg_card"]};border-radius:20px;padding:32px;text-align:center;border:1px dashed {LIA["border"]};backdrop-filter:blur(16px);-webkit-backdrop-filter:blur(16px);">
+            <p style="color:{LIA["text_secondary"]};margin:0;">Nenhum dado de criativo encontrado no periodo selecionado.</p>
         </div>
         ''', unsafe_allow_html=True)
 
-        st.markdown('<div class="table-container">', unsafe_allow_html=True)
-        st.markdown('<div class="table-header"><span class="table-header-title">Desempenho de cada anúncio</span></div>', unsafe_allow_html=True)
-
-        # Mostrar todos os criativos, ordenados por CTR (campeão primeiro)
-        creative_display = creative_data.sort_values('Taxa de cliques', ascending=False)
-        creative_formatters = {
-            "Valor gasto": lambda value: f"$ {value:,.2f}",
-            "Exibições": lambda value: f"{value:,.0f}",
-            "Cliques": lambda value: f"{value:,.0f}",
-            "Taxa de cliques": lambda value: f"{value:.2f}%",
-            "Custo por clique": lambda value: f"$ {value:,.2f}",
-            "Custo por mil": lambda value: f"$ {value:,.2f}",
-        }
-        columns = list(creative_display.columns)
-        header_cells = "".join(f"<th>{html.escape(str(col))}</th>" for col in columns)
-        body_rows = []
-        for _, row in creative_display.iterrows():
-            row_cells = []
-            for col in columns:
-                value = row[col]
-                if col in creative_formatters and pd.notna(value):
-                    formatted = creative_formatters[col](value)
-                else:
-                    formatted = "" if pd.isna(value) else str(value)
-                row_cells.append(f"<td>{html.escape(formatted)}</td>")
-            body_rows.append("<tr>" + "".join(row_cells) + "</tr>")
-        creative_table_html = f"""<table class="lia-html-table"><thead><tr>{header_cells}</tr></thead><tbody>{''.join(body_rows)}</tbody></table>"""
-        st.markdown(creative_table_html, unsafe_allow_html=True)
-        st.markdown('</div>', unsafe_allow_html=True)
-    except Exception as e:
-        logger.error(f"Erro ao renderizar tabela de criativos: {e}")
-        render_error_card("Dados de criativos indisponiveis", "Estamos processando as informacoes de criativos.")
-else:
-        st.markdown(f'''
-    <div class="empty-state" style="background:{LIA["bg_card"]};border-radius:20px;padding:32px;text-align:center;border:1px dashed {LIA["border"]};backdrop-filter:blur(16px);-webkit-backdrop-filter:blur(16px);">
-        <p style="color:{LIA["text_secondary"]};margin:0;">Nenhum dado de criativo encontrado no periodo selecionado.</p>
-    </div>
-    ''', unsafe_allow_html=True)
+    st.markdown('</div>', unsafe_allow_html=True)
 
-st.markdown('</div>', unsafe_allow_html=True)
+
+progressive_section(("creative",), lambda d: render_creatives_section(d["creative"]), height=220, label="Carregando criativos...")
 
 # -----------------------------------------------------------------------------
 # ESCOPO DO CICLO
@@ -2099,403 +772,279 @@ st.markdown(f'''
 # -----------------------------------------------------------------------------
 # TENDENCIA TEMPORAL
 # -----------------------------------------------------------------------------
-st.markdown('<div class="glass-card">', unsafe_allow_html=True)
-st.markdown('<div class="section-title"><div class="section-icon">~</div> Evolução ao longo do tempo</div>', unsafe_allow_html=True)
+@st.fragment
+def render_trends_section(trends_data):
+    st.markdown('<div class="glass-card">', unsafe_allow_html=True)
+    st.markdown('<div class="section-title"><div class="section-icon">~</div> Evolução ao longo do tempo</div>', unsafe_allow_html=True)
 
-if isinstance(trends_data, pd.DataFrame) and not trends_data.empty and "Data" in trends_data.columns:
-    try:
-        st.markdown('<div class="chart-card trend-toggle">', unsafe_allow_html=True)
-        st.markdown('<div class="section-title"><div class="section-icon">~</div> Cliques por dia</div>', unsafe_allow_html=True)
-
-        trend_tabs = st.tabs(["Diário", "Semanal"])
-        trend_daily = trends_data.copy()
-        # Use explicit format to avoid parsing warnings (Data is in format "dd/mm")
-        trend_daily["__date"] = pd.to_datetime(trend_daily["Data"], format="%d/%m", errors="coerce")
-        current_year = datetime.now().year
-        trend_daily["__date"] = trend_daily["__date"].apply(
-            lambda value: value.replace(year=current_year) if pd.notna(value) else value
-        )
-
-        with trend_tabs[0]:
-            fig_daily = go.Figure()
-            fig_daily.add_trace(go.Scatter(
-                x=trend_daily["Data"],
-                y=trend_daily["Cliques"],
-                mode="lines",
-                line=dict(color=LIA["primary"], width=3, shape="spline"),
-                fill="tozeroy",
-                fillcolor="rgba(92,201,182,0.2)"
-            ))
-            fig_daily.update_layout(
-                height=260,
-                margin=dict(l=10, r=10, t=10, b=10),
-                paper_bgcolor="rgba(247,249,252,0)",
-                plot_bgcolor="rgba(247,249,252,0)",
-                xaxis=dict(showgrid=False, tickfont=dict(size=11, color=LIA["text_secondary"]), tickcolor=LIA["text_secondary"]),
-                yaxis=dict(showgrid=True, gridcolor="rgba(92,201,182,0.12)", tickfont=dict(size=11, color=LIA["text_secondary"])),
-                showlegend=False
-            )
-            st.plotly_chart(fig_daily, use_container_width=True)
+    if isinstance(trends_data, pd.DataFrame) and not trends_data.empty and "Data" in trends_data.columns:
+        try:
+            st.markdown('<div class="chart-card trend-toggle">', unsafe_allow_html=True)
+            st.markdown('<div class="section-title"><div class="section-icon">~</div> Cliques por dia</div>', unsafe_allow_html=True)
 
-        with trend_tabs[1]:
-            weekly = trend_daily.dropna(subset=["__date"]).set_index("__date").resample("W-MON")["Cliques"].sum().reset_index()
-            weekly["Label"] = weekly["__date"].dt.strftime("Sem %d/%m")
-            if weekly.empty:
-                st.markdown(f'''
-                <div class="empty-state" style="background:{LIA["bg_card"]};border-radius:20px;padding:24px;text-align:center;border:1px dashed {LIA["border"]};">
-                    <p style="color:{LIA["text_secondary"]};margin:0;">Sem dados suficientes para consolidar as semanas.</p>
-                </div>
-            ''', unsafe_allow_html=True)
-            else:
-                fig_weekly = go.Figure()
-                fig_weekly.add_trace(go.Scatter(
-                    x=weekly["Label"],
-                    y=weekly["Cliques"],
-                    mode="lines",
-                    line=dict(color=LIA["secondary"], width=3, shape="spline"),
-                    fill="tozeroy",
-                    fillcolor="rgba(122,92,255,0.18)"
-                ))
-                fig_weekly.update_layout(
-                    height=260,
-                    margin=dict(l=10, r=10, t=10, b=10),
-                    paper_bgcolor="rgba(247,249,252,0)",
-                    plot_bgcolor="rgba(247,249,252,0)",
-                    xaxis=dict(showgrid=False, tickfont=dict(size=11, color=LIA["text_secondary"])),
-                    yaxis=dict(showgrid=True, gridcolor="rgba(92,201,182,0.12)", tickfont=dict(size=11, color=LIA["text_secondary"])),
-                    showlegend=False
-                )
-                st.plotly_chart(fig_weekly, use_container_width=True)
+            trend_tabs = st.tabs(["Diário", "Semanal"])
+            # Datas e consolidação semanal calculadas uma vez por conteúdo (charts.build_trend_frames)
+            trend_daily, weekly = build_trend_frames(trends_data)
 
-        st.markdown('</div>', unsafe_allow_html=True)
+            with trend_tabs[0]:
+                st.plotly_chart(daily_clicks_figure(trend_daily), use_container_width=True)
 
-        chart_cols = st.columns(3)
-
-        with chart_cols[0]:
-            st.markdown('<div class="chart-card">', unsafe_allow_html=True)
-            fig1 = go.Figure()
-            fig1.add_trace(go.Scatter(
-                x=trends_data["Data"],
-                y=trends_data["Cliques"],
-                mode="lines+markers",
-                line=dict(color=LIA["primary"], width=2, shape='spline'),
-                marker=dict(size=6, color=LIA["primary"]),
-                fill="tozeroy",
-                fillcolor="rgba(92,201,182,0.16)"
-            ))
-            fig1.update_layout(
-                title=dict(text="Cliques/Dia", font=dict(size=14, color=LIA["text_light"], family="Inter")),
-                height=220, margin=dict(l=10, r=10, t=40, b=30),
-                paper_bgcolor="rgba(247,249,252,0)", plot_bgcolor="rgba(247,249,252,0)",
-                xaxis=dict(showgrid=False, tickfont=dict(size=11, color=LIA["text_secondary"]), showline=True, linecolor="rgba(92,201,182,0.2)"),
-                yaxis=dict(showgrid=True, gridcolor="rgba(92,201,182,0.12)", tickfont=dict(size=11, color=LIA["text_secondary"]), showline=True, linecolor="rgba(92,201,182,0.2)"),
-                showlegend=False
-            )
-            st.plotly_chart(fig1, use_container_width=True)
-            st.markdown('</div>', unsafe_allow_html=True)
+            with trend_tabs[1]:
+                if weekly.empty:
+                    st.markdown(f'''
+                    <div class="empty-state" style="background:{LIA["bg_card"]};border-radius:20px;padding:24px;text-align:center;border:1px dashed {LIA["border"]};">
+                        <p style="color:{LIA["text_secondary"]};margin:0;">Sem dados suficientes para consolidar as semanas.</p>
+                    </div>
+                ''', unsafe_allow_html=True)
+                else:
+                    st.plotly_chart(weekly_clicks_figure(weekly), use_container_width=True)
 
-        with chart_cols[1]:
-            st.markdown('<div class="chart-card">', unsafe_allow_html=True)
-            fig2 = go.Figure()
-            fig2.add_trace(go.Scatter(
-                x=trends_data["Data"],
-                y=trends_data["CTR"],
-                mode="lines+markers",
-                line=dict(color=LIA["secondary"], width=2, shape='spline'),
-                marker=dict(size=6, color=LIA["secondary"]),
-                fill="tozeroy",
-                fillcolor="rgba(122,92,255,0.16)"
-            ))
-            fig2.update_layout(
-                title=dict(text="CTR/Dia (%)", font=dict(size=14, color=LIA["text_light"], family="Inter")),
-                height=220, margin=dict(l=10, r=10, t=40, b=30),
-                paper_bgcolor="rgba(247,249,252,0)", plot_bgcolor="rgba(247,249,252,0)",
-                xaxis=dict(showgrid=False, tickfont=dict(size=11, color=LIA["text_secondary"]), showline=True, linecolor="rgba(92,201,182,0.2)"),
-                yaxis=dict(showgrid=True, gridcolor="rgba(92,201,182,0.12)", tickfont=dict(size=11, color=LIA["text_secondary"]), showline=True, linecolor="rgba(92,201,182,0.2)"),
-                showlegend=False
-            )
-            st.plotly_chart(fig2, use_container_width=True)
             st.markdown('</div>', unsafe_allow_html=True)
 
-        with chart_cols[2]:
-            st.markdown('<div class="chart-card">', unsafe_allow_html=True)
-            fig3 = go.Figure()
-            fig3.add_trace(go.Scatter(
-                x=trends_data["Data"], y=trends_data["CPC"],
-                mode="lines+markers", line=dict(color=LIA["success"], width=3),
-                marker=dict(size=10, color=LIA["success"], line=dict(width=2, color=LIA["bg_dark"])),
-                fill="tozeroy", fillcolor="rgba(92,201,182,0.2)"
-            ))
-            fig3.update_layout(
-                title=dict(text="CPC/Dia ($)", font=dict(size=14, color=LIA["text_light"], family="Inter")),
-                height=220, margin=dict(l=10, r=10, t=40, b=30),
-                paper_bgcolor="rgba(247,249,252,0)", plot_bgcolor="rgba(247,249,252,0)",
-                xaxis=dict(showgrid=False, tickfont=dict(size=11, color=LIA["text_secondary"]), showline=True, linecolor="rgba(92,201,182,0.2)"),
-                yaxis=dict(showgrid=True, gridcolor="rgba(92,201,182,0.12)", tickfont=dict(size=11, color=LIA["text_secondary"]), showline=True, linecolor="rgba(92,201,182,0.2)"),
-                showlegend=False
-            )
-            st.plotly_chart(fig3, use_container_width=True)
-            st.markdown('</div>', unsafe_allow_html=True)
-    except Exception as e:
-        logger.error(f"Erro ao renderizar graficos: {e}")
-        render_error_card("Graficos indisponiveis", "Estamos processando os dados de tendencia.")
-else:
-    st.markdown(f'''
-    <div class="empty-state" style="background:{LIA["bg_card"]};border-radius:20px;padding:32px;text-align:center;border:1px dashed {LIA["border"]};backdrop-filter:blur(16px);-webkit-backdrop-filter:blur(16px);">
-        <p style="color:{LIA["text_secondary"]};margin:0;">Sem dados de tendência temporal para o período e campanha selecionados.</p>
-    </div>
-    ''', unsafe_allow_html=True)
+            chart_cols = st.columns(3)
 
-st.markdown('</div>', unsafe_allow_html=True)
+            with chart_cols[0]:
+                st.markdown('<div class="chart-card">', unsafe_allow_html=True)
+                st.plotly_chart(clicks_per_day_figure(trends_data), use_container_width=True)
+                st.markdown('</div>', unsafe_allow_html=True)
 
-# -----------------------------------------------------------------------------
-# FUNIL DE CONVERSÃO SIMPLES (Impressões -> Cliques -> Loja -> Instalações)
-# -----------------------------------------------------------------------------
-cols = st.columns([3, 2])
+            with chart_cols[1]:
+                st.markdown('<div class="chart-card">', unsafe_allow_html=True)
+                st.plotly_chart(ctr_per_day_figure(trends_data), use_container_width=True)
+                st.markdown('</div>', unsafe_allow_html=True)
 
-with cols[0]:
-    st.markdown('<div class="chart-card">', unsafe_allow_html=True)
-    st.markdown('<div class="section-title"><div class="section-icon">~</div> Cliques e taxa de cliques por dia</div>', unsafe_allow_html=True)
-    if isinstance(trends_data, pd.DataFrame) and not trends_data.empty and "Data" in trends_data.columns:
-        fig = go.Figure()
-        fig.add_trace(go.Scatter(x=trends_data["Data"], y=trends_data["Cliques"], name="Cliques", mode="lines+markers", line=dict(color=LIA["primary"], width=3, shape='spline'), marker=dict(size=8, color=LIA["primary"]), fill="tozeroy", fillcolor="rgba(92,201,182,0.16)"))
-        fig.add_trace(go.Scatter(x=trends_data["Data"], y=trends_data["CTR"], name="CTR %", yaxis="y2", mode="lines+markers", line=dict(color=LIA["success"], width=3, shape='spline'), marker=dict(size=8, color=LIA["success"])))
-        fig.update_layout(
-            yaxis2=dict(overlaying="y", side="right", range=[0, trends_data["CTR"].max() * 1.2] if trends_data["CTR"].max() > 0 else [0, 5], tickfont=dict(color=LIA["text_secondary"]), gridcolor="rgba(92,201,182,0.12)"),
-            yaxis=dict(tickfont=dict(color=LIA["text_secondary"]), gridcolor="rgba(92,201,182,0.12)"),
-            xaxis=dict(tickfont=dict(color=LIA["text_secondary"])),
-            legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1, font=dict(color=LIA["text_light"])),
-            height=350, margin=dict(l=0, r=0, t=30, b=0),
-            paper_bgcolor="rgba(247,249,252,0)", plot_bgcolor="rgba(247,249,252,0)",
-            hovermode="x unified"
-        )
-        st.plotly_chart(fig, use_container_width=True)
+            with chart_cols[2]:
+                st.markdown('<div class="chart-card">', unsafe_allow_html=True)
+                st.plotly_chart(cpc_per_day_figure(trends_data), use_container_width=True)
+                st.markdown('</div>', unsafe_allow_html=True)
+        except Exception as e:
+            logger.error(f"Erro ao renderizar graficos: {e}")
+            render_error_card("Graficos indisponiveis", "Estamos processando os dados de tendencia.")
     else:
         st.markdown(f'''
-        <div class="empty-state" style="background:{LIA["bg_card"]};border-radius:20px;padding:32px;text-align:center;border:1px dashed {LIA["border"]};">
-            <p style="color:{LIA["text_secondary"]};margin:0;">Sem dados de tendência para o período selecionado.</p>
+        <div class="empty-state" style="background:{LIA["bg_card"]};border-radius:20px;padding:32px;text-align:center;border:1px dashed {LIA["border"]};backdrop-filter:blur(16px);-webkit-backdrop-filter:blur(16px);">
+            <p style="color:{LIA["text_secondary"]};margin:0;">Sem dados de tendência temporal para o período e campanha selecionados.</p>
         </div>
-    ''', unsafe_allow_html=True)
-    st.markdown('</div>', unsafe_allow_html=True)
-
-with cols[1]:
-    st.markdown('<div class="chart-card">', unsafe_allow_html=True)
-
-    # Determinar modo do funil com base nos dados disponíveis
-    _has_install_events = int(meta_data.get("instalacoes_sdk", 0) or 0) > 0
-    _has_store_clicks = int(meta_data.get("store_clicks_meta", 0) or 0) > 0
-
-    if _has_install_events or _has_store_clicks:
-        # Funil de instalação: campanha de app install
-        st.markdown('<div class="section-title"><div class="section-icon">V</div> Caminho do usuário até a instalação</div>', unsafe_allow_html=True)
-        store_clicks_meta = int(meta_data.get("store_clicks_meta", 0) or 0)
-        funnel_labels = ["Viram o anúncio", "Clicaram no anúncio", "Foram para a loja do app", "Aguardando integração (campanha de instalações Meta)"]
-        funnel_values = [
-            int(meta_data.get('impressoes', 0) or 0),
-            int(meta_data.get('cliques_link', 0) or 0),
-            store_clicks_meta,
-            0,
-        ]
-        funnel_caption = "Funil de conversão · Etapa final de instalações aguardando integração com campanha de instalações Meta"
-    else:
-        # Funil de landing page: campanha de tráfego/conversão no site
-        st.markdown('<div class="section-title"><div class="section-icon">V</div> Caminho do usuário até a ação no site</div>', unsafe_allow_html=True)
+        ''', unsafe_allow_html=True)
 
-        # Buscar primary_cta_click do GA4 events
-        _cta_clicks = 0
-        try:
-            _events_df = data_provider.get_events_data(
-                period=selected_period,
-                custom_start=custom_start_str,
-                custom_end=custom_end_str,
-                campaign_filter=ga4_campaign_filter,
-            )
-            if not _events_df.empty and "Nome do Evento" in _events_df.columns:
-                _cta_rows = _events_df[_events_df["Nome do Evento"].str.contains("cta_click|primary_cta", case=False, na=False)]
-                if not _cta_rows.empty:
-                    # Extrair número da string formatada "10 (0.23%)"
-                    raw = str(_cta_rows.iloc[0]["Contagem de Eventos"])
-                    _cta_clicks = int(raw.replace(".", "").split("(")[0].strip().split()[0]) if raw else 0
-        except Exception:
-            _cta_clicks = 0
+    st.markdown('</div>', unsafe_allow_html=True)
 
-        ga4_sessions = int(ga4_data.get('sessoes', 0) or 0)
-        funnel_labels = ["Viram o anúncio", "Clicaram no anúncio", "Visitaram o site", "Clicaram no CTA"]
-        funnel_values = [
-            int(meta_data.get('impressoes', 0) or 0),
-            int(meta_data.get('cliques_link', 0) or 0),
-            ga4_sessions,
-            _cta_clicks,
-        ]
-        funnel_caption = "Funil de conversão · Mostra quantas pessoas passaram por cada etapa, desde ver o anúncio até clicar no CTA do site"
-
-    funnel_df = pd.DataFrame({"Etapa": funnel_labels, "Valor": funnel_values})
-    fig_funnel = go.Figure(go.Funnel(
-        y=funnel_df['Etapa'],
-        x=funnel_df['Valor'],
-        textposition="inside",
-        textinfo="value+percent initial",
-        marker=dict(
-            color=[LIA["primary"], LIA["secondary"], LIA["accent"], LIA["success"]],
-            line=dict(width=2, color=LIA["bg_dark"])
-        ),
-        textfont=dict(color=LIA["bg_dark"], size=12, family="Inter")
-    ))
-    fig_funnel.update_layout(
-        height=350,
-        margin=dict(l=40, r=40, t=40, b=40),
-        paper_bgcolor="rgba(247,249,252,0)",
-        plot_bgcolor="rgba(247,249,252,0)",
-        font=dict(color=LIA["text_light"])
-    )
-    st.plotly_chart(fig_funnel, use_container_width=True)
-    st.caption(funnel_caption)
-
-    # Se sem installs em modo real, exibir nota discreta no admin
-    if not _has_install_events and meta_data.get("_data_source") in ("real", "real_no_filter"):
-        if st.session_state.get("show_integration_settings"):
-            _no_app_id = not getattr(data_provider, 'meta_client', None) or not getattr(data_provider.meta_client, 'app_id', None)
-            if _no_app_id:
-                st.caption("ℹ️ Instalações: aguardando integração com campanha de instalações Meta.")
-            else:
-                st.caption("ℹ️ Instalações: aguardando integração com campanha de instalações Meta.")
 
-    st.markdown('</div>', unsafe_allow_html=True)
+progressive_section(("trends",), lambda d: render_trends_section(d["trends"]), height=300, label="Carregando tendência...")
 
 # -----------------------------------------------------------------------------
-# LANDING PAGE (GA4)
+# FUNIL DE CONVERSÃO SIMPLES (Impressões -> Cliques -> Loja -> Instalações)
 # -----------------------------------------------------------------------------
-st.markdown('<div class="glass-card">', unsafe_allow_html=True)
-st.markdown('<div class="section-title"><div class="section-icon">@</div> Comportamento no site</div>', unsafe_allow_html=True)
+@st.fragment
+def _funnel_mode_needs_sdk(meta_data):
+    """O Meta base sozinho não decide o funil: sem instalações nem cliques na loja, o SDK/GA4 pode virar para instalação."""
+    return not (int(meta_data.get("instalacoes_sdk", 0) or 0) > 0 or int(meta_data.get("store_clicks_meta", 0) or 0) > 0)
 
-# Indicador de fonte de dados GA4 (discreto)
-ga4_source = ga4_data.get("_data_source", "unknown")
-ga4_filter = ga4_data.get("_campaign_filter", None)
-if st.session_state.get("show_integration_settings"):
-    if ga4_source == "real":
-        st.caption(f"✅ GA4 conectado | Filtro: {ga4_filter if ga4_filter else 'Todas as campanhas'}")
-    elif ga4_source == "partial":
-        st.caption(f"⚠️ GA4: dados parciais | Filtro: {ga4_filter if ga4_filter else 'Todas as campanhas'}")
-    elif ga4_source == "no_data":
-        st.caption(f"⚠️ GA4 conectado, sem dados para '{ga4_filter}'. UTMs podem levar até 48h.")
-    elif ga4_source == "mock":
-        st.caption("💡 GA4: dados de demonstração. Configure credenciais nos Secrets.")
-
-ga4_cards = [
-    {"icon": "🌐", "label": "Visitas ao site", "value": f"{ga4_data['sessoes']:,.0f}", "delta": ga4_data['delta_sessoes']},
-    {"icon": "👥", "label": "Visitantes únicos", "value": f"{ga4_data['usuarios']:,.0f}", "delta": ga4_data['delta_usuarios']},
-    {"icon": "📄", "label": "Páginas visualizadas", "value": f"{ga4_data['pageviews']:,.0f}", "delta": ga4_data['delta_pageviews']},
-    {"icon": "⚡", "label": "Taxa de engajamento", "value": f"{ga4_data['taxa_engajamento']:.1f}%", "delta": ga4_data['delta_engajamento']},
-    {"icon": "⏱️", "label": "Tempo médio no site", "value": ga4_data['tempo_medio'], "delta": None, "suffix": ""},
-]
-
-ga4_cards_html = "\n".join(
-    build_kpi_card(
-        card["icon"],
-        card["label"],
-        card["value"],
-        card.get("delta"),
-        suffix=card.get("suffix", "%"),
-        invert=card.get("invert", False),
-        precision=card.get("precision", 1),
-    )
-    for card in ga4_cards
+
+def render_funnel_section(meta_data, ga4_data, trends_data, ga4_events_data):
+    cols = st.columns([3, 2])
+
+    with cols[0]:
+        st.markdown('<div class="chart-card">', unsafe_allow_html=True)
+        st.markdown('<div class="section-title"><div class="section-icon">~</div> Cliques e taxa de cliques por dia</div>', unsafe_allow_html=True)
+        if isinstance(trends_data, pd.DataFrame) and not trends_data.empty and "Data" in trends_data.columns:
+            st.plotly_chart(clicks_ctr_dual_axis_figure(trends_data), use_container_width=True)
+        else:
+            st.markdown(f'''
+            <div class="empty-state" style="background:{LIA["bg_card"]};border-radius:20px;padding:32px;text-align:center;border:1px dashed {LIA["border"]};">
+                <p style="color:{LIA["text_secondary"]};margin:0;">Sem dados de tendência para o período selecionado.</p>
+            </div>
+        ''', unsafe_allow_html=True)
+        st.markdown('</div>', unsafe_allow_html=True)
+
+    with cols[1]:
+        st.markdown('<div class="chart-card">', unsafe_allow_html=True)
+
+        # Determinar modo do funil com base nos dados disponíveis
+        _has_install_events = int(meta_data.get("instalacoes_sdk", 0) or 0) > 0
+        _has_store_clicks = int(meta_data.get("store_clicks_meta", 0) or 0) > 0
+
+        if _has_install_events or _has_store_clicks:
+            # Funil de instalação: campanha de app install
+            st.markdown('<div class="section-title"><div class="section-icon">V</div> Caminho do usuário até a instalação</div>', unsafe_allow_html=True)
+            store_clicks_meta = int(meta_data.get("store_clicks_meta", 0) or 0)
+            funnel_labels = ["Viram o anúncio", "Clicaram no anúncio", "Foram para a loja do app", "Aguardando integração (campanha de instalações Meta)"]
+            funnel_values = [
+                int(meta_data.get('impressoes', 0) or 0),
+                int(meta_data.get('cliques_link', 0) or 0),
+                store_clicks_meta,
+                0,
+            ]
+            funnel_caption = "Funil de conversão · Etapa final de instalações aguardando integração com campanha de instalações Meta"
+        else:
+            # Funil de landing page: campanha de tráfego/conversão no site
+            st.markdown('<div class="section-title"><div class="section-icon">V</div> Caminho do usuário até a ação no site</div>', unsafe_allow_html=True)
+
+            # Buscar primary_cta_click do GA4 events
+            _cta_clicks = 0
+            try:
+                _events_df = ga4_events_data
+                if not _events_df.empty and "Nome do Evento" in _events_df.columns:
+                    _cta_rows = _events_df[_events_df["Nome do Evento"].str.contains("cta_click|primary_cta", case=False, na=False)]
+                    if not _cta_rows.empty:
+                        # Extrair número da string formatada "10 (0.23%)"
+                        raw = str(_cta_rows.iloc[0]["Contagem de Eventos"])
+                        _cta_clicks = int(raw.replace(".", "").split("(")[0].strip().split()[0]) if raw else 0
+            except Exception:
+                _cta_clicks = 0
+
+            ga4_sessions = int(ga4_data.get('sessoes', 0) or 0)
+            funnel_labels = ["Viram o anúncio", "Clicaram no anúncio", "Visitaram o site", "Clicaram no CTA"]
+            funnel_values = [
+                int(meta_data.get('impressoes', 0) or 0),
+                int(meta_data.get('cliques_link', 0) or 0),
+                ga4_sessions,
+                _cta_clicks,
+            ]
+            funnel_caption = "Funil de conversão · Mostra quantas pessoas passaram por cada etapa, desde ver o anúncio até clicar no CTA do site"
+
+        st.plotly_chart(funnel_figure(funnel_labels, funnel_values), use_container_width=True)
+        st.caption(funnel_caption)
+
+        # Se sem installs em modo real, exibir nota discreta no admin
+        if not _has_install_events and meta_data.get("_data_source") in ("real", "real_no_filter"):
+            if st.session_state.get("show_integration_settings"):
+                _no_app_id = not getattr(data_provider, 'meta_client', None) or not getattr(data_provider.meta_client, 'app_id', None)
+                if _no_app_id:
+                    st.caption("ℹ️ Instalações: aguardando integração com campanha de instalações Meta.")
+                else:
+                    st.caption("ℹ️ Instalações: aguardando integração com campanha de instalações Meta.")
+
+        st.markdown('</div>', unsafe_allow_html=True)
+
+
+# O funil também consome o SDK: quando o Meta base não decide o modo, o enriquecimento
+# roda sempre (ver _funnel_mode_needs_sdk), com ou sem o painel admin aberto
+progressive_section(
+    ("meta_full", "ga4", "trends", "events"),
+    lambda d: render_funnel_section(d["meta_full"], d["ga4"], d["trends"], d["events"]),
+    height=380,
+    label="Carregando funil...",
 )
 
-ga4_section = textwrap.dedent(f"""
-<div class="kpi-grid ga4-grid">
-{ga4_cards_html}
-</div>
-""")
+# Painel realtime (últimos 30 min) para o período "Hoje": relatórios core do GA4 atrasam horas
+_realtime_refresh_seconds = app_config.ga4_realtime_refresh_seconds
 
-st.markdown(ga4_section, unsafe_allow_html=True)
 
-# Tabelas lado a lado: Origem/Midia e Eventos
-show_events_card = events_mode != "off"
-table_cols = st.columns(2) if show_events_card else st.columns(1)
+@st.fragment(run_every=_realtime_refresh_seconds or None)
+def render_realtime_panel():
+    realtime = data_provider.get_realtime_summary()
+    if not realtime or realtime.get("error"):
+        return
 
-with table_cols[0]:
-    # Tabela Origem/Midia
-    try:
-        source_data = data_provider.get_source_medium(period=selected_period, custom_start=custom_start_str, custom_end=custom_end_str, campaign_filter=ga4_campaign_filter)
-        if len(source_data) > 0 and "Origem / Midia" in source_data.columns:
-            source_data = source_data[source_data["Origem / Midia"].str.contains("paid", case=False, na=False)]
-        if len(source_data) > 0:
-            st.markdown('<div class="table-container">', unsafe_allow_html=True)
-            st.markdown('<div class="table-header"><span class="table-header-title">De onde vieram os visitantes (anúncios pagos)</span></div>', unsafe_allow_html=True)
+    realtime_cards_html = "\n".join([
+        build_kpi_card("🟢", "Usuários ativos (30 min)", f"{realtime['active_users']:,.0f}", None, suffix=""),
+        build_kpi_card("⚡", "Eventos (30 min)", f"{realtime['total_events']:,.0f}", None, suffix=""),
+    ])
+    st.markdown(f'<div class="kpi-grid ga4-grid">{realtime_cards_html}</div>', unsafe_allow_html=True)
 
-            source_html = '<table class="lia-html-table"><thead><tr>'
-            for col in source_data.columns:
-                source_html += f'<th>{col}</th>'
-            source_html += '</tr></thead><tbody>'
+    top_events = " · ".join(
+        f"{row['Evento']}: {row['Contagem']:,}" for row in realtime.get("rows", [])[:5]
+    )
+    stale_note = " (última leitura disponível)" if realtime.get("stale") else ""
+    st.caption(f"Tempo real, atualizado às {realtime.get('fetched_at')}{stale_note}" + (f" | {top_events}" if top_events else ""))
 
-            for _, row in source_data.iterrows():
-                source_html += '<tr>'
-                for col in source_data.columns:
-                    source_html += f'<td>{row[col]}</td>'
-                source_html += '</tr>'
-            source_html += '</tbody></table>'
 
-            st.markdown(source_html, unsafe_allow_html=True)
-            st.markdown('</div>', unsafe_allow_html=True)
-        else:
-            st.markdown(f'''
-            <div class="empty-state" style="background:{LIA["bg_card"]};border-radius:20px;padding:20px;text-align:center;border:1px dashed {LIA["border"]};backdrop-filter:blur(16px);-webkit-backdrop-filter:blur(16px);">
-                <p style="color:{LIA["text_secondary"]};margin:0;">Nenhuma origem de tráfego paga encontrada no período.</p>
-            </div>
-        ''', unsafe_allow_html=True)
-    except Exception as e:
-        logger.error(f"Erro ao renderizar tabela de origem/midia: {e}")
+# -----------------------------------------------------------------------------
+# LANDING PAGE (GA4)
+# -----------------------------------------------------------------------------
+@st.fragment
+def render_ga4_section(ga4_data, ga4_cards_html, source_medium_data, ga4_events_data, events_mode, selected_period):
+    st.markdown('<div class="glass-card">', unsafe_allow_html=True)
+    st.markdown('<div class="section-title"><div class="section-icon">@</div> Comportamento no site</div>', unsafe_allow_html=True)
+
+    # Indicador de fonte de dados GA4 (discreto)
+    ga4_source = ga4_data.get("_data_source", "unknown")
+    ga4_filter = ga4_data.get("_campaign_filter", None)
+    if st.session_state.get("show_integration_settings"):
+        if ga4_source == "real":
+            st.caption(f"✅ GA4 conectado | Filtro: {ga4_filter if ga4_filter else 'Todas as campanhas'}")
+        elif ga4_source == "partial":
+            st.caption(f"⚠️ GA4: dados parciais | Filtro: {ga4_filter if ga4_filter else 'Todas as campanhas'}")
+        elif ga4_source == "no_data":
+            st.caption(f"⚠️ GA4 conectado, sem dados para '{ga4_filter}'. UTMs podem levar até 48h.")
+        elif ga4_source == "mock":
+            st.caption("💡 GA4: dados de demonstração. Configure credenciais nos Secrets.")
+
+    if selected_period == "today":
+        render_realtime_panel()
+
+    st.markdown(f'<div class="kpi-grid ga4-grid">\n{ga4_cards_html}\n</div>', unsafe_allow_html=True)
+
+    # Tabelas lado a lado: Origem/Midia e Eventos
+    show_events_card = events_mode != "off"
+    table_cols = st.columns(2) if show_events_card else st.columns(1)
+
+    with table_cols[0]:
+        # Tabela Origem/Midia
+        try:
+            source_data = source_medium_data
+            if len(source_data) > 0 and "Origem / Midia" in source_data.columns:
+                source_data = source_data[source_data["Origem / Midia"].str.contains("paid", case=False, na=False)]
+            if len(source_data) > 0:
+                st.markdown('<div class="table-container">', unsafe_allow_html=True)
+                st.markdown('<div class="table-header"><span class="table-header-title">De onde vieram os visitantes (anúncios pagos)</span></div>', unsafe_allow_html=True)
+
+                render_paginated_table(source_data, key="page_source_medium")
+                st.markdown('</div>', unsafe_allow_html=True)
+            else:
+                st.markdown(f'''
+                <div class="empty-state" style="background:{LIA["bg_card"]};border-radius:20px;padding:20px;text-align:center;border:1px dashed {LIA["border"]};backdrop-filter:blur(16px);-webkit-backdrop-filter:blur(16px);">
+                    <p style="color:{LIA["text_secondary"]};margin:0;">Nenhuma origem de tráfego paga encontrada no período.</p>
+                </div>
+            ''', unsafe_allow_html=True)
+        except Exception as e:
+            logger.error(f"Erro ao renderizar tabela de origem/midia: {e}")
+
+    # Com EVENTS_MODE=off só existe a coluna de origem/mídia
+    if show_events_card:
+        with table_cols[1]:
+            # Tabela de Eventos do GA4 com Tooltips CSS
+            try:
+                events_data = ga4_events_data
+                if len(events_data) > 0:
+                    event_tooltips = {
+                        "page_view": "Total de visualizações da página.",
+                        "session_start": "Total de acessos à landing page originados das campanhas.",
+                        "first_visit": "Quantidade de pessoas únicas que visitaram a landing page.",
+                        "scroll": "Indica que o usuário rolou a página.",
+                        "scroll_25": "Indica até onde o usuário rolou a página (nível de leitura).",
+                        "scroll_50": "Indica até onde o usuário rolou a página (nível de leitura).",
+                        "scroll_75": "Indica até onde o usuário rolou a página (nível de leitura).",
+                        "landing_visit": "Usuários que realmente carregaram e visualizaram a landing page.",
+                        "user_engagement": "Percentual de usuários que tiveram alguma interação relevante na página.",
+                        "primary_cta_click": "Clique no botão principal de ação (ex: 'Baixar agora').",
+                        "cta_baixe_agora_click": "Clique no botão principal de ação (ex: 'Baixar agora').",
+                        "cta_click_store": "Clique no botão que direciona para a loja do app (App Store ou Google Play). Indica intenção clara de instalação.",
+                        "click": "Clique genérico em algum elemento da página.",
+                        "store_click": "Clique no botão que direciona para a loja do app (App Store ou Google Play). Indica intenção clara de instalação.",
+                        "install": "Aguardando integração com campanha de instalações Meta.",
+                    }
+                    st.markdown('<div class="table-container">', unsafe_allow_html=True)
+                    st.markdown('<div class="table-header"><span class="table-header-title">Ações dos visitantes no site</span></div>', unsafe_allow_html=True)
+                    render_paginated_table(events_data, key="page_ga4_events", tooltips=event_tooltips, tooltip_column="Nome do Evento")
+                    st.markdown('</div>', unsafe_allow_html=True)
+            except Exception as e:
+                logger.error(f"Erro ao renderizar tabela de eventos: {e}")
+    st.markdown('</div>', unsafe_allow_html=True)
+
+
+def _render_ga4(ga4_data, source_medium_data, ga4_events_data):
+    ga4_kpi_cards_html = _ga4_kpi_cards_html_cached(ga4_dataset_key, _payload_fingerprint(ga4_data), ga4_data)
+    render_ga4_section(ga4_data, ga4_kpi_cards_html, source_medium_data, ga4_events_data, events_mode, selected_period)
 
-with table_cols[1]:
-    # Tabela de Eventos do GA4 com Tooltips CSS
-    try:
-        events_data = data_provider.get_events_data(period=selected_period, custom_start=custom_start_str, custom_end=custom_end_str, campaign_filter=ga4_campaign_filter)
-        if len(events_data) > 0:
-            event_tooltips = {
-                "page_view": "Total de visualizações da página.",
-                "session_start": "Total de acessos à landing page originados das campanhas.",
-                "first_visit": "Quantidade de pessoas únicas que visitaram a landing page.",
-                "scroll": "Indica que o usuário rolou a página.",
-                "scroll_25": "Indica até onde o usuário rolou a página (nível de leitura).",
-                "scroll_50": "Indica até onde o usuário rolou a página (nível de leitura).",
-                "scroll_75": "Indica até onde o usuário rolou a página (nível de leitura).",
-                "landing_visit": "Usuários que realmente carregaram e visualizaram a landing page.",
-                "user_engagement": "Percentual de usuários que tiveram alguma interação relevante na página.",
-                "primary_cta_click": "Clique no botão principal de ação (ex: 'Baixar agora').",
-                "cta_baixe_agora_click": "Clique no botão principal de ação (ex: 'Baixar agora').",
-                "cta_click_store": "Clique no botão que direciona para a loja do app (App Store ou Google Play). Indica intenção clara de instalação.",
-                "click": "Clique genérico em algum elemento da página.",
-                "store_click": "Clique no botão que direciona para a loja do app (App Store ou Google Play). Indica intenção clara de instalação.",
-                "install": "Aguardando integração com campanha de instalações Meta.",
-            }
-            columns = list(events_data.columns)
-            header_html = "".join(f"<th>{html.escape(str(col))}</th>" for col in columns)
-            body_rows = []
-            for _, row in events_data.iterrows():
-                cells = []
-                for col in columns:
-                    value = "" if pd.isna(row[col]) else str(row[col])
-                    tooltip_attr = ""
-                    if col == "Nome do Evento":
-                        tooltip = event_tooltips.get(str(row[col]).strip(), "")
-                        if tooltip:
-                            tooltip_attr = f' title="{html.escape(tooltip)}"'
-                    cells.append(f"<td{tooltip_attr}>{html.escape(value)}</td>")
-                body_rows.append("<tr>" + "".join(cells) + "</tr>")
-            events_table_html = f"""
-            <table class="lia-html-table">
-                <thead><tr>{header_html}</tr></thead>
-                <tbody>{''.join(body_rows)}</tbody>
-            </table>
-            """
-            st.markdown('<div class="table-container">', unsafe_allow_html=True)
-            st.markdown('<div class="table-header"><span class="table-header-title">Ações dos visitantes no site</span></div>', unsafe_allow_html=True)
-            st.markdown(events_table_html, unsafe_allow_html=True)
-            st.markdown('</div>', unsafe_allow_html=True)
-    except Exception as e:
-        logger.error(f"Erro ao renderizar tabela de eventos: {e}")
-st.markdown('</div>', unsafe_allow_html=True)
+
+progressive_section(
+    ("ga4", "source_medium", "events"),
+    lambda d: _render_ga4(d["ga4"], d["source_medium"], d["events"]),
+    height=320,
+    label="Carregando comportamento no site...",
+)
 
 # Footer
 st.markdown(f'''
@@ -2507,3 +1056,70 @@ st.markdown(f'''
 
 # Fechar camada de conteudo
 st.markdown('</div>', unsafe_allow_html=True)
+
+# -----------------------------------------------------------------------------
+# PREENCHER AS SEÇÕES CONFORME AS FONTES FICAM PRONTAS
+# -----------------------------------------------------------------------------
+def _load_ai_precompute_inputs(period, campanha):
+    """Dados de um período/campanha pelos mesmos fetchers (e caches) da página."""
+    meta_filter = None if campanha == "Todas" else campanha
+    ga4_filter = utm_filter_map.get(campanha)
+    return _ai_analysis_inputs(
+        _fetch_meta_cached(period, meta_filter, None, None, "campaign", _cache_breakdowns, _cache_app_id),
+        _fetch_ga4_cached(period, None, None, ga4_filter),
+        _fetch_creative_cached(period, meta_filter, None, None),
+        _fetch_source_medium_cached(period, None, None, ga4_filter),
+        _fetch_events_cached(period, None, None, ga4_filter),
+    )
+
+
+_loaded_data = {}
+with startup_profile.phase("primeira carga e renderização dos dados"):
+    _pending = set(_data_futures)
+    while _pending:
+        _done, _pending = wait(_pending, return_when=FIRST_COMPLETED)
+        for _future in _done:
+            _name = _data_futures[_future]
+            try:
+                _loaded_data[_name] = _future.result()
+            except Exception as e:
+                logger.error(f"Erro ao carregar dados ({_name}): {e}")
+                _loaded_data[_name] = _data_fallback(_name)
+
+            if _name == "meta":
+                # Enriquecimento SDK é uma etapa à parte: não segura o grid de KPIs
+                _meta_base = _loaded_data["meta"]
+                if (
+                    (sdk_enrichment_displayed or _funnel_mode_needs_sdk(_meta_base))
+                    and _meta_base.get("_data_source") in ("real", "real_no_filter")
+                ):
+                    _sdk_future = submit_with_session(
+                        _fetch_meta_sdk_cached, selected_period, custom_start_str, custom_end_str,
+                        _cache_app_id, not int(_meta_base.get("instalacoes_sdk", 0) or 0),
+                    )
+                    _data_futures[_sdk_future] = "meta_sdk"
+                    _pending.add(_sdk_future)
+                else:
+                    _loaded_data["meta_full"] = _meta_base
+            elif _name == "meta_sdk":
+                _loaded_data["meta_full"] = {**_loaded_data["meta"], **_loaded_data["meta_sdk"]}
+        render_ready_sections(_loaded_data)
+
+# -----------------------------------------------------------------------------
+# PRÉ-GERAÇÃO DAS ANÁLISES DE IA (opcional, AI_PRECOMPUTE)
+# -----------------------------------------------------------------------------
+# Só depois de "Atualizar dados"/"Limpar cache": períodos pré-definidos × ciclos vão para o
+# cache de análises (até 12 chamadas pagas por execução, ver ai_precompute)
+_ai_precompute_requested = st.session_state.pop("ai_precompute_force", False)
+if (
+    _ai_precompute_requested
+    and AI_AGENT_AVAILABLE
+    and app_config.ai_precompute_enabled
+    and app_config.ai_backend_ready
+    and get_ai_analysis_cache() is not None
+):
+    _precompute_agent = _new_ai_agent()
+    _ai_precompute_scheduler().trigger(
+        submit_with_session,
+        lambda: precompute_analyses(_precompute_agent, _load_ai_precompute_inputs),
+    )
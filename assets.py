@@ -0,0 +1,113 @@
+"""Camada de assets: CSS do tema e logo renderizados uma vez por processo.
+
+Com ``server.enableStaticServing`` ligado, o logo é publicado em ``static/`` com hash
+no nome e referenciado por URL (o navegador baixa uma vez e guarda em cache); sem
+static serving, vira um único data URI em cache.
+
+O CSS continua inline: o static serving do Streamlit só entrega imagens com o
+Content-Type real (o resto sai como text/plain + nosniff, e o navegador recusa
+como stylesheet). Por isso o tema é montado e minificado uma vez por processo.
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import logging
+import os
+import re
+from functools import lru_cache
+from typing import Optional
+
+from theme import LIA, build_theme_css
+
+logger = logging.getLogger(__name__)
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+STATIC_DIR = os.path.join(APP_DIR, "static")
+STATIC_URL_PREFIX = "app/static"
+LOGO_PATH = os.path.join(APP_DIR, "logo_lia.png")
+
+
+def _content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()[:12]
+
+
+def static_serving_enabled() -> bool:
+    """Indica se o Streamlit está servindo a pasta static/ (server.enableStaticServing)."""
+    try:
+        import streamlit as st
+
+        return bool(st.get_option("server.enableStaticServing"))
+    except Exception:
+        return False
+
+
+def _publish_static(filename: str, data: bytes) -> Optional[str]:
+    """Grava o arquivo em static/ (se ainda não existir) e retorna a URL relativa, ou None."""
+    path = os.path.join(STATIC_DIR, filename)
+    try:
+        if not os.path.exists(path):
+            os.makedirs(STATIC_DIR, exist_ok=True)
+            tmp_path = f"{path}.tmp-{os.getpid()}"
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        return f"{STATIC_URL_PREFIX}/{filename}"
+    except OSError as e:
+        logger.warning(f"Não foi possível publicar asset estático {filename}: {e}")
+        return None
+
+
+_CSS_COMMENT_RE = re.compile(r"/\*.*?\*/", re.DOTALL)
+_CSS_WHITESPACE_RE = re.compile(r"\s+")
+_CSS_PUNCTUATION_RE = re.compile(r"\s*([{};,])\s*")
+
+
+def minify_css(css: str) -> str:
+    """Remove comentários e espaços redundantes (não mexe em espaços de seletores como "a :hover")."""
+    css = _CSS_COMMENT_RE.sub("", css)
+    css = _CSS_WHITESPACE_RE.sub(" ", css)
+    css = _CSS_PUNCTUATION_RE.sub(r"\1", css)
+    return css.replace(";}", "}").strip()
+
+
+@lru_cache(maxsize=1)
+def theme_css() -> str:
+    """CSS do tema LIA, montado e minificado uma única vez por processo."""
+    return minify_css(build_theme_css(LIA))
+
+
+@lru_cache(maxsize=1)
+def theme_css_hash() -> str:
+    return _content_hash(theme_css().encode("utf-8"))
+
+
+@lru_cache(maxsize=1)
+def theme_style_html() -> str:
+    """Tag <style> do tema, identificada pelo hash do conteúdo."""
+    return f'<style id="lia-theme-{theme_css_hash()}">{theme_css()}</style>'
+
+
+@lru_cache(maxsize=1)
+def _logo_bytes() -> Optional[bytes]:
+    try:
+        if os.path.exists(LOGO_PATH):
+            with open(LOGO_PATH, "rb") as f:
+                return f.read()
+    except OSError as e:
+        logger.error(f"Erro ao carregar logo: {e}")
+    return None
+
+
+@lru_cache(maxsize=2)
+def logo_src(static_serving: bool) -> Optional[str]:
+    """URL do logo da coruja (static/ com hash) ou data URI único; None se o arquivo não existir."""
+    data = _logo_bytes()
+    if data is None:
+        return None
+    if static_serving:
+        url = _publish_static(f"logo_lia-{_content_hash(data)}.png", data)
+        if url:
+            return url
+    return f"data:image/png;base64,{base64.b64encode(data).decode()}"
@@ -0,0 +1 @@
+"""Benchmarks de ponta a ponta do dashboard (``python -m benchmarks.run``)."""
@@ -0,0 +1,133 @@
+"""
+Graph API (Meta) e GA4 servidos localmente para os benchmarks
+
+FakeGraphAPI substitui ``requests.get`` do meta_integration e FakeGA4Client o cliente
+do GA4Integration; os dois contam as requisições por endpoint. Os dados vêm de uma
+SyntheticAccount (benchmarks.synthetic_data), gerada sob demanda página a página.
+"""
+
+from __future__ import annotations
+
+import json
+from collections import Counter
+from typing import Any, Dict, Optional
+from unittest import mock
+from urllib.parse import parse_qsl, urlsplit
+
+import requests
+from google.analytics.data_v1beta.types import RunReportResponse
+
+from benchmarks.synthetic_data import AD_ACCOUNT_ID, APP_ID, SyntheticAccount, ga4_report_response, graph_page
+
+
+class FakeResponse:
+    """O suficiente de requests.Response para o meta_integration."""
+
+    def __init__(self, status_code: int, payload: Dict[str, Any], url: str):
+        self.status_code = status_code
+        self.url = url
+        self._payload = payload
+
+    @property
+    def text(self) -> str:
+        return json.dumps(self._payload)
+
+    def json(self) -> Dict[str, Any]:
+        return self._payload
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} Error for url: {self.url}", response=self)
+
+
+class FakeGraphAPI:
+    """
+    ``requests.get`` da Graph API servido pela conta sintética
+
+    /insights pagina como a Graph (cursor ``after`` + ``paging.next`` com a URL completa)
+    quando o pedido traz ``limit``; sem ele a resposta vem numa página só.
+    """
+
+    def __init__(self, account: SyntheticAccount, ad_account_id: str = AD_ACCOUNT_ID, app_id: str = APP_ID):
+        self.account = account
+        self.ad_account_id = ad_account_id
+        self.app_id = app_id
+        self.requests: Counter = Counter()
+
+    def reset(self) -> None:
+        self.requests.clear()
+
+    def patch(self):
+        """Context manager que liga este fake no lugar de requests.get."""
+        return mock.patch("meta_integration.requests.get", self)
+
+    def __call__(self, url: str, params: Optional[Dict[str, Any]] = None, **kwargs) -> FakeResponse:
+        parts = urlsplit(url)
+        query = dict(parse_qsl(parts.query))
+        query.update({key: str(value) for key, value in (params or {}).items()})
+        segments = [segment for segment in parts.path.split("/") if segment][1:]  # sem a versão (v21.0)
+        base_url = f"{parts.scheme}://{parts.netloc}{parts.path}"
+
+        if segments == [self.ad_account_id, "insights"]:
+            return self._insights(base_url, query)
+        if segments == [self.app_id]:
+            self.requests["app"] += 1
+            return FakeResponse(200, {"id": self.app_id, "name": "LIA (benchmark)"}, url)
+        if segments == [self.app_id, "app_event_aggregations"]:
+            self.requests["app_event_aggregations"] += 1
+            since, until = self._time_range(query)
+            return FakeResponse(200, {"data": self.account.sdk_event_days(query.get("event_name", ""), since, until)}, url)
+        if segments == [self.app_id, "app_insights"]:
+            self.requests["app_insights"] += 1
+            return FakeResponse(200, {"data": []}, url)
+        if len(segments) == 1:
+            index = self.account.ad_index(segments[0])
+            if index is not None:
+                self.requests["ad"] += 1
+                return FakeResponse(200, {
+                    "id": segments[0],
+                    "name": self.account.ad_name(index),
+                    "effective_status": self.account.ad_status(index),
+                }, url)
+
+        self.requests["unknown"] += 1
+        return FakeResponse(404, {"error": {"message": f"Unknown path {parts.path}", "type": "GraphMethodException", "code": 803}}, url)
+
+    @staticmethod
+    def _time_range(query: Dict[str, str]) -> tuple:
+        if "time_range" in query:
+            time_range = json.loads(query["time_range"])
+            return time_range["since"], time_range["until"]
+        return query["since"], query["until"]
+
+    def _insights(self, base_url: str, query: Dict[str, str]) -> FakeResponse:
+        level = query.get("level", "account")
+        daily = query.get("time_increment") == "1"
+        self.requests[f"insights:{level}{':daily' if daily else ''}"] += 1
+        since, until = self._time_range(query)
+        total, fetch = self.account.insights_rows(level, daily, since, until)
+        return FakeResponse(200, graph_page(fetch, total, base_url, query), base_url)
+
+
+class FakeGA4Client:
+    """``run_report`` do GA4 servido pela conta sintética (respeita offset/limit e row_count)."""
+
+    def __init__(self, account: SyntheticAccount):
+        self.account = account
+        self.requests: Counter = Counter()
+
+    def reset(self) -> None:
+        self.requests.clear()
+
+    def run_report(self, request) -> RunReportResponse:
+        self.requests["run_report"] += 1
+        date_range = request.date_ranges[0]
+        return ga4_report_response(
+            self.account,
+            [dimension.name for dimension in request.dimensions],
+            [metric.name for metric in request.metrics],
+            date_range.start_date,
+            date_range.end_date,
+            offset=request.offset,
+            limit=request.limit,
+        )
@@ -0,0 +1,387 @@
+"""
+Benchmark de ponta a ponta do carregamento do dashboard com contas sintéticas
+
+Cada cenário (período × tamanho da conta) passa pelas integrações reais
+(MetaAdsIntegration, GA4Integration), pelo DataProvider, pelo meta_funnel e pela
+renderização das tabelas, com a Graph API e o GA4 servidos por benchmarks.fixtures.
+Por etapa são medidos tempo de parede (melhor de N execuções), requisições e pico de
+memória (tracemalloc, numa execução à parte para não distorcer o tempo).
+
+Uso:
+    python -m benchmarks.run                      # todos os cenários -> benchmarks/results/<commit>.json
+    python -m benchmarks.run --scenarios 7d-10ads 30d-500ads --repeat 1 --output /tmp/bench.json
+    python -m benchmarks.run --compare benchmarks/results/abc1234.json benchmarks/results/def5678.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+from benchmarks.fixtures import FakeGA4Client, FakeGraphAPI, SyntheticAccount
+from build_info import resolve_git_metadata
+from data_provider import DataProvider
+from ga4_fact_store import GA4DailyFactStore
+from ga_integration import GA4Integration
+from html_tables import clear_render_cache, paginate_frame, render_html_table
+from meta_funnel import (
+    INSTALL_ACTION_TYPES,
+    build_meta_funnel,
+    collect_action_type_diagnostics,
+    resolve_link_clicks,
+    resolve_store_clicks,
+    sum_actions_by_types,
+)
+from meta_integration import MetaAdsIntegration
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+RESULTS_VERSION = 1
+DEFAULT_REPEAT = 3
+DEFAULT_TOLERANCE = 0.20
+# Diferenças de tempo abaixo disso são ruído, mesmo que passem da tolerância relativa
+MIN_WALL_DELTA_SECONDS = 0.005
+
+# Mesmos formatos da tabela de criativos do app
+CREATIVE_FORMATS = {
+    "Valor gasto": "$ {:,.2f}",
+    "Exibições": "{:,.0f}",
+    "Cliques": "{:,.0f}",
+    "Taxa de cliques": "{:.2f}%",
+    "Custo por clique": "$ {:,.2f}",
+    "Custo por mil": "$ {:,.2f}",
+}
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """Período do dashboard × tamanho da conta (opcionalmente com o fact store do GA4 já populado)."""
+
+    name: str
+    period: str
+    ads: int
+    custom_days: int = 0
+    campaign_filter: Optional[str] = None
+    fact_store: bool = False
+
+    def date_kwargs(self, today: Optional[date] = None) -> Dict[str, Optional[str]]:
+        """custom_start/custom_end (período custom termina ontem; os demais são resolvidos pelas integrações)."""
+        if self.period != "custom":
+            return {"custom_start": None, "custom_end": None}
+        end = (today or date.today()) - timedelta(days=1)
+        start = end - timedelta(days=self.custom_days - 1)
+        return {"custom_start": start.isoformat(), "custom_end": end.isoformat()}
+
+
+PERIODS = (("7d", "last_7d", 0), ("30d", "last_30d", 0), ("180d", "custom", 180))
+ACCOUNT_SIZES = (10, 500, 5000)
+SCENARIOS = tuple(
+    Scenario(f"{label}-{ads}ads", period, ads, custom_days)
+    for label, period, custom_days in PERIODS
+    for ads in ACCOUNT_SIZES
+) + (
+    # Mesmo 180d com os dias consolidados no fact store: só os dias ainda abertos vão ao GA4
+    Scenario("180d-500ads-factstore", "custom", 500, 180, fact_store=True),
+)
+
+
+class BenchmarkEnv:
+    """Conta sintética + fakes da Graph/GA4 de um cenário, com os caches do processo zerados a cada execução."""
+
+    def __init__(self, scenario: Scenario, seed: int = 0):
+        self.scenario = scenario
+        self.account = SyntheticAccount(scenario.ads, seed=seed)
+        self.graph = FakeGraphAPI(self.account)
+        self.ga4_client = FakeGA4Client(self.account)
+        self.date_kwargs = scenario.date_kwargs()
+        self._fact_store_dir = tempfile.TemporaryDirectory(prefix="lia-bench-") if scenario.fact_store else None
+        self.fact_store = (
+            GA4DailyFactStore(os.path.join(self._fact_store_dir.name, "ga4_facts.sqlite3"))
+            if self._fact_store_dir else None
+        )
+        # Entradas das etapas que não buscam dados (funil, tabelas), preparadas em prepare()
+        self.insights = None
+        self.creative_data = None
+
+    def reset(self) -> None:
+        self.graph.reset()
+        self.ga4_client.reset()
+        GA4Integration.clear_report_cache()
+        MetaAdsIntegration._AGG_ENDPOINT_UNSUPPORTED_CACHE.clear()
+        clear_render_cache()
+
+    def close(self) -> None:
+        if self._fact_store_dir is not None:
+            self._fact_store_dir.cleanup()
+            self._fact_store_dir = None
+
+    def meta_integration(self) -> MetaAdsIntegration:
+        return MetaAdsIntegration(access_token="benchmark", ad_account_id=self.graph.ad_account_id, app_id=self.graph.app_id)
+
+    def ga4_integration(self) -> GA4Integration:
+        return GA4Integration({}, "properties/3000000003", fact_store=self.fact_store, client=self.ga4_client)
+
+    def data_provider(self) -> DataProvider:
+        provider = DataProvider(mode="auto")
+        provider._meta_client = self.meta_integration()
+        provider._ga4_clients = (self.ga4_integration(), None)
+        return provider
+
+    def prepare(self) -> None:
+        with self.graph.patch():
+            self.insights = self.meta_integration().get_ad_insights(date_range=self.scenario.period, **self.date_kwargs)
+            self.creative_data = self.data_provider().get_creative_data(
+                self.scenario.period, campaign_filter=self.scenario.campaign_filter, **self.date_kwargs
+            )
+        if self.fact_store is not None:
+            # Popula o fact store (como uma carga anterior do dashboard); as medições pegam o caminho quente
+            _ga4_integration_stage(self)
+            _data_provider_stage(self)
+        self.reset()
+
+    def request_counts(self) -> Dict[str, Any]:
+        meta, ga4 = dict(self.graph.requests), dict(self.ga4_client.requests)
+        return {"meta": meta, "ga4": ga4, "total": sum(meta.values()) + sum(ga4.values())}
+
+
+def _meta_integration_stage(env: BenchmarkEnv) -> None:
+    meta = env.meta_integration()
+    period, dates, campaign = env.scenario.period, env.date_kwargs, env.scenario.campaign_filter
+    with env.graph.patch():
+        meta.get_ad_insights(date_range=period, campaign_name_filter=campaign, **dates)
+        meta.get_aggregated_insights(date_range=period, campaign_name_filter=campaign, **dates)
+        meta.get_creative_insights(date_range=period, campaign_name_filter=campaign, **dates)
+        meta.get_all_sdk_events(date_range=period, **dates)
+
+
+def _ga4_integration_stage(env: BenchmarkEnv) -> None:
+    ga4 = env.ga4_integration()
+    period, dates, campaign = env.scenario.period, env.date_kwargs, env.scenario.campaign_filter
+    ga4.get_aggregated_metrics(date_range=period, campaign_filter=campaign, **dates)
+    ga4.get_sessions_data(date_range=period, **dates)
+    ga4.get_events_data(date_range=period, campaign_filter=campaign, **dates)
+    ga4.get_source_medium_data(date_range=period, campaign_filter=campaign, **dates)
+
+
+def _data_provider_stage(env: BenchmarkEnv) -> None:
+    """O que uma renderização do dashboard pede ao DataProvider."""
+    provider = env.data_provider()
+    period, dates, campaign = env.scenario.period, env.date_kwargs, env.scenario.campaign_filter
+    with env.graph.patch():
+        provider.get_meta_metrics(period, campaign_filter=campaign, include_sdk=False, **dates)
+        provider.get_sdk_enrichment(period, **dates)
+        provider.get_creative_data(period, campaign_filter=campaign, **dates)
+        provider.get_daily_trends(period, campaign_filter=campaign, **dates)
+        provider.get_ga4_metrics(period, campaign_filter=campaign, **dates)
+        provider.get_source_medium(period, campaign_filter=campaign, **dates)
+        provider.get_events_data(period, campaign_filter=campaign, **dates)
+
+
+def _meta_funnel_stage(env: BenchmarkEnv) -> None:
+    df = env.insights
+    actions = df["actions"]
+    collect_action_type_diagnostics(actions)
+    store_clicks, _ = resolve_store_clicks(df)
+    installs, _ = sum_actions_by_types(actions, INSTALL_ACTION_TYPES)
+    build_meta_funnel({
+        "impressoes": df["impressions"].sum(),
+        "cliques_link": resolve_link_clicks(df),
+        "store_clicks_meta": store_clicks,
+        "instalacoes_sdk": installs,
+    })
+
+
+def _tables_stage(env: BenchmarkEnv) -> None:
+    """Tabela de criativos: a primeira página (como no app) e a tabela inteira."""
+    creative_display = env.creative_data.sort_values("Taxa de cliques", ascending=False)
+    page_df, _ = paginate_frame(creative_display, 1)
+    render_html_table(page_df, formats=CREATIVE_FORMATS)
+    render_html_table(creative_display, formats=CREATIVE_FORMATS)
+
+
+STAGES: Dict[str, Callable[[BenchmarkEnv], None]] = {
+    "meta_integration": _meta_integration_stage,
+    "ga4_integration": _ga4_integration_stage,
+    "data_provider": _data_provider_stage,
+    "meta_funnel": _meta_funnel_stage,
+    "tables": _tables_stage,
+}
+
+
+def measure_stage(stage: Callable[[BenchmarkEnv], None], env: BenchmarkEnv, repeat: int = DEFAULT_REPEAT) -> Dict[str, Any]:
+    """
+    Mede uma etapa: tempo (melhor de ``repeat``), requisições e pico de memória
+
+    Args:
+        stage: Função da etapa
+        env: Ambiente do cenário
+        repeat: Execuções cronometradas
+
+    Returns:
+        Dicionário com wall_seconds, wall_seconds_runs, requests e peak_memory_bytes
+    """
+    runs = []
+    for _ in range(max(1, repeat)):
+        env.reset()
+        started = time.perf_counter()
+        stage(env)
+        runs.append(time.perf_counter() - started)
+    requests = env.request_counts()
+
+    env.reset()
+    tracemalloc.start()
+    try:
+        stage(env)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "wall_seconds": round(min(runs), 6),
+        "wall_seconds_runs": [round(run, 6) for run in runs],
+        "requests": requests,
+        "peak_memory_bytes": peak,
+    }
+
+
+def run_scenario(scenario: Scenario, repeat: int = DEFAULT_REPEAT, seed: int = 0,
+                 stages: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+    env = BenchmarkEnv(scenario, seed=seed)
+    try:
+        env.prepare()
+        results = {name: measure_stage(STAGES[name], env, repeat) for name in (stages or STAGES)}
+    finally:
+        env.close()
+    return {
+        **asdict(scenario),
+        **env.date_kwargs,
+        "stages": results,
+        "totals": {
+            "wall_seconds": round(sum(r["wall_seconds"] for r in results.values()), 6),
+            "requests": sum(r["requests"]["total"] for r in results.values()),
+            "peak_memory_bytes": max((r["peak_memory_bytes"] for r in results.values()), default=0),
+        },
+    }
+
+
+def run_benchmarks(scenarios: Sequence[Scenario] = SCENARIOS, repeat: int = DEFAULT_REPEAT, seed: int = 0,
+                   progress: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+    """
+    Roda os cenários e monta o relatório (JSON serializável)
+
+    Args:
+        scenarios: Cenários a rodar
+        repeat: Execuções cronometradas por etapa
+        seed: Seed das contas sintéticas
+        progress: Chamado com o resultado de cada cenário assim que termina
+
+    Returns:
+        Relatório com metadados do build/ambiente e um item por cenário
+    """
+    git = resolve_git_metadata()
+    report = {
+        "version": RESULTS_VERSION,
+        "commit": git["commit"],
+        "branch": git["branch"],
+        "created_at_utc": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "seed": seed,
+        "scenarios": [],
+    }
+    for scenario in scenarios:
+        result = run_scenario(scenario, repeat=repeat, seed=seed)
+        report["scenarios"].append(result)
+        if progress:
+            progress(result)
+    return report
+
+
+def compare_results(baseline: Dict[str, Any], current: Dict[str, Any],
+                    tolerance: float = DEFAULT_TOLERANCE) -> List[str]:
+    """
+    Regressões de ``current`` em relação a ``baseline`` (cenários/etapas presentes nos dois)
+
+    Tempo e memória regridem acima de ``tolerance`` (relativo); requisições, com qualquer aumento.
+
+    Returns:
+        Uma linha legível por regressão (vazia se nada piorou)
+    """
+    base_scenarios = {item["name"]: item for item in baseline.get("scenarios", [])}
+    regressions = []
+    for scenario in current.get("scenarios", []):
+        base = base_scenarios.get(scenario["name"])
+        if base is None:
+            continue
+        for stage, result in scenario["stages"].items():
+            before = base["stages"].get(stage)
+            if before is None:
+                continue
+            label = f"{scenario['name']}/{stage}"
+            old_wall, new_wall = before["wall_seconds"], result["wall_seconds"]
+            if new_wall > old_wall * (1 + tolerance) and new_wall - old_wall > MIN_WALL_DELTA_SECONDS:
+                regressions.append(f"{label}: tempo {old_wall:.4f}s -> {new_wall:.4f}s")
+            old_peak, new_peak = before["peak_memory_bytes"], result["peak_memory_bytes"]
+            if new_peak > old_peak * (1 + tolerance):
+                regressions.append(f"{label}: memória {old_peak / 1e6:.1f} MB -> {new_peak / 1e6:.1f} MB")
+            old_requests, new_requests = before["requests"]["total"], result["requests"]["total"]
+            if new_requests > old_requests:
+                regressions.append(f"{label}: requisições {old_requests} -> {new_requests}")
+    return regressions
+
+
+def _print_scenario(result: Dict[str, Any]) -> None:
+    print(f"{result['name']}: {result['totals']['wall_seconds']:.3f}s, "
+          f"{result['totals']['requests']} requisições, pico {result['totals']['peak_memory_bytes'] / 1e6:.1f} MB")
+    for stage, stage_result in result["stages"].items():
+        print(f"  {stage:<17} {stage_result['wall_seconds']:>9.4f}s  {stage_result['requests']['total']:>6} req  "
+              f"{stage_result['peak_memory_bytes'] / 1e6:>8.1f} MB")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    scenario_names = [scenario.name for scenario in SCENARIOS]
+    parser = argparse.ArgumentParser(description="Benchmark de ponta a ponta do dashboard com contas sintéticas")
+    parser.add_argument("--scenarios", nargs="+", choices=scenario_names, default=scenario_names)
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="execuções cronometradas por etapa")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="arquivo JSON de saída (padrão: benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", nargs=2, metavar=("BASE", "ATUAL"), help="compara dois resultados e sai")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="piora relativa aceita em tempo/memória")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        with open(args.compare[0], "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        with open(args.compare[1], "r", encoding="utf-8") as f:
+            current = json.load(f)
+        regressions = compare_results(baseline, current, args.tolerance)
+        print("\n".join(regressions) if regressions else "Nenhuma regressão.")
+        return 1 if regressions else 0
+
+    # Os fallbacks do funil registram avisos a cada execução; só erros interessam aqui
+    logging.basicConfig(level=logging.ERROR)
+    selected = [scenario for scenario in SCENARIOS if scenario.name in args.scenarios]
+    report = run_benchmarks(selected, repeat=args.repeat, seed=args.seed, progress=_print_scenario)
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{report['commit']}.json")
+    directory = os.path.dirname(output)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"Resultados em {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,36 +1,114 @@
-"""Informações de build/deploy para diagnóstico visível no dashboard."""
+"""Informações de build/deploy para diagnóstico visível no dashboard.
+
+Ordem de resolução do stamp:
+1. Variável de ambiente LIA_BUILD_STAMP (texto final, usado como está); no Streamlit
+   Cloud, que publica direto do git, vem dos Secrets (ver README e deploy.ps1)
+2. Arquivo build_info.json gerado no build (``python build_info.py``), só quando o app
+   não está num checkout git; num checkout o arquivo envelheceria a cada pull/commit
+3. git no diretório do app; no caminho de renderização isso roda em segundo plano
+   (``get_build_stamp_nowait``), nunca segurando a primeira renderização
+"""
 
 from __future__ import annotations
 
+import json
 import os
 import subprocess
+import threading
 from datetime import datetime, timezone
 from functools import lru_cache
 
 APP_START_UTC = datetime.now(timezone.utc)
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+BUILD_INFO_PATH = os.path.join(APP_DIR, "build_info.json")
+GIT_TIMEOUT_SECONDS = 5
+
+_background_lock = threading.Lock()
+_background_thread: threading.Thread | None = None
 
 
 def _run_git_command(args: list[str]) -> str | None:
     try:
-        out = subprocess.check_output(["git", *args], stderr=subprocess.DEVNULL, text=True).strip()
+        out = subprocess.check_output(
+            ["git", *args], cwd=APP_DIR, stderr=subprocess.DEVNULL, text=True, timeout=GIT_TIMEOUT_SECONDS
+        ).strip()
         return out or None
     except Exception:
         return None
 
 
-@lru_cache(maxsize=1)
-def get_build_stamp() -> str:
-    """Retorna stamp de build com commit/hash/data para troubleshooting de deploy."""
-    explicit_stamp = os.getenv("LIA_BUILD_STAMP")
-    if explicit_stamp:
-        return explicit_stamp
+def resolve_git_metadata() -> dict[str, str]:
+    """Commit, branch e data do commit via git ("unknown*" quando indisponível)."""
+    return {
+        "commit": _run_git_command(["rev-parse", "--short", "HEAD"]) or "unknown",
+        "commit_date": _run_git_command(["log", "-1", "--format=%cd", "--date=iso-strict"]) or "unknown-date",
+        "branch": _run_git_command(["rev-parse", "--abbrev-ref", "HEAD"]) or "unknown-branch",
+    }
 
-    commit = _run_git_command(["rev-parse", "--short", "HEAD"]) or "unknown"
-    commit_date = _run_git_command(["log", "-1", "--format=%cd", "--date=iso-strict"]) or "unknown-date"
-    branch = _run_git_command(["rev-parse", "--abbrev-ref", "HEAD"]) or "unknown-branch"
 
+def _format_stamp(metadata: dict[str, str]) -> str:
     started_at = APP_START_UTC.isoformat(timespec="seconds")
     return (
-        f"build commit={commit} branch={branch} commit_date={commit_date} "
-        f"app_started_utc={started_at}"
+        f"build commit={metadata.get('commit', 'unknown')} branch={metadata.get('branch', 'unknown-branch')} "
+        f"commit_date={metadata.get('commit_date', 'unknown-date')} app_started_utc={started_at}"
     )
+
+
+def _read_build_info_file(path: str | None = None) -> dict[str, str] | None:
+    try:
+        with open(path or BUILD_INFO_PATH, "r", encoding="utf-8") as f:
+            metadata = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return metadata if isinstance(metadata, dict) and metadata.get("commit") else None
+
+
+def _stamp_without_git() -> str | None:
+    """Stamp que sai sem processo externo (env ou arquivo gerado), ou None."""
+    explicit_stamp = os.getenv("LIA_BUILD_STAMP")
+    if explicit_stamp:
+        return explicit_stamp
+    if os.path.exists(os.path.join(APP_DIR, ".git")):
+        return None
+    metadata = _read_build_info_file()
+    return _format_stamp(metadata) if metadata else None
+
+
+def write_build_info(path: str | None = None) -> dict[str, str]:
+    """Grava os metadados do git em ``path`` (padrão: BUILD_INFO_PATH; passo de build/deploy) e os retorna."""
+    metadata = resolve_git_metadata()
+    metadata["built_at_utc"] = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    with open(path or BUILD_INFO_PATH, "w", encoding="utf-8") as f:
+        json.dump(metadata, f, indent=2)
+    return metadata
+
+
+@lru_cache(maxsize=1)
+def get_build_stamp() -> str:
+    """Retorna stamp de build com commit/hash/data para troubleshooting de deploy."""
+    return _stamp_without_git() or _format_stamp(resolve_git_metadata())
+
+
+def get_build_stamp_nowait() -> str:
+    """
+    Stamp de build sem bloquear a renderização
+
+    Env/arquivo gerado respondem na hora. Sem eles, o git roda numa thread em segundo
+    plano e, até terminar, volta um stamp provisório (os próximos reruns mostram o final).
+
+    Returns:
+        Stamp final ou provisório ("build resolvendo...")
+    """
+    global _background_thread
+    if get_build_stamp.cache_info().currsize or _stamp_without_git() is not None:
+        return get_build_stamp()
+
+    with _background_lock:
+        if _background_thread is None or not _background_thread.is_alive():
+            _background_thread = threading.Thread(target=get_build_stamp, name="lia-build-stamp", daemon=True)
+            _background_thread.start()
+    return f"build resolvendo... app_started_utc={APP_START_UTC.isoformat(timespec='seconds')}"
+
+
+if __name__ == "__main__":
+    print(json.dumps(write_build_info(), indent=2))
@@ -0,0 +1,241 @@
+"""Figuras Plotly do dashboard, memoizadas pelo conteúdo dos dados + paleta."""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+import pandas as pd
+import plotly.graph_objects as go
+
+from html_tables import frame_fingerprint
+from theme import LIA
+
+FIGURE_CACHE_MAX_ENTRIES = 64
+
+# Figuras prontas (já validadas pelo Plotly); st.plotly_chart só faz to_dict() + JSON
+_figure_cache: "OrderedDict[str, object]" = OrderedDict()
+_figure_cache_lock = threading.Lock()
+
+
+def palette_fingerprint(palette: Dict[str, str]) -> str:
+    return hashlib.sha256(repr(sorted(palette.items())).encode("utf-8")).hexdigest()
+
+
+def _memoize(kind: str, data_key: str, palette: Dict[str, str], build: Callable[[], object]):
+    """Retorna o objeto em cache para (tipo, dados, paleta) ou constrói e guarda (LRU)."""
+    cache_key = f"{kind}:{data_key}:{palette_fingerprint(palette)}"
+    with _figure_cache_lock:
+        cached = _figure_cache.get(cache_key)
+        if cached is not None:
+            _figure_cache.move_to_end(cache_key)
+            return cached
+
+    value = build()
+
+    with _figure_cache_lock:
+        _figure_cache[cache_key] = value
+        while len(_figure_cache) > FIGURE_CACHE_MAX_ENTRIES:
+            _figure_cache.popitem(last=False)
+    return value
+
+
+def clear_figure_cache() -> None:
+    with _figure_cache_lock:
+        _figure_cache.clear()
+
+
+# =============================================================================
+# TENDÊNCIA (DIÁRIO / SEMANAL)
+# =============================================================================
+def build_trend_frames(trends_data: pd.DataFrame, year: Optional[int] = None) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Converte "dd/mm" em datas do ano corrente e consolida as semanas (W-MON) uma única vez
+
+    Args:
+        trends_data: DataFrame com colunas Data ("dd/mm") e Cliques
+        year: Ano aplicado às datas (padrão: ano corrente)
+
+    Returns:
+        Tupla (diário com coluna __date, semanal com __date/Cliques/Label)
+    """
+    year = year or datetime.now().year
+
+    def build():
+        trend_daily = trends_data.copy()
+        # Data vem como "dd/mm": anexar o ano e converter a coluna inteira de uma vez
+        trend_daily["__date"] = pd.to_datetime(
+            trend_daily["Data"].astype(str) + f"/{year}", format="%d/%m/%Y", errors="coerce"
+        )
+        weekly = trend_daily.dropna(subset=["__date"]).set_index("__date").resample("W-MON")["Cliques"].sum().reset_index()
+        weekly["Label"] = weekly["__date"].dt.strftime("Sem %d/%m")
+        return trend_daily, weekly
+
+    return _memoize(f"trend_frames:{year}", frame_fingerprint(trends_data), {}, build)
+
+
+def daily_clicks_figure(trend_daily: pd.DataFrame, palette: Dict[str, str] = LIA) -> go.Figure:
+    def build():
+        fig = go.Figure()
+        fig.add_trace(go.Scatter(
+            x=trend_daily["Data"],
+            y=trend_daily["Cliques"],
+            mode="lines",
+            line=dict(color=palette["primary"], width=3, shape="spline"),
+            fill="tozeroy",
+            fillcolor="rgba(92,201,182,0.2)"
+        ))
+        fig.update_layout(
+            height=260,
+            margin=dict(l=10, r=10, t=10, b=10),
+            paper_bgcolor="rgba(247,249,252,0)",
+            plot_bgcolor="rgba(247,249,252,0)",
+            xaxis=dict(showgrid=False, tickfont=dict(size=11, color=palette["text_secondary"]), tickcolor=palette["text_secondary"]),
+            yaxis=dict(showgrid=True, gridcolor="rgba(92,201,182,0.12)", tickfont=dict(size=11, color=palette["text_secondary"])),
+            showlegend=False
+        )
+        return fig
+
+    return _memoize("daily_clicks", frame_fingerprint(trend_daily[["Data", "Cliques"]]), palette, build)
+
+
+def weekly_clicks_figure(weekly: pd.DataFrame, palette: Dict[str, str] = LIA) -> go.Figure:
+    def build():
+        fig = go.Figure()
+        fig.add_trace(go.Scatter(
+            x=weekly["Label"],
+            y=weekly["Cliques"],
+            mode="lines",
+            line=dict(color=palette["secondary"], width=3, shape="spline"),
+            fill="tozeroy",
+            fillcolor="rgba(122,92,255,0.18)"
+        ))
+        fig.update_layout(
+            height=260,
+            margin=dict(l=10, r=10, t=10, b=10),
+            paper_bgcolor="rgba(247,249,252,0)",
+            plot_bgcolor="rgba(247,249,252,0)",
+            xaxis=dict(showgrid=False, tickfont=dict(size=11, color=palette["text_secondary"])),
+            yaxis=dict(showgrid=True, gridcolor="rgba(92,201,182,0.12)", tickfont=dict(size=11, color=palette["text_secondary"])),
+            showlegend=False
+        )
+        return fig
+
+    return _memoize("weekly_clicks", frame_fingerprint(weekly[["Label", "Cliques"]]), palette, build)
+
+
+# =============================================================================
+# MÉTRICAS POR DIA (CLIQUES / CTR / CPC)
+# =============================================================================
+def _daily_metric_layout(fig: go.Figure, title: str, palette: Dict[str, str]) -> None:
+    fig.update_layout(
+        title=dict(text=title, font=dict(size=14, color=palette["text_light"], family="Inter")),
+        height=220, margin=dict(l=10, r=10, t=40, b=30),
+        paper_bgcolor="rgba(247,249,252,0)", plot_bgcolor="rgba(247,249,252,0)",
+        xaxis=dict(showgrid=False, tickfont=dict(size=11, color=palette["text_secondary"]), showline=True, linecolor="rgba(92,201,182,0.2)"),
+        yaxis=dict(showgrid=True, gridcolor="rgba(92,201,182,0.12)", tickfont=dict(size=11, color=palette["text_secondary"]), showline=True, linecolor="rgba(92,201,182,0.2)"),
+        showlegend=False
+    )
+
+
+def clicks_per_day_figure(trends_data: pd.DataFrame, palette: Dict[str, str] = LIA) -> go.Figure:
+    def build():
+        fig = go.Figure()
+        fig.add_trace(go.Scatter(
+            x=trends_data["Data"],
+            y=trends_data["Cliques"],
+            mode="lines+markers",
+            line=dict(color=palette["primary"], width=2, shape='spline'),
+            marker=dict(size=6, color=palette["primary"]),
+            fill="tozeroy",
+            fillcolor="rgba(92,201,182,0.16)"
+        ))
+        _daily_metric_layout(fig, "Cliques/Dia", palette)
+        return fig
+
+    return _memoize("clicks_per_day", frame_fingerprint(trends_data[["Data", "Cliques"]]), palette, build)
+
+
+def ctr_per_day_figure(trends_data: pd.DataFrame, palette: Dict[str, str] = LIA) -> go.Figure:
+    def build():
+        fig = go.Figure()
+        fig.add_trace(go.Scatter(
+            x=trends_data["Data"],
+            y=trends_data["CTR"],
+            mode="lines+markers",
+            line=dict(color=palette["secondary"], width=2, shape='spline'),
+            marker=dict(size=6, color=palette["secondary"]),
+            fill="tozeroy",
+            fillcolor="rgba(122,92,255,0.16)"
+        ))
+        _daily_metric_layout(fig, "CTR/Dia (%)", palette)
+        return fig
+
+    return _memoize("ctr_per_day", frame_fingerprint(trends_data[["Data", "CTR"]]), palette, build)
+
+
+def cpc_per_day_figure(trends_data: pd.DataFrame, palette: Dict[str, str] = LIA) -> go.Figure:
+    def build():
+        fig = go.Figure()
+        fig.add_trace(go.Scatter(
+            x=trends_data["Data"], y=trends_data["CPC"],
+            mode="lines+markers", line=dict(color=palette["success"], width=3),
+            marker=dict(size=10, color=palette["success"], line=dict(width=2, color=palette["bg_dark"])),
+            fill="tozeroy", fillcolor="rgba(92,201,182,0.2)"
+        ))
+        _daily_metric_layout(fig, "CPC/Dia ($)", palette)
+        return fig
+
+    return _memoize("cpc_per_day", frame_fingerprint(trends_data[["Data", "CPC"]]), palette, build)
+
+
+def clicks_ctr_dual_axis_figure(trends_data: pd.DataFrame, palette: Dict[str, str] = LIA) -> go.Figure:
+    def build():
+        fig = go.Figure()
+        fig.add_trace(go.Scatter(x=trends_data["Data"], y=trends_data["Cliques"], name="Cliques", mode="lines+markers", line=dict(color=palette["primary"], width=3, shape='spline'), marker=dict(size=8, color=palette["primary"]), fill="tozeroy", fillcolor="rgba(92,201,182,0.16)"))
+        fig.add_trace(go.Scatter(x=trends_data["Data"], y=trends_data["CTR"], name="CTR %", yaxis="y2", mode="lines+markers", line=dict(color=palette["success"], width=3, shape='spline'), marker=dict(size=8, color=palette["success"])))
+        fig.update_layout(
+            yaxis2=dict(overlaying="y", side="right", range=[0, trends_data["CTR"].max() * 1.2] if trends_data["CTR"].max() > 0 else [0, 5], tickfont=dict(color=palette["text_secondary"]), gridcolor="rgba(92,201,182,0.12)"),
+            yaxis=dict(tickfont=dict(color=palette["text_secondary"]), gridcolor="rgba(92,201,182,0.12)"),
+            xaxis=dict(tickfont=dict(color=palette["text_secondary"])),
+            legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1, font=dict(color=palette["text_light"])),
+            height=350, margin=dict(l=0, r=0, t=30, b=0),
+            paper_bgcolor="rgba(247,249,252,0)", plot_bgcolor="rgba(247,249,252,0)",
+            hovermode="x unified"
+        )
+        return fig
+
+    return _memoize("clicks_ctr_dual_axis", frame_fingerprint(trends_data[["Data", "Cliques", "CTR"]]), palette, build)
+
+
+# =============================================================================
+# FUNIL
+# =============================================================================
+def funnel_figure(labels: Sequence[str], values: Sequence[int], palette: Dict[str, str] = LIA) -> go.Figure:
+    funnel_df = pd.DataFrame({"Etapa": list(labels), "Valor": list(values)})
+
+    def build():
+        fig = go.Figure(go.Funnel(
+            y=funnel_df['Etapa'],
+            x=funnel_df['Valor'],
+            textposition="inside",
+            textinfo="value+percent initial",
+            marker=dict(
+                color=[palette["primary"], palette["secondary"], palette["accent"], palette["success"]],
+                line=dict(width=2, color=palette["bg_dark"])
+            ),
+            textfont=dict(color=palette["bg_dark"], size=12, family="Inter")
+        ))
+        fig.update_layout(
+            height=350,
+            margin=dict(l=40, r=40, t=40, b=40),
+            paper_bgcolor="rgba(247,249,252,0)",
+            plot_bgcolor="rgba(247,249,252,0)",
+            font=dict(color=palette["text_light"])
+        )
+        return fig
+
+    return _memoize("funnel", frame_fingerprint(funnel_df), palette, build)
@@ -1,12 +1,19 @@
 """
 Arquivo de configuração para credenciais e variáveis de ambiente
 Suporta tanto variáveis de ambiente quanto Streamlit secrets
+
+Os getters ``Config.get_*`` resolvem a cada chamada. Caminhos quentes da renderização
+leem ``Config.snapshot()``: a configuração já resolvida, congelada e renovada só quando
+o TTL vence, quando um arquivo de secrets muda ou após ``Config.invalidate()``.
 """
 
 import json
 import logging
 import os
-from typing import Dict, Any, Optional
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Any, Optional, Tuple
 
 # Tentar importar streamlit para acessar secrets
 try:
@@ -18,6 +25,25 @@ except ImportError:
 logger = logging.getLogger(__name__)
 
 
+@dataclass(frozen=True)
+class ConfigSnapshot:
+    """Configuração resolvida de uma vez (sem secrets em texto; só o que a renderização consulta)."""
+
+    events_mode: str
+    install_campaigns_configured: bool
+    landing_host_filter: Optional[str]
+    ga4_realtime_refresh_seconds: int
+    meta_configured: bool
+    ga4_configured: bool
+    openai_configured: bool
+    ai_backend: str
+    ai_base_url: Optional[str]
+    ai_backend_ready: bool
+    ai_precompute_enabled: bool
+    ai_prompt_token_budget: int
+    resolved_at: float
+
+
 class Config:
     """Classe de configuração centralizada para o dashboard LIA"""
 
@@ -33,9 +59,24 @@ class Config:
     GOOGLE_SERVICE_ACCOUNT_JSON: Optional[str] = os.getenv("GOOGLE_SERVICE_ACCOUNT_JSON")
     GA4_SERVICE_ACCOUNT_JSON: Optional[str] = os.getenv("GA4_SERVICE_ACCOUNT_JSON")
     LANDING_HOST_FILTER: Optional[str] = os.getenv("LANDING_HOST_FILTER")
+    GA4_FACT_STORE_PATH: Optional[str] = os.getenv("GA4_FACT_STORE_PATH")
+    GA4_REALTIME_REFRESH_SECONDS: Optional[str] = os.getenv("GA4_REALTIME_REFRESH_SECONDS")
 
     # OpenAI
     OPENAI_API_KEY: Optional[str] = os.getenv("OPENAI_API_KEY")
+    AI_CACHE_PATH: Optional[str] = os.getenv("AI_CACHE_PATH")
+    AI_PROMPT_TOKEN_BUDGET: Optional[str] = os.getenv("AI_PROMPT_TOKEN_BUDGET")
+    AI_PRECOMPUTE: Optional[str] = os.getenv("AI_PRECOMPUTE")
+    AI_BACKEND: Optional[str] = os.getenv("AI_BACKEND")
+    AI_BASE_URL: Optional[str] = os.getenv("AI_BASE_URL")
+    AI_REPLAY_PATH: Optional[str] = os.getenv("AI_REPLAY_PATH")
+
+    # Snapshot da configuração resolvida (ver snapshot/invalidate)
+    SNAPSHOT_TTL_SECONDS = 300
+    _snapshot: Optional[ConfigSnapshot] = None
+    _snapshot_expires_at = 0.0
+    _snapshot_secrets_mtimes: Tuple[Optional[float], ...] = ()
+    _snapshot_lock = threading.Lock()
 
     @staticmethod
     def _get_streamlit_secret(key: str, default: Any = None) -> Any:
@@ -107,6 +148,89 @@ class Config:
             return env_value
         return cls._get_streamlit_secret("LANDING_HOST_FILTER")
 
+    @classmethod
+    def get_ga4_fact_store_path(cls) -> Optional[str]:
+        """Obtém o caminho do fact store diário do GA4 ("off" desativa; vazio usa o padrão)."""
+        raw = os.getenv("GA4_FACT_STORE_PATH") or cls._get_streamlit_secret("GA4_FACT_STORE_PATH")
+        if raw and str(raw).strip().lower() in {"off", "0", "false", "none"}:
+            return None
+        if raw:
+            return str(raw).strip()
+
+        from ga4_fact_store import DEFAULT_FACT_STORE_PATH
+        return DEFAULT_FACT_STORE_PATH
+
+    @classmethod
+    def get_ai_cache_path(cls) -> Optional[str]:
+        """Obtém o caminho do cache de análises de IA ("off" desativa; vazio usa o padrão)."""
+        raw = os.getenv("AI_CACHE_PATH") or cls._get_streamlit_secret("AI_CACHE_PATH")
+        if raw and str(raw).strip().lower() in {"off", "0", "false", "none"}:
+            return None
+        if raw:
+            return str(raw).strip()
+
+        from ai_cache import DEFAULT_AI_CACHE_PATH
+        return DEFAULT_AI_CACHE_PATH
+
+    @classmethod
+    def get_ai_prompt_token_budget(cls) -> int:
+        """Orçamento estimado de tokens para os dados enviados à IA (tabelas são cortadas para caber)."""
+        from ai_prompt import DEFAULT_PROMPT_TOKEN_BUDGET
+
+        raw = os.getenv("AI_PROMPT_TOKEN_BUDGET") or cls._get_streamlit_secret("AI_PROMPT_TOKEN_BUDGET")
+        if raw is None or str(raw).strip() == "":
+            return DEFAULT_PROMPT_TOKEN_BUDGET
+        try:
+            return max(1, int(str(raw).strip()))
+        except ValueError:
+            logger.warning("AI_PROMPT_TOKEN_BUDGET inválido '%s'; usando %s", raw, DEFAULT_PROMPT_TOKEN_BUDGET)
+            return DEFAULT_PROMPT_TOKEN_BUDGET
+
+    @classmethod
+    def get_ai_precompute_enabled(cls) -> bool:
+        """Indica se as análises de IA são pré-geradas em segundo plano após "Atualizar dados" (até 12 chamadas pagas)."""
+        raw = os.getenv("AI_PRECOMPUTE") or cls._get_streamlit_secret("AI_PRECOMPUTE", False)
+        normalized = str(raw).strip().lower()
+        return normalized in {"1", "true", "yes", "on"}
+
+    @classmethod
+    def get_ai_backend(cls) -> str:
+        """Backend de LLM da análise: openai (HTTP, padrão) ou replay (respostas gravadas em AI_REPLAY_PATH)."""
+        raw = os.getenv("AI_BACKEND") or cls._get_streamlit_secret("AI_BACKEND")
+        if raw:
+            normalized = str(raw).strip().lower()
+            if normalized in {"openai", "replay"}:
+                return normalized
+            logger.warning("AI_BACKEND inválido '%s'; usando openai", raw)
+        return "openai"
+
+    @classmethod
+    def get_ai_base_url(cls) -> Optional[str]:
+        """Endpoint compatível com a OpenAI (ex.: servidor local de ai_stub_server.py); vazio usa a OpenAI."""
+        raw = os.getenv("AI_BASE_URL") or cls._get_streamlit_secret("AI_BASE_URL")
+        return str(raw).strip() if raw else None
+
+    @classmethod
+    def get_ai_replay_path(cls) -> str:
+        """Arquivo de respostas gravadas usado pelo backend replay."""
+        raw = os.getenv("AI_REPLAY_PATH") or cls._get_streamlit_secret("AI_REPLAY_PATH")
+        if raw:
+            return str(raw).strip()
+
+        from ai_backends import DEFAULT_REPLAY_PATH
+        return DEFAULT_REPLAY_PATH
+
+    @classmethod
+    def get_ga4_realtime_refresh_seconds(cls) -> int:
+        """Intervalo de atualização do painel realtime do GA4 (0 desativa o polling automático)."""
+        raw = os.getenv("GA4_REALTIME_REFRESH_SECONDS") or cls._get_streamlit_secret("GA4_REALTIME_REFRESH_SECONDS")
+        if raw is None or str(raw).strip() == "":
+            return 60
+        try:
+            return max(0, int(str(raw).strip()))
+        except ValueError:
+            logger.warning("GA4_REALTIME_REFRESH_SECONDS inválido '%s'; usando 60s", raw)
+            return 60
 
     @classmethod
     def get_ga4_app_property_id(cls) -> Optional[str]:
@@ -186,21 +310,24 @@ class Config:
         return normalized in {"1", "true", "yes", "on"}
 
     @classmethod
-    def get_events_mode(cls) -> str:
-        """Define modo dos eventos: ga4|off.
-
-        Prioridade:
-        1) ENV/secret EVENTS_MODE (ga4/off)
-        2) default automático: ga4 se GA4 configurado, senão off
-        """
+    def _explicit_events_mode(cls) -> Optional[str]:
         raw = os.getenv("EVENTS_MODE") or cls._get_streamlit_secret("EVENTS_MODE")
         if raw:
             normalized = str(raw).strip().lower()
             if normalized in {"ga4", "off"}:
                 return normalized
             logger.warning("EVENTS_MODE inválido '%s'; usando fallback automático", raw)
+        return None
+
+    @classmethod
+    def get_events_mode(cls) -> str:
+        """Define modo dos eventos: ga4|off.
 
-        return "ga4" if cls.validate_ga4_credentials() else "off"
+        Prioridade:
+        1) ENV/secret EVENTS_MODE (ga4/off)
+        2) default automático: ga4 se GA4 configurado, senão off
+        """
+        return cls._explicit_events_mode() or ("ga4" if cls.validate_ga4_credentials() else "off")
 
     @classmethod
     def get_openai_api_key(cls) -> Optional[str]:
@@ -217,6 +344,11 @@ class Config:
         """Valida se a chave da API OpenAI está disponível"""
         return bool(cls.get_openai_api_key())
 
+    @classmethod
+    def validate_ai_backend(cls) -> bool:
+        """Indica se a análise com IA pode rodar (chave OpenAI, endpoint compatível ou replay)."""
+        return cls.get_ai_backend() == "replay" or bool(cls.get_ai_base_url()) or cls.validate_openai_credentials()
+
     @classmethod
     def validate_meta_credentials(cls) -> bool:
         """Valida se as credenciais do Meta estão disponíveis"""
@@ -258,3 +390,80 @@ class Config:
             'ga4': 'Conectado' if validation['ga4'] else 'Não configurado',
             'openai': 'Conectado' if validation['openai'] else 'Não configurado',
         }
+
+    @staticmethod
+    def _secrets_file_mtimes() -> Tuple[Optional[float], ...]:
+        """mtime de cada secrets.toml que o Streamlit lê (None se o arquivo não existe)."""
+        if not HAS_STREAMLIT:
+            return ()
+        # Locais documentados (home e diretório atual); a lista interna do Streamlit é
+        # preferida quando existe, por refletir ajustes de configuração (secrets.files)
+        paths = [
+            os.path.join(os.path.expanduser("~"), ".streamlit", "secrets.toml"),
+            os.path.join(os.getcwd(), ".streamlit", "secrets.toml"),
+        ]
+        try:
+            from streamlit.runtime.secrets import secrets_singleton
+            paths = list(getattr(secrets_singleton, "_file_paths", None) or paths)
+        except Exception:
+            pass
+        mtimes = []
+        for path in paths:
+            try:
+                mtimes.append(os.path.getmtime(path))
+            except OSError:
+                mtimes.append(None)
+        return tuple(mtimes)
+
+    @classmethod
+    def _resolve_snapshot(cls) -> ConfigSnapshot:
+        ga4_configured = cls.validate_ga4_credentials()
+        openai_configured = cls.validate_openai_credentials()
+        ai_backend = cls.get_ai_backend()
+        ai_base_url = cls.get_ai_base_url()
+        return ConfigSnapshot(
+            events_mode=cls._explicit_events_mode() or ("ga4" if ga4_configured else "off"),
+            install_campaigns_configured=cls.get_install_campaigns_configured(),
+            landing_host_filter=cls.get_landing_host_filter(),
+            ga4_realtime_refresh_seconds=cls.get_ga4_realtime_refresh_seconds(),
+            meta_configured=cls.validate_meta_credentials(),
+            ga4_configured=ga4_configured,
+            openai_configured=openai_configured,
+            ai_backend=ai_backend,
+            ai_base_url=ai_base_url,
+            ai_backend_ready=ai_backend == "replay" or bool(ai_base_url) or openai_configured,
+            ai_precompute_enabled=cls.get_ai_precompute_enabled(),
+            ai_prompt_token_budget=cls.get_ai_prompt_token_budget(),
+            resolved_at=time.time(),
+        )
+
+    @classmethod
+    def snapshot(cls) -> ConfigSnapshot:
+        """
+        Configuração resolvida e congelada, compartilhada no processo
+
+        Renovada quando passa ``SNAPSHOT_TTL_SECONDS``, quando um secrets.toml muda
+        (mtime) ou após ``invalidate()``; entre renovações, ler é só acessar atributos.
+
+        Returns:
+            ConfigSnapshot atual
+        """
+        mtimes = cls._secrets_file_mtimes()
+        with cls._snapshot_lock:
+            if (
+                cls._snapshot is not None
+                and time.monotonic() < cls._snapshot_expires_at
+                and mtimes == cls._snapshot_secrets_mtimes
+            ):
+                return cls._snapshot
+            cls._snapshot = cls._resolve_snapshot()
+            cls._snapshot_expires_at = time.monotonic() + cls.SNAPSHOT_TTL_SECONDS
+            cls._snapshot_secrets_mtimes = mtimes
+            logger.info("Configuração resolvida (snapshot renovado)")
+            return cls._snapshot
+
+    @classmethod
+    def invalidate(cls) -> None:
+        """Descarta o snapshot: a próxima leitura resolve env/secrets de novo."""
+        with cls._snapshot_lock:
+            cls._snapshot = None
@@ -1,4 +1,32 @@
-"""Helpers para payload dos cards KPI do dashboard."""
+"""Helpers para payload e HTML dos cards KPI do dashboard."""
+
+from theme import LIA
+
+# Template já sem indentação (antes era textwrap.dedent a cada card)
+_KPI_CARD_TEMPLATE = """<label class="kpi-card" id="{card_id}">
+    <input type="checkbox" />
+    <div class="kpi-inner">
+        <div class="kpi-front">
+            <div class="kpi-top">
+                <div style="display:flex;align-items:center;gap:8px;">
+                    <div class="kpi-icon">{icon}</div>
+                    <div class="kpi-label">{label}</div>
+                </div>
+                <span style="font-size:16px;color:{text_muted};">⋯</span>
+            </div>
+            <div class="kpi-value">{value}</div>
+            <div class="kpi-delta {delta_class}">{delta_text}</div>
+        </div>
+        <div class="kpi-back">
+            <div class="kpi-top">
+                <div class="kpi-label">{label}</div>
+                <span style="font-size:14px;color:{text_muted};">✕</span>
+            </div>
+            <h3 style="margin:0;font-size:18px;color:{text_dark};">{value}</h3>
+            <p>Variação: <span class="{delta_class}">{delta_text}</span></p>
+        </div>
+    </div>
+</label>"""
 
 
 def _num(value, default=0.0):
@@ -43,3 +71,59 @@ def build_meta_kpi_cards_payload(meta_data: dict) -> list:
         cards.append({"icon": "👁️", "label": "View Content (SDK)", "value": f"{view_content:,.0f}", "delta": 0, "suffix": ""})
 
     return cards
+
+
+def build_ga4_kpi_cards_payload(ga4_data: dict) -> list:
+    """Monta o payload padronizado dos cards KPI da seção GA4 (comportamento no site)."""
+    return [
+        {"icon": "🌐", "label": "Visitas ao site", "value": f"{_num(ga4_data.get('sessoes'), 0.0):,.0f}", "delta": ga4_data.get('delta_sessoes')},
+        {"icon": "👥", "label": "Visitantes únicos", "value": f"{_num(ga4_data.get('usuarios'), 0.0):,.0f}", "delta": ga4_data.get('delta_usuarios')},
+        {"icon": "📄", "label": "Páginas visualizadas", "value": f"{_num(ga4_data.get('pageviews'), 0.0):,.0f}", "delta": ga4_data.get('delta_pageviews')},
+        {"icon": "⚡", "label": "Taxa de engajamento", "value": f"{_num(ga4_data.get('taxa_engajamento'), 0.0):.1f}%", "delta": ga4_data.get('delta_engajamento')},
+        {"icon": "⏱️", "label": "Tempo médio no site", "value": ga4_data.get('tempo_medio', "0m 0s"), "delta": None, "suffix": ""},
+    ]
+
+
+def build_kpi_card(icon, label, value, delta, suffix="%", invert=False, precision=1, palette: dict = LIA) -> str:
+    """Monta o HTML de um card KPI (frente/verso com variação)."""
+    delta_class = "delta-neutral"
+    delta_text = "stable"
+
+    if delta is not None and delta != 0:
+        is_positive = delta > 0
+        # Se invert=True, positivo é ruim (ex: CPC subindo)
+        is_good = not is_positive if invert else is_positive
+        delta_class = "delta-up" if is_good else "delta-down"
+        icon_delta = "↑" if is_positive else "↓"
+        delta_text = f"{icon_delta} {abs(delta):.{precision}f}{suffix}"
+
+    card_id = "kpi-" + "".join(
+        char.lower() if char.isalnum() else "-" for char in str(label)
+    ).strip("-")
+
+    return _KPI_CARD_TEMPLATE.format(
+        card_id=card_id,
+        icon=icon,
+        label=label,
+        value=value,
+        delta_class=delta_class,
+        delta_text=delta_text,
+        text_muted=palette["text_muted"],
+        text_dark=palette["text_dark"],
+    )
+
+
+def build_kpi_cards_html(cards: list) -> str:
+    """HTML dos cards de um payload (meta ou GA4), na ordem do payload."""
+    return "\n".join(
+        build_kpi_card(
+            card["icon"],
+            card["label"],
+            card["value"],
+            card.get("delta"),
+            suffix=card.get("suffix", "%"),
+            invert=card.get("invert", False),
+            precision=card.get("precision", 1),
+        )
+        for card in cards
+    )
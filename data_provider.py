@@ -0,0 +1,815 @@
+"""Provider de dados do dashboard: Meta Ads + GA4 com fallback para dados mock.
+
+Os SDKs (``google.analytics.data_v1beta``/gRPC, ``requests``) só são importados e os
+clientes só são construídos no primeiro acesso, para não pesar no cold start.
+
+O app mantém uma única instância por processo (``st.cache_resource``); o estado de
+erro é por sessão e fica no mapeamento devolvido por ``session_state``.
+"""
+
+import logging
+import sys
+import threading
+from datetime import datetime, timedelta
+from typing import Callable, MutableMapping, Optional
+
+import pandas as pd
+
+import startup_profile
+from config import Config
+from ga4_fact_store import GA4DailyFactStore
+from landing_events_service import build_landing_events_card_data
+from meta_funnel import ACTIVATE_APP_ACTION_TYPES, INSTALL_ACTION_TYPES, STORE_CLICK_ACTION_TYPES, collect_action_type_diagnostics, collect_all_action_types, sum_actions_by_types
+
+logger = logging.getLogger(__name__)
+
+
+_UNSET = object()
+
+
+class DataProvider:
+    ERROR_STATE_KEY = "data_provider_error_state"
+    ERROR_MESSAGE_KEY = "data_provider_error_message"
+
+    def __init__(self, mode="auto", session_state: Optional[Callable[[], MutableMapping]] = None):
+        """
+        Args:
+            mode: "auto" (APIs reais quando há credenciais) ou "mock"
+            session_state: Função que devolve o estado da sessão atual (ex.: ``lambda: st.session_state``);
+                sem ela o estado de erro fica na própria instância
+        """
+        self.mode = mode
+        self._local_state = {}
+        self._session_state = session_state or (lambda: self._local_state)
+        # Clientes construídos no primeiro acesso (ver meta_client / ga4_client)
+        self._meta_client = _UNSET
+        self._ga4_clients = _UNSET
+        self._clients_lock = threading.Lock()
+
+    @property
+    def meta_client(self):
+        """Cliente Meta Ads (None sem credenciais); importa ``meta_integration`` no primeiro uso."""
+        if self._meta_client is _UNSET:
+            with self._clients_lock:
+                if self._meta_client is _UNSET:
+                    self._meta_client = self._init_meta_client()
+        return self._meta_client
+
+    @property
+    def ga4_client(self):
+        return self._get_ga4_clients()[0]
+
+    @property
+    def ga4_app_client(self):
+        return self._get_ga4_clients()[1]
+
+    def _get_ga4_clients(self):
+        if self._ga4_clients is _UNSET:
+            with self._clients_lock:
+                if self._ga4_clients is _UNSET:
+                    self._ga4_clients = self._init_ga4_clients()
+        return self._ga4_clients
+
+    @staticmethod
+    def _init_meta_client():
+        """Inicializa o cliente do Meta Ads se as credenciais estiverem disponíveis"""
+        try:
+            if Config.validate_meta_credentials():
+                meta_integration = startup_profile.timed_import("meta_integration")
+                with startup_profile.phase("cliente Meta"):
+                    client = meta_integration.MetaAdsIntegration(
+                        access_token=Config.get_meta_access_token(),
+                        ad_account_id=Config.get_meta_ad_account_id(),
+                        app_id=Config.get_meta_app_id(),
+                    )
+                logger.info("Meta Ads client initialized")
+                return client
+        except Exception as e:
+            logger.error(f"Erro ao inicializar Meta client: {e}")
+        return None
+
+    def _init_ga4_clients(self):
+        """
+        Inicializa os clientes GA4 (site e app) se as credenciais estiverem disponíveis
+
+        Returns:
+            Tupla (cliente do site, cliente do app); cada um pode ser None
+        """
+        try:
+            if Config.validate_ga4_credentials():
+                ga_integration = startup_profile.timed_import("ga_integration")
+                with startup_profile.phase("clientes GA4"):
+                    creds = Config.get_ga4_credentials()
+                    fact_store = self._init_ga4_fact_store()
+                    ga4_client = ga_integration.GA4Integration(
+                        credentials_json=creds,
+                        property_id=Config.get_ga4_property_id(),
+                        fact_store=fact_store,
+                    )
+                    ga4_app_client = None
+                    ga4_app_property_id = Config.get_ga4_app_property_id()
+                    if ga4_app_property_id:
+                        ga4_app_client = ga_integration.GA4Integration(
+                            credentials_json=creds,
+                            property_id=ga4_app_property_id,
+                            fact_store=fact_store,
+                        )
+                logger.info("GA4 client initialized")
+                return ga4_client, ga4_app_client
+        except Exception as e:
+            logger.error(f"Erro ao inicializar GA4 client: {e}")
+        return None, None
+
+    @staticmethod
+    def _init_ga4_fact_store():
+        """Abre o fact store diário do GA4 (None se desativado ou sem disco gravável)."""
+        path = Config.get_ga4_fact_store_path()
+        if not path:
+            return None
+        try:
+            return GA4DailyFactStore(path)
+        except Exception as e:
+            logger.warning(f"GA4 fact store desativado ({path}): {e}")
+            return None
+
+    @staticmethod
+    def clear_api_caches() -> None:
+        """Descarta as respostas do GA4 guardadas no processo (ex.: "Atualizar dados"), sem importar o SDK à toa."""
+        ga_integration = sys.modules.get("ga_integration")
+        if ga_integration is not None:
+            ga_integration.GA4Integration.clear_report_cache()
+
+    def _state(self) -> MutableMapping:
+        try:
+            return self._session_state()
+        except Exception:
+            # Fora de uma sessão (thread sem contexto do Streamlit, scripts)
+            return self._local_state
+
+    @property
+    def error_state(self) -> bool:
+        return bool(self._state().get(self.ERROR_STATE_KEY, False))
+
+    @error_state.setter
+    def error_state(self, value: bool) -> None:
+        self._state()[self.ERROR_STATE_KEY] = bool(value)
+
+    @property
+    def error_message(self) -> str:
+        return self._state().get(self.ERROR_MESSAGE_KEY, "")
+
+    @error_message.setter
+    def error_message(self, value: str) -> None:
+        self._state()[self.ERROR_MESSAGE_KEY] = value
+
+    def _safe_execute(self, func, default=None):
+        """Executa funcao com tratamento de erro"""
+        try:
+            return func()
+        except Exception as e:
+            logger.error(f"DataProvider error: {e}")
+            self.error_state = True
+            self.error_message = str(e)
+            return default
+
+    def _period_to_api_format(self, period):
+        """Converte período do dashboard para formato da API"""
+        mapping = {
+            "today": "today",
+            "yesterday": "yesterday",
+            "last_7d": "last_7d",
+            "last_14d": "last_14d",
+            "last_30d": "last_30d",
+            "custom": "custom"
+        }
+        return mapping.get(period, "last_7d")
+
+    def _enrich_with_sdk_events(self, result: dict, api_period: str, custom_start, custom_end, install_fallback=True):
+        """
+        Busca eventos SDK e enriquece o resultado com dados do SDK.
+
+        Com ``install_fallback``, ``instalacoes_sdk`` zerado é preenchido pelo SDK
+        (ou pelo first_open do GA4 do app); sem ele o campo não é tocado.
+        """
+        if not self.meta_client:
+            return
+
+        if not self.meta_client.app_id:
+            result["_all_sdk_events"] = {}
+            result["_sdk_source"] = "no_app_id"
+            result["_sdk_event_types"] = []
+            result["_sdk_errors"] = ["META_APP_ID não configurado — eventos SDK não podem ser consultados"]
+            result["_sdk_debug"] = {}
+            return
+
+        try:
+            sdk_data = self.meta_client.get_all_sdk_events(
+                date_range=api_period,
+                custom_start=custom_start,
+                custom_end=custom_end,
+            )
+            result["_all_sdk_events"] = sdk_data["events"]
+            result["_sdk_source"] = sdk_data["source"]
+            result["_sdk_event_types"] = list(sdk_data["events"].keys())
+            result["_sdk_errors"] = sdk_data["errors"]
+            result["_sdk_debug"] = sdk_data.get("_debug", {})
+
+            # Se não encontrou install events nas actions do Ads Insights,
+            # usar dados do SDK endpoint (que inclui eventos não-atribuídos)
+            if install_fallback and result.get("instalacoes_sdk", 0) == 0:
+                sdk_installs = sdk_data["install_count"]
+                if sdk_installs == 0 and sdk_data["activate_count"] > 0:
+                    logger.warning(
+                        "Using SDK activate_app (%d) as proxy for installs",
+                        sdk_data["activate_count"],
+                    )
+                    sdk_installs = sdk_data["activate_count"]
+
+                if sdk_installs > 0:
+                    result["instalacoes_sdk"] = sdk_installs
+
+            endpoint_unsupported = bool(result.get("_sdk_debug", {}).get("endpoint_unsupported"))
+            if install_fallback and result.get("instalacoes_sdk", 0) == 0 and endpoint_unsupported:
+                if self.ga4_app_client:
+                    ga4_installs = self.ga4_app_client.get_event_count(
+                        event_name="first_open",
+                        date_range=api_period,
+                        custom_start=custom_start,
+                        custom_end=custom_end,
+                    )
+                    if ga4_installs > 0:
+                        result["instalacoes_sdk"] = ga4_installs
+                        result["_sdk_source"] = "ga4_first_open"
+                        result["_sdk_debug"]["ga4_fallback"] = {
+                            "event": "first_open",
+                            "value": ga4_installs,
+                            "used": True,
+                        }
+                else:
+                    msg = "Instalações indisponíveis: Meta endpoint unsupported e GA4_APP_PROPERTY_ID ausente."
+                    result["_sdk_errors"].append(msg)
+                    result["_sdk_debug"]["ga4_fallback"] = {"used": False, "reason": "missing_ga4_app_property_id"}
+
+        except Exception as e:
+            logger.error("Failed to fetch SDK events: %s", e)
+            result["_sdk_source"] = result.get("_sdk_source", "error")
+            result["_sdk_errors"] = [str(e)]
+            result["_sdk_debug"] = {}
+
+    def get_sdk_enrichment(self, period="7d", custom_start=None, custom_end=None, install_fallback=True):
+        """
+        Eventos SDK do app como etapa separada do get_meta_metrics (são totais da conta, não por campanha)
+
+        Args:
+            period: Período do dashboard
+            custom_start: Data inicial (período custom)
+            custom_end: Data final (período custom)
+            install_fallback: Buscar instalações no SDK/GA4 first_open (só quando as actions
+                do Ads Insights não trouxeram instalações)
+
+        Returns:
+            Dict com os campos _sdk_* / _all_sdk_events (e instalacoes_sdk, com install_fallback)
+            para mesclar no resultado do Meta
+        """
+        result = {"instalacoes_sdk": 0} if install_fallback else {}
+        if self.meta_client and self.mode != "mock":
+            self._enrich_with_sdk_events(
+                result, self._period_to_api_format(period), custom_start, custom_end, install_fallback=install_fallback
+            )
+        return result
+
+    def get_meta_metrics(self, period="7d", level="campaign", filters=None, campaign_filter=None, custom_start=None, custom_end=None, include_sdk=True):
+        # Tentar dados reais primeiro
+        if self.meta_client and self.mode != "mock":
+            try:
+                api_period = self._period_to_api_format(period)
+
+                # Primeiro busca COM filtro de campanha
+                insights = self.meta_client.get_ad_insights(date_range=api_period, campaign_name_filter=campaign_filter, custom_start=custom_start, custom_end=custom_end)
+
+                if not insights.empty:
+                    result = self._process_meta_insights(insights)
+
+                    # Buscar métricas agregadas para Alcance e Frequência corretos
+                    aggregated = self.meta_client.get_aggregated_insights(
+                        date_range=api_period,
+                        campaign_name_filter=campaign_filter,
+                        custom_start=custom_start,
+                        custom_end=custom_end
+                    )
+                    if aggregated:
+                        result["alcance"] = aggregated.get("reach", result["alcance"])
+                        result["frequencia"] = aggregated.get("frequency", result["frequencia"])
+                        result["_debug"] = {"aggregated_insights": aggregated.get("_debug", {})}
+
+                    # Eventos SDK (são totais, não por campanha); o dashboard busca à parte via get_sdk_enrichment
+                    if include_sdk:
+                        self._enrich_with_sdk_events(result, api_period, custom_start, custom_end)
+
+                    result["_data_source"] = "real"
+                    result["_filter_applied"] = campaign_filter
+                    return result
+
+                # Se não encontrou com filtro, tenta SEM filtro para ver se há dados
+                if campaign_filter:
+                    logger.info(f"Meta: No data found for filter '{campaign_filter}', trying without filter")
+                    insights_no_filter = self.meta_client.get_ad_insights(date_range=api_period, campaign_name_filter=None, custom_start=custom_start, custom_end=custom_end)
+
+                    if not insights_no_filter.empty:
+                        # Há dados mas não com o filtro especificado
+                        result = self._process_meta_insights(insights_no_filter)
+
+                        # Buscar métricas agregadas para Alcance e Frequência corretos
+                        aggregated = self.meta_client.get_aggregated_insights(
+                            date_range=api_period,
+                            campaign_name_filter=None,
+                            custom_start=custom_start,
+                            custom_end=custom_end
+                        )
+                        if aggregated:
+                            result["alcance"] = aggregated.get("reach", result["alcance"])
+                            result["frequencia"] = aggregated.get("frequency", result["frequencia"])
+                            result["_debug"] = {"aggregated_insights": aggregated.get("_debug", {})}
+
+                        # Eventos SDK (são totais, não por campanha)
+                        if include_sdk:
+                            self._enrich_with_sdk_events(result, api_period, custom_start, custom_end)
+
+                        result["_data_source"] = "real_no_filter"
+                        result["_filter_applied"] = None
+                        result["_requested_filter"] = campaign_filter
+                        # Log das campanhas disponíveis para debug
+                        if 'campaign_name' in insights_no_filter.columns:
+                            available = insights_no_filter['campaign_name'].unique().tolist()
+                            logger.info(f"Meta: Available campaigns: {available}")
+                            result["_available_campaigns"] = available
+                        return result
+
+            except Exception as e:
+                logger.error(f"Erro ao obter dados reais do Meta: {e}")
+
+        # Fallback para mock
+        result = self._safe_execute(
+            lambda: self._get_mock_meta_metrics(period, level),
+            default=self._empty_meta_metrics()
+        )
+        result["_data_source"] = "mock"
+        return result
+
+    def _process_meta_insights(self, df):
+        """Processa insights do Meta para formato do dashboard"""
+        import math
+
+        def safe_sum(col):
+            """Soma segura que trata NaN"""
+            if col not in df.columns:
+                return 0
+            val = df[col].sum()
+            return 0 if (pd.isna(val) or math.isnan(val)) else val
+
+        def safe_int(val):
+            """Conversão segura para int"""
+            if pd.isna(val) or (isinstance(val, float) and math.isnan(val)):
+                return 0
+            return int(val)
+
+        def safe_div(numerator, denominator):
+            """Divisão segura que retorna 0 se divisor for 0"""
+            if denominator == 0:
+                return 0
+            return numerator / denominator
+
+
+        try:
+            # Agregar métricas básicas
+            total_spend = safe_sum('spend')
+            total_impressions = safe_int(safe_sum('impressions'))
+            total_clicks = safe_int(safe_sum('clicks'))
+
+            # Calcular métricas derivadas corretamente a partir dos totais
+            # CTR = (clicks / impressions) * 100
+            ctr = safe_div(total_clicks, total_impressions) * 100
+            # CPC = spend / clicks
+            cpc = safe_div(total_spend, total_clicks)
+            # CPM = (spend / impressions) * 1000
+            cpm = safe_div(total_spend, total_impressions) * 1000
+
+            # Nota: Alcance e Frequência serão sobrescritos pelo get_aggregated_insights
+            # pois não podem ser somados (são métricas de usuários únicos)
+            actions_series = df["actions"] if "actions" in df.columns else pd.Series(dtype=object)
+            found_action_types = collect_all_action_types(actions_series)
+            diagnostics = collect_action_type_diagnostics(actions_series)
+            store_clicks, has_store_clicks = sum_actions_by_types(actions_series, STORE_CLICK_ACTION_TYPES)
+            if not has_store_clicks:
+                # Fallback: try outbound_click specifically
+                store_clicks, has_outbound = sum_actions_by_types(actions_series, {"outbound_click"})
+                if not has_outbound:
+                    # Fallback: try link_click
+                    store_clicks, has_link_clicks = sum_actions_by_types(actions_series, {"link_click"})
+                    if has_link_clicks:
+                        logger.warning(
+                            "Meta funnel: store click actions not found, "
+                            "using 'link_click' as fallback"
+                        )
+                    else:
+                        logger.warning(
+                            "Meta funnel: no store click actions found. "
+                            "Using total clicks as fallback."
+                        )
+                        store_clicks = total_clicks
+
+            # SDK install events: check all known install action types
+            instalacoes_sdk, tem_eventos_instalacao = sum_actions_by_types(actions_series, INSTALL_ACTION_TYPES)
+            if not tem_eventos_instalacao:
+                # Try activate_app as secondary signal for installs
+                activate_count, has_activate = sum_actions_by_types(actions_series, ACTIVATE_APP_ACTION_TYPES)
+                if has_activate:
+                    logger.warning(
+                        "Meta funnel: no install events found, but found activate_app events (%d). "
+                        "Using activate_app as proxy for installs.",
+                        activate_count,
+                    )
+                    instalacoes_sdk = activate_count
+                    tem_eventos_instalacao = True
+                else:
+                    logger.warning(
+                        "Meta funnel: no SDK install events found. "
+                        "Action types in response: %s",
+                        list(diagnostics.get("all_action_types", {}).keys()),
+                    )
+
+            return {
+                "investimento": total_spend,
+                "impressoes": total_impressions,
+                "alcance": safe_int(safe_sum('reach')),  # Pode ser sobrescrito por aggregated
+                "frequencia": 0,  # Será sobrescrito por aggregated; reach não é aditivo
+                "cliques_link": total_clicks,
+                "store_clicks_meta": store_clicks,
+                "instalacoes_sdk": instalacoes_sdk,
+                "instalacoes_total": 0,
+                "ctr_link": round(ctr, 2),
+                "cpc_link": round(cpc, 2),
+                "cpm": round(cpm, 2),
+                "delta_investimento": 0,
+                "delta_impressoes": 0,
+                "delta_alcance": 0,
+                "delta_frequencia": 0,
+                "delta_cliques": 0,
+                "delta_ctr": 0,
+                "delta_cpc": 0,
+                "delta_cpm": 0,
+                "_action_types_found": found_action_types,
+                "_sdk_diagnostics": diagnostics,
+            }
+        except Exception as e:
+            logger.error(f"Erro ao processar insights Meta: {e}")
+            return self._empty_meta_metrics()
+
+    def get_ga4_metrics(self, period="7d", filters=None, custom_start=None, custom_end=None, campaign_filter=None):
+        # Tentar dados reais primeiro
+        if self.ga4_client and self.mode != "mock":
+            try:
+                api_period = self._period_to_api_format(period)
+                metrics = self.ga4_client.get_aggregated_metrics(date_range=api_period, custom_start=custom_start, custom_end=custom_end, campaign_filter=campaign_filter)
+
+                if metrics:
+                    sessions = metrics.get('sessoes', 0)
+                    users = metrics.get('usuarios', 0)
+                    pageviews = metrics.get('pageviews', 0)
+
+                    # Log para diagnóstico
+                    logger.info(f"GA4 metrics retrieved - sessions: {sessions}, users: {users}, pageviews: {pageviews}, filter: {campaign_filter}")
+
+                    # Verificar se há dados significativos (não apenas sessions)
+                    has_meaningful_data = sessions > 0 or users > 0 or pageviews > 0
+
+                    if has_meaningful_data:
+                        # Adicionar deltas (por enquanto zerados)
+                        metrics['delta_sessoes'] = 0
+                        metrics['delta_usuarios'] = 0
+                        metrics['delta_pageviews'] = 0
+                        metrics['delta_engajamento'] = 0
+                        metrics['_campaign_filter'] = campaign_filter
+
+                        # Indicar se dados são completos ou parciais
+                        if sessions > 0:
+                            metrics['_data_source'] = 'real'
+                        else:
+                            # Dados parciais: há pageviews/users mas não sessions
+                            metrics['_data_source'] = 'partial'
+                            logger.warning(f"GA4 partial data: sessions=0 but users={users}, pageviews={pageviews}")
+                        return metrics
+
+                # GA4 conectado mas sem dados para este filtro
+                return {**self._empty_metrics(), "_data_source": "no_data", "_campaign_filter": campaign_filter}
+
+            except Exception as e:
+                logger.error(f"Erro ao obter dados reais do GA4: {e}")
+
+        # Fallback para mock
+        metrics = self._get_mock_ga4_metrics()
+        metrics["_data_source"] = "mock"
+        return metrics
+
+    def get_source_medium(self, period="7d", custom_start=None, custom_end=None, campaign_filter=None):
+        if self.ga4_client and self.mode != "mock":
+            try:
+                api_period = self._period_to_api_format(period)
+                df = self.ga4_client.get_sessions_data(date_range=api_period, custom_start=custom_start, custom_end=custom_end)
+                if not df.empty:
+                    # Agrupar por source_medium
+                    summary = df.groupby('source_medium').agg({
+                        'sessions': 'sum',
+                        'users': 'sum',
+                        'engagement_rate': 'mean',
+                        'pageviews': 'sum'
+                    }).reset_index()
+                    summary = summary.sort_values('sessions', ascending=False)
+                    summary.columns = ["Origem / Midia", "Sessoes", "Usuarios", "Engajamento", "Pageviews"]
+                    # Formatar engajamento
+                    summary["Engajamento"] = summary["Engajamento"].apply(lambda x: f"{x*100:.1f}%")
+                    return summary
+            except Exception as e:
+                logger.error(f"Erro ao obter source/medium real: {e}")
+
+        return self._get_mock_source_medium()
+
+    def get_events_data(self, period="7d", custom_start=None, custom_end=None, campaign_filter=None):
+        if self.ga4_client and self.mode != "mock":
+            try:
+                api_period = self._period_to_api_format(period)
+                df = self.ga4_client.get_events_data(date_range=api_period, custom_start=custom_start, custom_end=custom_end, campaign_filter=campaign_filter)
+                if not df.empty:
+                    # Renomear colunas para o dashboard
+                    df = df.rename(columns={
+                        'event_name': 'Nome do Evento',
+                        'event_count': 'Contagem de Eventos',
+                        'total_users': 'Total de Usuarios',
+                        'events_per_user': 'Eventos por Usuario'
+                    })
+                    # Formatar colunas com percentuais
+                    df['Contagem de Eventos'] = df.apply(lambda x: f"{x['Contagem de Eventos']:,} ({x['event_count_pct']:.2f}%)".replace(',', '.'), axis=1)
+                    df['Total de Usuarios'] = df.apply(lambda x: f"{x['Total de Usuarios']:,} ({x['users_pct']:.2f}%)".replace(',', '.'), axis=1)
+                    df['Eventos por Usuario'] = df['Eventos por Usuario'].apply(lambda x: f"{x:.2f}".replace('.', ','))
+
+                    return df[['Nome do Evento', 'Contagem de Eventos', 'Total de Usuarios', 'Eventos por Usuario']]
+            except Exception as e:
+                logger.error(f"Erro ao obter eventos reais: {e}")
+
+        return self._get_mock_events_data()
+
+    def get_landing_events_card_data(self, period="7d", custom_start=None, custom_end=None):
+        """Retorna dados do card de Eventos da Landing (GA4) com fallback seguro."""
+        config = Config.snapshot()
+        events_mode = config.events_mode
+        api_period = self._period_to_api_format(period)
+        landing_host_filter = config.landing_host_filter
+        return build_landing_events_card_data(
+            self.ga4_client,
+            events_mode=events_mode,
+            period_api=api_period,
+            custom_start=custom_start,
+            custom_end=custom_end,
+            landing_host_filter=landing_host_filter,
+        )
+
+    def get_realtime_summary(self):
+        """Retorna usuários ativos/eventos dos últimos 30 min do GA4 (None sem cliente real)."""
+        if self.ga4_client and self.mode != "mock":
+            try:
+                return self.ga4_client.get_realtime_summary()
+            except Exception as e:
+                logger.error(f"Erro ao obter realtime do GA4: {e}")
+        return None
+
+    def get_creative_data(self, period="7d", custom_start=None, custom_end=None, campaign_filter=None):
+        if self.meta_client and self.mode != "mock":
+            try:
+                api_period = self._period_to_api_format(period)
+
+                # Primeiro tenta com filtro de campanha
+                df = self.meta_client.get_creative_insights(date_range=api_period, campaign_name_filter=campaign_filter, custom_start=custom_start, custom_end=custom_end)
+
+                # Se não encontrou com filtro, tenta sem filtro
+                if df.empty and campaign_filter:
+                    logger.info(f"Creative: No data with filter '{campaign_filter}', trying without filter")
+                    df = self.meta_client.get_creative_insights(date_range=api_period, campaign_name_filter=None, custom_start=custom_start, custom_end=custom_end)
+
+                if not df.empty:
+                    # Renomear e selecionar colunas
+                    df = df.rename(columns={
+                        'ad_name': 'Criativo',
+                        'spend': 'Valor gasto',
+                        'impressions': 'Exibições',
+                        'clicks': 'Cliques',
+                        'ctr': 'Taxa de cliques',
+                        'cpc': 'Custo por clique',
+                        'cpm': 'Custo por mil'
+                    })
+                    # Adicionar coluna de formato (Meta API não retorna diretamente de forma simples, vamos inferir ou deixar fixo)
+                    df['Formato'] = df['Criativo'].apply(lambda x: "Video" if "video" in str(x).lower() else "Imagem")
+                    return df[['Criativo', 'Formato', 'Valor gasto', 'Exibições', 'Cliques', 'Taxa de cliques', 'Custo por clique', 'Custo por mil']]
+            except Exception as e:
+                logger.error(f"Erro ao obter criativos reais: {e}")
+
+        # Retorna DataFrame vazio em vez de mock data para não mostrar dados falsos
+        return pd.DataFrame()
+
+    def get_daily_trends(self, period="7d", custom_start=None, custom_end=None, campaign_filter=None):
+        """Retorna dados de tendência diária (cliques, CTR, CPC)"""
+        if self.meta_client and self.mode != "mock":
+            try:
+                api_period = self._period_to_api_format(period)
+
+                # Primeiro tenta com filtro de campanha
+                df = self.meta_client.get_ad_insights(
+                    date_range=api_period,
+                    campaign_name_filter=campaign_filter,
+                    custom_start=custom_start,
+                    custom_end=custom_end
+                )
+
+                # Se não encontrou com filtro, tenta sem filtro
+                if df.empty and campaign_filter:
+                    logger.info(f"Trends: No data with filter '{campaign_filter}', trying without filter")
+                    df = self.meta_client.get_ad_insights(
+                        date_range=api_period,
+                        campaign_name_filter=None,
+                        custom_start=custom_start,
+                        custom_end=custom_end
+                    )
+
+                if not df.empty and 'date_start' in df.columns:
+                    # Agrupar por data para obter totais diários
+                    df['Data'] = pd.to_datetime(df['date_start']).dt.strftime('%d/%m')
+                    df['_sort_key'] = pd.to_datetime(df['date_start'])
+
+                    # Agregar corretamente: CTR e CPC são métricas derivadas
+                    # CTR = clicks / impressions * 100
+                    # CPC = spend / clicks
+                    daily = df.groupby(['Data', '_sort_key'], sort=False).agg({
+                        'clicks': 'sum',
+                        'impressions': 'sum',
+                        'spend': 'sum'
+                    }).reset_index()
+
+                    # Calcular métricas derivadas corretamente
+                    daily['Cliques'] = daily['clicks']
+                    daily['CTR'] = (daily['clicks'] / daily['impressions'] * 100).fillna(0)
+                    daily['CPC'] = (daily['spend'] / daily['clicks']).fillna(0)
+
+                    # Ordenar por data cronologicamente
+                    daily = daily.sort_values('_sort_key').drop(columns=['_sort_key', 'clicks', 'impressions', 'spend'])
+                    return daily
+            except Exception as e:
+                logger.error(f"Erro ao obter tendências reais: {e}")
+
+        # Retorna DataFrame vazio se não há dados reais
+        return pd.DataFrame()
+
+    def _empty_meta_metrics(self):
+        return {
+            "investimento": 0, "impressoes": 0, "alcance": 0, "frequencia": 0,
+            "cliques_link": 0, "store_clicks_meta": 0, "instalacoes_sdk": 0, "instalacoes_total": 0,
+            "ctr_link": 0, "cpc_link": 0, "cpm": 0,
+            "delta_investimento": 0, "delta_impressoes": 0, "delta_alcance": 0,
+            "delta_frequencia": 0, "delta_cliques": 0, "delta_ctr": 0,
+            "delta_cpc": 0, "delta_cpm": 0,
+            "_data_source": "empty", "_filter_applied": None,
+            "_requested_filter": None, "_available_campaigns": [],
+            "_action_types_found": {},
+            "_sdk_source": "none", "_sdk_errors": [], "_sdk_debug": {},
+            "_debug": {},
+        }
+
+    def _empty_metrics(self):
+        return {
+            'sessoes': 0, 'usuarios': 0, 'pageviews': 0,
+            'taxa_engajamento': 0, 'tempo_medio': "0m 0s",
+            'delta_sessoes': 0, 'delta_usuarios': 0, 'delta_pageviews': 0, 'delta_engajamento': 0
+        }
+
+    def _get_mock_meta_metrics(self, period, level):
+        return {
+            "investimento": 1250.50, "impressoes": 85400, "alcance": 42100, "frequencia": 2.03,
+            "cliques_link": 2450, "store_clicks_meta": 1820, "instalacoes_sdk": 320, "instalacoes_total": 0,
+            "ctr_link": 2.87, "cpc_link": 0.51, "cpm": 14.64,
+            "delta_investimento": 12.5, "delta_impressoes": -5.2, "delta_alcance": 3.1,
+            "delta_frequencia": 0.5, "delta_cliques": 15.8, "delta_ctr": 0.45,
+            "delta_cpc": -8.2, "delta_cpm": 2.3,
+            "_sdk_source": "none", "_sdk_errors": [], "_sdk_debug": {},
+            "_debug": {},
+        }
+
+    def _get_mock_ga4_metrics(self):
+        return {
+            "sessoes": 3240, "usuarios": 2850, "pageviews": 6120,
+            "taxa_engajamento": 68.5, "tempo_medio": "1m 42s",
+            "delta_sessoes": 15.2, "delta_usuarios": 12.4,
+            "delta_pageviews": 18.9, "delta_engajamento": 3.2,
+        }
+
+    def _get_mock_creative_data(self):
+        return pd.DataFrame({
+            "Criativo": [
+                "Video_LIA_Problema_WhatsApp_v2", "Static_Beneficios_App_v1",
+                "Carousel_Features_3slides", "Video_Depoimento_Usuario",
+                "Static_Promo_Download_v3"
+            ],
+            "Formato": ["Video 15s", "Imagem", "Carrossel", "Video 30s", "Imagem"],
+            "Valor gasto": [285.00, 195.00, 165.00, 125.00, 80.00],
+            "Exibições": [42000, 31000, 26000, 18000, 8000],
+            "Cliques": [1280, 890, 620, 320, 90],
+            "Taxa de cliques": [3.05, 2.87, 2.38, 1.78, 1.12],
+            "Custo por clique": [0.22, 0.22, 0.27, 0.39, 0.89],
+            "Custo por mil": [6.79, 6.29, 6.35, 6.94, 10.00],
+        })
+
+    def _get_mock_daily_trends(self, period, custom_start=None, custom_end=None):
+        import random
+        random.seed(42)
+
+        # Calcular dias baseado no período ou datas personalizadas
+        if period == "custom" and custom_start and custom_end:
+            start_date = datetime.strptime(custom_start, "%Y-%m-%d")
+            end_date = datetime.strptime(custom_end, "%Y-%m-%d")
+            days = (end_date - start_date).days + 1
+            dates = [(start_date + timedelta(days=i)).strftime("%d/%m") for i in range(days)]
+        else:
+            # Mapeamento correto dos períodos do dashboard
+            days = {"today": 1, "yesterday": 1, "last_7d": 7, "last_14d": 14, "last_30d": 30}.get(period, 7)
+            dates = [(datetime.now() - timedelta(days=i)).strftime("%d/%m") for i in range(days-1, -1, -1)]
+
+        # Gerar dados mock para o número correto de dias
+        base_cliques = [380, 420, 395, 450, 480, 510, 565, 520, 490, 530, 560, 580, 540, 500]
+        base_ctr = [2.3, 2.4, 2.35, 2.5, 2.55, 2.6, 2.75, 2.65, 2.58, 2.7, 2.8, 2.85, 2.72, 2.62]
+        base_cpc = [0.30, 0.28, 0.29, 0.27, 0.26, 0.25, 0.24, 0.25, 0.26, 0.24, 0.23, 0.22, 0.24, 0.25]
+
+        # Estender dados se necessário
+        while len(base_cliques) < days:
+            base_cliques.extend([random.randint(380, 600) for _ in range(7)])
+            base_ctr.extend([round(random.uniform(2.2, 2.9), 2) for _ in range(7)])
+            base_cpc.extend([round(random.uniform(0.22, 0.32), 2) for _ in range(7)])
+
+        return pd.DataFrame({
+            "Data": dates,
+            "Cliques": base_cliques[:days],
+            "CTR": base_ctr[:days],
+            "CPC": base_cpc[:days],
+        })
+
+    def _get_mock_source_medium(self):
+        return pd.DataFrame({
+            "Origem / Midia": ["facebook / paid", "instagram / paid", "google / cpc", "(direct) / (none)", "google / organic"],
+            "Sessoes": [1450, 890, 285, 145, 80],
+            "Usuarios": [1200, 750, 240, 95, 55],
+            "Engajamento": ["72.3%", "68.9%", "58.2%", "45.1%", "62.8%"],
+            "Tempo Medio": ["1m 58s", "1m 42s", "1m 15s", "0m 48s", "2m 05s"],
+        })
+
+    def _get_mock_events_data(self):
+        """Retorna dados mock de eventos do GA4"""
+        return pd.DataFrame({
+            "Nome do Evento": [
+                "page_view", "session_start", "first_visit", "scroll",
+                "user_engagement", "scroll_50", "primary_cta_click"
+            ],
+            "Contagem de Eventos": [
+                "2.050 (33,19%)", "1.992 (32,25%)", "1.958 (31,70%)", "78 (1,26%)",
+                "78 (1,26%)", "17 (0,28%)", "3 (0,05%)"
+            ],
+            "Total de Usuarios": [
+                "1.968 (100%)", "1.968 (100%)", "1.958 (99,49%)", "68 (3,46%)",
+                "38 (1,93%)", "14 (0,71%)", "3 (0,15%)"
+            ],
+            "Eventos por Usuario": ["1,04", "1,01", "1,00", "1,15", "2,05", "1,21", "1,00"]
+        })
+
+    def get_cycle_status(self, period, meta_data, creative_data):
+        try:
+            insights = []
+            delta_ctr = meta_data.get("delta_ctr", 0)
+            delta_cpc = meta_data.get("delta_cpc", 0)
+
+            if abs(delta_ctr) < 0.5:
+                insights.append("CTR estavel")
+            elif delta_ctr > 0:
+                insights.append("CTR em alta")
+            else:
+                insights.append("CTR em queda")
+
+            if delta_cpc < 0:
+                insights.append("CPC controlado")
+            else:
+                insights.append("CPC em observacao")
+
+            if len(creative_data) > 0:
+                insights.append("Criativo lider identificado")
+
+            is_learning = period in ["today", "yesterday"]
+            phase = "Fase de Aprendizado (ate 48h)" if is_learning else "Otimizacao ativa"
+
+            return {"insights": insights, "phase": phase, "is_learning": is_learning}
+        except Exception as e:
+            logger.error(f"Erro em get_cycle_status: {e}")
+            return {"insights": ["Coletando dados..."], "phase": "Processando", "is_learning": True}
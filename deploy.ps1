@@ -27,6 +27,12 @@ git push -u origin main
 
 Write-Host "`n✅ Código enviado para o GitHub!" -ForegroundColor Green
 
+# build_info.json não vai para o git: no Streamlit Cloud o stamp vem do secret LIA_BUILD_STAMP
+$commit = git rev-parse --short HEAD
+$commitDate = git log -1 --format=%cd --date=iso-strict
+$branch = git rev-parse --abbrev-ref HEAD
+$buildStamp = "build commit=$commit branch=$branch commit_date=$commitDate"
+
 # 3. Instruções para Streamlit Cloud
 Write-Host "`n📊 Agora faça o deploy no Streamlit Cloud:" -ForegroundColor Yellow
 Write-Host "1. Acesse: https://streamlit.io/cloud" -ForegroundColor White
@@ -34,7 +40,9 @@ Write-Host "2. Clique em 'New app'" -ForegroundColor White
 Write-Host "3. Conecte sua conta GitHub" -ForegroundColor White
 Write-Host "4. Selecione o repositório: dashboard-lia" -ForegroundColor White
 Write-Host "5. Main file: app_lia_premium.py" -ForegroundColor White
-Write-Host "6. Clique em 'Deploy'`n" -ForegroundColor White
+Write-Host "6. Em 'Advanced settings' > Secrets, adicione (atualize a cada deploy):" -ForegroundColor White
+Write-Host "   LIA_BUILD_STAMP = `"$buildStamp`"" -ForegroundColor Cyan
+Write-Host "7. Clique em 'Deploy'`n" -ForegroundColor White
 
 Write-Host "🎉 Seu dashboard ficará disponível em:" -ForegroundColor Green
 Write-Host "   https://dashboard-lia-[seu-usuario].streamlit.app`n" -ForegroundColor Cyan
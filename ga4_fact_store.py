@@ -0,0 +1,75 @@
+"""Armazenamento local (SQLite) de fatos diários do GA4 já consolidados."""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from typing import Any, Dict, Iterable, List
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FACT_STORE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "ga4_facts.sqlite3")
+
+
+class GA4DailyFactStore:
+    """Guarda linhas diárias de relatórios GA4 por (propriedade, relatório, filtro, data)."""
+
+    def __init__(self, path: str = DEFAULT_FACT_STORE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS ga4_daily_facts (
+                    property TEXT NOT NULL,
+                    report TEXT NOT NULL,
+                    filter_key TEXT NOT NULL,
+                    date TEXT NOT NULL,
+                    rows_json TEXT NOT NULL,
+                    stored_at REAL NOT NULL,
+                    PRIMARY KEY (property, report, filter_key, date)
+                )
+                """
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=10)
+
+    def load(self, property_id: str, report: str, filter_key: str, dates: Iterable[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """Retorna as linhas guardadas para as datas pedidas (datas ausentes ficam fora do dict)."""
+        dates = list(dates)
+        if not dates:
+            return {}
+        placeholders = ",".join("?" for _ in dates)
+        with self._lock, closing(self._connect()) as conn:
+            cursor = conn.execute(
+                f"SELECT date, rows_json FROM ga4_daily_facts "
+                f"WHERE property = ? AND report = ? AND filter_key = ? AND date IN ({placeholders})",
+                [property_id, report, filter_key, *dates],
+            )
+            return {day: json.loads(rows_json) for day, rows_json in cursor.fetchall()}
+
+    def save(self, property_id: str, report: str, filter_key: str, rows_by_date: Dict[str, List[Dict[str, Any]]]) -> None:
+        """Grava (ou substitui) as linhas de cada data; listas vazias marcam dias sem dados."""
+        if not rows_by_date:
+            return
+        now = time.time()
+        records = [
+            (property_id, report, filter_key, day, json.dumps(rows, default=str), now)
+            for day, rows in rows_by_date.items()
+        ]
+        with self._lock, closing(self._connect()) as conn, conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO ga4_daily_facts "
+                "(property, report, filter_key, date, rows_json, stored_at) VALUES (?, ?, ?, ?, ?, ?)",
+                records,
+            )
+        logger.debug("GA4 fact store: %d dia(s) gravados para %s/%s", len(records), report, filter_key or "-")
@@ -5,31 +5,63 @@ Integração com Google Analytics 4 API para obter dados de sessões e eventos
 from google.analytics.data_v1beta import BetaAnalyticsDataClient
 from google.analytics.data_v1beta.types import (
     RunReportRequest,
+    RunReportResponse,
     Dimension,
     Metric,
     DateRange,
     FilterExpression,
     Filter,
+    MetricAggregation,
+    RunRealtimeReportRequest,
+    RunRealtimeReportResponse,
 )
 from google.oauth2 import service_account
+import numpy as np
 import pandas as pd
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Dict, Any
+from typing import Dict, Any, Callable, Iterator, Sequence, Tuple
+import hashlib
 import logging
+import threading
+import time
 
 logger = logging.getLogger(__name__)
 
 
 class GA4Integration:
-    def __init__(self, credentials_json: Dict[str, Any], property_id: str):
+    # Linhas por página nas queries paginadas (o GA4 aceita até 250k por requisição)
+    REPORT_PAGE_SIZE = 100000
+    # Dias fechados há mais tempo que esta janela já foram consolidados pelo GA4 (~48h)
+    SETTLED_AFTER_DAYS = 2
+    # Cache de respostas por requisição canônica, compartilhado entre instâncias (TTL + LRU)
+    _REPORT_CACHE = OrderedDict()
+    _REPORT_CACHE_LOCK = threading.Lock()
+    _REPORT_CACHE_TTL_SECONDS = 300
+    _REPORT_CACHE_MAX_ENTRIES = 256
+    # Realtime: resposta curta por propriedade + uma única busca em voo por propriedade
+    REALTIME_CACHE_TTL_SECONDS = 30
+    _REALTIME_CACHE = {}
+    _REALTIME_LOCKS = {}
+    _REALTIME_LOCKS_GUARD = threading.Lock()
+
+    def __init__(self, credentials_json: Dict[str, Any], property_id: str, fact_store: Any = None, client: Any = None):
         """
         Inicializa a integração com Google Analytics 4 API
 
         Args:
             credentials_json: Dicionário com credenciais da service account
             property_id: ID da propriedade GA4
+            fact_store: GA4DailyFactStore opcional para reaproveitar dias já consolidados
+            client: Cliente com ``run_report`` já pronto (opcional; dispensa as credenciais)
         """
         self.property_id = property_id
+        self.fact_store = fact_store
+
+        if client is not None:
+            self.credentials = None
+            self.client = client
+            return
 
         # Criar credenciais
         self.credentials = service_account.Credentials.from_service_account_info(
@@ -48,6 +80,239 @@ class GA4Integration:
             return value
         return f"properties/{value}"
 
+    @staticmethod
+    def _report_cache_key(request: RunReportRequest) -> str:
+        """
+        Hash da requisição serializada de forma determinística
+
+        O proto já carrega a propriedade e o intervalo de datas resolvido (YYYY-MM-DD),
+        então "today" em dias diferentes gera chaves diferentes.
+        """
+        payload = RunReportRequest.pb(request).SerializeToString(deterministic=True)
+        return hashlib.sha256(payload).hexdigest()
+
+    @classmethod
+    def clear_report_cache(cls) -> None:
+        """Descarta todas as respostas em cache (relatórios e realtime)."""
+        with cls._REPORT_CACHE_LOCK:
+            cls._REPORT_CACHE.clear()
+        with cls._REALTIME_LOCKS_GUARD:
+            cls._REALTIME_CACHE.clear()
+
+    def _run_report(self, request: RunReportRequest) -> RunReportResponse:
+        """
+        Executa run_report reaproveitando respostas idênticas dentro do TTL
+
+        Args:
+            request: Requisição completa (incluindo offset/limit da página)
+
+        Returns:
+            RunReportResponse (a mesma instância para chamadas repetidas; tratar como somente leitura)
+        """
+        ttl = self._REPORT_CACHE_TTL_SECONDS
+        if ttl <= 0:
+            return self.client.run_report(request)
+
+        key = self._report_cache_key(request)
+        cache = self._REPORT_CACHE
+        with self._REPORT_CACHE_LOCK:
+            entry = cache.get(key)
+            if entry is not None:
+                expires_at, cached_response = entry
+                if expires_at > time.monotonic():
+                    cache.move_to_end(key)
+                    return cached_response
+                del cache[key]
+
+        response = self.client.run_report(request)
+
+        with self._REPORT_CACHE_LOCK:
+            cache[key] = (time.monotonic() + ttl, response)
+            cache.move_to_end(key)
+            while len(cache) > self._REPORT_CACHE_MAX_ENTRIES:
+                cache.popitem(last=False)
+        return response
+
+    def _iter_report_pages(self, request: RunReportRequest, max_rows: int = None) -> Iterator[RunReportResponse]:
+        """
+        Executa um relatório paginando por offset/limit até consumir todas as linhas
+
+        Args:
+            request: Requisição base (offset/limit são sobrescritos a cada página)
+            max_rows: Limite opcional de linhas no total
+
+        Yields:
+            Uma RunReportResponse por página
+        """
+        offset = 0
+        while True:
+            page_limit = self.REPORT_PAGE_SIZE
+            if max_rows is not None:
+                page_limit = min(page_limit, max_rows - offset)
+            if page_limit <= 0:
+                return
+
+            page_request = RunReportRequest(request)
+            page_request.offset = offset
+            page_request.limit = page_limit
+            response = self._run_report(page_request)
+            yield response
+
+            fetched = len(response.rows)
+            offset += fetched
+            if fetched < page_limit or offset >= int(response.row_count or 0):
+                return
+
+    def iter_report_rows(self, request: RunReportRequest, max_rows: int = None) -> Iterator[Any]:
+        """Gera as linhas do relatório página a página, sem materializar a resposta inteira."""
+        for response in self._iter_report_pages(request, max_rows=max_rows):
+            yield from RunReportResponse.pb(response).rows
+
+    def _run_report_columns(
+        self,
+        request: RunReportRequest,
+        dimension_columns: Sequence[str],
+        metric_columns: Sequence[Tuple[str, Any]],
+        max_rows: int = None,
+    ) -> Tuple[Dict[str, np.ndarray], Dict[str, float]]:
+        """
+        Executa o relatório paginado e converte cada coluna direto para um array NumPy tipado
+
+        Args:
+            request: Requisição do relatório
+            dimension_columns: Nomes das colunas de dimensão, na ordem da requisição
+            metric_columns: Pares (nome, dtype) das métricas, na ordem da requisição
+            max_rows: Limite opcional de linhas no total
+
+        Returns:
+            Tupla com (colunas por nome, totais das métricas quando solicitados via metric_aggregations)
+        """
+        dimension_chunks = {name: [] for name in dimension_columns}
+        metric_chunks = {name: [] for name, _ in metric_columns}
+        totals: Dict[str, float] = {}
+
+        for response in self._iter_report_pages(request, max_rows=max_rows):
+            raw = RunReportResponse.pb(response)
+            if not totals and raw.totals:
+                totals = {
+                    name: float(raw.totals[0].metric_values[i].value or 0)
+                    for i, (name, _) in enumerate(metric_columns)
+                }
+
+            rows = raw.rows
+            if not rows:
+                continue
+
+            for i, name in enumerate(dimension_columns):
+                dimension_chunks[name].append(np.array([row.dimension_values[i].value for row in rows], dtype=object))
+            for i, (name, dtype) in enumerate(metric_columns):
+                values = np.array([row.metric_values[i].value or 0 for row in rows], dtype=np.float64)
+                metric_chunks[name].append(values.astype(dtype, copy=False))
+
+        columns: Dict[str, np.ndarray] = {}
+        for name in dimension_columns:
+            chunks = dimension_chunks[name]
+            columns[name] = np.concatenate(chunks) if chunks else np.empty(0, dtype=object)
+        for name, dtype in metric_columns:
+            chunks = metric_chunks[name]
+            columns[name] = np.concatenate(chunks) if chunks else np.empty(0, dtype=dtype)
+
+        return columns, totals
+
+    def _run_report_frame(
+        self,
+        request: RunReportRequest,
+        dimension_columns: Sequence[str],
+        metric_columns: Sequence[Tuple[str, Any]],
+        max_rows: int = None,
+    ) -> pd.DataFrame:
+        """Executa o relatório paginado e retorna um DataFrame montado a partir das colunas tipadas."""
+        columns, _ = self._run_report_columns(request, dimension_columns, metric_columns, max_rows=max_rows)
+        return pd.DataFrame(columns)
+
+    def _fetch_daily_frame(
+        self,
+        report: str,
+        filter_key: str,
+        start_date_str: str,
+        end_date_str: str,
+        fetch_range: Callable[[str, str], pd.DataFrame],
+        date_column: str = "date",
+    ) -> pd.DataFrame:
+        """
+        Combina dias consolidados do fact store com uma consulta ao GA4 apenas dos dias novos ou ainda abertos
+
+        Args:
+            report: Nome lógico do relatório no fact store
+            filter_key: Filtro aplicado na consulta (parte da chave do fact store)
+            start_date_str: Data inicial (YYYY-MM-DD)
+            end_date_str: Data final (YYYY-MM-DD)
+            fetch_range: Função que consulta o GA4 para um intervalo (início, fim) e retorna linhas diárias
+            date_column: Coluna com a dimensão date do GA4 (YYYYMMDD)
+
+        Returns:
+            DataFrame com as linhas diárias de todo o intervalo
+        """
+        if self.fact_store is None:
+            return fetch_range(start_date_str, end_date_str)
+
+        days = [day.strftime("%Y-%m-%d") for day in pd.date_range(start_date_str, end_date_str, freq="D")]
+        settled_until = (datetime.now().date() - timedelta(days=self.SETTLED_AFTER_DAYS)).strftime("%Y-%m-%d")
+        property_key = self._property_resource
+
+        try:
+            stored = self.fact_store.load(property_key, report, filter_key, [day for day in days if day <= settled_until])
+        except Exception as e:
+            logger.warning(f"GA4 fact store indisponível, consultando o período inteiro: {e}")
+            return fetch_range(start_date_str, end_date_str)
+
+        frames = [pd.DataFrame.from_records(rows) for rows in stored.values() if rows]
+        missing = [day for day in days if day not in stored]
+
+        if missing:
+            # Uma consulta por sequência de dias faltantes: lacunas nas duas pontas (ex.: início
+            # ainda não consolidado e hoje) não baixam de novo o miolo já guardado
+            fresh_frames = [fetch_range(run_start, run_end) for run_start, run_end in self._consecutive_runs(missing)]
+            fresh_frames = [frame for frame in fresh_frames if not frame.empty]
+            fresh = pd.concat(fresh_frames, ignore_index=True) if fresh_frames else pd.DataFrame()
+            fresh_days = pd.Series(dtype=object)
+            if not fresh.empty:
+                fresh_days = pd.to_datetime(fresh[date_column], format="%Y%m%d").dt.strftime("%Y-%m-%d")
+                in_missing = fresh_days.isin(missing).to_numpy()
+                fresh, fresh_days = fresh[in_missing], fresh_days[in_missing]
+                frames.append(fresh)
+
+            settled_missing = [day for day in missing if day <= settled_until]
+            if settled_missing:
+                rows_by_date: Dict[str, list] = {day: [] for day in settled_missing}
+                for day, record in zip(fresh_days.tolist(), fresh.to_dict("records")):
+                    if day in rows_by_date:
+                        rows_by_date[day].append(record)
+                try:
+                    self.fact_store.save(property_key, report, filter_key, rows_by_date)
+                except Exception as e:
+                    logger.warning(f"Não foi possível gravar no GA4 fact store: {e}")
+
+        logger.info(
+            f"GA4 {report}: {len(days) - len(missing)} dia(s) do fact store, {len(missing)} consultado(s) na API"
+        )
+
+        frames = [frame for frame in frames if not frame.empty]
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat(frames, ignore_index=True).sort_values(date_column, kind="stable", ignore_index=True)
+
+    @staticmethod
+    def _consecutive_runs(days: list) -> list:
+        """Agrupa dias ordenados (YYYY-MM-DD) em intervalos (início, fim) de dias consecutivos."""
+        runs = []
+        for day in days:
+            if runs and pd.Timestamp(day) - pd.Timestamp(runs[-1][1]) == pd.Timedelta(days=1):
+                runs[-1][1] = day
+            else:
+                runs.append([day, day])
+        return [(start, end) for start, end in runs]
+
     def _build_campaign_filter(self, campaign_filter: str) -> FilterExpression:
         """
         Cria filtro por campanha (utm_campaign) para as queries GA4
@@ -133,40 +398,39 @@ class GA4Integration:
         try:
             start_date_str, end_date_str = self._get_date_range(date_range, custom_start, custom_end)
 
-            # Criar requisição
-            request = RunReportRequest(
-                property=self._property_resource,
-                date_ranges=[DateRange(start_date=start_date_str, end_date=end_date_str)],
-                dimensions=[
-                    Dimension(name="date"),
-                    Dimension(name="sessionSourceMedium"),
-                ],
-                metrics=[
-                    Metric(name="sessions"),
-                    Metric(name="totalUsers"),
-                    Metric(name="screenPageViews"),
-                    Metric(name="engagementRate"),
-                    Metric(name="bounceRate"),
-                ],
-            )
-
-            # Executar requisição
-            response = self.client.run_report(request)
+            def fetch_range(start: str, end: str) -> pd.DataFrame:
+                # Criar requisição
+                request = RunReportRequest(
+                    property=self._property_resource,
+                    date_ranges=[DateRange(start_date=start, end_date=end)],
+                    dimensions=[
+                        Dimension(name="date"),
+                        Dimension(name="sessionSourceMedium"),
+                    ],
+                    metrics=[
+                        Metric(name="sessions"),
+                        Metric(name="totalUsers"),
+                        Metric(name="screenPageViews"),
+                        Metric(name="engagementRate"),
+                        Metric(name="bounceRate"),
+                    ],
+                )
 
-            # Converter para DataFrame
-            data = []
-            for row in response.rows:
-                data.append({
-                    'date': row.dimension_values[0].value,
-                    'source_medium': row.dimension_values[1].value,
-                    'sessions': int(row.metric_values[0].value),
-                    'users': int(row.metric_values[1].value),
-                    'pageviews': int(row.metric_values[2].value),
-                    'engagement_rate': float(row.metric_values[3].value),
-                    'bounce_rate': float(row.metric_values[4].value),
-                })
+                # Executar requisição paginada, convertendo colunas direto para arrays tipados
+                return self._run_report_frame(
+                    request,
+                    dimension_columns=["date", "source_medium"],
+                    metric_columns=[
+                        ("sessions", np.int64),
+                        ("users", np.int64),
+                        ("pageviews", np.int64),
+                        ("engagement_rate", np.float64),
+                        ("bounce_rate", np.float64),
+                    ],
+                )
 
-            return pd.DataFrame(data)
+            # Dias já consolidados vêm do fact store; só dias novos/abertos vão para a API
+            return self._fetch_daily_frame("sessions_source_medium", "", start_date_str, end_date_str, fetch_range)
 
         except Exception as e:
             logger.error(f"Erro ao obter dados do GA4: {str(e)}")
@@ -214,21 +478,17 @@ class GA4Integration:
 
             request = RunReportRequest(**request_params)
 
-            # Executar requisição
-            response = self.client.run_report(request)
-
-            # Converter para DataFrame
-            data = []
-            for row in response.rows:
-                data.append({
-                    'event_name': row.dimension_values[0].value,
-                    'event_count': int(row.metric_values[0].value),
-                    'total_users': int(row.metric_values[1].value),
-                    'events_per_user': float(row.metric_values[2].value),
-                    'event_value': float(row.metric_values[3].value),
-                })
-
-            df = pd.DataFrame(data)
+            # Executar requisição paginada, convertendo colunas direto para arrays tipados
+            df = self._run_report_frame(
+                request,
+                dimension_columns=["event_name"],
+                metric_columns=[
+                    ("event_count", np.int64),
+                    ("total_users", np.int64),
+                    ("events_per_user", np.float64),
+                    ("event_value", np.float64),
+                ],
+            )
 
             if not df.empty:
                 # Calcular totais para percentuais
@@ -268,7 +528,7 @@ class GA4Integration:
                     )
                 ),
             )
-            response = self.client.run_report(request)
+            response = self._run_report(request)
             total = 0
             for row in response.rows:
                 total += int(row.metric_values[0].value)
@@ -314,7 +574,7 @@ class GA4Integration:
             request = RunReportRequest(**request_params)
 
             # Executar requisição
-            response = self.client.run_report(request)
+            response = self._run_report(request)
 
             if response.rows:
                 row = response.rows[0]
@@ -374,7 +634,7 @@ class GA4Integration:
             request = RunReportRequest(**request_params)
 
             # Executar requisição
-            response = self.client.run_report(request)
+            response = self._run_report(request)
 
             # Converter para DataFrame
             data = []
@@ -429,22 +689,17 @@ class GA4Integration:
                 ],
             )
 
-            # Executar requisição
-            response = self.client.run_report(request)
-
-            # Converter para DataFrame
-            data = []
-            for row in response.rows:
-                campaign_name = row.dimension_values[0].value
-                # Ignorar campanhas vazias ou "(not set)"
-                if campaign_name and campaign_name not in ['(not set)', '(direct)']:
-                    data.append({
-                        'campaign': campaign_name,
-                        'sessions': int(row.metric_values[0].value),
-                        'users': int(row.metric_values[1].value),
-                    })
+            # Executar requisição paginada, convertendo colunas direto para arrays tipados
+            columns, _ = self._run_report_columns(
+                request,
+                dimension_columns=["campaign"],
+                metric_columns=[("sessions", np.int64), ("users", np.int64)],
+            )
 
-            df = pd.DataFrame(data)
+            # Ignorar campanhas vazias ou "(not set)"
+            campaigns = columns["campaign"]
+            keep = (campaigns != "") & ~np.isin(campaigns, ["(not set)", "(direct)"])
+            df = pd.DataFrame({name: values[keep] for name, values in columns.items()})
             if not df.empty:
                 df = df.sort_values('sessions', ascending=False)
             return df
@@ -477,7 +732,7 @@ class GA4Integration:
                     Metric(name="sessions"),
                 ],
             )
-            basic_response = self.client.run_report(basic_request)
+            basic_response = self._run_report(basic_request)
             total_sessions = int(basic_response.rows[0].metric_values[0].value) if basic_response.rows else 0
 
             # 2. Obter campanhas disponíveis
@@ -528,56 +783,83 @@ class GA4Integration:
         custom_end: str = None,
         landing_host_filter: str = None,
         limit: int = 8,
+        mode: str = "daily",
+        include_sparkline: bool = False,
     ) -> Dict[str, Any]:
-        """Obtém resumo de eventos da landing page para o card dedicado."""
+        """
+        Obtém resumo de eventos da landing page para o card dedicado
+
+        Args:
+            date_range: Período (last_7d, last_14d, last_30d, today, yesterday, custom)
+            custom_start: Data de início personalizada (YYYY-MM-DD)
+            custom_end: Data de fim personalizada (YYYY-MM-DD)
+            landing_host_filter: Host opcional para filtrar por pageLocation
+            limit: Máximo de linhas na tabela
+            mode: "daily" (linhas date × eventName) ou "aggregate" (eventName com totais do GA4)
+            include_sparkline: No modo "aggregate", busca também a série diária de eventCount
+
+        Returns:
+            Dicionário com linhas, totais e eventos-chave
+        """
         start_date_str, end_date_str = self._get_date_range(date_range, custom_start, custom_end)
+        dimension_filter = self._build_landing_host_filter(landing_host_filter)
 
-        request_params = {
-            "property": self._property_resource,
-            "date_ranges": [DateRange(start_date=start_date_str, end_date=end_date_str)],
-            "dimensions": [
-                Dimension(name="date"),
-                Dimension(name="eventName"),
-            ],
-            "metrics": [
-                Metric(name="eventCount"),
-                Metric(name="totalUsers"),
-                Metric(name="conversions"),
-            ],
-            "order_bys": [
-                {"metric": {"metric_name": "eventCount"}, "desc": True},
-            ],
-            "limit": max(1, int(limit)),
-        }
+        if mode == "aggregate":
+            return self._get_landing_events_aggregate(
+                start_date_str, end_date_str, dimension_filter, landing_host_filter, limit, include_sparkline
+            )
 
-        if landing_host_filter:
-            request_params["dimension_filter"] = FilterExpression(
-                filter=Filter(
-                    field_name="pageLocation",
-                    string_filter=Filter.StringFilter(
-                        match_type=Filter.StringFilter.MatchType.CONTAINS,
-                        value=landing_host_filter,
-                        case_sensitive=False,
-                    ),
-                )
+        def fetch_range(start: str, end: str) -> pd.DataFrame:
+            request_params = {
+                "property": self._property_resource,
+                "date_ranges": [DateRange(start_date=start, end_date=end)],
+                "dimensions": [
+                    Dimension(name="date"),
+                    Dimension(name="eventName"),
+                ],
+                "metrics": [
+                    Metric(name="eventCount"),
+                    Metric(name="totalUsers"),
+                    Metric(name="conversions"),
+                ],
+            }
+            if dimension_filter is not None:
+                request_params["dimension_filter"] = dimension_filter
+
+            return self._run_report_frame(
+                RunReportRequest(**request_params),
+                dimension_columns=["date", "event_name"],
+                metric_columns=[
+                    ("event_count", np.int64),
+                    ("users", np.int64),
+                    ("conversions", np.float64),
+                ],
             )
 
-        response = self.client.run_report(RunReportRequest(**request_params))
+        # Linhas date × eventName: dias consolidados vêm do fact store, o resto da API
+        daily = self._fetch_daily_frame("landing_events", landing_host_filter or "", start_date_str, end_date_str, fetch_range)
+        # Eventos-chave de baixo volume contam mesmo fora das linhas exibidas na tabela
+        events_by_name: Dict[str, int] = {}
+        if not daily.empty:
+            event_sums = daily.groupby("event_name", sort=False)["event_count"].sum()
+            events_by_name = dict(zip(event_sums.index.tolist(), event_sums.tolist()))
+        key_event_totals = self._key_event_totals(events_by_name)
+        if not daily.empty:
+            daily = daily.sort_values("event_count", ascending=False, kind="stable").head(max(1, int(limit)))
 
         rows = []
         total_events = 0
         total_users = 0
         total_conversions = 0.0
-        events_by_name: Dict[str, int] = {}
 
-        for row in response.rows:
-            event_name = row.dimension_values[1].value
-            event_count = int(float(row.metric_values[0].value or 0))
-            users = int(float(row.metric_values[1].value or 0))
-            conversions = float(row.metric_values[2].value or 0)
+        for record in daily.to_dict("records"):
+            event_name = record["event_name"]
+            event_count = int(record["event_count"])
+            users = int(record["users"])
+            conversions = float(record["conversions"])
 
             rows.append({
-                "Data": row.dimension_values[0].value,
+                "Data": record["date"],
                 "Evento": event_name,
                 "Contagem": event_count,
                 "Usuários": users,
@@ -587,10 +869,6 @@ class GA4Integration:
             total_events += event_count
             total_users += users
             total_conversions += conversions
-            events_by_name[event_name] = events_by_name.get(event_name, 0) + event_count
-
-        key_events = ["generate_lead", "form_submit", "whatsapp_click", "page_view"]
-        key_event_totals = {name: events_by_name.get(name, 0) for name in key_events if events_by_name.get(name, 0) > 0}
 
         return {
             "rows": rows,
@@ -603,6 +881,224 @@ class GA4Integration:
             "date_range": f"{start_date_str} a {end_date_str}",
         }
 
+    def _get_landing_events_aggregate(
+        self,
+        start_date_str: str,
+        end_date_str: str,
+        dimension_filter: FilterExpression,
+        landing_host_filter: str,
+        limit: int,
+        include_sparkline: bool,
+    ) -> Dict[str, Any]:
+        """Resumo agregado por eventName, com totais calculados pelo GA4 na mesma chamada."""
+        request_params = {
+            "property": self._property_resource,
+            "date_ranges": [DateRange(start_date=start_date_str, end_date=end_date_str)],
+            "dimensions": [Dimension(name="eventName")],
+            "metrics": [
+                Metric(name="eventCount"),
+                Metric(name="totalUsers"),
+                Metric(name="conversions"),
+            ],
+            "metric_aggregations": [MetricAggregation.TOTAL],
+            "order_bys": [
+                {"metric": {"metric_name": "eventCount"}, "desc": True},
+            ],
+        }
+        if dimension_filter is not None:
+            request_params["dimension_filter"] = dimension_filter
+
+        columns, totals = self._run_report_columns(
+            RunReportRequest(**request_params),
+            dimension_columns=["event_name"],
+            metric_columns=[
+                ("event_count", np.int64),
+                ("users", np.int64),
+                ("conversions", np.float64),
+            ],
+        )
+
+        # Todas as linhas entram nos eventos-chave; o limite vale só para a tabela
+        row_limit = max(1, int(limit))
+        rows = [
+            {
+                "Evento": name,
+                "Contagem": int(count),
+                "Usuários": int(users),
+                "Conversões": round(float(conversions), 2),
+            }
+            for name, count, users, conversions in zip(
+                columns["event_name"][:row_limit],
+                columns["event_count"][:row_limit],
+                columns["users"][:row_limit],
+                columns["conversions"][:row_limit],
+            )
+        ]
+        events_by_name = dict(zip(columns["event_name"].tolist(), columns["event_count"].tolist()))
+
+        # Totais vêm do próprio GA4 (usuários únicos no período, sem somar por linha)
+        total_events = int(totals.get("event_count", columns["event_count"].sum()))
+        total_users = int(totals.get("users", columns["users"].sum()))
+        total_conversions = float(totals.get("conversions", columns["conversions"].sum()))
+        key_event_totals = self._key_event_totals(events_by_name)
+
+        summary = {
+            "rows": rows,
+            "total_events": total_events,
+            "total_users": total_users,
+            "total_conversions": round(total_conversions, 2),
+            "has_conversions": total_conversions > 0,
+            "key_event_totals": key_event_totals,
+            "has_key_events": bool(key_event_totals),
+            "date_range": f"{start_date_str} a {end_date_str}",
+        }
+
+        if include_sparkline:
+            summary["sparkline"] = self._get_landing_events_sparkline(
+                start_date_str, end_date_str, dimension_filter, landing_host_filter
+            )
+
+        return summary
+
+    def _get_landing_events_sparkline(
+        self,
+        start_date_str: str,
+        end_date_str: str,
+        dimension_filter: FilterExpression,
+        landing_host_filter: str,
+    ) -> list:
+        """Série diária de eventCount (só a dimensão date) para o sparkline do card."""
+
+        def fetch_range(start: str, end: str) -> pd.DataFrame:
+            request_params = {
+                "property": self._property_resource,
+                "date_ranges": [DateRange(start_date=start, end_date=end)],
+                "dimensions": [Dimension(name="date")],
+                "metrics": [Metric(name="eventCount")],
+            }
+            if dimension_filter is not None:
+                request_params["dimension_filter"] = dimension_filter
+            return self._run_report_frame(
+                RunReportRequest(**request_params),
+                dimension_columns=["date"],
+                metric_columns=[("event_count", np.int64)],
+            )
+
+        daily = self._fetch_daily_frame(
+            "landing_events_daily_total", landing_host_filter or "", start_date_str, end_date_str, fetch_range
+        )
+        if daily.empty:
+            return []
+        return [
+            {"Data": day, "Contagem": int(count)}
+            for day, count in zip(daily["date"].tolist(), daily["event_count"].tolist())
+        ]
+
+    @staticmethod
+    def _build_landing_host_filter(landing_host_filter: str = None) -> FilterExpression:
+        """Filtro por host da landing (pageLocation), ou None quando não configurado."""
+        if not landing_host_filter:
+            return None
+        return FilterExpression(
+            filter=Filter(
+                field_name="pageLocation",
+                string_filter=Filter.StringFilter(
+                    match_type=Filter.StringFilter.MatchType.CONTAINS,
+                    value=landing_host_filter,
+                    case_sensitive=False,
+                ),
+            )
+        )
+
+    @staticmethod
+    def _key_event_totals(events_by_name: Dict[str, int]) -> Dict[str, int]:
+        """Filtra os eventos-chave da landing com contagem positiva."""
+        key_events = ["generate_lead", "form_submit", "whatsapp_click", "page_view"]
+        return {name: events_by_name.get(name, 0) for name in key_events if events_by_name.get(name, 0) > 0}
+
+    def get_realtime_summary(self, limit: int = 8) -> Dict[str, Any]:
+        """
+        Usuários ativos e eventos dos últimos 30 minutos (runRealtimeReport)
+
+        Sessões que pedem o mesmo painel dentro do TTL compartilham a resposta, e
+        apenas uma busca por propriedade fica em voo (as demais esperam por ela).
+
+        Args:
+            limit: Máximo de eventos na lista
+
+        Returns:
+            Dicionário com active_users, total_events, rows e fetched_at
+        """
+        cache_key = (self._property_resource, int(limit))
+        cached = self._get_fresh_realtime(cache_key)
+        if cached is not None:
+            return cached
+
+        with self._REALTIME_LOCKS_GUARD:
+            lock = self._REALTIME_LOCKS.setdefault(self._property_resource, threading.Lock())
+
+        with lock:
+            # Outra sessão pode ter buscado enquanto esperávamos o lock
+            cached = self._get_fresh_realtime(cache_key)
+            if cached is not None:
+                return cached
+
+            try:
+                summary = self._fetch_realtime_summary(limit)
+            except Exception as e:
+                logger.error("Erro ao obter relatório realtime do GA4: %s", e)
+                stale = self._REALTIME_CACHE.get(cache_key)
+                if stale is not None:
+                    return {**stale[1], "stale": True}
+                return {"active_users": 0, "total_events": 0, "rows": [], "fetched_at": None, "error": str(e)}
+
+            self._REALTIME_CACHE[cache_key] = (time.monotonic() + self.REALTIME_CACHE_TTL_SECONDS, summary)
+            return summary
+
+    def _get_fresh_realtime(self, cache_key: Tuple[str, int]) -> Dict[str, Any]:
+        """Resposta realtime ainda dentro do TTL, ou None."""
+        entry = self._REALTIME_CACHE.get(cache_key)
+        if entry is not None and entry[0] > time.monotonic():
+            return entry[1]
+        return None
+
+    def _fetch_realtime_summary(self, limit: int) -> Dict[str, Any]:
+        """Uma única chamada realtime: eventName com totais (activeUsers deduplicado pelo GA4)."""
+        request = RunRealtimeReportRequest(
+            property=self._property_resource,
+            dimensions=[Dimension(name="eventName")],
+            metrics=[
+                Metric(name="eventCount"),
+                Metric(name="activeUsers"),
+            ],
+            metric_aggregations=[MetricAggregation.TOTAL],
+            order_bys=[{"metric": {"metric_name": "eventCount"}, "desc": True}],
+            limit=max(1, int(limit)),
+        )
+        raw = RunRealtimeReportResponse.pb(self.client.run_realtime_report(request))
+
+        rows = [
+            {
+                "Evento": row.dimension_values[0].value,
+                "Contagem": int(row.metric_values[0].value or 0),
+                "Usuários": int(row.metric_values[1].value or 0),
+            }
+            for row in raw.rows
+        ]
+        if raw.totals:
+            total_events = int(raw.totals[0].metric_values[0].value or 0)
+            active_users = int(raw.totals[0].metric_values[1].value or 0)
+        else:
+            total_events = sum(row["Contagem"] for row in rows)
+            active_users = max((row["Usuários"] for row in rows), default=0)
+
+        return {
+            "active_users": active_users,
+            "total_events": total_events,
+            "rows": rows,
+            "fetched_at": datetime.now().strftime("%H:%M:%S"),
+        }
+
     def _empty_metrics(self) -> Dict[str, Any]:
         """Retorna métricas vazias em caso de erro"""
         return {
@@ -0,0 +1,141 @@
+"""Renderização vetorizada das tabelas HTML do dashboard (classe ``lia-html-table``)."""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Mapping, Optional, Tuple
+
+import pandas as pd
+
+DEFAULT_PAGE_SIZE = 50
+_RENDER_CACHE_MAX_ENTRIES = 64
+
+_render_cache: "OrderedDict[str, str]" = OrderedDict()
+_render_cache_lock = threading.Lock()
+
+
+def frame_fingerprint(df: pd.DataFrame) -> str:
+    """Hash do conteúdo do DataFrame (valores, índice e nomes das colunas)."""
+    digest = hashlib.sha256()
+    digest.update(repr(list(df.columns)).encode("utf-8"))
+    digest.update(pd.util.hash_pandas_object(df, index=True).values.tobytes())
+    return digest.hexdigest()
+
+
+def clear_render_cache() -> None:
+    with _render_cache_lock:
+        _render_cache.clear()
+
+
+def escape_series(values: pd.Series) -> pd.Series:
+    """Escapa HTML de uma coluna inteira de strings (equivalente a html.escape)."""
+    return (
+        values.str.replace("&", "&amp;", regex=False)
+        .str.replace("<", "&lt;", regex=False)
+        .str.replace(">", "&gt;", regex=False)
+        .str.replace('"', "&quot;", regex=False)
+        .str.replace("'", "&#x27;", regex=False)
+    )
+
+
+def format_column(values: pd.Series, fmt: Optional[str] = None) -> pd.Series:
+    """Formata a coluna com ``fmt`` (ex.: "$ {:,.2f}"); valores ausentes viram ""."""
+    present = values.notna()
+    formatted = pd.Series("", index=values.index, dtype=object)
+    if present.any():
+        formatter = fmt.format if fmt else str
+        formatted[present] = values[present].map(formatter)
+    return formatted.astype(str)
+
+
+def paginate_frame(df: pd.DataFrame, page: int = 1, page_size: int = DEFAULT_PAGE_SIZE) -> Tuple[pd.DataFrame, int]:
+    """
+    Recorta uma página do DataFrame
+
+    Args:
+        df: DataFrame completo
+        page: Página desejada (1-based; é limitada ao intervalo válido)
+        page_size: Linhas por página
+
+    Returns:
+        Tupla (DataFrame da página, total de páginas)
+    """
+    page_size = max(1, int(page_size))
+    page_count = max(1, -(-len(df) // page_size))
+    page = min(max(1, int(page)), page_count)
+    start = (page - 1) * page_size
+    return df.iloc[start:start + page_size], page_count
+
+
+def _build_table_html(
+    df: pd.DataFrame,
+    formats: Mapping[str, str],
+    tooltips: Mapping[str, str],
+    tooltip_column: Optional[str],
+    table_class: str,
+) -> str:
+    columns = list(df.columns)
+    header_html = "".join(
+        f"<th>{cell}</th>" for cell in escape_series(pd.Series([str(col) for col in columns], dtype=object))
+    )
+    if df.empty:
+        return f'<table class="{table_class}"><thead><tr>{header_html}</tr></thead><tbody></tbody></table>'
+
+    rows_html = pd.Series("<tr>", index=df.index, dtype=object)
+    for col in columns:
+        cells = escape_series(format_column(df[col], formats.get(col)))
+        if col == tooltip_column and tooltips:
+            titles = df[col].astype(str).str.strip().map(tooltips)
+            title_attrs = ' title="' + escape_series(titles.fillna("")) + '"'
+            title_attrs = title_attrs.where(titles.notna(), "")
+            rows_html = rows_html + "<td" + title_attrs + ">" + cells + "</td>"
+        else:
+            rows_html = rows_html + "<td>" + cells + "</td>"
+
+    body_html = "</tr>".join(rows_html.tolist()) + "</tr>"
+    return f'<table class="{table_class}"><thead><tr>{header_html}</tr></thead><tbody>{body_html}</tbody></table>'
+
+
+def render_html_table(
+    df: pd.DataFrame,
+    formats: Optional[Dict[str, str]] = None,
+    tooltips: Optional[Dict[str, str]] = None,
+    tooltip_column: Optional[str] = None,
+    table_class: str = "lia-html-table",
+) -> str:
+    """
+    Monta a tabela HTML formatando e escapando coluna a coluna (sem iterrows)
+
+    O HTML fica em cache pelo hash do conteúdo + opções, então tabelas que não
+    mudaram entre reruns não são remontadas.
+
+    Args:
+        df: Dados da tabela (já na ordem e com as colunas de exibição)
+        formats: Formato por coluna no padrão str.format (ex.: {"Cliques": "{:,.0f}"})
+        tooltips: Texto de ajuda por valor da ``tooltip_column`` (vira atributo title)
+        tooltip_column: Coluna cujas células recebem o tooltip
+        table_class: Classe CSS da tabela
+
+    Returns:
+        HTML da tabela
+    """
+    formats = formats or {}
+    tooltips = tooltips or {}
+    options = repr((sorted(formats.items()), sorted(tooltips.items()), tooltip_column, table_class))
+    cache_key = hashlib.sha256((frame_fingerprint(df) + options).encode("utf-8")).hexdigest()
+
+    with _render_cache_lock:
+        cached = _render_cache.get(cache_key)
+        if cached is not None:
+            _render_cache.move_to_end(cache_key)
+            return cached
+
+    table_html = _build_table_html(df, formats, tooltips, tooltip_column, table_class)
+
+    with _render_cache_lock:
+        _render_cache[cache_key] = table_html
+        while len(_render_cache) > _RENDER_CACHE_MAX_ENTRIES:
+            _render_cache.popitem(last=False)
+    return table_html
@@ -25,6 +25,7 @@ def build_landing_events_card_data(
     custom_start: str | None,
     custom_end: str | None,
     landing_host_filter: str | None,
+    include_sparkline: bool = False,
 ) -> dict[str, Any]:
     """Monta payload do card de eventos da landing sem quebrar a UI."""
     if events_mode == "off":
@@ -49,7 +50,9 @@ def build_landing_events_card_data(
             custom_start=custom_start,
             custom_end=custom_end,
             landing_host_filter=landing_host_filter,
-            limit=100,
+            limit=8,
+            mode="aggregate",
+            include_sparkline=include_sparkline,
         )
         rows = summary.get("rows", [])
         if not rows:
@@ -61,18 +64,11 @@ def build_landing_events_card_data(
                 "landing_host_filter": landing_host_filter,
             }
 
-        events_df = pd.DataFrame(rows)
-        grouped = events_df.groupby("Evento", as_index=False).agg({
-            "Contagem": "sum",
-            "Usuários": "sum",
-            "Conversões": "sum",
-        })
-        grouped = grouped.sort_values("Contagem", ascending=False).head(8)
-
+        # GA4 já devolve uma linha por evento, ordenada por contagem e com totais do período
         return {
             "status": "ok",
             "title": "Eventos da Landing (GA4)",
-            "table": grouped,
+            "table": pd.DataFrame(rows),
             "kpi_total_events": int(summary.get("total_events", 0)),
             "kpi_total_users": int(summary.get("total_users", 0)),
             "kpi_total_conversions": float(summary.get("total_conversions", 0)),
@@ -81,6 +77,7 @@ def build_landing_events_card_data(
             "has_conversions": bool(summary.get("has_conversions", False)),
             "date_range": summary.get("date_range"),
             "landing_host_filter": landing_host_filter,
+            "sparkline": summary.get("sparkline", []),
         }
     except Exception as exc:
         logger.error("Erro ao obter Eventos da Landing (GA4): %s", exc)
@@ -0,0 +1,68 @@
+"""Perfil de inicialização do processo: tempo de import dos SDKs e das fases de startup.
+
+Cada entrada guarda só a primeira medição (o cold start); reruns do Streamlit não
+sobrescrevem. O painel admin do dashboard mostra o snapshot.
+"""
+
+from __future__ import annotations
+
+import importlib
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from types import ModuleType
+from typing import Dict, Iterator, List, Tuple
+
+PROCESS_STARTED_AT = time.perf_counter()
+
+_timings: Dict[str, float] = {}
+_timings_lock = threading.Lock()
+
+
+def record(name: str, seconds: float) -> None:
+    """Registra a duração de uma fase (mantém a primeira medição do processo)."""
+    with _timings_lock:
+        _timings.setdefault(name, seconds)
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """Mede o bloco e registra como fase ``name``."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, time.perf_counter() - started)
+
+
+def timed_import(module_name: str) -> ModuleType:
+    """
+    Importa o módulo sob demanda, registrando o tempo do primeiro import
+
+    Args:
+        module_name: Nome do módulo (ex.: "ga_integration")
+
+    Returns:
+        O módulo importado
+    """
+    module = sys.modules.get(module_name)
+    if module is not None:
+        return module
+    with phase(f"import {module_name}"):
+        return importlib.import_module(module_name)
+
+
+def snapshot() -> List[Tuple[str, float]]:
+    """Fases registradas em ordem de ocorrência, com a duração em milissegundos."""
+    with _timings_lock:
+        return [(name, round(seconds * 1000, 1)) for name, seconds in _timings.items()]
+
+
+def uptime_seconds() -> float:
+    return time.perf_counter() - PROCESS_STARTED_AT
+
+
+def reset() -> None:
+    with _timings_lock:
+        _timings.clear()
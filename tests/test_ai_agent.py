@@ -0,0 +1,60 @@
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+from ai_agent import AIAgent
+from ai_cache import AIAnalysisCache
+
+
+def _chunk(content):
+    return SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=content))])
+
+
+def _streaming_agent(tmp_path, parts):
+    agent = AIAgent(api_key="sk-test", cache=AIAnalysisCache(str(tmp_path / "ai.sqlite3")))
+    agent.client = Mock()
+    agent.client.chat.completions.create.return_value = iter([_chunk(p) for p in parts] + [_chunk(None)])
+    return agent
+
+
+def test_user_prompt_is_cycle_specific():
+    agent = AIAgent(api_key="sk-test")
+
+    conversion = agent._build_user_prompt("DADOS", period="7d", cycle="Ciclo 2")
+    traffic = agent._build_user_prompt("DADOS", period="7d", cycle="Ciclo 1")
+
+    assert "FASE DE CONVERSÃO" in conversion and "últimos 7 dias" in conversion
+    assert "FASE DE TRÁFEGO" in traffic and "DADOS" in traffic
+
+
+def test_stream_uses_cycle_prompt_and_fills_cache(tmp_path):
+    agent = _streaming_agent(tmp_path, ["## Resumo", " do ciclo"])
+
+    chunks = list(agent.analyze_stream({"investimento": 5.0}, {}, cycle="Ciclo 1"))
+
+    assert chunks == ["## Resumo", " do ciclo"]
+    messages = agent.client.chat.completions.create.call_args.kwargs["messages"]
+    assert "FASE DE TRÁFEGO" in messages[1]["content"]
+
+    # mesma análise (mesmos números/ciclo) sai do cache, sem nova chamada
+    again = list(agent.analyze_stream({"investimento": 5.0}, {}, cycle="Ciclo 1"))
+    assert again == ["## Resumo do ciclo"]
+    assert agent.client.chat.completions.create.call_count == 1
+
+
+def test_agents_share_one_pooled_client_built_on_first_use():
+    first = AIAgent(api_key="sk-pool")
+    second = AIAgent(api_key="sk-pool")
+    assert first.backend._client is None
+
+    assert first.client is second.client
+    assert AIAgent(api_key="sk-other").client._client is first.client._client  # mesmo httpx.Client
+
+
+def test_latest_analysis_flags_changed_data(tmp_path):
+    agent = _streaming_agent(tmp_path, ["Análise de 7 dias"])
+    list(agent.analyze_stream({"investimento": 5.0}, {}, period="last_7d", cycle="Ciclo 2"))
+
+    assert agent.latest_analysis({"investimento": 5.0}, {}, period="last_7d", cycle="Ciclo 2") == ("Análise de 7 dias", False)
+    assert agent.latest_analysis({"investimento": 9.0}, {}, period="last_7d", cycle="Ciclo 2") == ("Análise de 7 dias", True)
+    # mesmo números, outro período: o prompt muda, então não há análise guardada
+    assert agent.latest_analysis({"investimento": 5.0}, {}, period="last_30d", cycle="Ciclo 2") is None
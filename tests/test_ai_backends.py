@@ -0,0 +1,55 @@
+import threading
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from ai_agent import AIAgent
+from ai_backends import OpenAIBackend, ReplayBackend, ReplayMissError
+from ai_stub_server import StubLLMServer
+
+MESSAGES = [{"role": "user", "content": "Analise"}]
+
+
+def test_replay_records_once_then_serves_offline(tmp_path):
+    path = str(tmp_path / "replay.json")
+    live = Mock()
+    live.complete.return_value = "## Resumo gravado"
+
+    recorder = ReplayBackend(path, record_from=live)
+    assert recorder.complete("m", MESSAGES, 0.7, 100) == "## Resumo gravado"
+    assert recorder.complete("m", MESSAGES, 0.7, 100) == "## Resumo gravado"
+    assert live.complete.call_count == 1
+
+    replay = ReplayBackend(path)
+    assert "".join(replay.stream("m", MESSAGES, 0.7, 100)) == "## Resumo gravado"
+    with pytest.raises(ReplayMissError):
+        replay.complete("outro-modelo", MESSAGES, 0.7, 100)
+    assert ReplayBackend(path, default_response="padrão").complete("x", MESSAGES, 0.7, 100) == "padrão"
+
+
+def test_agent_analyzes_through_replay_backend(tmp_path):
+    agent = AIAgent(api_key=None, backend=ReplayBackend(str(tmp_path / "r.json"), default_response="Tudo certo"))
+
+    assert agent.analyze({"investimento": 1.0}, {}) == "Tudo certo"
+    assert "".join(agent.analyze_stream({"investimento": 1.0}, {})) == "Tudo certo"
+
+
+def test_stub_server_speaks_openai_protocol_with_latency():
+    with StubLLMServer(latency_seconds=0.2, token_delay_seconds=0.01, response_text="Olá mundo da LIA") as server:
+        backend = OpenAIBackend(api_key=None, base_url=server.base_url)
+
+        started = time.perf_counter()
+        assert backend.complete("stub", MESSAGES, 0.7, 100) == "Olá mundo da LIA"
+        assert time.perf_counter() - started >= 0.2
+
+        assert list(backend.stream("stub", MESSAGES, 0.7, 100)) == ["Olá ", "mundo ", "da ", "LIA"]
+
+        threads = [threading.Thread(target=backend.complete, args=("stub", MESSAGES, 0.7, 100)) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert server.request_count == 6
+    assert server.max_in_flight >= 2
@@ -0,0 +1,103 @@
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import pandas as pd
+
+from ai_agent import AIAgent
+from ai_cache import AIAnalysisCache, analysis_cache_key
+
+
+def test_key_changes_with_cycle_model_and_prompt_version():
+    base = analysis_cache_key("dados", "Ciclo 2", "gpt-4o-mini", "1")
+
+    assert base == analysis_cache_key("dados", "Ciclo 2", "gpt-4o-mini", "1")
+    assert base != analysis_cache_key("dados", "Ciclo 1", "gpt-4o-mini", "1")
+    assert base != analysis_cache_key("dados", "Ciclo 2", "gpt-4o", "1")
+    assert base != analysis_cache_key("dados", "Ciclo 2", "gpt-4o-mini", "2")
+
+
+def test_cache_persists_across_instances_and_expires(tmp_path, monkeypatch):
+    path = str(tmp_path / "ai.sqlite3")
+    AIAnalysisCache(path).put("k", "análise", cycle="Ciclo 2", model="m", prompt_version="1")
+
+    assert AIAnalysisCache(path).get("k") == "análise"
+
+    import ai_cache
+    now = ai_cache.time.time()
+    monkeypatch.setattr(ai_cache.time, "time", lambda: now + AIAnalysisCache.DEFAULT_TTL_SECONDS + 1)
+    assert AIAnalysisCache(path).get("k") is None
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = AIAnalysisCache(str(tmp_path / "ai.sqlite3"), max_entries=2)
+    cache.put("a", "A", cycle="c", model="m", prompt_version="1")
+    cache.put("b", "B", cycle="c", model="m", prompt_version="1")
+    assert cache.get("a") == "A"  # "b" passa a ser o menos usado
+
+    cache.put("c", "C", cycle="c", model="m", prompt_version="1")
+
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") == "A"
+
+
+def _completion(content):
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+def test_analyze_reuses_cached_analysis(tmp_path):
+    agent = AIAgent(api_key="sk-test", cache=AIAnalysisCache(str(tmp_path / "ai.sqlite3")))
+    agent.client = Mock()
+    agent.client.chat.completions.create.return_value = _completion("Tudo certo")
+    meta = {"investimento": 10.0, "impressoes": 1000, "cliques_link": 20}
+    creatives = pd.DataFrame([{"Criativo": "Vídeo A", "Taxa de cliques": 2.0, "Custo por clique": 0.5}])
+
+    first = agent.analyze(meta, {}, creative_data=creatives, cycle="Ciclo 2")
+    second = agent.analyze(meta, {}, creative_data=creatives, cycle="Ciclo 2")
+    agent.analyze(meta, {}, creative_data=creatives, cycle="Ciclo 1")
+
+    assert first == second == "Tudo certo"
+    assert agent.client.chat.completions.create.call_count == 2
+
+
+class _RateLimited(Exception):
+    status_code = 429
+    body = {"message": "rate limited"}
+
+
+def test_api_errors_are_not_cached(tmp_path):
+    cache = AIAnalysisCache(str(tmp_path / "ai.sqlite3"))
+    agent = AIAgent(api_key="sk-test", cache=cache)
+    agent.client = Mock()
+    agent.client.chat.completions.create.side_effect = _RateLimited()
+
+    result = agent.analyze({}, {})
+
+    assert result == "❌ Erro da API OpenAI: rate limited"
+    assert len(cache) == 0
+
+
+def test_latest_ignores_analyses_from_other_prompt_versions(tmp_path):
+    cache = AIAnalysisCache(str(tmp_path / "ai.sqlite3"))
+    cache.put("k1", "prompt antigo", cycle="c", model="m", prompt_version="1", period="last_7d")
+
+    assert cache.get_latest("last_7d", "c", "m", "1") == ("k1", "prompt antigo")
+    assert cache.get_latest("last_7d", "c", "m", "2") is None
+
+
+def test_old_latest_table_without_prompt_version_is_recreated(tmp_path):
+    import sqlite3
+
+    path = str(tmp_path / "ai.sqlite3")
+    with sqlite3.connect(path) as conn:
+        conn.execute(
+            "CREATE TABLE ai_latest (period TEXT NOT NULL, cycle TEXT NOT NULL, model TEXT NOT NULL, "
+            "cache_key TEXT NOT NULL, updated_at REAL NOT NULL, PRIMARY KEY (period, cycle, model))"
+        )
+        conn.execute("INSERT INTO ai_latest VALUES ('last_7d', 'c', 'm', 'k0', 0)")
+    conn.close()
+
+    cache = AIAnalysisCache(path)
+    cache.put("k1", "análise", cycle="c", model="m", prompt_version="2", period="last_7d")
+
+    assert cache.get_latest("last_7d", "c", "m", "2") == ("k1", "análise")
@@ -0,0 +1,34 @@
+from unittest.mock import Mock
+
+from ai_precompute import PrecomputeScheduler, precompute_analyses
+
+
+def test_precompute_generates_only_missing_or_changed_analyses():
+    agent = Mock()
+    agent.latest_analysis.side_effect = lambda **kw: ("ok", False) if kw["period"] == "last_7d" else None
+    agent.analyze.side_effect = lambda **kw: "❌ Erro da API OpenAI: limite" if kw["cycle"] == "Ciclo 1" else "análise"
+
+    results = precompute_analyses(
+        agent, lambda period, campanha: {"meta_data": {}, "ga4_data": {}},
+        periods=("last_7d", "last_30d"), campaigns=("Ciclo 2", "Ciclo 1", "Todas"),
+    )
+
+    assert results == {
+        ("last_7d", "Ciclo 2"): "cache", ("last_7d", "Ciclo 1"): "cache", ("last_7d", "Todos os Ciclos"): "cache",
+        ("last_30d", "Ciclo 2"): "gerada", ("last_30d", "Ciclo 1"): "erro", ("last_30d", "Todos os Ciclos"): "gerada",
+    }
+    assert agent.analyze.call_count == 3
+
+
+def test_scheduler_runs_one_job_at_a_time_and_respects_interval():
+    scheduler = PrecomputeScheduler(min_interval_seconds=300)
+    queued = []
+
+    assert scheduler.trigger(queued.append, lambda: None) is True
+    assert scheduler.running
+    assert scheduler.trigger(queued.append, lambda: None, force=True) is False  # ainda rodando
+
+    queued.pop()()
+    assert not scheduler.running
+    assert scheduler.trigger(queued.append, lambda: None) is False  # dentro do intervalo
+    assert scheduler.trigger(queued.append, lambda: None, force=True) is True
@@ -0,0 +1,59 @@
+import pandas as pd
+
+from ai_prompt import build_analysis_data_text, compact_rows, estimate_tokens, rank_creatives
+
+
+def _creatives(count):
+    return pd.DataFrame([
+        {
+            "Criativo": f"Anúncio {i}",
+            "Valor gasto": float(i % 50),
+            "Cliques": i,
+            "Taxa de cliques": (i % 7) / 2,
+            "Custo por clique": 0.5,
+        }
+        for i in range(count)
+    ])
+
+
+def test_creatives_ranked_by_spend_then_ctr():
+    df = pd.DataFrame([
+        {"Criativo": "A", "Valor gasto": 10.0, "Taxa de cliques": 1.0},
+        {"Criativo": "B", "Valor gasto": 30.0, "Taxa de cliques": 0.5},
+        {"Criativo": "C", "Valor gasto": 10.0, "Taxa de cliques": 3.0},
+    ])
+
+    assert rank_creatives(df)["Criativo"].tolist() == ["B", "C", "A"]
+
+
+def test_compact_rows_share_one_header():
+    header, rows = compact_rows(
+        pd.DataFrame([{"Criativo": "Vídeo | A", "Valor gasto": 1.234}]),
+        [("Criativo", "Criativo", None), ("Valor gasto", "Gasto $", "{:.2f}"), ("Ausente", "X", None)],
+    )
+
+    assert header == "Criativo|Gasto $"
+    assert rows == ["Vídeo / A|1.23"]
+
+
+def test_large_accounts_are_truncated_to_the_budget():
+    events = pd.DataFrame([{"Nome do Evento": f"evento_{i}", "Contagem de Eventos": "10 (1,00%)"} for i in range(40)])
+
+    text = build_analysis_data_text(
+        {"investimento": 100.0}, {"sessoes": 10},
+        creative_data=_creatives(5000), events_data=events, token_budget=400,
+    )
+
+    assert estimate_tokens(text) <= 400
+    assert "Investimento $ 100.00" in text and "Sessões 10" in text
+    creative_lines = [line for line in text.splitlines() if line.startswith("Anúncio")]
+    assert creative_lines and all("|49.00|" in line for line in creative_lines)  # maiores gastos sobrevivem
+    assert f"(+{5000 - len(creative_lines)} linhas omitidas)" in text
+
+
+def test_small_bundles_are_kept_whole():
+    text = build_analysis_data_text({}, {}, creative_data=_creatives(3), source_data={})
+
+    assert "linhas omitidas" not in text
+    assert text.count("Anúncio") == 3
+    assert "ORIGENS" not in text
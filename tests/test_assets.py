@@ -0,0 +1,36 @@
+import assets
+
+
+def test_minify_css_keeps_descendant_selectors():
+    css = """
+    /* comentário */
+    .kpi-card :hover {
+        color: #FFF;
+        margin: 0 auto;
+    }
+    """
+
+    assert assets.minify_css(css) == ".kpi-card :hover{color: #FFF;margin: 0 auto}"
+
+
+def test_theme_is_built_once_and_tagged_with_hash():
+    assert assets.theme_css() is assets.theme_css()
+    html_tag = assets.theme_style_html()
+
+    assert html_tag.startswith(f'<style id="lia-theme-{assets.theme_css_hash()}">')
+    assert "/*" not in html_tag
+
+
+def test_logo_published_to_static_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(assets, "STATIC_DIR", str(tmp_path))
+    assets.logo_src.cache_clear()
+    try:
+        src = assets.logo_src(True)
+        inline = assets.logo_src(False)
+    finally:
+        assets.logo_src.cache_clear()
+
+    filename = src.rsplit("/", 1)[-1]
+    assert src.startswith("app/static/logo_lia-")
+    assert (tmp_path / filename).read_bytes() == assets._logo_bytes()
+    assert inline.startswith("data:image/png;base64,")
@@ -0,0 +1,72 @@
+import json
+
+from datetime import date, timedelta
+from unittest import mock
+
+from benchmarks.fixtures import FakeGraphAPI, SyntheticAccount
+from benchmarks.run import BenchmarkEnv, Scenario, _ga4_integration_stage, compare_results, run_scenario
+from ga_integration import GA4Integration
+from meta_integration import MetaAdsIntegration
+
+
+def test_run_scenario_reports_time_requests_and_memory_per_stage():
+    result = run_scenario(Scenario("tiny", "last_7d", ads=3), repeat=1)
+
+    stages = result["stages"]
+    assert set(stages) == {"meta_integration", "ga4_integration", "data_provider", "meta_funnel", "tables"}
+    meta_requests = stages["meta_integration"]["requests"]["meta"]
+    assert meta_requests["insights:campaign:daily"] == 1
+    assert meta_requests["ad"] == 3  # um pedido por anúncio em get_creative_insights
+    assert meta_requests["app_event_aggregations"] == 6
+    assert stages["ga4_integration"]["requests"]["ga4"]["run_report"] == 4
+    assert stages["meta_funnel"]["requests"]["total"] == 0
+    assert all(stage["peak_memory_bytes"] > 0 and stage["wall_seconds"] > 0 for stage in stages.values())
+    assert result["totals"]["requests"] == sum(stage["requests"]["total"] for stage in stages.values())
+    json.dumps(result)
+
+
+def test_fact_store_scenario_only_fetches_unsettled_days():
+    env = BenchmarkEnv(Scenario("tiny-factstore", "custom", ads=3, custom_days=30, fact_store=True))
+    try:
+        env.prepare()
+        with mock.patch.object(env.ga4_client, "run_report", wraps=env.ga4_client.run_report) as run_report:
+            _ga4_integration_stage(env)
+    finally:
+        env.close()
+
+    sessions = [call.args[0] for call in run_report.call_args_list
+                if [d.name for d in call.args[0].dimensions] == ["date", "sessionSourceMedium"]]
+    assert len(sessions) == 1
+    settled_until = date.today() - timedelta(days=GA4Integration.SETTLED_AFTER_DAYS)
+    assert sessions[0].date_ranges[0].start_date == (settled_until + timedelta(days=1)).isoformat()
+    assert env.ga4_integration().credentials is None  # construtor com cliente injetado
+
+
+def test_fake_graph_pages_insights_like_the_graph_api():
+    account = SyntheticAccount(ads=120, seed=7)  # 3 campanhas
+    graph = FakeGraphAPI(account)
+    meta = MetaAdsIntegration(access_token="t", ad_account_id=graph.ad_account_id, app_id=graph.app_id)
+
+    with graph.patch():
+        df = meta.get_ad_insights(date_range="custom", custom_start="2024-01-01", custom_end="2024-07-18")
+        again = meta.get_ad_insights(date_range="custom", custom_start="2024-01-01", custom_end="2024-07-18")
+
+    assert len(df) == 3 * 200
+    assert graph.requests["insights:campaign:daily"] == 4  # 2 páginas de 500 por chamada
+    assert df["date_start"].min() == "2024-01-01" and df["date_start"].max() == "2024-07-18"
+    assert df.equals(again)
+
+
+def _report(wall, peak, requests):
+    stage = {"wall_seconds": wall, "peak_memory_bytes": peak, "requests": {"total": requests}}
+    return {"scenarios": [{"name": "7d-10ads", "stages": {"meta_integration": stage}}]}
+
+
+def test_compare_results_flags_regressions_beyond_tolerance():
+    baseline = _report(1.0, 10_000_000, 20)
+
+    assert compare_results(baseline, _report(1.1, 11_000_000, 20)) == []
+    regressions = compare_results(baseline, _report(1.5, 20_000_000, 21))
+    assert [line.split(": ")[1].split(" ")[0] for line in regressions] == ["tempo", "memória", "requisições"]
+    # Variação pequena em valor absoluto é ruído
+    assert compare_results(_report(0.001, 1, 1), _report(0.004, 1, 1)) == []
@@ -28,3 +28,61 @@ def test_get_build_stamp_includes_commit_branch(monkeypatch):
     assert "branch=main" in stamp
     assert "commit_date=2026-02-15T19:00:00+00:00" in stamp
     assert "app_started_utc=" in stamp
+
+
+def test_generated_build_info_file_skips_git(monkeypatch, tmp_path):
+    import json
+
+    import build_info
+
+    get_build_stamp.cache_clear()
+    monkeypatch.delenv("LIA_BUILD_STAMP", raising=False)
+    path = tmp_path / "build_info.json"
+    path.write_text(json.dumps({"commit": "f00d123", "branch": "release", "commit_date": "2026-03-01T10:00:00+00:00"}))
+    monkeypatch.setattr(build_info, "BUILD_INFO_PATH", str(path))
+    monkeypatch.setattr(build_info, "APP_DIR", str(tmp_path))
+    monkeypatch.setattr(build_info, "_run_git_command", lambda args: (_ for _ in ()).throw(AssertionError("git")))
+
+    assert "commit=f00d123 branch=release" in build_info.get_build_stamp_nowait()
+    get_build_stamp.cache_clear()
+
+
+def test_build_info_file_is_ignored_in_a_git_checkout(monkeypatch, tmp_path):
+    import json
+
+    import build_info
+
+    get_build_stamp.cache_clear()
+    monkeypatch.delenv("LIA_BUILD_STAMP", raising=False)
+    (tmp_path / ".git").mkdir()
+    path = tmp_path / "build_info.json"
+    path.write_text(json.dumps({"commit": "old0000", "branch": "main", "commit_date": "2026-03-01T10:00:00+00:00"}))
+    monkeypatch.setattr(build_info, "BUILD_INFO_PATH", str(path))
+    monkeypatch.setattr(build_info, "APP_DIR", str(tmp_path))
+    monkeypatch.setattr(build_info, "_run_git_command", lambda args: "new1111" if args[-1] == "HEAD" else None)
+
+    assert "commit=new1111" in build_info.get_build_stamp()
+    get_build_stamp.cache_clear()
+
+
+def test_nowait_resolves_git_in_background(monkeypatch, tmp_path):
+    import threading
+
+    import build_info
+
+    get_build_stamp.cache_clear()
+    monkeypatch.delenv("LIA_BUILD_STAMP", raising=False)
+    monkeypatch.setattr(build_info, "BUILD_INFO_PATH", str(tmp_path / "ausente.json"))
+    release = threading.Event()
+
+    def slow_git(args):
+        release.wait(5)
+        return "abc1234" if args[-1] == "HEAD" else None
+
+    monkeypatch.setattr(build_info, "_run_git_command", slow_git)
+
+    assert build_info.get_build_stamp_nowait().startswith("build resolvendo...")
+    release.set()
+    build_info._background_thread.join(5)
+    assert "commit=abc1234" in build_info.get_build_stamp_nowait()
+    get_build_stamp.cache_clear()
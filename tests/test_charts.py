@@ -0,0 +1,41 @@
+import pandas as pd
+
+import charts
+from theme import LIA
+
+
+def _trends():
+    return pd.DataFrame({
+        "Data": ["29/12", "30/12", "31/12", "01/01"],
+        "Cliques": [10, 20, 30, 5],
+        "CTR": [1.0, 1.5, 2.0, 0.5],
+        "CPC": [0.5, 0.4, 0.3, 0.6],
+    })
+
+
+def test_trend_frames_apply_year_vectorized():
+    daily, weekly = charts.build_trend_frames(_trends(), year=2024)
+
+    expected = pd.to_datetime(_trends()["Data"], format="%d/%m").apply(lambda value: value.replace(year=2024))
+    assert daily["__date"].tolist() == expected.tolist()
+    assert weekly["Cliques"].sum() == 65
+    assert weekly["Label"].str.startswith("Sem ").all()
+
+
+def test_figures_are_reused_for_equal_data_and_theme():
+    charts.clear_figure_cache()
+    first = charts.clicks_per_day_figure(_trends())
+
+    assert charts.clicks_per_day_figure(_trends().copy()) is first
+    assert charts.clicks_per_day_figure(_trends().assign(Cliques=[1, 2, 3, 4])) is not first
+    assert charts.clicks_per_day_figure(_trends(), palette={**LIA, "primary": "#000000"}) is not first
+
+
+def test_funnel_figure_keyed_by_values():
+    labels = ["Viram", "Clicaram", "Visitaram", "CTA"]
+
+    fig = charts.funnel_figure(labels, [100, 10, 5, 1])
+
+    assert list(fig.data[0].x) == [100, 10, 5, 1]
+    assert charts.funnel_figure(labels, [100, 10, 5, 1]) is fig
+    assert charts.funnel_figure(labels, [100, 10, 5, 2]) is not fig
@@ -0,0 +1,66 @@
+import pytest
+
+from config import Config
+
+
+@pytest.fixture(autouse=True)
+def fresh_snapshot():
+    Config.invalidate()
+    yield
+    Config.invalidate()
+
+
+def test_snapshot_is_frozen_until_invalidated(monkeypatch):
+    monkeypatch.setenv("EVENTS_MODE", "off")
+    first = Config.snapshot()
+
+    monkeypatch.setenv("EVENTS_MODE", "ga4")
+    assert Config.snapshot() is first
+    assert Config.get_events_mode() == "ga4"  # getters continuam resolvendo na hora
+    with pytest.raises(AttributeError):
+        first.events_mode = "ga4"
+
+    Config.invalidate()
+    assert Config.snapshot().events_mode == "ga4"
+
+
+def test_ga4_credentials_are_parsed_once_per_snapshot(monkeypatch):
+    monkeypatch.delenv("EVENTS_MODE", raising=False)
+    calls = []
+    monkeypatch.setattr(Config, "get_ga4_credentials", classmethod(lambda cls: calls.append(1) or {}))
+
+    snapshot = Config.snapshot()
+    Config.snapshot()
+
+    assert snapshot.ga4_configured is False and snapshot.events_mode == "off"
+    assert len(calls) == 1
+
+
+def test_snapshot_refreshes_on_secrets_change_and_ttl(monkeypatch):
+    mtimes = [(1.0,)]
+    monkeypatch.setattr(Config, "_secrets_file_mtimes", staticmethod(lambda: mtimes[0]))
+    first = Config.snapshot()
+    assert Config.snapshot() is first
+
+    mtimes[0] = (2.0,)
+    second = Config.snapshot()
+    assert second is not first
+
+    monkeypatch.setattr(Config, "SNAPSHOT_TTL_SECONDS", 0)
+    Config.invalidate()
+    assert Config.snapshot() is not Config.snapshot()
+
+
+def test_secrets_mtimes_fall_back_to_documented_paths(monkeypatch, tmp_path):
+    from streamlit.runtime.secrets import secrets_singleton
+
+    monkeypatch.delattr(secrets_singleton, "_file_paths", raising=False)
+    monkeypatch.setenv("HOME", str(tmp_path / "home"))
+    (tmp_path / ".streamlit").mkdir()
+    (tmp_path / ".streamlit" / "secrets.toml").write_text("X = 1\n")
+    monkeypatch.chdir(tmp_path)
+
+    mtimes = Config._secrets_file_mtimes()
+
+    assert mtimes[0] is None
+    assert mtimes[1] == (tmp_path / ".streamlit" / "secrets.toml").stat().st_mtime
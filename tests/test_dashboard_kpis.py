@@ -1,4 +1,4 @@
-from dashboard_kpis import build_meta_kpi_cards_payload
+from dashboard_kpis import build_ga4_kpi_cards_payload, build_kpi_card, build_kpi_cards_html, build_meta_kpi_cards_payload
 
 
 def test_ga4_fallback_renders_install_card_label_when_install_campaign_configured():
@@ -43,3 +43,22 @@ def test_sdk_cards_hidden_by_default_when_install_campaign_not_configured():
 
     assert "Instalações (GA4)" not in labels
     assert "Instalações (SDK)" not in labels
+
+
+def test_ga4_payload_formats_values_and_tolerates_missing_keys():
+    cards = build_ga4_kpi_cards_payload({"sessoes": 1234, "taxa_engajamento": 55.56, "delta_sessoes": 3})
+
+    values = {card["label"]: card["value"] for card in cards}
+    assert values["Visitas ao site"] == "1,234"
+    assert values["Visitantes únicos"] == "0"
+    assert values["Taxa de engajamento"] == "55.6%"
+    assert values["Tempo médio no site"] == "0m 0s"
+
+
+def test_kpi_card_html_marks_inverted_deltas():
+    card = build_kpi_card("💡", "Custo por clique", "$ 1.00", 5.0, invert=True)
+
+    assert card.startswith('<label class="kpi-card" id="kpi-custo-por-clique">')
+    assert '<div class="kpi-delta delta-down">↑ 5.0%</div>' in card
+    assert build_kpi_cards_html([{"icon": "x", "label": "A", "value": "1", "delta": None}]).count("<label") == 1
+
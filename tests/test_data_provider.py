@@ -0,0 +1,103 @@
+import threading
+from unittest.mock import Mock
+
+import pandas as pd
+
+from data_provider import DataProvider
+
+
+def _boom():
+    raise RuntimeError("timeout")
+
+
+def test_error_state_is_scoped_to_the_calling_session():
+    sessions = {"a": {}, "b": {}}
+    current = threading.local()
+    provider = DataProvider(mode="mock", session_state=lambda: sessions[current.name])
+
+    current.name = "a"
+    assert provider._safe_execute(_boom, default=0) == 0
+    assert provider.error_state is True
+    assert provider.error_message == "timeout"
+
+    current.name = "b"
+    assert provider.error_state is False
+    assert provider.error_message == ""
+    assert sessions["a"][DataProvider.ERROR_STATE_KEY] is True
+
+
+def test_error_state_falls_back_to_instance_without_session():
+    def no_session():
+        raise RuntimeError("sem contexto")
+
+    provider = DataProvider(mode="mock", session_state=no_session)
+
+    provider._safe_execute(_boom)
+
+    assert provider.error_state is True
+    assert DataProvider(mode="mock").error_state is False
+
+
+def _provider_with_meta_client():
+    meta_client = Mock()
+    meta_client.app_id = "123"
+    meta_client.get_ad_insights.return_value = pd.DataFrame(
+        [{"spend": 10.0, "impressions": 1000, "clicks": 20, "reach": 800}]
+    )
+    meta_client.get_aggregated_insights.return_value = {}
+    meta_client.get_all_sdk_events.return_value = {
+        "events": {"fb_mobile_install": 7},
+        "source": "aggregations",
+        "errors": [],
+        "install_count": 7,
+        "activate_count": 0,
+    }
+    provider = DataProvider(mode="auto")
+    provider._meta_client = meta_client
+    provider._ga4_clients = (None, None)
+    return provider, meta_client
+
+
+def test_meta_metrics_can_skip_sdk_enrichment():
+    provider, meta_client = _provider_with_meta_client()
+
+    result = provider.get_meta_metrics(period="last_7d", include_sdk=False)
+
+    assert result["_data_source"] == "real"
+    assert result["cliques_link"] == 20
+    assert "_sdk_source" not in result
+    meta_client.get_all_sdk_events.assert_not_called()
+
+
+def test_sdk_enrichment_is_a_separate_stage():
+    provider, meta_client = _provider_with_meta_client()
+
+    enrichment = provider.get_sdk_enrichment(period="last_7d")
+
+    assert enrichment["instalacoes_sdk"] == 7
+    assert enrichment["_sdk_source"] == "aggregations"
+    assert enrichment["_all_sdk_events"] == {"fb_mobile_install": 7}
+    # installs já vindos das actions do Ads Insights têm prioridade: nada a sobrescrever
+    assert "instalacoes_sdk" not in provider.get_sdk_enrichment(period="last_7d", install_fallback=False)
+
+
+def test_clear_api_caches_makes_the_next_read_reach_ga4():
+    from google.analytics.data_v1beta.types import RunReportResponse
+
+    from ga_integration import GA4Integration
+
+    GA4Integration.clear_report_cache()
+    client = Mock()
+    client.run_report.return_value = RunReportResponse()
+    provider = DataProvider(mode="auto")
+    provider._ga4_clients = (GA4Integration({}, "123", client=client), None)
+
+    provider.get_ga4_metrics("7d")
+    calls = client.run_report.call_count
+    provider.get_ga4_metrics("7d")
+    assert client.run_report.call_count == calls  # servido pelo cache de relatórios
+
+    DataProvider.clear_api_caches()
+    provider.get_ga4_metrics("7d")
+    assert client.run_report.call_count == 2 * calls
+
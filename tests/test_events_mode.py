@@ -32,3 +32,26 @@ def test_config_events_mode_default_off_when_ga4_not_configured(monkeypatch):
 def test_config_events_mode_env_override(monkeypatch):
     monkeypatch.setenv("EVENTS_MODE", "ga4")
     assert Config.get_events_mode() == "ga4"
+
+
+def test_landing_card_requests_server_side_aggregate():
+    client = Mock()
+    client.get_landing_events_summary.return_value = {
+        "rows": [{"Evento": "page_view", "Contagem": 10, "Usuários": 4, "Conversões": 0.0}],
+        "total_events": 10,
+        "total_users": 4,
+        "date_range": "2024-01-01 a 2024-01-07",
+    }
+
+    payload = build_landing_events_card_data(
+        client,
+        events_mode="ga4",
+        period_api="last_7d",
+        custom_start=None,
+        custom_end=None,
+        landing_host_filter=None,
+    )
+
+    assert payload["status"] == "ok"
+    assert payload["table"]["Evento"].tolist() == ["page_view"]
+    assert client.get_landing_events_summary.call_args.kwargs["mode"] == "aggregate"
@@ -0,0 +1,99 @@
+from datetime import datetime, timedelta
+from unittest.mock import Mock
+
+from google.analytics.data_v1beta.types import DimensionValue, MetricValue, Row, RunReportResponse
+
+from ga4_fact_store import GA4DailyFactStore
+from ga_integration import GA4Integration
+
+
+def _day(offset):
+    return datetime.now().date() - timedelta(days=offset)
+
+
+def _sessions_client():
+    """Cliente fake que devolve uma linha por dia do intervalo pedido."""
+    client = Mock()
+
+    def run_report(request):
+        start = datetime.strptime(request.date_ranges[0].start_date, "%Y-%m-%d").date()
+        end = datetime.strptime(request.date_ranges[0].end_date, "%Y-%m-%d").date()
+        rows = []
+        day = start
+        while day <= end:
+            rows.append(Row(
+                dimension_values=[DimensionValue(value=day.strftime("%Y%m%d")), DimensionValue(value="facebook / paid")],
+                metric_values=[MetricValue(value=v) for v in ["10", "8", "20", "0.5", "0.5"]],
+            ))
+            day += timedelta(days=1)
+        return RunReportResponse(rows=rows, row_count=len(rows))
+
+    client.run_report.side_effect = run_report
+    return client
+
+
+def _make_integration(client, store):
+    GA4Integration.clear_report_cache()
+    integration = GA4Integration.__new__(GA4Integration)
+    integration.property_id = "123"
+    integration.client = client
+    integration.fact_store = store
+    return integration
+
+
+def test_store_roundtrip_keeps_empty_days(tmp_path):
+    store = GA4DailyFactStore(str(tmp_path / "facts.sqlite3"))
+    store.save("properties/1", "sessions", "", {"2024-01-01": [{"sessions": 3}], "2024-01-02": []})
+
+    loaded = store.load("properties/1", "sessions", "", ["2024-01-01", "2024-01-02", "2024-01-03"])
+
+    assert loaded == {"2024-01-01": [{"sessions": 3}], "2024-01-02": []}
+    assert store.load("properties/1", "sessions", "ciclo2", ["2024-01-01"]) == {}
+
+
+def test_second_query_only_fetches_unsettled_days(tmp_path):
+    store = GA4DailyFactStore(str(tmp_path / "facts.sqlite3"))
+    client = _sessions_client()
+    integration = _make_integration(client, store)
+    start, end = _day(9).strftime("%Y-%m-%d"), _day(0).strftime("%Y-%m-%d")
+
+    first = integration.get_sessions_data(date_range="custom", custom_start=start, custom_end=end)
+    second = integration.get_sessions_data(date_range="custom", custom_start=start, custom_end=end)
+
+    assert len(first) == 10
+    assert len(second) == 10
+    assert second["sessions"].sum() == first["sessions"].sum()
+
+    refetch = client.run_report.call_args_list[-1].args[0].date_ranges[0]
+    settled_until = _day(GA4Integration.SETTLED_AFTER_DAYS)
+    assert refetch.start_date == (settled_until + timedelta(days=1)).strftime("%Y-%m-%d")
+    assert refetch.end_date == end
+
+
+def test_gaps_at_both_ends_fetch_each_run_separately(tmp_path):
+    store = GA4DailyFactStore(str(tmp_path / "facts.sqlite3"))
+    client = _sessions_client()
+    integration = _make_integration(client, store)
+    settled_until = GA4Integration.SETTLED_AFTER_DAYS
+    middle = [_day(offset).strftime("%Y-%m-%d") for offset in range(settled_until + 5, settled_until, -1)]
+    integration.get_sessions_data(date_range="custom", custom_start=middle[0], custom_end=middle[-1])
+    start, end = _day(settled_until + 8).strftime("%Y-%m-%d"), _day(0).strftime("%Y-%m-%d")
+
+    df = integration.get_sessions_data(date_range="custom", custom_start=start, custom_end=end)
+
+    assert len(df) == settled_until + 9
+    ranges = [call.args[0].date_ranges[0] for call in client.run_report.call_args_list[1:]]
+    assert [(r.start_date, r.end_date) for r in ranges] == [
+        (start, _day(settled_until + 6).strftime("%Y-%m-%d")),
+        (_day(settled_until).strftime("%Y-%m-%d"), end),
+    ]
+
+
+def test_without_store_queries_whole_range():
+    client = _sessions_client()
+    integration = _make_integration(client, None)
+
+    df = integration.get_sessions_data(date_range="last_7d")
+
+    assert len(df) == 7
+    assert client.run_report.call_count == 1
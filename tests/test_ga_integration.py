@@ -0,0 +1,219 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock
+
+import numpy as np
+from google.analytics.data_v1beta.types import (
+    DimensionValue,
+    MetricValue,
+    Row,
+    RunRealtimeReportResponse,
+    RunReportRequest,
+    RunReportResponse,
+)
+
+from ga_integration import GA4Integration
+
+
+def _make_integration(client, property_id="123"):
+    GA4Integration.clear_report_cache()
+    integration = GA4Integration.__new__(GA4Integration)
+    integration.property_id = property_id
+    integration.client = client
+    integration.fact_store = None
+    return integration
+
+
+def _row(dimensions, metrics):
+    return Row(
+        dimension_values=[DimensionValue(value=str(v)) for v in dimensions],
+        metric_values=[MetricValue(value=str(v)) for v in metrics],
+    )
+
+
+def _paged_client(rows):
+    """Cliente fake que respeita offset/limit como a API do GA4."""
+    client = Mock()
+
+    def run_report(request):
+        page = rows[request.offset:request.offset + request.limit]
+        return RunReportResponse(rows=page, row_count=len(rows))
+
+    client.run_report.side_effect = run_report
+    return client
+
+
+def test_sessions_data_paginates_past_page_size(monkeypatch):
+    rows = [_row(["20240101", f"source{i} / cpc"], [i, i, i * 2, 0.5, 0.25]) for i in range(5)]
+    client = _paged_client(rows)
+    integration = _make_integration(client)
+    monkeypatch.setattr(GA4Integration, "REPORT_PAGE_SIZE", 2)
+
+    df = integration.get_sessions_data(date_range="custom", custom_start="2024-01-01", custom_end="2024-01-01")
+
+    assert len(df) == 5
+    assert [call.args[0].offset for call in client.run_report.call_args_list] == [0, 2, 4]
+    assert df["sessions"].dtype == np.int64
+    assert df["engagement_rate"].dtype == np.float64
+    assert df["pageviews"].tolist() == [0, 2, 4, 6, 8]
+
+
+def test_iter_report_rows_streams_every_page(monkeypatch):
+    rows = [_row([f"event_{i}"], [i]) for i in range(7)]
+    integration = _make_integration(_paged_client(rows))
+    monkeypatch.setattr(GA4Integration, "REPORT_PAGE_SIZE", 3)
+
+    names = [row.dimension_values[0].value for row in integration.iter_report_rows(RunReportRequest())]
+
+    assert names == [f"event_{i}" for i in range(7)]
+
+
+def test_available_campaigns_skips_not_set_without_per_row_dicts():
+    rows = [
+        _row(["lia_ciclo2_conversao"], [30, 20]),
+        _row(["(not set)"], [99, 90]),
+        _row(["(direct)"], [50, 40]),
+        _row(["lia_ciclo1_trafego"], [40, 35]),
+    ]
+    integration = _make_integration(_paged_client(rows))
+
+    df = integration.get_available_campaigns(date_range="last_30d")
+
+    assert df["campaign"].tolist() == ["lia_ciclo1_trafego", "lia_ciclo2_conversao"]
+    assert df["sessions"].tolist() == [40, 30]
+
+
+def test_events_data_empty_report_returns_empty_frame():
+    integration = _make_integration(_paged_client([]))
+
+    df = integration.get_events_data(date_range="last_7d")
+
+    assert df.empty
+
+
+def test_landing_events_aggregate_uses_ga4_totals():
+    client = Mock()
+    client.run_report.return_value = RunReportResponse(
+        rows=[_row(["page_view"], [30, 12, 0]), _row(["generate_lead"], [5, 5, 5])],
+        totals=[_row(["RESERVED_TOTAL"], [35, 14, 5])],
+        row_count=2,
+    )
+    integration = _make_integration(client)
+
+    summary = integration.get_landing_events_summary(date_range="last_7d", mode="aggregate")
+
+    request = client.run_report.call_args.args[0]
+    assert [d.name for d in request.dimensions] == ["eventName"]
+    assert len(request.metric_aggregations) == 1
+    assert [row["Evento"] for row in summary["rows"]] == ["page_view", "generate_lead"]
+    # usuários únicos vêm do total do GA4, não da soma das linhas
+    assert summary["total_users"] == 14
+    assert summary["key_event_totals"] == {"generate_lead": 5, "page_view": 30}
+    assert "sparkline" not in summary
+
+
+def test_landing_events_aggregate_counts_key_events_beyond_table_limit():
+    rows = [_row([f"scroll_{i}"], [100 - i, 10, 0]) for i in range(8)] + [_row(["whatsapp_click"], [3, 3, 3])]
+    integration = _make_integration(_paged_client(rows))
+
+    summary = integration.get_landing_events_summary(date_range="last_7d", mode="aggregate", limit=8)
+
+    assert len(summary["rows"]) == 8
+    assert "whatsapp_click" not in [row["Evento"] for row in summary["rows"]]
+    assert summary["key_event_totals"] == {"whatsapp_click": 3}
+    assert summary["has_key_events"] is True
+
+
+def test_identical_requests_hit_report_cache():
+    rows = [_row(["lia_ciclo2_conversao"], [30, 20])]
+    client = _paged_client(rows)
+    integration = _make_integration(client)
+    # outra instância (ex.: diagnóstico de UTM) compartilha o cache da classe
+    other = GA4Integration.__new__(GA4Integration)
+    other.__dict__.update(integration.__dict__)
+
+    first = integration.get_available_campaigns(date_range="last_30d")
+    second = other.get_available_campaigns(date_range="last_30d")
+    assert client.run_report.call_count == 1
+    assert first["campaign"].tolist() == second["campaign"].tolist()
+
+    integration.get_available_campaigns(date_range="last_7d")
+    assert client.run_report.call_count == 2
+
+
+def test_report_cache_evicts_lru(monkeypatch):
+    client = _paged_client([_row(["page_view"], [1, 1, 1, 1])])
+    integration = _make_integration(client)
+    monkeypatch.setattr(GA4Integration, "_REPORT_CACHE_MAX_ENTRIES", 2)
+
+    integration.get_events_data(date_range="last_7d")
+    integration.get_events_data(date_range="last_14d")
+    integration.get_events_data(date_range="last_30d")  # descarta last_7d (menos recente)
+    integration.get_events_data(date_range="last_14d")
+    assert client.run_report.call_count == 3
+
+    integration.get_events_data(date_range="last_7d")
+    assert client.run_report.call_count == 4
+
+
+def test_report_cache_refetches_after_ttl(monkeypatch):
+    import ga_integration
+
+    client = _paged_client([_row(["page_view"], [1, 1, 1, 1])])
+    integration = _make_integration(client)
+    now = [1000.0]
+    monkeypatch.setattr(ga_integration.time, "monotonic", lambda: now[0])
+
+    integration.get_events_data(date_range="last_7d")
+    now[0] += GA4Integration._REPORT_CACHE_TTL_SECONDS - 1
+    integration.get_events_data(date_range="last_7d")
+    assert client.run_report.call_count == 1
+
+    now[0] += 2  # passou do TTL
+    integration.get_events_data(date_range="last_7d")
+    assert client.run_report.call_count == 2
+
+
+def _realtime_client():
+    client = Mock()
+    client.run_realtime_report.return_value = RunRealtimeReportResponse(
+        rows=[_row(["page_view"], [12, 4]), _row(["generate_lead"], [2, 2])],
+        totals=[_row(["RESERVED_TOTAL"], [14, 5])],
+        row_count=2,
+    )
+    return client
+
+
+def test_realtime_summary_uses_totals_and_short_cache():
+    client = _realtime_client()
+    integration = _make_integration(client)
+
+    summary = integration.get_realtime_summary()
+    again = integration.get_realtime_summary()
+
+    assert summary["active_users"] == 5
+    assert summary["total_events"] == 14
+    assert [row["Evento"] for row in summary["rows"]] == ["page_view", "generate_lead"]
+    assert again is summary
+    assert client.run_realtime_report.call_count == 1
+
+
+def test_realtime_concurrent_polls_are_coalesced():
+    client = _realtime_client()
+    release = threading.Event()
+    response = client.run_realtime_report.return_value
+
+    def slow_realtime(request):
+        release.wait(timeout=2)
+        return response
+
+    client.run_realtime_report.side_effect = slow_realtime
+    integration = _make_integration(client)
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        futures = [pool.submit(integration.get_realtime_summary) for _ in range(4)]
+        release.set()
+        results = [future.result() for future in futures]
+
+    assert client.run_realtime_report.call_count == 1
+    assert all(result["active_users"] == 5 for result in results)
@@ -0,0 +1,63 @@
+import html
+
+import numpy as np
+import pandas as pd
+
+import html_tables
+from html_tables import frame_fingerprint, paginate_frame, render_html_table
+
+
+def _loop_render(df, formats):
+    """Implementação antiga (iterrows + html.escape por célula) usada como referência."""
+    header = "".join(f"<th>{html.escape(str(col))}</th>" for col in df.columns)
+    rows = []
+    for _, row in df.iterrows():
+        cells = []
+        for col in df.columns:
+            value = row[col]
+            if col in formats and pd.notna(value):
+                text = formats[col].format(value)
+            else:
+                text = "" if pd.isna(value) else str(value)
+            cells.append(f"<td>{html.escape(text)}</td>")
+        rows.append("<tr>" + "".join(cells) + "</tr>")
+    return f'<table class="lia-html-table"><thead><tr>{header}</tr></thead><tbody>{"".join(rows)}</tbody></table>'
+
+
+def test_vectorized_render_matches_per_cell_loop():
+    df = pd.DataFrame({
+        "Criativo": ["<b>Anúncio</b> & cia", "Vídeo 'LIA'", None],
+        "Valor gasto": [1234.5, np.nan, 10.0],
+        "Cliques": [1200, 30, 0],
+    })
+    formats = {"Valor gasto": "$ {:,.2f}", "Cliques": "{:,.0f}"}
+
+    assert render_html_table(df, formats=formats) == _loop_render(df, formats)
+
+
+def test_tooltips_only_on_known_values():
+    df = pd.DataFrame({"Nome do Evento": ["page_view ", "custom"], "Contagem": ["10", "2"]})
+
+    table = render_html_table(df, tooltips={"page_view": 'Visualizações "totais"'}, tooltip_column="Nome do Evento")
+
+    assert '<td title="Visualizações &quot;totais&quot;">page_view </td>' in table
+    assert "<td>custom</td>" in table
+
+
+def test_unchanged_frame_reuses_cached_html(monkeypatch):
+    df = pd.DataFrame({"a": range(5)})
+    first = render_html_table(df)
+    monkeypatch.setattr(html_tables, "_build_table_html", lambda *args: "rebuilt")
+
+    assert render_html_table(df.copy()) == first
+    assert render_html_table(df.assign(a=df["a"] + 1)) == "rebuilt"
+    assert frame_fingerprint(df) != frame_fingerprint(df.rename(columns={"a": "b"}))
+
+
+def test_paginate_frame_clamps_page():
+    df = pd.DataFrame({"a": range(120)})
+
+    page, page_count = paginate_frame(df, page=9, page_size=50)
+
+    assert page_count == 3
+    assert page["a"].tolist() == list(range(100, 120))
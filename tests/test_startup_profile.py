@@ -0,0 +1,42 @@
+import sys
+
+import startup_profile
+from data_provider import DataProvider
+
+
+def test_phase_keeps_first_measurement():
+    startup_profile.reset()
+
+    with startup_profile.phase("carga"):
+        pass
+    startup_profile.record("carga", 99.0)
+
+    (name, ms), = startup_profile.snapshot()
+    assert name == "carga"
+    assert ms < 99000
+
+
+def test_timed_import_records_only_new_modules(monkeypatch):
+    startup_profile.reset()
+    monkeypatch.delitem(sys.modules, "theme", raising=False)
+
+    module = startup_profile.timed_import("theme")
+    assert startup_profile.timed_import("theme") is module
+    startup_profile.timed_import("config")  # já importado: não entra no perfil
+
+    assert [name for name, _ in startup_profile.snapshot()] == ["import theme"]
+
+
+def test_data_provider_builds_clients_on_first_use(monkeypatch):
+    calls = []
+    monkeypatch.setattr(DataProvider, "_init_meta_client", staticmethod(lambda: calls.append("meta") or "meta"))
+    monkeypatch.setattr(DataProvider, "_init_ga4_clients", lambda self: calls.append("ga4") or ("site", "app"))
+
+    provider = DataProvider(mode="auto")
+    assert calls == []
+
+    assert provider.meta_client == "meta"
+    assert provider.ga4_client == "site"
+    assert provider.ga4_app_client == "app"
+    assert provider.meta_client == "meta"
+    assert calls == ["meta", "ga4"]
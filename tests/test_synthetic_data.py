@@ -0,0 +1,87 @@
+import pandas as pd
+
+from benchmarks.synthetic_data import (
+    SyntheticAccount,
+    creative_frame,
+    ga4_report_response,
+    meta_insights_frame,
+    meta_insights_pages,
+)
+from data_provider import DataProvider
+from html_tables import render_html_table
+from meta_funnel import (
+    ACTIVATE_APP_ACTION_TYPES,
+    INSTALL_ACTION_TYPES,
+    STORE_CLICK_ACTION_TYPES,
+    collect_action_type_diagnostics,
+    resolve_store_clicks,
+    sum_actions_by_types,
+)
+
+
+def test_same_seed_generates_the_same_account():
+    first = list(meta_insights_pages(SyntheticAccount(ads=200, seed=3), "2024-01-01", "2024-01-31", page_size=50))
+    second = list(meta_insights_pages(SyntheticAccount(ads=200, seed=3), "2024-01-01", "2024-01-31", page_size=50))
+    other_seed = list(meta_insights_pages(SyntheticAccount(ads=200, seed=4), "2024-01-01", "2024-01-31", page_size=50))
+
+    assert first == second
+    assert first != other_seed
+    # Uma janela menor traz exatamente as mesmas linhas daqueles dias
+    window = SyntheticAccount(ads=200, seed=3).campaign_day_rows("2024-01-10", "2024-01-10")
+    assert window == [row for page in first for row in page["data"] if row["date_start"] == "2024-01-10"]
+
+
+def test_pages_follow_graph_cursors_until_the_last_row():
+    account = SyntheticAccount(ads=120, seed=1)  # 3 campanhas x 30 dias = 90 linhas
+    pages = list(meta_insights_pages(account, "2024-03-01", "2024-03-30", page_size=40))
+
+    assert [len(page["data"]) for page in pages] == [40, 40, 10]
+    assert all("next" in page["paging"] for page in pages[:-1])
+    assert "next" not in pages[-1]["paging"]
+    assert [row for page in pages for row in page["data"]] == account.campaign_day_rows("2024-03-01", "2024-03-30")
+
+
+def test_actions_cover_every_store_install_and_activate_variant():
+    account = SyntheticAccount(ads=100, seed=0)
+    df = meta_insights_frame(account, "2024-01-01", "2024-01-31")
+    diagnostics = collect_action_type_diagnostics(df["actions"])
+
+    assert set(diagnostics["store_click_events"]) == STORE_CLICK_ACTION_TYPES
+    assert set(diagnostics["install_events"]) == INSTALL_ACTION_TYPES
+    assert set(diagnostics["activate_app_events"]) == ACTIVATE_APP_ACTION_TYPES
+    store_clicks, source = resolve_store_clicks(df)
+    assert source == "actions" and store_clicks > 0
+
+    everything = meta_insights_frame(SyntheticAccount(ads=10, variants_per_row=None), "2024-01-01", "2024-01-01")
+    assert set(INSTALL_ACTION_TYPES) <= {a["action_type"] for a in everything["actions"].iloc[0]}
+
+
+def test_process_meta_insights_totals_match_the_generated_rows():
+    df = meta_insights_frame(SyntheticAccount(ads=500, seed=2), "2024-01-01", "2024-03-31")
+    result = DataProvider(mode="mock")._process_meta_insights(df)
+
+    assert len(df) == 10 * 91
+    assert result["impressoes"] == int(df["impressions"].sum())
+    assert result["instalacoes_sdk"] == sum_actions_by_types(df["actions"], INSTALL_ACTION_TYPES)[0] > 0
+
+
+def test_ga4_report_response_pages_by_offset_and_limit():
+    account = SyntheticAccount(ads=250, seed=0)  # 5 origens fixas + 10 de utm
+    dimensions, metrics = ["date", "sessionSourceMedium"], ["sessions", "totalUsers", "engagementRate"]
+
+    full = ga4_report_response(account, dimensions, metrics, "2024-01-01", "2024-01-07")
+    page = ga4_report_response(account, dimensions, metrics, "20240101", "20240107", offset=100, limit=10)
+
+    assert full.row_count == page.row_count == 7 * 15
+    assert len(full.rows) == 105 and len(page.rows) == 5
+    assert page.rows[0] == full.rows[100]
+    assert full.rows[0].dimension_values[0].value == "20240101"
+    assert 0 < float(full.rows[0].metric_values[2].value) < 1
+
+
+def test_creative_frame_renders_as_the_dashboard_table():
+    df = creative_frame(SyntheticAccount(ads=300, seed=5), "2024-01-01", "2024-01-30")
+
+    assert len(df) == 300 and df["Criativo"].is_unique
+    assert pd.api.types.is_float_dtype(df["Valor gasto"])
+    assert render_html_table(df, formats={"Valor gasto": "$ {:,.2f}"}).count("<tr>") == 301
@@ -0,0 +1,887 @@
+"""Paleta oficial LIA (mint / violet) e CSS do tema do dashboard."""
+
+from __future__ import annotations
+
+from typing import Dict
+
+# =============================================================================
+# PALETA OFICIAL LIA - MINT / VIOLET
+# =============================================================================
+LIA = {
+    # Cores principais LIA
+    "primary": "#5CC9B6",           # Mint / Aqua Green
+    "primary_dark": "#5CC9B6",      # Mantém consistência com a marca
+    "primary_light": "#F7F9FC",     # Ice Gray para fundos suaves
+    "secondary": "#7A5CFF",         # Soft Violet
+    "accent": "#7A5CFF",            # Reforço secundário
+
+    # Base de fundo
+    "gradient_start": "#F7F9FC",
+    "gradient_mid": "#F7F9FC",
+    "gradient_end": "#FFFFFF",
+
+    # Backgrounds
+    "bg_dark": "#FFFFFF",           # Usado para textos sobre gradientes
+    "bg_card": "#FFFFFF",           # Superfície de cartões
+    "bg_card_solid": "#FFFFFF",
+    "bg_glass": "rgba(92, 201, 182, 0.06)",
+    "bg_hover": "rgba(92, 201, 182, 0.1)",
+
+    # Texto
+    "text_light": "#1A2B49",        # Navy para títulos
+    "text_primary": "#1A2B49",
+    "text_secondary": "rgba(26, 43, 73, 0.7)",
+    "text_muted": "rgba(26, 43, 73, 0.55)",
+    "text_dark": "#1A2B49",
+
+    # Status colors (alinhados à marca)
+    "success": "#5CC9B6",
+    "success_light": "rgba(92, 201, 182, 0.2)",
+    "error": "#7A5CFF",
+    "error_light": "rgba(122, 92, 255, 0.2)",
+    "warning": "#7A5CFF",
+    "warning_light": "rgba(122, 92, 255, 0.18)",
+
+    # Bordas e sombras
+    "border": "rgba(26, 43, 73, 0.12)",
+    "border_light": "rgba(26, 43, 73, 0.08)",
+    "shadow": "rgba(26, 43, 73, 0.12)",
+    "glow": "rgba(92, 201, 182, 0.18)",
+}
+
+
+def build_theme_css(palette: Dict[str, str] = LIA) -> str:
+    """Monta o CSS do dashboard (sem a tag <style>) a partir da paleta."""
+    return f"""
+@import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700;800&display=swap');
+
+*, *::before, *::after {{ box-sizing: border-box; }}
+
+/* Fundo: Ice Gray com glow suave */
+html, body, [data-testid="stAppViewContainer"], .stApp {{
+    background: linear-gradient(
+        180deg,
+        rgba(255, 210, 180, 0.3) 0%,
+        rgba(255, 245, 240, 0.4) 25%,
+        #FFFFFF 60%
+    ) !important;
+    min-height: 100vh;
+    font-family: 'Inter', -apple-system, sans-serif !important;
+}}
+
+/* Ajuste para melhor transição do gradiente */
+[data-testid="stAppViewContainer"]::before {{
+    content: '';
+    position: fixed;
+    top: 0;
+    left: 0;
+    right: 0;
+    bottom: 0;
+    background: radial-gradient(ellipse at 20% 0%, rgba(92, 201, 182, 0.12) 0%, transparent 55%),
+                radial-gradient(ellipse at 85% 100%, rgba(122, 92, 255, 0.1) 0%, transparent 45%);
+    pointer-events: none;
+    z-index: 0;
+}}
+
+[data-testid="stSidebar"], section[data-testid="stSidebar"],
+button[kind="header"], [data-testid="collapsedControl"] {{
+    display: none !important;
+}}
+
+.main .block-container {{
+    padding: 20px !important;
+    max-width: 1200px !important;
+    margin: 0 auto;
+    position: relative;
+    z-index: 1;
+}}
+
+/* ========== CARTOES GLASSMORPHISM ESCUROS ========== */
+.glass-card {{
+    background: linear-gradient(
+        120deg,
+        rgba(255, 210, 180, 0.35) 0%,
+        rgba(255, 170, 120, 0.35) 35%,
+        rgba(255, 150, 110, 0.28) 70%,
+        rgba(255, 245, 240, 0.4) 100%
+    );
+    backdrop-filter: blur(16px);
+    -webkit-backdrop-filter: blur(16px);
+    border: 1px solid {palette["border"]};
+    border-radius: 20px;
+    box-shadow: 0 12px 24px rgba(92, 201, 182, 0.12),
+                0 0 16px rgba(92, 201, 182, 0.18);
+    padding: 24px;
+}}
+
+.content-layer {{
+    display: flex;
+    flex-direction: column;
+    gap: 18px;
+    margin-top: 16px;
+}}
+
+.empty-state {{
+    display: none !important;
+}}
+
+/* ========== HEADER (glass escuro com glow) ========== */
+.lia-header {{
+    background: linear-gradient(
+        120deg,
+        rgba(255, 210, 180, 0.35) 0%,
+        rgba(255, 170, 120, 0.35) 35%,
+        rgba(255, 150, 110, 0.28) 70%,
+        rgba(255, 245, 240, 0.4) 100%
+    );
+    backdrop-filter: blur(18px);
+    -webkit-backdrop-filter: blur(18px);
+    border-radius: 20px;
+    padding: 20px 28px;
+    min-height: 84px;
+    display: flex;
+    align-items: center;
+    justify-content: space-between;
+    border: 1px solid {palette["border"]};
+    box-shadow: 0 12px 24px rgba(92, 201, 182, 0.12),
+                0 0 16px rgba(122, 92, 255, 0.14);
+    margin-bottom: 0;
+    overflow: visible;
+    position: relative;
+    z-index: 2;
+}}
+
+.lia-header-left {{
+    display: flex;
+    align-items: center;
+    gap: 14px;
+}}
+
+.lia-logo {{
+    width: 50px;
+    height: 50px;
+    border-radius: 20px;
+    background: linear-gradient(135deg, {palette["primary"]} 0%, {palette["secondary"]} 100%);
+    backdrop-filter: blur(12px);
+    display: flex;
+    align-items: center;
+    justify-content: center;
+    box-shadow: 0 8px 16px rgba(92, 201, 182, 0.18),
+                0 0 12px rgba(122, 92, 255, 0.14);
+    position: relative;
+    z-index: 3;
+}}
+
+.lia-logo img {{
+    width: 32px;
+    height: 32px;
+    filter: none;
+    mix-blend-mode: normal;
+}}
+
+.lia-title-group {{
+    display: flex;
+    flex-direction: column;
+}}
+
+.lia-main-title {{
+    font-size: 20px;
+    font-weight: 800;
+    color: {palette["text_light"]};
+    letter-spacing: -0.5px;
+    margin: 0;
+    line-height: 1.2;
+    text-shadow: none;
+}}
+
+.lia-subtitle {{
+    font-size: 12px;
+    color: {palette["text_secondary"]};
+    font-weight: 500;
+    margin: 0;
+}}
+
+/* ========== STATUS CARD ========== */
+.status-card {{
+    background: {palette["bg_card"]};
+    border-radius: 20px;
+    padding: 12px 20px;
+    display: flex;
+    align-items: center;
+    gap: 12px;
+    border: 1px solid {palette["border"]};
+    box-shadow: 0 10px 20px rgba(92, 201, 182, 0.12),
+                0 0 12px rgba(92, 201, 182, 0.18);
+}}
+
+.status-owl {{
+    width: 28px;
+    height: 28px;
+    filter: drop-shadow(0 0 8px rgba(92, 201, 182, 0.18));
+}}
+
+.status-text {{
+    font-size: 13px;
+    color: {palette["text_primary"]};
+    font-weight: 500;
+}}
+
+/* ========== KPI GRID & CARDS ========== */
+.section-title {{
+    font-size: 15px;
+    font-weight: 700;
+    color: {palette["text_light"]};
+    margin-bottom: 18px;
+    display: flex;
+    align-items: center;
+    gap: 8px;
+    text-transform: uppercase;
+    letter-spacing: 0.5px;
+}}
+
+.section-icon {{
+    width: 24px;
+    height: 24px;
+    background: linear-gradient(135deg, {palette["primary"]} 0%, {palette["secondary"]} 100%);
+    color: {palette["bg_dark"]};
+    border-radius: 16px;
+    display: flex;
+    align-items: center;
+    justify-content: center;
+    font-size: 12px;
+    font-weight: 800;
+    box-shadow: 0 6px 12px rgba(92, 201, 182, 0.18),
+                0 0 10px rgba(122, 92, 255, 0.14);
+}}
+
+.kpi-grid {{
+    display: grid;
+    grid-template-columns: repeat(auto-fit, minmax(130px, 1fr));
+    gap: 12px;
+}}
+
+.kpi-card {{
+    position: relative;
+    perspective: 1000px;
+    height: 150px;
+    display: block;
+}}
+
+.kpi-card input {{
+    position: absolute;
+    opacity: 0;
+    pointer-events: none;
+}}
+
+.kpi-inner {{
+    position: relative;
+    width: 100%;
+    height: 100%;
+}}
+
+.kpi-front,
+.kpi-back {{
+    position: absolute;
+    inset: 0;
+    backface-visibility: hidden;
+    background: {palette["bg_card"]};
+    border-radius: 20px;
+    padding: 16px;
+    border: 1px solid {palette["border"]};
+    transition: transform 0.6s ease, background 0.2s ease, box-shadow 0.2s ease;
+    cursor: pointer;
+    box-shadow: 0 10px 20px rgba(92, 201, 182, 0.12),
+                0 0 12px rgba(92, 201, 182, 0.18);
+}}
+
+.kpi-front {{
+    transform: rotateY(0deg);
+}}
+
+.kpi-back {{
+    transform: rotateY(180deg);
+}}
+
+.kpi-card input:checked ~ .kpi-inner .kpi-back {{
+    transform: rotateY(0deg);
+}}
+
+.kpi-card input:checked ~ .kpi-inner .kpi-front {{
+    transform: rotateY(-180deg);
+}}
+
+.kpi-card:hover .kpi-front,
+.kpi-card:hover .kpi-back {{
+    background: {palette["bg_card"]};
+    border-color: {palette["primary"]};
+    box-shadow: 0 12px 24px rgba(92, 201, 182, 0.14),
+                0 0 14px rgba(92, 201, 182, 0.18);
+}}
+
+.kpi-top {{
+    display: flex;
+    align-items: center;
+    justify-content: space-between;
+    gap: 8px;
+    margin-bottom: 10px;
+}}
+
+.kpi-icon {{
+    font-size: 16px;
+    filter: drop-shadow(0 0 6px rgba(92, 201, 182, 0.18));
+}}
+
+.kpi-label {{
+    font-size: 11px;
+    font-weight: 600;
+    color: {palette["text_secondary"]};
+    text-transform: uppercase;
+    letter-spacing: 0.3px;
+    margin: 0;
+}}
+
+.kpi-value {{
+    font-size: 20px;
+    font-weight: 800;
+    color: {palette["text_light"]};
+    margin-bottom: 6px;
+    text-shadow: none;
+}}
+
+.kpi-delta {{
+    font-size: 11px;
+    font-weight: 700;
+    display: flex;
+    align-items: center;
+    gap: 2px;
+}}
+
+.kpi-back p {{
+    margin: 12px 0 0 0;
+    font-size: 12px;
+    color: {palette["text_secondary"]};
+}}
+
+.delta-up {{ color: {palette["success"]}; text-shadow: 0 0 10px rgba(92, 201, 182, 0.18); }}
+.delta-down {{ color: {palette["error"]}; text-shadow: 0 0 10px rgba(122, 92, 255, 0.14); }}
+.delta-neutral {{ color: {palette["text_muted"]}; }}
+
+/* ========== BADGES ========== */
+.badge-row {{
+    display: flex;
+    gap: 8px;
+    margin-bottom: 16px;
+}}
+
+.badge {{
+    padding: 6px 12px;
+    border-radius: 18px;
+    font-size: 11px;
+    font-weight: 700;
+    display: flex;
+    align-items: center;
+    gap: 6px;
+}}
+
+.badge-orange, .badge-cyan {{
+    background: rgba(92, 201, 182, 0.12);
+    color: {palette["primary"]};
+    border: 1px solid rgba(92, 201, 182, 0.3);
+    box-shadow: 0 0 6px rgba(92, 201, 182, 0.14);
+}}
+
+.badge-green {{
+    background: rgba(92, 201, 182, 0.12);
+    color: {palette["success"]};
+    border: 1px solid rgba(92, 201, 182, 0.3);
+    box-shadow: 0 0 6px rgba(92, 201, 182, 0.14);
+}}
+
+/* ========== TABELA COM HEADER GLASS ESCURO ========== */
+.table-container {{
+    background: {palette["bg_card"]};
+    backdrop-filter: blur(16px);
+    -webkit-backdrop-filter: blur(16px);
+    border-radius: 20px;
+    overflow: hidden;
+    border: 1px solid {palette["border"]};
+    box-shadow: 0 12px 24px rgba(92, 201, 182, 0.12),
+                0 0 16px rgba(92, 201, 182, 0.18);
+    margin-bottom: 12px;
+}}
+
+.table-header {{
+    background: rgba(92, 201, 182, 0.12);
+    padding: 14px 18px;
+    border-bottom: 1px solid {palette["border"]};
+}}
+
+.table-header-title {{
+    font-size: 14px;
+    font-weight: 600;
+    color: {palette["text_light"]};
+}}
+
+.stDataFrame {{
+    background: transparent !important;
+}}
+
+[data-testid="stDataFrame"] > div {{
+    background: transparent !important;
+}}
+
+.lia-html-table {{
+    width: 100%;
+    border-collapse: collapse;
+    font-size: 14px;
+    text-align: left;
+}}
+
+.lia-html-table :is(th, td) {{
+    padding: 12px 16px;
+    white-space: nowrap;
+    vertical-align: middle;
+}}
+
+.lia-html-table thead th {{
+    background: rgba(92, 201, 182, 0.12);
+    border-bottom: 1px solid {palette["border"]};
+    color: {palette["text_light"]};
+    font-weight: 600;
+    text-transform: capitalize;
+    letter-spacing: 0.02em;
+}}
+
+.lia-html-table tbody td {{
+    border-bottom: 1px solid rgba(26, 43, 73, 0.08);
+    color: {palette["text_primary"]};
+    opacity: 0.88;
+    transition: opacity 0.3s ease, background 0.3s ease;
+}}
+
+.lia-html-table tbody tr:nth-child(odd) {{
+    background: rgba(247, 249, 252, 0.9);
+}}
+
+.lia-html-table tbody tr:hover td {{
+    opacity: 1;
+}}
+
+.lia-html-table tbody tr:last-child td {{
+    border-bottom: 0;
+}}
+
+.lia-html-table tbody td:nth-child(n + 2) {{
+    text-align: right;
+    font-variant-numeric: tabular-nums;
+}}
+
+.event-tooltip-wrapper {{
+    position: relative;
+    display: inline-flex;
+    align-items: center;
+    gap: 6px;
+}}
+
+.event-btn {{
+    background: transparent;
+    border: none;
+    padding: 0;
+    font-size: 14px;
+    font-weight: 600;
+    color: {palette["text_light"]};
+    cursor: default;
+    display: inline-flex;
+    align-items: center;
+    gap: 6px;
+}}
+
+.tooltip-icon {{
+    width: 16px;
+    height: 16px;
+    border-radius: 50%;
+    background: linear-gradient(135deg, {palette["primary"]} 0%, {palette["secondary"]} 100%);
+    color: {palette["bg_dark"]};
+    display: inline-flex;
+    align-items: center;
+    justify-content: center;
+    font-size: 11px;
+    font-weight: 700;
+    box-shadow: 0 0 8px rgba(92, 201, 182, 0.18);
+}}
+
+.tooltip-popup {{
+    position: absolute;
+    left: 0;
+    bottom: calc(100% + 8px);
+    background: {palette["bg_card"]};
+    color: {palette["text_light"]};
+    padding: 8px 10px;
+    border-radius: 16px;
+    font-size: 12px;
+    line-height: 1.4;
+    min-width: 160px;
+    max-width: 240px;
+    opacity: 0;
+    pointer-events: none;
+    transform: translateY(4px);
+    transition: opacity 0.2s ease, transform 0.2s ease;
+    z-index: 10;
+    border: 1px solid {palette["border"]};
+    box-shadow: 0 10px 20px rgba(92, 201, 182, 0.12),
+                0 0 14px rgba(122, 92, 255, 0.14);
+}}
+
+.event-tooltip-wrapper:hover .tooltip-popup,
+.event-tooltip-wrapper:focus-within .tooltip-popup {{
+    opacity: 1;
+    pointer-events: auto;
+    transform: translateY(0);
+}}
+
+/* ========== CARD DE ESCOPO ========== */
+.scope-card {{
+    background: {palette["bg_card"]};
+    backdrop-filter: blur(16px);
+    -webkit-backdrop-filter: blur(16px);
+    border-radius: 20px;
+    padding: 16px 20px;
+    display: flex;
+    align-items: center;
+    gap: 12px;
+    border: 1px solid {palette["border"]};
+    box-shadow: 0 12px 24px rgba(92, 201, 182, 0.12),
+                0 0 14px rgba(92, 201, 182, 0.18);
+    margin-bottom: 12px;
+}}
+
+.scope-text {{
+    font-size: 13px;
+    color: {palette["text_primary"]};
+}}
+
+/* ========== GRAFICOS EM CARDS ========== */
+.chart-card {{
+    background: {palette["bg_card"]};
+    backdrop-filter: blur(16px);
+    -webkit-backdrop-filter: blur(16px);
+    border-radius: 20px;
+    padding: 18px;
+    border: 1px solid {palette["border"]};
+    box-shadow: 0 12px 24px rgba(92, 201, 182, 0.12),
+                0 0 16px rgba(92, 201, 182, 0.18);
+    margin-bottom: 12px;
+}}
+
+.trend-toggle [data-baseweb="tab-list"] {{
+    gap: 8px;
+    background: rgba(92, 201, 182, 0.1);
+    border-radius: 18px;
+    padding: 4px;
+}}
+
+.trend-toggle [data-baseweb="tab"] {{
+    background: transparent;
+    border-radius: 18px;
+    padding: 6px 14px;
+    color: {palette["text_secondary"]};
+    font-size: 13px;
+    font-weight: 600;
+}}
+
+.trend-toggle [aria-selected="true"] {{
+    background: linear-gradient(135deg, {palette["primary"]} 0%, {palette["secondary"]} 100%);
+    color: {palette["bg_dark"]};
+    box-shadow: 0 8px 16px rgba(92, 201, 182, 0.14),
+                0 0 12px rgba(122, 92, 255, 0.14);
+}}
+
+.js-plotly-plot .plotly .modebar {{ display: none !important; }}
+
+/* ========== FILTROS ========== */
+.filter-card {{
+    background: {palette["bg_card"]};
+    backdrop-filter: blur(16px);
+    -webkit-backdrop-filter: blur(16px);
+    border: 1px solid {palette["border"]};
+    border-radius: 20px;
+    box-shadow: 0 8px 16px rgba(92, 201, 182, 0.1);
+    padding: 18px 18px 10px 18px;
+}}
+
+.stSelectbox > div > div {{
+    background: #FFFFFF !important;
+    border: 1px solid {palette["border"]} !important;
+    border-radius: 18px !important;
+    box-shadow: none;
+    color: {palette["text_light"]} !important;
+}}
+
+.stSelectbox > div > div:hover {{
+    border-color: {palette["primary"]} !important;
+    box-shadow: none;
+}}
+
+.stSelectbox label {{
+    color: {palette["text_secondary"]} !important;
+    font-size: 12px !important;
+}}
+
+.stSelectbox [data-baseweb="select"] span {{
+    color: {palette["text_light"]} !important;
+}}
+
+/* ========== AGENTE DE IA ========== */
+.ai-agent-card {{
+    background: linear-gradient(135deg, rgba(92, 201, 182, 0.12) 0%, rgba(122, 92, 255, 0.12) 100%);
+    backdrop-filter: blur(16px);
+    -webkit-backdrop-filter: blur(16px);
+    border: 1px solid {palette["primary"]};
+    border-radius: 20px;
+    padding: 24px;
+    margin-bottom: 16px;
+    box-shadow: 0 12px 24px rgba(92, 201, 182, 0.12),
+                0 0 14px rgba(122, 92, 255, 0.14);
+}}
+
+.ai-agent-header {{
+    display: flex;
+    align-items: center;
+    gap: 12px;
+    margin-bottom: 16px;
+}}
+
+.ai-agent-icon {{
+    width: 40px;
+    height: 40px;
+    background: linear-gradient(135deg, {palette["primary"]} 0%, {palette["secondary"]} 100%);
+    border-radius: 20px;
+    display: flex;
+    align-items: center;
+    justify-content: center;
+    font-size: 20px;
+    box-shadow: 0 8px 16px rgba(92, 201, 182, 0.18),
+                0 0 12px rgba(122, 92, 255, 0.14);
+}}
+
+.ai-agent-title {{
+    font-size: 16px;
+    font-weight: 700;
+    color: {palette["text_light"]};
+    text-shadow: none;
+}}
+
+.ai-agent-subtitle {{
+    font-size: 12px;
+    color: {palette["text_secondary"]};
+}}
+
+.ai-agent-content {{
+    background: #FFFFFF;
+    border-radius: 20px;
+    padding: 16px;
+    font-size: 14px;
+    line-height: 1.6;
+    color: {palette["text_primary"]};
+    border: 1px solid {palette["border"]};
+}}
+
+.ai-agent-content h1, .ai-agent-content h2, .ai-agent-content h3 {{
+    font-size: 14px;
+    font-weight: 700;
+    margin: 12px 0 8px 0;
+    color: {palette["text_light"]};
+}}
+
+.ai-agent-content p {{
+    margin: 8px 0;
+}}
+
+.ai-agent-content ul, .ai-agent-content ol {{
+    margin: 8px 0;
+    padding-left: 20px;
+    color: {palette["text_primary"]};
+}}
+
+/* ========== FOOTER ========== */
+.footer {{
+    text-align: center;
+    padding: 8px 0 0 0;
+    color: {palette["text_secondary"]};
+    font-size: 12px;
+    border-top: none;
+    margin-top: 8px;
+}}
+
+/* ========== STREAMLIT GLOBAL OVERRIDES ========== */
+.stButton > button {{
+    background: linear-gradient(135deg, {palette["primary"]} 0%, {palette["secondary"]} 100%) !important;
+    color: #FFFFFF !important;
+    border: none !important;
+    border-radius: 999px !important;
+    padding: 10px 20px !important;
+    font-weight: 600 !important;
+    box-shadow: 0 8px 16px rgba(92, 201, 182, 0.18),
+                0 0 12px rgba(122, 92, 255, 0.14) !important;
+    transition: all 0.3s ease !important;
+}}
+
+.stButton > button:hover {{
+    transform: translateY(-2px) !important;
+    box-shadow: 0 10px 20px rgba(92, 201, 182, 0.18),
+                0 0 14px rgba(122, 92, 255, 0.14) !important;
+}}
+
+.stButton > button[kind="secondary"],
+.stButton > button[kind="secondary"]:hover {{
+    background: #FFFFFF !important;
+    color: {palette["text_light"]} !important;
+    border: 1px solid rgba(92, 201, 182, 0.18) !important;
+    box-shadow: none !important;
+    transform: none !important;
+}}
+
+.stButton > button[kind="tertiary"],
+.stButton > button[kind="tertiary"]:hover {{
+    background: transparent !important;
+    color: {palette["text_light"]} !important;
+    border: none !important;
+    box-shadow: none !important;
+    text-decoration: underline;
+    text-decoration-color: rgba(92, 201, 182, 0.6);
+}}
+
+.ai-analysis-button .stButton > button {{
+    position: relative;
+    overflow: hidden;
+    justify-content: center;
+    gap: 10px;
+    height: 56px;
+    font-size: 16px !important;
+    letter-spacing: 0.2px;
+    background: {palette["text_light"]} !important;
+    color: #FFFFFF !important;
+    border-radius: 999px !important;
+    border: none !important;
+    box-shadow: 0 10px 18px rgba(26, 43, 73, 0.18);
+}}
+
+.ai-analysis-button .stButton > button::after {{
+    content: "";
+    position: absolute;
+    left: 8%;
+    right: 8%;
+    bottom: 8px;
+    height: 3px;
+    border-radius: 999px;
+    background: linear-gradient(90deg, {palette["primary"]}, {palette["secondary"]});
+    opacity: 0;
+    transition: opacity 0.25s ease;
+}}
+
+.ai-analysis-button .stButton > button:hover::after {{
+    opacity: 1;
+}}
+
+/* Date input styling */
+.stDateInput > div > div {{
+    background: #FFFFFF !important;
+    border: 1px solid {palette["border"]} !important;
+    border-radius: 18px !important;
+    color: {palette["text_light"]} !important;
+    box-shadow: none !important;
+}}
+
+.stDateInput label {{
+    color: {palette["text_secondary"]} !important;
+}}
+
+/* Metric styling */
+[data-testid="stMetricValue"] {{
+    color: {palette["text_light"]} !important;
+}}
+
+[data-testid="stMetricDelta"] {{
+    color: {palette["success"]} !important;
+}}
+
+/* Text elements */
+.stMarkdown p, .stMarkdown li {{
+    color: {palette["text_primary"]};
+}}
+
+/* Alerts */
+.stAlert {{
+    background: #FFFFFF !important;
+    border: 1px solid rgba(92, 201, 182, 0.18) !important;
+    border-radius: 20px !important;
+    box-shadow: 0 10px 20px rgba(92, 201, 182, 0.12),
+                0 0 12px rgba(122, 92, 255, 0.14) !important;
+}}
+
+.stAlert [data-testid="stAlertContent"] {{
+    color: {palette["text_light"]} !important;
+}}
+
+/* Expander styling */
+.streamlit-expanderHeader {{
+    background: #FFFFFF !important;
+    border: 1px solid {palette["border"]} !important;
+    border-radius: 18px !important;
+    color: {palette["text_light"]} !important;
+}}
+
+/* Scrollbar styling */
+::-webkit-scrollbar {{
+    width: 8px;
+    height: 8px;
+}}
+
+::-webkit-scrollbar-track {{
+    background: rgba(26, 43, 73, 0.08);
+    border-radius: 16px;
+}}
+
+::-webkit-scrollbar-thumb {{
+    background: {palette["primary"]};
+    border-radius: 16px;
+}}
+
+::-webkit-scrollbar-thumb:hover {{
+    background: {palette["primary_dark"]};
+}}
+
+/* Link styling */
+a {{
+    color: {palette["primary"]} !important;
+    text-decoration: none;
+}}
+
+a:hover {{
+    text-decoration: underline;
+    text-shadow: 0 0 10px rgba(92, 201, 182, 0.18);
+}}
+
+/* Loading spinner */
+.stSpinner > div {{
+    border-top-color: {palette["primary"]} !important;
+}}
+
+/* Skeleton de seção enquanto os dados carregam */
+.lia-skeleton {{
+    border-radius: 20px;
+    border: 1px solid {palette["border"]};
+    margin: 12px 0;
+    padding: 20px;
+    color: {palette["text_muted"]};
+    font-size: 13px;
+    background: linear-gradient(90deg, rgba(92, 201, 182, 0.06) 25%, rgba(122, 92, 255, 0.10) 50%, rgba(92, 201, 182, 0.06) 75%);
+    background-size: 200% 100%;
+    animation: lia-skeleton-shimmer 1.4s ease-in-out infinite;
+}}
+
+@keyframes lia-skeleton-shimmer {{
+    0% {{ background-position: 200% 0; }}
+    100% {{ background-position: -200% 0; }}
+}}
+"""